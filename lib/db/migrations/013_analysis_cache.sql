@@ -0,0 +1,21 @@
+-- Migration: 013_analysis_cache
+-- Description: Content-addressed cache of chart analyses
+--
+-- Keyed by "<sha256 of image bytes>:<sha256 of prompt>:<model>" so identical
+-- charts analysed with the same prompt and model are reused across live cycles,
+-- backtests, tournaments, A/B tests and the prompt optimizer. prompt_short_hash
+-- is the 5-char generate_prompt_hash, kept for display only.
+-- See python/trading_bot/db/analysis_cache.py.
+
+CREATE TABLE IF NOT EXISTS bt_analysis_cache (
+    cache_key TEXT PRIMARY KEY,
+    image_hash TEXT NOT NULL,
+    prompt_hash TEXT NOT NULL,
+    prompt_short_hash TEXT,
+    model TEXT NOT NULL,
+    result_json JSONB NOT NULL,
+    created_at TEXT NOT NULL
+);
+
+-- Prefix lookups (image only / image + prompt) use LIKE 'prefix%'
+CREATE INDEX IF NOT EXISTS idx_bt_analysis_cache_key_prefix ON bt_analysis_cache (cache_key text_pattern_ops);
@@ -0,0 +1,11 @@
+-- Migration: 014_recommendation_chart_hash
+-- Description: Store a perceptual hash (dHash) of each analyzed chart
+--
+-- The trading cycle compares a new capture against charts other instances
+-- already analyzed for the same symbol/timeframe/prompt/model in the current
+-- boundary and reuses the recommendation when the hashes are within
+-- charts.hash_max_distance (config.yaml) bits.
+
+ALTER TABLE recommendations ADD COLUMN IF NOT EXISTS chart_hash TEXT;
+
+COMMENT ON COLUMN recommendations.chart_hash IS 'dHash (hex) of the analyzed chart screenshot. Used to skip LLM calls for near-identical charts in the same boundary.';
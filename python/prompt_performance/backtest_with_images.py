@@ -52,6 +52,7 @@ project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
 from trading_bot.core.analyzer import ChartAnalyzer
+from trading_bot.core.llm_dispatcher import get_llm_dispatcher
 from trading_bot.core.prompts.analyzer_prompt import (
     code_nova_improoved_based_on_analyzis,
     get_analyzer_prompt_hybrid_ultimate,
@@ -269,6 +270,9 @@ class PromptAnalyzer:
         self.config = config
         self.openai_client = openai.OpenAI(api_key=config.openai.api_key)
         self.analyzer = ChartAnalyzer(self.openai_client, config)
+        # Shared with tournaments and the live cycle: one concurrency cap and rate limit
+        self.llm_dispatcher = get_llm_dispatcher()
+        self.llm_dispatcher.attach(self.openai_client)
         self.verbose_prompts = verbose_prompts
         self.progress_callback = progress_callback
         self.candle_fetcher = candle_fetcher
@@ -315,6 +319,42 @@ class PromptAnalyzer:
         """
         return self.get_prompt_function_static(prompt_name)
 
+    def render_placeholder_prompt(self, image_info: 'ImageInfo', prompt_name: str) -> Optional[Dict[str, Any]]:
+        """Prompt data built with 'N/A' market data (for display, hashing and metadata).
+
+        Returns None if the prompt can't be resolved or rendered.
+        """
+        try:
+            prompt_func = self.get_prompt_function(prompt_name)
+            return prompt_func({
+                'symbol': image_info.symbol,
+                'timeframe': image_info.timeframe,
+                'mid_price': 'N/A',
+                'bid_price': 'N/A',
+                'ask_price': 'N/A',
+                'last_close_price': 'N/A',
+                'funding_rate': 'N/A',
+                'long_short_ratio': 'N/A'
+            })
+        except Exception as e:
+            logger.debug(f"Failed to render prompt {prompt_name}: {e}")
+            return None
+
+    def get_content_cached_analysis(self, image_info: 'ImageInfo', prompt_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Look up the content-addressed analysis cache (image bytes + prompt hash + model).
+
+        The prompt hash ignores market data lines, so the placeholder prompt
+        maps to the same entry as the prompt analyze_image actually sends.
+        """
+        cache = self.analyzer.analysis_cache
+        if cache is None or not prompt_data.get('prompt'):
+            return None
+        try:
+            key = self.analyzer.analysis_cache_key(image_info.filepath.read_bytes(), prompt_data['prompt'])
+        except OSError:
+            return None
+        return cache.get(key)
+
     def analyze_image(
         self,
         image_info: ImageInfo,
@@ -384,11 +424,13 @@ class PromptAnalyzer:
             # Analyze chart using custom_prompt_data parameter
             # This is the EXACT same path as live analyzer
             # Pass skip_market_data=True to avoid fetching current market data
-            result = self.analyzer.analyze_chart_with_assistant(
+            result = self.llm_dispatcher.run(
+                self.analyzer.analyze_chart_with_assistant,
                 image_path=str(image_info.filepath),
                 target_timeframe=image_info.timeframe,
                 custom_prompt_data=prompt_data,
-                skip_market_data=True  # Don't fetch current market data for historical backtest
+                skip_market_data=True,  # Don't fetch current market data for historical backtest
+                label=f"{image_info.symbol}/{prompt_name}",
             )
 
             # Check for errors or skipped
@@ -930,23 +972,14 @@ class ImageBacktester:
         if CANCEL_EVENT.is_set():
             return
 
+        # Render the prompt once (placeholder market data); reused for display,
+        # cache keys and error-row metadata
+        prompt_meta = self.prompt_analyzer.render_placeholder_prompt(image_info, prompt_name)
+
         # Emit prompt display event BEFORE cache check (so user sees what's being analyzed)
         if self.prompt_analyzer.verbose_prompts and self.prompt_analyzer.progress_callback:
             try:
-                # Get prompt function and generate prompt text
-                prompt_func = self.prompt_analyzer.get_prompt_function(prompt_name)
-                market_data = {
-                    'symbol': image_info.symbol,
-                    'timeframe': image_info.timeframe,
-                    'mid_price': 'N/A',
-                    'bid_price': 'N/A',
-                    'ask_price': 'N/A',
-                    'last_close_price': 'N/A',
-                    'funding_rate': 'N/A',
-                    'long_short_ratio': 'N/A'
-                }
-                prompt_data = prompt_func(market_data)
-                prompt_text = prompt_data.get('prompt', '')
+                prompt_text = (prompt_meta or {}).get('prompt', '')
 
                 # Get assistant model
                 assistant_model = 'N/A'
@@ -982,31 +1015,37 @@ class ImageBacktester:
             except Exception as e:
                 logger.debug(f"Failed to emit prompt display event: {e}")
 
-        # Check store to avoid re-analyzing the same prompt+image+model (save API cost)
+        # Avoid re-analyzing the same image+prompt+model (save API cost).
+        # Content-addressed cache first (identical chart bytes under any name,
+        # from any run/tournament/live cycle), then the store's filename lookup.
         cached = None
         try:
+            if prompt_meta is not None:
+                hit = self.prompt_analyzer.get_content_cached_analysis(image_info, prompt_meta)
+                if hit is not None:
+                    cached = {
+                        'prompt_version': (prompt_meta.get('version') or {}).get('name', 'unknown'),
+                        'recommendation': hit.get('recommendation'),
+                        'confidence': hit.get('confidence'),
+                        'entry_price': hit.get('entry_price'),
+                        'stop_loss': hit.get('stop_loss'),
+                        'take_profit': hit.get('take_profit'),
+                        'rr_ratio': hit.get('risk_reward_ratio'),
+                        'raw_response': hit.get('raw_response') or hit.get('raw_text'),
+                        'rationale': hit.get('rationale'),
+                        'assistant_id': hit.get('assistant_id'),
+                        'assistant_model': hit.get('assistant_model'),
+                    }
             image_filename = image_info.filepath.name
-            # try to determine intended assistant_model from prompt metadata
-            try:
-                prompt_func = self.prompt_analyzer.get_prompt_function(prompt_name)
-                prompt_meta = prompt_func({
-                    'symbol': image_info.symbol,
-                    'timeframe': image_info.timeframe,
-                    'mid_price': 'N/A',
-                    'bid_price': 'N/A',
-                    'ask_price': 'N/A',
-                    'last_close_price': 'N/A',
-                    'funding_rate': 'N/A',
-                    'long_short_ratio': 'N/A'
-                })
+            # intended assistant_model from prompt metadata
+            intended_model = None
+            if prompt_meta is not None:
                 intended_model = (
                     prompt_meta.get('assistant_model')
                     or prompt_meta.get('model')
                     or (prompt_meta.get('version', {}) or {}).get('model')
                 )
-            except Exception:
-                intended_model = None
-            if self.backtest_store is not None and self.backtest_store.has_cached_analysis(
+            if cached is None and self.backtest_store is not None and self.backtest_store.has_cached_analysis(
                 prompt_name=prompt_name,
                 image_filename=image_filename,
                 assistant_model=intended_model,
@@ -1171,22 +1210,8 @@ class ImageBacktester:
 
             # Always log an analysis record (even if failed or HOLD)
             if analysis is None:
-                # Try to extract prompt version metadata without incurring analysis again
-                try:
-                    prompt_func = self.prompt_analyzer.get_prompt_function(prompt_name)
-                    prompt_meta = prompt_func({
-                        'symbol': image_info.symbol,
-                        'timeframe': image_info.timeframe,
-                        'mid_price': 'N/A',
-                        'bid_price': 'N/A',
-                        'ask_price': 'N/A',
-                        'last_close_price': 'N/A',
-                        'funding_rate': 'N/A',
-                        'long_short_ratio': 'N/A'
-                    })
-                    prompt_version = prompt_meta.get('version', {}).get('name', 'unknown')
-                except Exception:
-                    prompt_version = 'unknown'
+                # Prompt version metadata from the already-rendered prompt
+                prompt_version = ((prompt_meta or {}).get('version') or {}).get('name', 'unknown')
 
                 err_row = {
                     'prompt_name': prompt_name,
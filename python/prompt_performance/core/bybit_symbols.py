@@ -6,11 +6,9 @@ from dataclasses import dataclass
 from pathlib import Path
 from typing import Dict, List, Optional
 
-import requests
+from trading_bot.core.bybit_market_client import get_bybit_market_client
 
 SYMBOLS_JSON = Path(__file__).with_name("bybit_symbols.json")
-BYBIT_BASE_URL = "https://api.bybit.com"
-INSTRUMENTS_PATH = "/v5/market/instruments-info"
 
 
 @dataclass
@@ -31,10 +29,8 @@ def _fetch_page(category: str, cursor: Optional[str] = None, limit: int = 1000)
     params: Dict[str, object] = {"category": category, "limit": limit}
     if cursor:
         params["cursor"] = cursor
-    url = BYBIT_BASE_URL + INSTRUMENTS_PATH
-    r = requests.get(url, params=params, timeout=20)
-    r.raise_for_status()
-    return r.json()
+    # Shared pooled client; raises httpx.HTTPStatusError on HTTP errors
+    return get_bybit_market_client().get_sync("instruments_info", **params)
 
 
 def fetch_bybit_symbols(category: str = "linear") -> List[str]:
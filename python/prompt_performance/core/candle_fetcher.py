@@ -35,6 +35,14 @@ class CandleFetcher:
         self.api_manager = BybitAPIManager(self.config, use_testnet=use_testnet)
         self.db = CandleStoreDatabase()
 
+    def _get_kline(self, params: Dict[str, Any]) -> Dict[str, Any]:
+        """Public kline request over the shared pooled market-data client."""
+        try:
+            return self.api_manager.market.get_sync('kline', **params)
+        except Exception as e:
+            logger.error(f"Kline request failed: {type(e).__name__}: {e}")
+            return {"retCode": -1, "retMsg": f"{type(e).__name__}: {e}", "error": str(e)}
+
     def _infer_category_from_symbol(self, symbol: str) -> str:
         """Infer Bybit category from symbol."""
         symbol_upper = symbol.upper()
@@ -92,7 +100,7 @@ class CandleFetcher:
             'category': category
         }
 
-        response = self.api_manager.get_kline(**params)
+        response = self._get_kline(params)
 
         if not response or response.get('retCode') != 0:
             logger.error(f"Failed to fetch candles: {response}")
@@ -166,7 +174,7 @@ class CandleFetcher:
             'category': category
         }
 
-        response = self.api_manager.get_kline(**params)
+        response = self._get_kline(params)
 
         if not response or response.get('retCode') != 0:
             logger.error(f"Failed to fetch candles backwards: {response}")
@@ -12,11 +12,13 @@ from trading_bot.db.client import (
     get_connection as get_db_connection,
     query,
     execute,
+    execute_many,
     get_table_name,
     DB_TYPE,
     should_run_migrations,
     release_connection
 )
+from trading_bot.db.candle_cache import CandleArrays, get_candle_cache
 
 logger = logging.getLogger(__name__)
 
@@ -136,7 +138,7 @@ class CandleStoreDatabase:
                 return results[0]['max']
             return None
         finally:
-            release_connection()
+            release_connection(conn)
 
     def get_earliest_candle_timestamp(self, symbol: str, timeframe: str) -> Optional[int]:
         """Get the earliest stored candle timestamp for a symbol/timeframe."""
@@ -155,7 +157,7 @@ class CandleStoreDatabase:
                 return results[0]['min']
             return None
         finally:
-            release_connection()
+            release_connection(conn)
 
     def insert_candles(self, candles: List[Dict[str, Any]], symbol: str, timeframe: str, category: str):
         """Insert candles into cache, skipping duplicates."""
@@ -167,54 +169,83 @@ class CandleStoreDatabase:
         # Sort candles by start_time ascending
         candles_sorted = sorted(candles, key=lambda x: x['start_time'])
 
+        # Use INSERT OR IGNORE for SQLite, ON CONFLICT DO NOTHING for PostgreSQL
+        if DB_TYPE == 'postgres':
+            sql = f"""
+                INSERT INTO {table_name}
+                (symbol, timeframe, category, start_time, open_price, high_price,
+                 low_price, close_price, volume, turnover)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (symbol, timeframe, start_time) DO NOTHING
+            """
+        else:
+            sql = f"""
+                INSERT OR IGNORE INTO {table_name}
+                (symbol, timeframe, category, start_time, open_price, high_price,
+                 low_price, close_price, volume, turnover)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """
+
+        rows = [
+            (
+                symbol,
+                timeframe,
+                category,
+                candle['start_time'],
+                candle['open_price'],
+                candle['high_price'],
+                candle['low_price'],
+                candle['close_price'],
+                candle['volume'],
+                candle['turnover']
+            )
+            for candle in candles_sorted
+        ]
+
         conn = self.get_connection()
         try:
-            inserted_count = 0
-            for candle in candles_sorted:
-                try:
-                    # Use INSERT OR IGNORE for SQLite, ON CONFLICT DO NOTHING for PostgreSQL
-                    if DB_TYPE == 'postgres':
-                        sql = f"""
-                            INSERT INTO {table_name}
-                            (symbol, timeframe, category, start_time, open_price, high_price,
-                             low_price, close_price, volume, turnover)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                            ON CONFLICT (symbol, timeframe, start_time) DO NOTHING
-                        """
-                    else:
-                        sql = f"""
-                            INSERT OR IGNORE INTO {table_name}
-                            (symbol, timeframe, category, start_time, open_price, high_price,
-                             low_price, close_price, volume, turnover)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """
-
-                    params = (
-                        symbol,
-                        timeframe,
-                        category,
-                        candle['start_time'],
-                        candle['open_price'],
-                        candle['high_price'],
-                        candle['low_price'],
-                        candle['close_price'],
-                        candle['volume'],
-                        candle['turnover']
-                    )
-
-                    execute(conn, sql, params)
-                    # Note: rowcount may not be reliable across databases for INSERT OR IGNORE
-                    inserted_count += 1
-                except Exception as e:
-                    logger.warning(f"Failed to insert candle for {symbol} {timeframe}: {e}")
-
-            conn.commit()
+            # One statement batch, one commit
+            inserted_count = execute_many(conn, sql, rows)
             logger.info(f"Inserted {inserted_count} new candles for {symbol} {timeframe}")
+        except Exception as e:
+            logger.warning(f"Failed to insert {len(rows)} candles for {symbol} {timeframe}: {e}")
+            return
         finally:
-            release_connection()
+            release_connection(conn)
+
+        # Write through to the columnar cache (klines_store stays the durable copy)
+        candle_cache = get_candle_cache()
+        if candle_cache is not None:
+            try:
+                candle_cache.append(symbol, timeframe, candles_sorted)
+            except Exception as e:
+                logger.warning(f"Failed to update columnar candle cache for {symbol} {timeframe}: {e}")
+
+    def get_candle_arrays(self, symbol: str, timeframe: str,
+                          start_timestamp: Optional[int] = None,
+                          end_timestamp: Optional[int] = None,
+                          limit: Optional[int] = None) -> Optional[CandleArrays]:
+        """Get candles as NumPy column arrays from the columnar cache, ordered by start_time ASC.
+
+        Syncs the cache from klines_store first. Returns None when the cache is disabled.
+        """
+        candle_cache = get_candle_cache()
+        if candle_cache is None:
+            return None
+
+        conn = self.get_connection()
+        try:
+            candle_cache.sync_from_store(conn, symbol, timeframe, since=start_timestamp)
+        finally:
+            release_connection(conn)
+        return candle_cache.read(symbol, timeframe, start=start_timestamp, end=end_timestamp, limit=limit)
 
     def get_candles_after_timestamp(self, symbol: str, timeframe: str, start_timestamp: int, limit: int = 1000) -> List[Dict[str, Any]]:
         """Get candles after a specific timestamp, ordered by start_time ASC."""
+        arrays = self.get_candle_arrays(symbol, timeframe, start_timestamp=start_timestamp, limit=limit)
+        if arrays is not None:
+            return arrays.to_dicts(store_format=True, symbol=symbol, timeframe=timeframe)
+
         table_name = get_table_name('klines_store')
         sql = f"""
             SELECT * FROM {table_name}
@@ -226,7 +257,7 @@ class CandleStoreDatabase:
         try:
             return query(conn, sql, (symbol, timeframe, start_timestamp, limit))
         finally:
-            release_connection()
+            release_connection(conn)
 
     def get_candle_count(self, symbol: str, timeframe: str) -> int:
         """Get total count of candles for a symbol/timeframe."""
@@ -245,7 +276,7 @@ class CandleStoreDatabase:
                 return results[0]['count']
             return 0
         finally:
-            release_connection()
+            release_connection(conn)
 
     def store_prompt_hash_mapping(self, prompt_hash: str, prompt_text: str, timeframe: Optional[str] = None, symbol: Optional[str] = None):
         """Store a prompt hash to prompt text mapping with optional metadata."""
@@ -275,7 +306,7 @@ class CandleStoreDatabase:
             execute(conn, sql, (prompt_hash, prompt_text, timeframe, normalized_symbol))
             conn.commit()
         finally:
-            release_connection()
+            release_connection(conn)
 
     def _timeframe_to_ms(self, timeframe: str) -> int:
         mapping = {"1m":60000, "5m":300000, "15m":900000, "30m":1800000, "1h":3600000, "4h":14400000, "1d":86400000, "1w":604800000}
@@ -299,7 +330,7 @@ class CandleStoreDatabase:
                 return []
             times = [r['start_time'] for r in rows]
         finally:
-            release_connection()
+            release_connection(conn)
 
         interval = self._timeframe_to_ms(timeframe)
         gaps: List[Dict[str, int]] = []
@@ -324,7 +355,7 @@ class CandleStoreDatabase:
             results = query(conn, sql, (prompt_hash,))
             return results[0]['prompt_text'] if results else None
         finally:
-            release_connection()
+            release_connection(conn)
 
     def get_all_prompt_mappings(self) -> Dict[str, str]:
         """Get all prompt hash to text mappings."""
@@ -337,7 +368,7 @@ class CandleStoreDatabase:
             results = query(conn, sql, ())
             return {row['prompt_hash']: row['prompt_text'] for row in results}
         finally:
-            release_connection()
+            release_connection(conn)
 
     def get_prompt_metadata(self, prompt_hash: str) -> Optional[Dict[str, str]]:
         """Get metadata (timeframe, symbol) for a prompt hash."""
@@ -355,7 +386,7 @@ class CandleStoreDatabase:
                 }
             return None
         finally:
-            release_connection()
+            release_connection(conn)
 
     def get_available_symbols(self) -> List[str]:
         """Get all unique symbols available in the candle cache."""
@@ -369,7 +400,7 @@ class CandleStoreDatabase:
             results = query(conn, sql, ())
             return [row['symbol'] for row in results]
         finally:
-            release_connection()
+            release_connection(conn)
 
     def get_available_timeframes(self, symbol: Optional[str] = None) -> List[str]:
         """Get all unique timeframes available in the candle cache, optionally filtered by symbol."""
@@ -394,7 +425,7 @@ class CandleStoreDatabase:
             results = query(conn, sql, params)
             return [row['timeframe'] for row in results]
         finally:
-            release_connection()
+            release_connection(conn)
 
     def get_candles_between_timestamps(self, symbol: str, timeframe: str,
                                       start_timestamp: int, end_timestamp: int,
@@ -412,7 +443,7 @@ class CandleStoreDatabase:
         try:
             return query(conn, sql, (symbol, timeframe, start_timestamp, end_timestamp, limit))
         finally:
-            release_connection()
+            release_connection(conn)
 
     def get_candle_date_range(self, symbol: str, timeframe: str) -> Optional[Dict[str, int]]:
         """Get the date range (earliest and latest timestamps) for a symbol/timeframe."""
@@ -435,4 +466,4 @@ class CandleStoreDatabase:
                     }
             return None
         finally:
-            release_connection()
+            release_connection(conn)
@@ -1,7 +1,9 @@
 import logging
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Union
 from datetime import datetime
 
+import numpy as np
+
 from .utils import generate_prompt_hash
 
 logger = logging.getLogger(__name__)
@@ -54,17 +56,9 @@ class TradeSimulator:
         # Final fallback
         return 'empty'
 
-    def _find_entry_candle_index(self, record: Dict[str, Any], candles: List[Dict[str, Any]]) -> Optional[int]:
-        """Find the index of the candle that corresponds to the entry timestamp."""
-        if not candles:
-            return None
-
-        record_timestamp = record.get('timestamp')
-        if record_timestamp is None:
-            # No timestamp provided (e.g., unit tests) -> start from the first candle
-            return 0
-
-        # Convert record timestamp to milliseconds for comparison
+    @staticmethod
+    def _record_timestamp_ms(record_timestamp: Any) -> Optional[int]:
+        """Convert a record timestamp (ISO string, seconds or ms) to milliseconds."""
         if isinstance(record_timestamp, str):
             try:
                 # Handle ISO format strings
@@ -72,16 +66,28 @@ class TradeSimulator:
                     dt = datetime.fromisoformat(record_timestamp.replace('Z', '+00:00'))
                 else:
                     dt = datetime.fromisoformat(record_timestamp)
-                record_ms = int(dt.timestamp() * 1000)
+                return int(dt.timestamp() * 1000)
             except ValueError:
                 return None
         elif isinstance(record_timestamp, (int, float)):
             # Assume already in ms if > 1e10, otherwise convert from seconds
             if record_timestamp > 1e10:
-                record_ms = int(record_timestamp)
-            else:
-                record_ms = int(record_timestamp * 1000)
-        else:
+                return int(record_timestamp)
+            return int(record_timestamp * 1000)
+        return None
+
+    def _find_entry_candle_index(self, record: Dict[str, Any], candles: List[Dict[str, Any]]) -> Optional[int]:
+        """Find the index of the candle that corresponds to the entry timestamp."""
+        if not candles:
+            return None
+
+        record_timestamp = record.get('timestamp')
+        if record_timestamp is None:
+            # No timestamp provided (e.g., unit tests) -> start from the first candle
+            return 0
+
+        record_ms = self._record_timestamp_ms(record_timestamp)
+        if record_ms is None:
             return None
 
         # Find the closest candle to the record timestamp
@@ -627,13 +633,229 @@ class TradeSimulator:
             'realized_pnl_percent': realized_pnl_percent
         }
 
+    # ------------------------------------------------------------------
+    # Array-backed path (same outputs as the dict-walking methods above)
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def candles_to_arrays(candles: Union[List[Dict[str, Any]], Any]) -> Dict[str, Any]:
+        """
+        Build the high/low/close/start_time arrays used by the array path.
+
+        Accepts a list of klines_store-style candle dicts or a CandleArrays
+        object from the columnar candle cache. Missing prices become NaN;
+        start_time is normalised to milliseconds.
+        """
+        if hasattr(candles, 'high') and hasattr(candles, 'timestamp'):
+            start_time = np.asarray(candles.timestamp, dtype=np.float64)
+            high = np.asarray(candles.high, dtype=np.float64)
+            low = np.asarray(candles.low, dtype=np.float64)
+            close = np.asarray(candles.close, dtype=np.float64)
+        else:
+            def column(key, default=np.nan):
+                return np.array(
+                    [c.get(key) if c.get(key) is not None else default for c in candles],
+                    dtype=np.float64,
+                )
+            start_time = column('start_time', 0)
+            high = column('high_price')
+            low = column('low_price')
+            close = column('close_price')
+
+        # Same seconds→ms rule as _find_entry_candle_index
+        start_time = np.where(start_time < 1e10, np.trunc(start_time * 1000), start_time).astype(np.int64)
+        return {
+            'start_time': start_time,
+            'high': high,
+            'low': low,
+            'close': close,
+            'sorted': bool(len(start_time) < 2 or np.all(start_time[1:] >= start_time[:-1])),
+        }
+
+    def _find_entry_candle_index_arrays(self, record: Dict[str, Any], arrays: Dict[str, Any]) -> Optional[int]:
+        """Closest-candle lookup via searchsorted (first index on ties, like the linear scan)."""
+        start_time = arrays['start_time']
+        if len(start_time) == 0:
+            return None
+
+        record_timestamp = record.get('timestamp')
+        if record_timestamp is None:
+            return 0
+        record_ms = self._record_timestamp_ms(record_timestamp)
+        if record_ms is None:
+            return None
+
+        if not arrays['sorted']:
+            return int(np.argmin(np.abs(start_time - record_ms)))
+
+        idx = int(np.searchsorted(start_time, record_ms, side='left'))
+        if idx >= len(start_time):
+            idx = len(start_time) - 1
+        elif idx > 0 and (record_ms - start_time[idx - 1]) <= (start_time[idx] - record_ms):
+            idx -= 1
+        # First occurrence of the chosen timestamp
+        return int(np.searchsorted(start_time, start_time[idx], side='left'))
+
+    def simulate_trade_arrays(self, record: Dict[str, Any], arrays: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Array-backed equivalent of simulate_trade.
+
+        Args:
+            record: Analysis record with recommendation, prices, etc.
+            arrays: Output of candles_to_arrays (reuse it across records)
+        """
+        if len(arrays['start_time']) == 0:
+            return {
+                'outcome': 'no_data',
+                'duration_candles': 0,
+                'achieved_rr': 0.0,
+                'exit_price': None,
+                'exit_candle_index': None,
+                'entry_candle_index': None,
+                'realized_pnl_price': None,
+                'realized_pnl_percent': None
+            }
+
+        entry_candle_index = self._find_entry_candle_index_arrays(record, arrays)
+
+        if entry_candle_index is None:
+            return {
+                'outcome': 'entry_candle_not_found',
+                'duration_candles': 0,
+                'achieved_rr': 0.0,
+                'exit_price': None,
+                'exit_candle_index': None,
+                'entry_candle_index': None,
+                'realized_pnl_price': None,
+                'realized_pnl_percent': None
+            }
+
+        recommendation = record['recommendation'].lower()
+        if recommendation not in ('buy', 'sell'):
+            return {
+                'outcome': 'invalid_recommendation',
+                'duration_candles': 0,
+                'achieved_rr': 0.0,
+                'exit_price': None,
+                'exit_candle_index': None,
+                'entry_candle_index': entry_candle_index,
+                'realized_pnl_price': None,
+                'realized_pnl_percent': None
+            }
+
+        return self._simulate_touch_arrays(
+            recommendation == 'buy', record['entry_price'], record['stop_loss'], record['take_profit'],
+            arrays, entry_candle_index
+        )
+
+    def _simulate_touch_arrays(self, is_buy: bool, entry_price: float, stop_loss: float, take_profit: float,
+                               arrays: Dict[str, Any], entry_candle_index: int) -> Dict[str, Any]:
+        """
+        Vectorized _simulate_buy_trade_touch / _simulate_sell_trade_touch.
+
+        Entry is the first candle at/after entry_candle_index whose range
+        contains entry_price; the exit is the first candle from there on that
+        hits SL (checked first) or TP, found with argmax over boolean masks.
+        """
+        high = arrays['high']
+        low = arrays['low']
+        n = len(high)
+
+        with np.errstate(invalid='ignore'):
+            touched = (low[entry_candle_index:] <= entry_price) & (entry_price <= high[entry_candle_index:])
+        if not touched.any():
+            return {
+                'outcome': 'expired', 'duration_candles': 0, 'achieved_rr': 0.0,
+                'exit_price': None, 'exit_candle_index': None, 'entry_candle_index': None,
+                'mfe_price': 0.0, 'mae_price': 0.0,
+                'mfe_percent': 0.0, 'mae_percent': 0.0,
+                'mfe_r': None, 'mae_r': None,
+                'realized_pnl_price': None, 'realized_pnl_percent': None
+            }
+        entry_index = entry_candle_index + int(np.argmax(touched))
+
+        with np.errstate(invalid='ignore'):
+            if is_buy:
+                sl_hit = low[entry_index:] <= stop_loss
+                tp_hit = high[entry_index:] >= take_profit
+            else:
+                sl_hit = high[entry_index:] >= stop_loss
+                tp_hit = low[entry_index:] <= take_profit
+        hit = sl_hit | tp_hit
+
+        if hit.any():
+            offset = int(np.argmax(hit))
+            exit_index = entry_index + offset
+            is_loss = bool(sl_hit[offset])
+        else:
+            exit_index = n - 1
+            is_loss = None
+
+        # Extremes from entry through exit (NaN candles are skipped like None)
+        max_high = max(entry_price, float(np.nanmax(high[entry_index:exit_index + 1])))
+        min_low = min(entry_price, float(np.nanmin(low[entry_index:exit_index + 1])))
+        R = abs(entry_price - stop_loss) if stop_loss is not None else None
+
+        if is_buy:
+            mfe_price = max(0.0, max_high - entry_price)
+            mae_price = max(0.0, entry_price - min_low)
+        else:
+            mfe_price = max(0.0, entry_price - min_low)
+            mae_price = max(0.0, max_high - entry_price)
+        mfe_percent = (mfe_price / entry_price * 100.0) if entry_price else None
+        mae_percent = (mae_price / entry_price * 100.0) if entry_price else None
+        mfe_r = (mfe_price / R) if R not in (None, 0) else None
+        mae_r = (mae_price / R) if R not in (None, 0) else None
+
+        if is_loss is None:
+            # Entered but no exit
+            exit_price = float(arrays['close'][-1])
+            if np.isnan(exit_price):
+                exit_price = None
+            if exit_price is not None and entry_price is not None:
+                realized_pnl_price = (exit_price - entry_price) if is_buy else (entry_price - exit_price)
+            else:
+                realized_pnl_price = None
+            realized_pnl_percent = ((realized_pnl_price / entry_price) * 100.0) if (realized_pnl_price is not None and entry_price) else None
+            return {
+                'outcome': 'expired', 'duration_candles': n - (entry_index or entry_candle_index), 'achieved_rr': 0.0,
+                'exit_price': exit_price, 'exit_candle_index': n - 1,
+                'entry_candle_index': entry_index,
+                'mfe_price': mfe_price, 'mae_price': mae_price,
+                'mfe_percent': mfe_percent, 'mae_percent': mae_percent,
+                'mfe_r': mfe_r, 'mae_r': mae_r,
+                'realized_pnl_price': realized_pnl_price, 'realized_pnl_percent': realized_pnl_percent
+            }
+
+        exit_price = stop_loss if is_loss else take_profit
+        if is_buy:
+            achieved_rr = (exit_price - entry_price) / (take_profit - entry_price)
+            realized_pnl_price = exit_price - entry_price
+        else:
+            achieved_rr = (entry_price - exit_price) / (entry_price - take_profit)
+            realized_pnl_price = entry_price - exit_price
+        realized_pnl_percent = (realized_pnl_price / entry_price * 100.0) if entry_price else None
+        return {
+            'outcome': 'loss' if is_loss else 'win', 'duration_candles': exit_index - entry_index + 1,
+            'achieved_rr': achieved_rr,
+            'exit_price': exit_price, 'exit_candle_index': exit_index, 'entry_candle_index': entry_index,
+            'mfe_price': mfe_price, 'mae_price': mae_price,
+            'mfe_percent': mfe_percent, 'mae_percent': mae_percent,
+            'mfe_r': mfe_r, 'mae_r': mae_r,
+            'realized_pnl_price': realized_pnl_price, 'realized_pnl_percent': realized_pnl_percent
+        }
+
     def simulate_multiple_trades(self, records: List[Dict[str, Any]], candles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
-        """Simulate trades for multiple records."""
+        """Simulate trades for multiple records against one symbol's candles.
+
+        Candles are converted to arrays once and shared by every record.
+        """
         results = []
+        arrays = self.candles_to_arrays(candles)
 
         for record in records:
             try:
-                simulation_result = self.simulate_trade(record, candles)
+                simulation_result = self.simulate_trade_arrays(record, arrays)
 
                 # Extract prompt version from available data
                 prompt_version = self._extract_prompt_version(record)
@@ -682,10 +904,11 @@ class TradeSimulator:
     def simulate_multiple_trades_with_prompt_hash(self, records: List[Dict[str, Any]], candles: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
         """Simulate trades for multiple records using prompt hash instead of prompt version."""
         results = []
+        arrays = self.candles_to_arrays(candles)
 
         for record in records:
             try:
-                simulation_result = self.simulate_trade(record, candles)
+                simulation_result = self.simulate_trade_arrays(record, arrays)
 
                 # Extract prompt hash from dedicated column
                 prompt_hash = self._extract_prompt_hash(record)
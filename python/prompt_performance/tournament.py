@@ -19,6 +19,7 @@ from prompt_performance.backtest_with_images import (
     ImageBacktester, ImageSelector, PROMPT_REGISTRY
 )
 from prompt_performance.core.backtest_store import BacktestStore
+from trading_bot.core.llm_dispatcher import get_llm_dispatcher
 
 
 @dataclass
@@ -217,6 +218,8 @@ class PromptTournament:
         """Run a single phase of the tournament"""
         self.current_phase = phase_num
         phase_scores: Dict[str, PromptScore] = {}
+        # The dispatcher is process-wide: report only what this phase added
+        llm_before = get_llm_dispatcher().metrics()
 
         self._emit('phase_start', {
             'phase': phase_num,
@@ -417,6 +420,13 @@ class PromptTournament:
                 except Exception as e:
                     self._emit('error', {'message': f'Future error for {prompt_name}: {e}'})
 
+        # Analyses go through the shared LLM dispatcher (see PromptAnalyzer)
+        llm = get_llm_dispatcher().metrics_since(llm_before)
+        self._emit('info', {'message': (
+            f"  LLM dispatcher: {llm['calls']} calls, avg queue wait {llm['queue_wait_avg']:.1f}s, "
+            f"avg service {llm['service_time_avg']:.1f}s, {llm['retries']} rate-limit retries"
+        )})
+
         # Emit prompt_complete for each prompt
         for prompt_name in self.active_prompts:
             score = phase_scores[prompt_name]
@@ -360,6 +360,13 @@ class TradingBot:
             self.stop()
 
     async def _run_async(self) -> None:
+        """Run trading cycles, closing a browser kept warm between them on exit."""
+        try:
+            await self._run_cycles_async()
+        finally:
+            await self.trading_cycle.close_browser()
+
+    async def _run_cycles_async(self) -> None:
         """Async main loop that runs trading cycles at boundaries."""
         timeframe = self.trading_cycle.timeframe
         self._pause_reason = None  # Track why bot is paused
@@ -16,12 +16,12 @@ import os
 import json
 from pathlib import Path
 from datetime import datetime
-import requests
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'python'))
 
 from prompt_performance.core.bybit_symbols import get_bybit_symbols_cached
+from trading_bot.core.bybit_market_client import get_bybit_market_client
 from trading_bot.strategies.candle_adapter import CandleAdapter
 from trading_bot.strategies.pair_screener import PairScreener
 import pandas as pd
@@ -30,10 +30,7 @@ import pandas as pd
 def fetch_ticker(symbol: str) -> tuple:
     """Fetch ticker for a single symbol. Returns (symbol, turnover24h)."""
     try:
-        url = "https://api.bybit.com/v5/market/tickers"
-        params = {"category": "linear", "symbol": symbol}
-        response = requests.get(url, params=params, timeout=10)
-        data = response.json()
+        data = get_bybit_market_client().get_sync("tickers", category="linear", symbol=symbol)
 
         if data.get("retCode") == 0:
             items = data.get("result", {}).get("list", [])
@@ -171,7 +168,9 @@ async def main():
     screener = PairScreener(lookback_days=120, min_data_points=100)
     results = screener.screen_pairs(
         symbol_candles=symbol_candles,
-        min_volume_usd=1_000_000
+        min_volume_usd=1_000_000,
+        batched=True,  # Matrix prefilter before per-pair statsmodels checks
+        workers=os.cpu_count()  # Full checks on survivors across all cores
     )
 
     if results.empty:
@@ -0,0 +1,122 @@
+"""Tests for the vectorized ADX/ATR kernel and batched stop tightening."""
+
+import asyncio
+from types import SimpleNamespace
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading_bot.core.adx_stop_tightener import (
+    ADXStopTightener,
+    adx_atr_arrays,
+    calculate_adx_components,
+    calculate_atr,
+    calculate_directional_movement,
+    calculate_true_range,
+)
+from trading_bot.core.common_types import PositionInfo
+
+
+def _series(n, seed=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return close + rng.random(n), close - rng.random(n), close
+
+
+def _reference(high, low, close, period):
+    """Bar-by-bar Wilder ADX/ATR, as the scalar helpers compute it."""
+    n = len(close)
+    tr, pdm, mdm = [0.0] * n, [0.0] * n, [0.0] * n
+    for i in range(1, n):
+        tr[i] = calculate_true_range(high[i], low[i], close[i - 1])
+        pdm[i], mdm[i] = calculate_directional_movement(high[i], low[i], high[i - 1], low[i - 1])
+
+    def rma(values, first):
+        out = [None] * n
+        out[first + period - 1] = sum(values[first:first + period]) / period
+        for i in range(first + period, n):
+            out[i] = (out[i - 1] * (period - 1) + values[i]) / period
+        return out
+
+    atr, spdm, smdm = rma(tr, 1), rma(pdm, 1), rma(mdm, 1)
+    pdi = [0.0] * n
+    mdi = [0.0] * n
+    dx = [0.0] * n
+    for i in range(period, n):
+        pdi[i] = spdm[i] / atr[i] * 100 if atr[i] else 0.0
+        mdi[i] = smdm[i] / atr[i] * 100 if atr[i] else 0.0
+        dx[i] = abs(pdi[i] - mdi[i]) / (pdi[i] + mdi[i]) * 100 if pdi[i] + mdi[i] else 0.0
+    return rma(dx, period)[-1], pdi[-1], mdi[-1], atr[-1]
+
+
+@pytest.mark.parametrize("n, period", [(28, 14), (33, 14), (400, 14), (60, 2), (3000, 5)])
+def test_kernel_matches_bar_by_bar_wilder(n, period):
+    high, low, close = _series(n)
+    result = adx_atr_arrays(high, low, close, adx_period=period)
+
+    expected = _reference(high, low, close, period)
+    got = (result["adx"][-1], result["plus_di"][-1], result["minus_di"][-1], result["atr"][-1])
+    assert np.allclose(got, expected, rtol=1e-9)
+    assert np.isnan(result["adx"][2 * period - 2]) and not np.isnan(result["adx"][2 * period - 1])
+
+
+def test_batch_rows_match_single_series():
+    rows = [_series(50, seed) for seed in range(3)]
+    high, low, close = (np.stack(col) for col in zip(*rows))
+
+    batch = adx_atr_arrays(high, low, close, adx_period=14, atr_period=10)
+    for i, (h, l, c) in enumerate(rows):
+        single = adx_atr_arrays(h, l, c, adx_period=14, atr_period=10)
+        for name in ("adx", "plus_di", "minus_di", "atr"):
+            assert np.allclose(batch[name][i], single[name], equal_nan=True)
+
+
+def test_latest_value_helpers_accept_lists_and_frames():
+    high, low, close = _series(40)
+    candles = [{"high": h, "low": l, "close": c} for h, l, c in zip(high, low, close)]
+
+    adx, pdi, mdi, atr = _reference(high, low, close, 14)
+    assert np.allclose(calculate_adx_components(candles, 14), (adx, pdi, mdi))
+    assert calculate_atr(pd.DataFrame(candles), 14) == pytest.approx(atr)
+    assert calculate_adx_components(candles[:20], 14) == (None, None, None)
+    assert calculate_atr(candles[:10], 14) is None
+
+
+def test_check_and_tighten_uses_one_batched_pass(monkeypatch):
+    high, low, close = _series(40)
+    klines = [[str(i * 3600000), "0", str(h), str(l), str(c), "1", "1"]
+              for i, (h, l, c) in enumerate(zip(high, low, close))][::-1]
+    api_manager = SimpleNamespace(get_kline=lambda **kw: {"retCode": 0, "result": {"list": klines}})
+    updates = []
+
+    async def update_stop_loss(position, new_stop):
+        updates.append((position.symbol, new_stop))
+        return {"success": True}
+
+    monitor = SimpleNamespace(_get_recv_window=lambda: 5000, _update_stop_loss=update_stop_loss)
+    config = SimpleNamespace(trading=SimpleNamespace(
+        enable_position_tightening=True, enable_adx_tightening=True, adx_period=14, atr_period=14,
+        adx_strength_threshold=25, base_atr_multiplier=1.0, adx_target_profit_usd=10.0,
+    ))
+    monkeypatch.setattr("trading_bot.core.adx_stop_tightener.get_server_synchronized_timestamp", lambda api: 0)
+    tightener = ADXStopTightener(SimpleNamespace(api_manager=api_manager), config, monitor)
+
+    calls = []
+    kernel = adx_atr_arrays
+    monkeypatch.setattr("trading_bot.core.adx_stop_tightener.adx_atr_arrays",
+                        lambda *a, **kw: calls.append(a[0].shape) or kernel(*a, **kw))
+
+    last = close[-1]
+    positions = [
+        PositionInfo("AUSDT", "Buy", 1, last, last, 20.0, last - 50, None, 0, 10.0),
+        PositionInfo("BUSDT", "Sell", 1, last, last, 20.0, last + 50, None, 0, 10.0),
+        PositionInfo("CUSDT", "Buy", 1, last, last, 0.0, None, None, 0, 10.0),
+    ]
+    result = asyncio.run(tightener.check_and_tighten_adx_stop(positions))
+
+    assert calls == [(2, 40)]
+    assert [r["symbol"] for r in result] == ["AUSDT", "BUSDT"]
+    assert all(r["status"] == "tightened" for r in result)
+    atr = calculate_atr([{"high": h, "low": l, "close": c} for h, l, c in zip(high, low, close)], 14)
+    assert updates[0][1] == pytest.approx(last - atr * (1.2 if result[0]["reasoning"]["trend_strength"] == "strong" else 1.0))
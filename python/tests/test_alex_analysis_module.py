@@ -0,0 +1,117 @@
+"""Tests for AlexAnalysisModule's concurrent candle fan-out and local resampling."""
+
+import asyncio
+from unittest.mock import Mock
+
+import numpy as np
+import pytest
+
+from trading_bot.strategies.alex_analysis_module import AlexAnalysisModule
+from trading_bot.strategies.candle_adapter import CandleAdapter
+
+HOUR = 3_600_000
+
+
+def _hourly(n, end_hour=10_000, seed=0):
+    """n normalized 1h candles ending at end_hour, newest first like the API."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    candles = [
+        {'timestamp': (end_hour - n + 1 + i) * HOUR, 'open': c - 0.1, 'high': c + 0.5,
+         'low': c - 0.5, 'close': c, 'volume': 10.0, 'turnover': 1000.0}
+        for i, c in enumerate(close)
+    ]
+    return candles[::-1]
+
+
+class FakeAdapter(CandleAdapter):
+    def __init__(self, delay=0.0, history=1000):
+        super().__init__()
+        self.delay = delay
+        self.history = history
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_candles(self, symbol, timeframe, limit=100, **kwargs):
+        self.calls.append((symbol, timeframe, limit))
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(self.delay)
+        self.in_flight -= 1
+        step = self._timeframe_to_ms(timeframe) // HOUR
+        hourly = _hourly(min(limit, self.history) * step)
+        return self.resample_candles(hourly, '1h', timeframe) if step > 1 else hourly
+
+
+def _module(adapter, **config):
+    module = AlexAnalysisModule(config=Mock(), strategy_config={'timeframes': ['1h', '4h', '1d'], **config})
+    module.candle_adapter = adapter
+    return module
+
+
+def _fetch_fn(adapter):
+    async def fetch(symbol, tf, limit=200):
+        return await adapter.get_candles(symbol, tf, limit)
+    return fetch
+
+
+def test_cycle_fetches_every_symbol_and_timeframe_concurrently():
+    adapter = FakeAdapter(delay=0.2)
+    symbols = [f'SYM{i}USDT' for i in range(30)]
+
+    results = asyncio.run(_module(adapter, max_concurrent_fetches=100).run_analysis_cycle(symbols, '1h', 'cycle-1'))
+
+    # All 90 requests were in flight at once: the cycle costs one round-trip
+    assert [r['symbol'] for r in results] == symbols
+    assert all('error' not in r for r in results)
+    assert len(adapter.calls) == 90 and adapter.max_in_flight == 90
+
+
+def test_in_flight_fetches_are_bounded():
+    adapter = FakeAdapter(delay=0.01)
+    asyncio.run(_module(adapter, max_concurrent_fetches=4).run_analysis_cycle(['A', 'B', 'C'], '1h', 'c'))
+    assert adapter.max_in_flight == 4
+
+
+def test_higher_timeframes_are_resampled_from_the_lowest():
+    adapter = FakeAdapter()
+    module = _module(adapter, resample_higher_timeframes=True)
+    candles = asyncio.run(module._fetch_timeframe_candles('BTCUSDT', ['1h', '4h', '1d'], _fetch_fn(adapter)))
+
+    # 1000 hourly candles cover 250 4h candles but only 41 daily ones
+    assert sorted(adapter.calls) == [('BTCUSDT', '1d', 200), ('BTCUSDT', '1h', 1000)]
+    assert len(candles['1h']) == 200 and candles['1h'][0]['timestamp'] == 10_000 * HOUR
+    assert len(candles['4h']) == 200 and len(candles['1d']) == 200
+
+    hourly = _hourly(1000)[::-1]
+    four_hour = candles['4h'][1]  # newest complete 4h candle
+    group = [c for c in hourly if four_hour['timestamp'] <= c['timestamp'] < four_hour['timestamp'] + 4 * HOUR]
+    assert len(group) == 4
+    assert four_hour['open'] == group[0]['open'] and four_hour['close'] == group[-1]['close']
+    assert four_hour['high'] == max(c['high'] for c in group)
+    assert four_hour['volume'] == 40.0
+
+
+@pytest.mark.parametrize("history, api_4h", [(150, 150), (400, 200)])
+def test_short_history_falls_back_to_api_fetch(history, api_4h):
+    # 400 hourly candles resample to ~100 4h ones: enough for the indicators but
+    # short of CANDLE_LIMIT, so the full window comes from the API
+    adapter = FakeAdapter(history=history)
+    module = _module(adapter, resample_higher_timeframes=True, timeframes=['1h', '4h'])
+    candles = asyncio.run(module._fetch_timeframe_candles('BTCUSDT', ['1h', '4h'], _fetch_fn(adapter)))
+
+    assert adapter.calls == [('BTCUSDT', '1h', 1000), ('BTCUSDT', '4h', 200)]
+    assert len(candles['4h']) == api_4h
+
+
+def test_resample_drops_partial_leading_bucket_and_keeps_order():
+    adapter = CandleAdapter()
+    hourly = _hourly(10, end_hour=11)  # hours 2..11
+
+    newest_first = adapter.resample_candles(hourly, '1h', '4h')
+    assert [c['timestamp'] // HOUR for c in newest_first] == [8, 4]
+    oldest_first = adapter.resample_candles(hourly[::-1], '1h', '4h')
+    assert oldest_first == newest_first[::-1]
+    assert not adapter.can_resample('1h', '1w') and not adapter.can_resample('4h', '1h')
+
@@ -0,0 +1,110 @@
+"""Tests for the content-addressed analysis cache."""
+
+import pytest
+
+import trading_bot.db.client as db_client
+from trading_bot.db.analysis_cache import (
+    AnalysisCache,
+    AnalysisCacheKey,
+    hash_image_bytes,
+    make_analysis_key,
+)
+
+PROMPT = "Analyze this chart.\nCurrent market price: 101.5\nReturn JSON."
+
+
+@pytest.fixture
+def backtest_db(tmp_path, monkeypatch):
+    if db_client.DB_TYPE != 'sqlite':
+        pytest.skip("SQLite-only test")
+    monkeypatch.setattr(db_client, "BACKTEST_DB_PATH", str(tmp_path / "backtests.db"))
+
+
+def _result(rec="buy", **extra):
+    return {"recommendation": rec, "confidence": 0.8, "entry_price": 100.0, **extra}
+
+
+def test_key_is_content_addressed():
+    key = make_analysis_key(b"png-bytes", PROMPT, "gpt-4o")
+
+    assert key.image_hash == hash_image_bytes(b"png-bytes")
+    assert str(key) == f"{key.image_hash}:{key.prompt_hash}:gpt-4o"
+    # Same bytes under another name, and market-data lines that change, map to the same key
+    other_price = PROMPT.replace("101.5", "99.0")
+    assert make_analysis_key(b"png-bytes", other_price, "gpt-4o") == key
+    assert make_analysis_key(b"other-bytes", PROMPT, "gpt-4o") != key
+    assert make_analysis_key(b"png-bytes", PROMPT, "o3") != key
+
+
+def test_prompt_part_is_full_sha256_with_short_hash_for_display():
+    from prompt_performance.core.utils import generate_prompt_hash
+
+    key = make_analysis_key(b"png-bytes", PROMPT, "gpt-4o")
+
+    assert len(key.prompt_hash) == 64
+    assert key.prompt_short_hash == generate_prompt_hash(PROMPT)
+    # The display hash takes no part in identity
+    assert AnalysisCacheKey(key.image_hash, key.prompt_hash, key.model) == key
+    assert key.prompt_short_hash not in str(key).split(":")
+
+
+def test_put_get_round_trip_through_database(backtest_db):
+    key = make_analysis_key(b"img", PROMPT, "gpt-4o")
+    AnalysisCache().put(key, _result())
+
+    fresh = AnalysisCache()
+    assert fresh.get(key) == _result()
+    assert fresh.stats()["db_hits"] == 1
+    # Second read is served from memory
+    assert fresh.get(key) == _result()
+    assert fresh.stats()["hits"] == 1
+
+
+def test_errors_and_skips_are_not_cached(backtest_db):
+    cache = AnalysisCache()
+    key = make_analysis_key(b"img", PROMPT, "gpt-4o")
+
+    assert cache.put(key, {"recommendation": "hold", "error": True}) is False
+    assert cache.put(key, {"recommendation": "hold", "skipped": True}) is False
+    assert cache.get(key) is None
+
+
+def test_prefix_lookups(backtest_db):
+    cache = AnalysisCache()
+    image = hash_image_bytes(b"img")
+    cache.put(AnalysisCacheKey(image, "aaaaa", "gpt-4o"), _result("buy"))
+    cache.put(AnalysisCacheKey(image, "bbbbb", "o3"), _result("sell"))
+
+    assert cache.lookup(image, "aaaaa", "gpt-4o")["recommendation"] == "buy"
+    assert cache.lookup(image, "bbbbb")["recommendation"] == "sell"
+    assert cache.lookup(image)["recommendation"] == "sell"  # newest match
+    assert cache.lookup(image, "ccccc") is None
+    assert cache.lookup(image[:-1]) is None  # prefixes stop at component boundaries
+
+    # Same lookups resolve from the table when memory is cold
+    cache.clear_memory()
+    assert cache.lookup(image, "aaaaa")["recommendation"] == "buy"
+    assert cache.lookup(image)["recommendation"] in ("buy", "sell")
+
+    with pytest.raises(ValueError):
+        cache.lookup(image, model="gpt-4o")
+
+
+def test_memory_lru_is_bounded():
+    cache = AnalysisCache(max_entries=2, persist=False)
+    keys = [AnalysisCacheKey(f"img{i}", "p", "m") for i in range(3)]
+    for key in keys:
+        cache.put(key, _result())
+
+    assert cache.get(keys[0]) is None
+    assert cache.get(keys[2]) is not None
+    assert cache.stats()["size"] == 2
+
+
+def test_returned_results_are_copies():
+    cache = AnalysisCache(persist=False)
+    key = AnalysisCacheKey("img", "p", "m")
+    cache.put(key, _result())
+
+    cache.get(key)["recommendation"] = "mutated"
+    assert cache.get(key)["recommendation"] == "buy"
@@ -0,0 +1,110 @@
+"""Tests for the shared pooled Bybit market-data client."""
+
+import asyncio
+import time
+
+import httpx
+import pytest
+
+from trading_bot.core.bybit_market_client import TESTNET_URL, BybitMarketClient
+
+
+class Recorder:
+    """MockTransport handler that records requests and plays scripted responses."""
+
+    def __init__(self, responses=None):
+        self.requests = []
+        self.responses = list(responses or [])
+
+    def __call__(self, request):
+        self.requests.append(request)
+        if self.responses:
+            return self.responses.pop(0)
+        return httpx.Response(200, json={"retCode": 0, "result": {"list": [], "path": request.url.path}})
+
+
+@pytest.fixture
+def make_client():
+    clients = []
+
+    def make(handler, **kwargs):
+        client = BybitMarketClient(transport=httpx.MockTransport(handler), **kwargs)
+        clients.append(client)
+        return client
+
+    yield make
+    for client in clients:
+        client.close()
+
+
+def test_sync_and_async_callers_share_one_pool(make_client):
+    recorder = Recorder()
+    client = make_client(recorder)
+
+    client.get_sync("tickers", category="linear", symbol="BTCUSDT")
+    http = client._client
+
+    async def fan_out():
+        return await asyncio.gather(*(client.get("kline", symbol=s, interval="60", limit=5) for s in ("A", "B", "C")))
+
+    results = asyncio.run(fan_out())
+    asyncio.run(client.get("server_time"))  # a second, unrelated event loop
+
+    assert client._client is http
+    assert [r["result"]["path"] for r in results] == ["/v5/market/kline"] * 3
+    assert len(recorder.requests) == 5
+    assert recorder.requests[0].url.params["symbol"] == "BTCUSDT"
+
+
+def test_none_params_are_dropped(make_client):
+    recorder = Recorder()
+    client = make_client(recorder)
+
+    client.get_sync("instruments_info", category="linear", cursor=None, limit=1000)
+
+    assert dict(recorder.requests[0].url.params) == {"category": "linear", "limit": "1000"}
+
+
+def test_endpoint_cap_spaces_requests(make_client):
+    client = make_client(Recorder(), endpoint_limits={"kline": 10})
+
+    async def burst():
+        await asyncio.gather(*(client.get("kline", symbol="BTCUSDT") for _ in range(13)))
+
+    started = time.monotonic()
+    asyncio.run(burst())
+
+    # 10 requests fit the burst, the remaining 3 are paced at 10/s
+    assert time.monotonic() - started >= 0.25
+
+
+def test_rate_limited_response_is_retried(make_client):
+    reset_ms = str(int((time.time() + 0.05) * 1000))
+    recorder = Recorder([
+        httpx.Response(200, json={"retCode": 10006, "retMsg": "Too many visits!"},
+                       headers={"X-Bapi-Limit-Reset-Timestamp": reset_ms}),
+        httpx.Response(403),
+    ])
+    client = make_client(recorder)
+    client._retry_delay = lambda headers, attempt: 0.01
+
+    data = client.get_sync("tickers", category="linear")
+
+    assert data["retCode"] == 0
+    assert len(recorder.requests) == 3
+    assert client.rate_limited == 2
+
+
+def test_http_errors_raise(make_client):
+    client = make_client(Recorder([httpx.Response(500)]))
+
+    with pytest.raises(httpx.HTTPStatusError):
+        client.get_sync("tickers", category="linear")
+
+
+def test_testnet_and_unknown_endpoint():
+    client = BybitMarketClient(testnet=True)
+    assert client.base_url == TESTNET_URL
+
+    with pytest.raises(ValueError):
+        client.get_sync("wallet_balance")
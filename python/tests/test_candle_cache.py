@@ -0,0 +1,205 @@
+"""
+Tests for the memory-mapped columnar candle cache.
+"""
+
+import multiprocessing
+import sqlite3
+
+import numpy as np
+import pytest
+
+from trading_bot.db.candle_cache import CandleArrays, ColumnarCandleCache
+
+HOUR_MS = 3_600_000
+
+
+def _candles(start, count, price=100.0):
+    return [
+        {
+            "start_time": (start + k) * HOUR_MS,
+            "open_price": price + k,
+            "high_price": price + k + 1,
+            "low_price": price + k - 1,
+            "close_price": price + k + 0.5,
+            "volume": 10.0 + k,
+            "turnover": 1000.0 + k,
+        }
+        for k in range(count)
+    ]
+
+
+@pytest.fixture
+def store():
+    conn = sqlite3.connect(":memory:")
+    conn.row_factory = sqlite3.Row
+    conn.execute("""
+        CREATE TABLE klines_store (
+            symbol TEXT NOT NULL, timeframe TEXT NOT NULL, category TEXT NOT NULL,
+            start_time INTEGER NOT NULL, open_price REAL NOT NULL, high_price REAL NOT NULL,
+            low_price REAL NOT NULL, close_price REAL NOT NULL, volume REAL NOT NULL,
+            turnover REAL NOT NULL, UNIQUE(symbol, timeframe, start_time)
+        )
+    """)
+    yield conn
+    conn.close()
+
+
+def _insert(conn, candles, symbol="BTCUSDT", timeframe="1h"):
+    conn.executemany(
+        "INSERT OR IGNORE INTO klines_store VALUES (?, ?, 'linear', ?, ?, ?, ?, ?, ?, ?)",
+        [(symbol, timeframe, c["start_time"], c["open_price"], c["high_price"], c["low_price"],
+          c["close_price"], c["volume"], c["turnover"]) for c in candles],
+    )
+    conn.commit()
+
+
+def test_sync_and_read_ranges(tmp_path, store):
+    """Cache mirrors klines_store and slices by time range / limit."""
+    _insert(store, _candles(0, 100))
+    cache = ColumnarCandleCache(tmp_path)
+
+    assert cache.sync_from_store(store, "BTCUSDT", "1h") == 100
+    assert cache.sync_from_store(store, "BTCUSDT", "1h") == 0
+
+    arrays = cache.read("BTCUSDT", "1h")
+    assert isinstance(arrays, CandleArrays)
+    assert len(arrays) == 100
+    assert isinstance(arrays.close, np.ndarray)
+    assert arrays.close[0] == 100.5
+
+    window = cache.read("BTCUSDT", "1h", start=10 * HOUR_MS, end=19 * HOUR_MS)
+    np.testing.assert_array_equal(window.timestamp, np.arange(10, 20) * HOUR_MS)
+
+    latest = cache.read("BTCUSDT", "1h", limit=5, latest=True)
+    np.testing.assert_array_equal(latest.timestamp, np.arange(95, 100) * HOUR_MS)
+
+
+def test_incremental_sync_and_backfill(tmp_path, store):
+    """New rows are appended; older rows are merged in when requested."""
+    _insert(store, _candles(50, 50))
+    cache = ColumnarCandleCache(tmp_path)
+    cache.sync_from_store(store, "BTCUSDT", "1h")
+
+    _insert(store, _candles(100, 10) + _candles(0, 50))
+    assert cache.sync_from_store(store, "BTCUSDT", "1h") == 10
+    assert cache.sync_from_store(store, "BTCUSDT", "1h", since=20 * HOUR_MS) == 30
+
+    ts = cache.read("BTCUSDT", "1h").timestamp
+    np.testing.assert_array_equal(ts, np.arange(20, 110) * HOUR_MS)
+
+
+def test_append_never_overwrites(tmp_path):
+    """Existing timestamps keep their first-written values."""
+    cache = ColumnarCandleCache(tmp_path)
+    assert cache.append("ETHUSDT", "4h", _candles(0, 10)) == 10
+    assert cache.append("ETHUSDT", "4h", _candles(5, 10, price=500.0)) == 5
+
+    arrays = cache.read("ETHUSDT", "4h")
+    assert len(arrays) == 15
+    assert arrays.open[5] == 105.0
+    assert arrays.open[10] == 505.0
+
+
+def test_to_dicts_formats(tmp_path):
+    """Dict materialisation matches the adapter and klines_store naming."""
+    cache = ColumnarCandleCache(tmp_path)
+    cache.append("SOLUSDT", "1h", [{"timestamp": HOUR_MS, "open": 1, "high": 2, "low": 0.5,
+                                    "close": 1.5, "volume": 3, "turnover": 4}])
+    arrays = cache.read("SOLUSDT", "1h")
+
+    assert arrays.to_dicts() == [{"timestamp": HOUR_MS, "open": 1.0, "high": 2.0, "low": 0.5,
+                                  "close": 1.5, "volume": 3.0, "turnover": 4.0}]
+    row = arrays.to_dicts(store_format=True, symbol="SOLUSDT")[0]
+    assert row["symbol"] == "SOLUSDT"
+    assert row["start_time"] == HOUR_MS
+    assert row["close_price"] == 1.5
+
+
+def test_rows_written_inside_cached_range_are_reconciled(tmp_path, store):
+    """Rows another writer puts into klines_store inside the cached range show up."""
+    _insert(store, _candles(0, 10) + _candles(20, 10))
+    cache = ColumnarCandleCache(tmp_path)
+    assert cache.sync_from_store(store, "BTCUSDT", "1h") == 20
+
+    _insert(store, _candles(10, 10))  # e.g. the simulator filling the gap directly
+    assert cache.sync_from_store(store, "BTCUSDT", "1h") == 10
+    np.testing.assert_array_equal(cache.read("BTCUSDT", "1h").timestamp, np.arange(30) * HOUR_MS)
+    assert cache.sync_from_store(store, "BTCUSDT", "1h") == 0
+
+
+def _append_interleaved(root, worker, workers):
+    cache = ColumnarCandleCache(root)
+    for batch in range(10):
+        hours = [worker + workers * (batch * 5 + k) for k in range(5)]
+        cache.append("BTCUSDT", "1h", [_candles(h, 1)[0] for h in hours])
+
+
+def test_concurrent_processes_neither_drop_nor_duplicate(tmp_path):
+    """Appends and merge-rewrites from several processes serialize on the file lock."""
+    ctx = multiprocessing.get_context("fork")
+    workers = [ctx.Process(target=_append_interleaved, args=(tmp_path, w, 4)) for w in range(4)]
+    for p in workers:
+        p.start()
+    for p in workers:
+        p.join(30)
+        assert p.exitcode == 0
+
+    ts = ColumnarCandleCache(tmp_path).read("BTCUSDT", "1h").timestamp
+    np.testing.assert_array_equal(ts, np.arange(200) * HOUR_MS)
+
+
+def test_candle_store_database_reads_through_the_cache(tmp_path, monkeypatch):
+    """CandleStoreDatabase's array and dict readers go through the columnar cache."""
+    from prompt_performance.core import database_utils
+
+    if database_utils.DB_TYPE != "sqlite":
+        pytest.skip("CandleStoreDatabase keeps its own file only in SQLite mode")
+    cache = ColumnarCandleCache(tmp_path / "cache")
+    monkeypatch.setattr(database_utils, "get_candle_cache", lambda: cache)
+    db = database_utils.CandleStoreDatabase(db_path=str(tmp_path / "candle_store.db"))
+    db.insert_candles(_candles(0, 30), "BTCUSDT", "1h", "linear")
+
+    arrays = db.get_candle_arrays("BTCUSDT", "1h", start_timestamp=10 * HOUR_MS, limit=5)
+    np.testing.assert_array_equal(arrays.timestamp, np.arange(10, 15) * HOUR_MS)
+    rows = db.get_candles_after_timestamp("BTCUSDT", "1h", 25 * HOUR_MS)
+    assert [r["start_time"] for r in rows] == [h * HOUR_MS for h in range(25, 30)]
+    assert rows[0]["symbol"] == "BTCUSDT" and rows[0]["close_price"] == 125.5
+
+
+def test_trade_candles_sync_only_on_a_miss(tmp_path, monkeypatch):
+    """Covered ranges are served from the mmap alone; dicts match the SQL path's shape."""
+    from trading_bot.utils import get_trade_candles_bot_control as trade_candles
+
+    db_path = tmp_path / "candle_store.db"
+    conn = sqlite3.connect(db_path)
+    conn.execute("""
+        CREATE TABLE klines_store (
+            symbol TEXT NOT NULL, timeframe TEXT NOT NULL, category TEXT NOT NULL,
+            start_time INTEGER NOT NULL, open_price REAL NOT NULL, high_price REAL NOT NULL,
+            low_price REAL NOT NULL, close_price REAL NOT NULL, volume REAL NOT NULL,
+            turnover REAL NOT NULL, UNIQUE(symbol, timeframe, start_time)
+        )
+    """)
+    _insert(conn, _candles(0, 30))
+    conn.close()
+
+    opened = []
+
+    def connect():
+        opened.append(1)
+        return sqlite3.connect(db_path)
+
+    cache = ColumnarCandleCache(tmp_path / "cache")
+    monkeypatch.setattr(trade_candles, "get_candle_cache", lambda: cache)
+    monkeypatch.setattr(trade_candles, "_get_candle_connection", connect)
+
+    rows = trade_candles._get_candles_from_db("BTCUSDT.P", "1h", 0, 29 * HOUR_MS, HOUR_MS)
+    assert len(rows) == 30 and len(opened) == 1
+    assert rows[0]["category"] == "linear" and rows[0]["symbol"] == "BTCUSDT"
+
+    rows = trade_candles._get_candles_from_db("BTCUSDT", "1h", 5 * HOUR_MS, 20 * HOUR_MS, HOUR_MS)
+    assert [r["start_time"] for r in rows] == [h * HOUR_MS for h in range(5, 21)]
+    assert len(opened) == 1  # covered: no klines_store queries
+
+    trade_candles._get_candles_from_db("BTCUSDT", "1h", 0, 40 * HOUR_MS, HOUR_MS)
+    assert len(opened) == 2  # reaches past the cached range: resync
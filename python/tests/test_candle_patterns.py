@@ -0,0 +1,131 @@
+"""Tests for vectorized candlestick pattern and swing-pivot detection."""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading_bot.core.candle_patterns import PATTERN_NAMES, detect_patterns_frame, swing_pivots
+from trading_bot.services.alex_strategy import AlexStrategy
+from trading_bot.services.market_regime_strategy import MarketRegimeStrategy
+
+
+def _candles(n, seed=0):
+    """Choppy candles with small bodies so every pattern shows up."""
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    open_ = close + rng.normal(0, 0.8, n)
+    return pd.DataFrame({
+        'open': open_,
+        'high': np.maximum(open_, close) + rng.exponential(0.5, n),
+        'low': np.minimum(open_, close) - rng.exponential(0.5, n),
+        'close': close,
+        'volume': rng.exponential(1000, n),
+    })
+
+
+def _regime_frame(strategy, df):
+    df = df.copy()
+    df['volume_avg_20'] = df['volume'].rolling(window=20).mean()
+    df['body'] = (df['close'] - df['open']).abs()
+    df['range'] = df['high'] - df['low']
+    df['upper_shadow'] = df['high'] - df[['open', 'close']].max(axis=1)
+    df['lower_shadow'] = df[['open', 'close']].min(axis=1) - df['low']
+    df['volume_confirmed'] = df['volume'] > (strategy.config['volume_threshold'] * df['volume_avg_20'])
+    return df
+
+
+def _reference_patterns(df, lookback):
+    """The bar-by-bar loop the vectorized detector replaced."""
+    patterns = {name: [] for name in PATTERN_NAMES}
+    for i in range(1, min(len(df), lookback + 1)):
+        idx = -i
+        cur, prev = df.iloc[idx], df.iloc[idx - 1]
+        if (prev['close'] < prev['open'] and cur['close'] > cur['open'] and cur['open'] < prev['close']
+                and cur['close'] > prev['open'] and cur['volume_confirmed']):
+            patterns['bullish_engulfing'].append(idx)
+        if (prev['close'] > prev['open'] and cur['close'] < cur['open'] and cur['open'] > prev['close']
+                and cur['close'] < prev['open'] and cur['volume_confirmed']):
+            patterns['bearish_engulfing'].append(idx)
+        if (cur['body'] <= 0.3 * cur['range'] and cur['lower_shadow'] >= 2.0 * cur['body']
+                and cur['upper_shadow'] <= 0.2 * cur['range'] and cur['close'] > cur['low'] + 0.6 * cur['range']
+                and cur['volume_confirmed']):
+            patterns['hammer'].append(idx)
+        if (cur['body'] <= 0.3 * cur['range'] and cur['upper_shadow'] >= 2.0 * cur['body']
+                and cur['lower_shadow'] <= 0.2 * cur['range'] and cur['close'] < cur['high'] - 0.6 * cur['range']
+                and cur['volume_confirmed']):
+            patterns['shooting_star'].append(idx)
+        if cur['high'] < prev['high'] and cur['low'] > prev['low'] and cur['volume'] < prev['volume']:
+            patterns['inside_bar'].append(idx)
+    return patterns
+
+
+def _reference_pivots(high, low):
+    highs, lows = [], []
+    for i in range(2, len(high) - 2):
+        if all(high[i] > high[j] for j in (i - 2, i - 1, i + 1, i + 2)):
+            highs.append(i)
+        if all(low[i] < low[j] for j in (i - 2, i - 1, i + 1, i + 2)):
+            lows.append(i)
+    return highs, lows
+
+
+@pytest.mark.parametrize("n, lookback", [(300, 300), (300, 10), (5, 10), (1, 10)])
+def test_patterns_match_bar_by_bar_loop(n, lookback):
+    strategy = MarketRegimeStrategy({'volume_threshold': 1.0, 'pattern_lookback': lookback})
+    df = _regime_frame(strategy, _candles(n))
+
+    patterns = strategy._detect_candlestick_patterns(df)
+
+    assert patterns == _reference_patterns(df, lookback)
+    if n == 300 and lookback == 300:
+        assert all(patterns[name] for name in PATTERN_NAMES)
+
+
+def test_swing_pivots_match_fractal_loop():
+    df = _candles(200, seed=3)
+    is_high, is_low = swing_pivots(df['high'], df['low'])
+
+    highs, lows = _reference_pivots(df['high'].to_numpy(), df['low'].to_numpy())
+    assert np.flatnonzero(is_high).tolist() == highs
+    assert np.flatnonzero(is_low).tolist() == lows
+
+
+def test_strategy_pivots_keep_their_output_shape():
+    df = _candles(120, seed=4)
+    highs, lows = _reference_pivots(df['high'].to_numpy(), df['low'].to_numpy())
+
+    zones = MarketRegimeStrategy({})._analyze_liquidity_zones(df)
+    assert [z['index'] for z in zones['swing_highs']] == highs
+    assert [z['price'] for z in zones['swing_lows']] == [df['low'].iloc[i] for i in lows]
+
+    levels = AlexStrategy({}).identify_support_resistance(df, lookback_periods=100)
+    tail_highs, tail_lows = _reference_pivots(df['high'].to_numpy()[-100:], df['low'].to_numpy()[-100:])
+    assert levels['resistance_levels'] == sorted(df['high'].to_numpy()[-100:][tail_highs])
+    assert levels['support_levels'] == sorted(df['low'].to_numpy()[-100:][tail_lows])
+
+
+def test_stacked_symbols_do_not_leak_across_boundaries():
+    a, b = _candles(50, seed=1), _candles(50, seed=2)
+    stacked = pd.concat([a.assign(symbol='A'), b.assign(symbol='B')], ignore_index=True)
+    # B's first bar sits inside A's last bar, which would read as an inside bar
+    stacked.loc[50, ['high', 'low', 'volume']] = [a['high'].iloc[-1] - 0.01, a['low'].iloc[-1] + 0.01, 0.0]
+
+    flags = detect_patterns_frame(stacked, group_col='symbol')
+    assert not flags['inside_bar'].iloc[50]
+    pd.testing.assert_frame_equal(flags.iloc[:50], detect_patterns_frame(a))
+
+    is_high, _ = swing_pivots(stacked['high'], stacked['low'], groups=stacked['symbol'])
+    assert not is_high[[48, 49, 50, 51]].any()
+
+
+def test_batch_detection_matches_per_symbol_detection():
+    strategy = MarketRegimeStrategy({'volume_threshold': 1.0, 'pattern_lookback': 40})
+    frames = {f'SYM{i}USDT': _candles(60 + i * 7, seed=i) for i in range(6)}
+    frames['EMPTYUSDT'] = _candles(0)
+
+    batch = strategy.detect_candlestick_patterns_batch(frames)
+
+    assert set(batch) == set(frames) - {'EMPTYUSDT'}
+    for symbol, patterns in batch.items():
+        df = _regime_frame(strategy, frames[symbol])
+        assert patterns == _reference_patterns(df, 40), symbol
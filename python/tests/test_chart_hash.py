@@ -0,0 +1,55 @@
+"""Tests for perceptual chart hashing."""
+
+import io
+
+import numpy as np
+import pytest
+from PIL import Image
+
+from trading_bot.core.chart_hash import compute_chart_hash, hamming_distance, is_near_duplicate
+
+
+def _png(pixels: np.ndarray) -> bytes:
+    buf = io.BytesIO()
+    Image.fromarray(pixels.astype(np.uint8)).save(buf, format="PNG")
+    return buf.getvalue()
+
+
+def _chart(seed: int) -> np.ndarray:
+    """Random-walk 'price line' on a dark background."""
+    rng = np.random.default_rng(seed)
+    img = np.full((300, 600, 3), 20, dtype=np.int16)
+    ys = np.clip(150 + np.cumsum(rng.normal(0, 4, 600)), 5, 294).astype(int)
+    for x, y in enumerate(ys):
+        img[y - 4:y + 4, x] = (40, 200, 90)
+        img[y + 4:, x] = (30, 60, 40)
+    return img
+
+
+def test_identical_images_hash_identically():
+    png = _png(_chart(1))
+    assert compute_chart_hash(png) == compute_chart_hash(png)
+    assert len(compute_chart_hash(png)) == 64  # 16x16 bits
+
+
+def test_small_changes_stay_near_and_different_charts_are_far():
+    base = _chart(1)
+    tweaked = base.copy()
+    tweaked[290:, 590:] = 255  # a few pixels in the corner (e.g. a live price tag)
+
+    h_base = compute_chart_hash(_png(base))
+    h_tweaked = compute_chart_hash(_png(tweaked))
+    h_other = compute_chart_hash(_png(_chart(2)))
+
+    assert is_near_duplicate(h_base, h_tweaked)
+    assert not is_near_duplicate(h_base, h_other)
+    assert hamming_distance(h_base, h_other) > hamming_distance(h_base, h_tweaked)
+
+
+def test_near_duplicate_guards():
+    assert not is_near_duplicate(None, "00")
+    assert not is_near_duplicate("00", "0000")
+    assert not is_near_duplicate("00", "00", max_distance=-1)
+    assert is_near_duplicate("0f", "0e", max_distance=1)
+    with pytest.raises(ValueError):
+        hamming_distance("00", "0000")
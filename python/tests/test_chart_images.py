@@ -0,0 +1,153 @@
+"""Tests for the in-memory chart image pipeline."""
+
+import io
+import threading
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+import trading_bot.core.storage as storage
+from trading_bot.core.chart_images import ChartImagePipeline, encode_for_llm
+from trading_bot.core.sourcer import ChartSourcer
+
+
+def _png(width=400, height=200):
+    img = Image.new("RGB", (width, height), (20, 30, 40))
+    for x in range(0, width, 7):
+        img.putpixel((x, x % height), (250, 200, 10))
+    buffer = io.BytesIO()
+    img.save(buffer, format="PNG")
+    return buffer.getvalue()
+
+
+@pytest.fixture
+def fake_storage(monkeypatch):
+    files = {}
+    gate = threading.Event()
+    gate.set()
+
+    def save_file(path, data, content_type="image/png"):
+        gate.wait(5)
+        files[path] = data
+        return {"success": True, "path": path}
+
+    def delete_file(path):
+        files.pop(path, None)
+        return {"success": True}
+
+    monkeypatch.setattr(storage, "save_file", save_file)
+    monkeypatch.setattr(storage, "read_file", files.get)
+    monkeypatch.setattr(storage, "delete_file", delete_file)
+    return SimpleNamespace(files=files, gate=gate)
+
+
+def test_png_at_full_size_is_passed_through():
+    png = _png()
+    assert encode_for_llm(png, "png") == (png, "png")
+
+
+@pytest.mark.parametrize("fmt, ext, pil_format", [("webp", "webp", "WEBP"), ("jpeg", "jpg", "JPEG")])
+def test_llm_reencode_downscales(fmt, ext, pil_format):
+    data, got_ext = encode_for_llm(_png(), fmt, quality=70, max_width=200)
+
+    assert got_ext == ext
+    with Image.open(io.BytesIO(data)) as img:
+        assert img.format == pil_format
+        assert img.size == (200, 100)
+
+
+def test_reads_are_served_from_memory_while_write_is_pending(fake_storage):
+    pipeline = ChartImagePipeline(async_writes=True)
+    png = _png()
+    fake_storage.gate.clear()  # hold the background write
+
+    assert pipeline.save("charts/BTCUSDT_1h_20250101_000000.png", png) is None
+    assert pipeline.read("charts/BTCUSDT_1h_20250101_000000.png") == png
+    assert pipeline.pending_writes() == 1
+    assert "charts/BTCUSDT_1h_20250101_000000.png" not in fake_storage.files
+
+    fake_storage.gate.set()
+    assert pipeline.flush(timeout=5)
+    assert fake_storage.files["charts/BTCUSDT_1h_20250101_000000.png"] == png
+    assert pipeline.pending_writes() == 0
+
+
+def test_delete_waits_for_a_running_write(fake_storage):
+    pipeline = ChartImagePipeline(async_writes=True)
+    fake_storage.gate.clear()  # write has started and is blocked in storage
+    pipeline.save("charts/a.png", _png())
+
+    deleter = threading.Thread(target=pipeline.delete, args=("charts/a.png",))
+    deleter.start()
+    deleter.join(0.1)
+    assert deleter.is_alive()  # waiting for the write instead of racing it
+
+    fake_storage.gate.set()
+    deleter.join(5)
+    assert "charts/a.png" not in fake_storage.files
+    assert pipeline.read("charts/a.png") is None
+
+
+def test_delete_cancels_a_queued_write(fake_storage):
+    pipeline = ChartImagePipeline(async_writes=True)
+    fake_storage.gate.clear()
+    for name in ("busy1", "busy2", "queued"):  # two writer threads: the third write waits
+        pipeline.save(f"charts/{name}.png", _png())
+
+    assert pipeline.delete("charts/queued.png") == {"success": True}
+    fake_storage.gate.set()
+    assert pipeline.flush(timeout=5)
+    assert set(fake_storage.files) == {"charts/busy1.png", "charts/busy2.png"}
+
+
+def test_synchronous_writes_return_the_storage_result(fake_storage):
+    pipeline = ChartImagePipeline(async_writes=False)
+    result = pipeline.save("charts/a.png", _png())
+
+    assert result == {"success": True, "path": "charts/a.png"}
+    assert "charts/a.png" in fake_storage.files
+
+
+def test_evicted_charts_fall_back_to_storage(fake_storage):
+    pipeline = ChartImagePipeline(max_images=1, async_writes=False)
+    first, second = _png(100, 50), _png(120, 60)
+    pipeline.save("charts/a.png", first)
+    pipeline.save("charts/b.png", second)
+    fake_storage.files["charts/a.png"] = b"from-storage"
+
+    assert pipeline.read("charts/a.png") == b"from-storage"
+    assert pipeline.read("charts/b.png") == second
+    assert pipeline.read("charts/missing.png") is None
+
+
+def test_llm_image_uses_configured_format(fake_storage):
+    pipeline = ChartImagePipeline(async_writes=False, llm_format="webp", llm_quality=60)
+    png = _png()
+    pipeline.save("charts/ETHUSDT_4h_20250101_000000.png", png)
+
+    data, filename = pipeline.llm_image("charts/ETHUSDT_4h_20250101_000000.png")
+    assert filename == "ETHUSDT_4h_20250101_000000.webp"
+    assert len(data) < len(png)
+    assert pipeline.llm_image("charts/ETHUSDT_4h_20250101_000000.png")[0] is data  # memoised
+
+
+def test_screenshot_clip_matches_pil_crop(tmp_path):
+    config = SimpleNamespace(
+        paths=SimpleNamespace(charts=str(tmp_path / "charts")),
+        tradingview=SimpleNamespace(
+            enabled=False, rate_limit=None,
+            browser=SimpleNamespace(viewport_width=400, viewport_height=200),
+            screenshot=SimpleNamespace(crop={"left": 50, "top": 40, "right": 120, "bottom": 40}),
+        ),
+    )
+    sourcer = ChartSourcer(config)
+    sourcer.page = SimpleNamespace(viewport_size={"width": 400, "height": 200})
+
+    clip = sourcer._screenshot_clip()
+    assert clip == {"x": 50, "y": 40, "width": 230, "height": 120}
+    with Image.open(io.BytesIO(sourcer._crop_screenshot(_png()))) as cropped:
+        assert cropped.size == (clip["width"], clip["height"])
+
+    config.tradingview.screenshot.crop_via_clip = False
+    assert sourcer._screenshot_clip() is None
@@ -0,0 +1,158 @@
+"""Tests for adaptive chart readiness detection."""
+
+import asyncio
+import time
+
+from trading_bot.core.chart_readiness import (
+    CANVAS_STABLE,
+    DOM_QUIET,
+    NETWORK_IDLE,
+    TIMEOUT,
+    WaitTimings,
+    canvas_snapshot,
+    timed_wait,
+    wait_for_chart_ready,
+)
+
+
+class FakePage:
+    """Scripted readiness behaviour: None = never ready, Exception = detector unavailable.
+
+    canvas_hashes entries are a painted canvas hash, (hash, painted) or None.
+    """
+
+    def __init__(self, network_idle_after=None, canvas_hashes=None, dom_quiet_after=None):
+        self.network_idle_after = network_idle_after
+        self.canvas_hashes = canvas_hashes if isinstance(canvas_hashes, Exception) else list(canvas_hashes or [])
+        self.dom_quiet_after = dom_quiet_after
+        self.canvas_polls = 0
+
+    async def _ready_after(self, delay):
+        if isinstance(delay, Exception):
+            raise delay
+        await asyncio.sleep(3600 if delay is None else delay)
+        return True
+
+    async def wait_for_load_state(self, state, timeout=None):
+        await self._ready_after(self.network_idle_after)
+
+    async def evaluate(self, script, arg=None):
+        if "toDataURL" in script:
+            self.canvas_polls += 1
+            if isinstance(self.canvas_hashes, Exception):
+                raise self.canvas_hashes
+            current = self.canvas_hashes.pop(0) if self.canvas_hashes else f"changing-{self.canvas_polls}"
+            if isinstance(current, str):
+                current = (current, True)
+            return None if current is None else {"hash": current[0], "painted": current[1]}
+        return await self._ready_after(self.dom_quiet_after)
+
+
+def _run(page, cap=1.0, **kwargs):
+    started = time.monotonic()
+    signal = asyncio.run(wait_for_chart_ready(page, ".chart-container", cap=cap, poll_interval=0.01, **kwargs))
+    return signal, time.monotonic() - started
+
+
+def test_two_identical_canvas_hashes_end_the_wait():
+    page = FakePage(canvas_hashes=[None, "1:10", "1:20", "1:20"])
+    signal, elapsed = _run(page)
+
+    assert signal == CANVAS_STABLE
+    assert page.canvas_polls == 4
+    assert elapsed < 0.5
+
+
+def test_first_signal_wins():
+    assert _run(FakePage(network_idle_after=0.01), after_navigation=True)[0] == NETWORK_IDLE
+    assert _run(FakePage(dom_quiet_after=0.01))[0] == DOM_QUIET
+
+
+def test_already_idle_network_does_not_end_in_page_waits():
+    # After a click or timeframe change the page is long past networkidle
+    page = FakePage(network_idle_after=0, dom_quiet_after=0.05)
+    signal, elapsed = _run(page)
+
+    assert signal == DOM_QUIET
+    assert elapsed >= 0.04
+    assert _run(FakePage(network_idle_after=0, dom_quiet_after=0.05), after_navigation=True)[0] == NETWORK_IDLE
+
+
+def test_blank_canvas_is_not_stable():
+    blank = ("1:0", False)
+    signal, _ = _run(FakePage(canvas_hashes=[blank] * 100), cap=0.2)
+    assert signal == TIMEOUT
+
+    # Same half-painted hash twice counts once the canvas has changed during the wait
+    page = FakePage(canvas_hashes=[blank, ("1:5", False), ("1:5", False)])
+    assert _run(page)[0] == CANVAS_STABLE
+    assert page.canvas_polls == 3
+
+
+def test_in_page_wait_needs_a_change_from_the_snapshot():
+    # The old chart is painted and stable: without a change the cap is the fallback
+    page = FakePage(canvas_hashes=["1:10"] * 100, dom_quiet_after=0.01)
+    before = asyncio.run(canvas_snapshot(page, ".chart-container"))
+    signal, elapsed = _run(page, cap=0.2, changed_from=before)
+
+    assert before == "1:10"
+    assert signal == TIMEOUT
+    assert elapsed >= 0.19
+
+    # Stable once the repainted chart has been seen twice
+    page = FakePage(canvas_hashes=["1:10", "1:10", "1:20", "1:20"])
+    assert _run(page, changed_from="1:10")[0] == CANVAS_STABLE
+    assert page.canvas_polls == 4
+
+    # Repainted before the first poll still counts as a change
+    page = FakePage(canvas_hashes=["1:20", "1:20"])
+    assert _run(page, changed_from="1:10")[0] == CANVAS_STABLE
+    assert page.canvas_polls == 2
+
+
+def test_in_page_dom_quiet_waits_for_the_repaint():
+    page = FakePage(canvas_hashes=["1:10"] * 5 + ["2:%d" % i for i in range(100)], dom_quiet_after=0.01)
+    signal, elapsed = _run(page, changed_from="1:10")
+
+    assert signal == DOM_QUIET
+    assert page.canvas_polls >= 6
+
+
+def test_canvas_snapshot_without_a_readable_canvas():
+    assert asyncio.run(canvas_snapshot(FakePage(canvas_hashes=[None]))) == ''
+    assert asyncio.run(canvas_snapshot(FakePage(canvas_hashes=RuntimeError("page closed")))) == ''
+
+
+def test_cap_bounds_the_wait():
+    signal, elapsed = _run(FakePage(), cap=0.1)
+
+    assert signal == TIMEOUT
+    assert 0.09 < elapsed < 0.5
+
+
+def test_failed_detectors_fall_back_to_the_cap():
+    boom = RuntimeError("page closed")
+    page = FakePage(network_idle_after=boom, canvas_hashes=boom, dom_quiet_after=boom)
+    signal, elapsed = _run(page, cap=0.1)
+
+    assert signal == TIMEOUT
+    assert elapsed >= 0.09
+
+
+def test_timed_wait_records_steps():
+    timings = WaitTimings()
+
+    async def waits():
+        await timed_wait(timings, "navigation", FakePage(dom_quiet_after=0.01), cap=1.0)
+        await timed_wait(timings, "navigation", FakePage(), cap=0.2)
+        await timed_wait(timings, "timeframe", None, cap=0.001, adaptive=False)
+
+    asyncio.run(waits())
+    summary = timings.summary()
+
+    assert list(summary) == ["navigation", "timeframe"]  # slowest total first
+    assert summary["navigation"]["count"] == 2
+    assert summary["navigation"]["signals"] == {DOM_QUIET: 1, TIMEOUT: 1}
+    assert summary["timeframe"]["signals"] == {"fixed": 1}
+    assert summary["navigation"]["max"] >= 0.19
+    assert "navigation: n=2" in timings.format_summary()
@@ -0,0 +1,104 @@
+"""Tests for CointegrationAnalysisModule's deduplicated, concurrent pair evaluation."""
+
+import asyncio
+from unittest.mock import Mock
+
+import numpy as np
+
+import trading_bot.strategies.candle_adapter as candle_adapter_module
+from trading_bot.strategies.candle_adapter import CandleAdapter
+from trading_bot.strategies.cointegration_analysis_module import CointegrationAnalysisModule
+
+HOUR = 3_600_000
+
+
+def _candles(seed, n=500, base=None):
+    rng = np.random.default_rng(seed)
+    close = (base if base is not None else 100 + np.cumsum(rng.normal(0, 1, n))) * (1 + seed) + rng.normal(0, 0.5, n)
+    return [{'timestamp': i * HOUR, 'open': c, 'high': c + 1, 'low': c - 1, 'close': c, 'volume': 1.0}
+            for i, c in enumerate(close)]
+
+
+class FakeAdapter(CandleAdapter):
+    def __init__(self, series):
+        super().__init__()
+        self.series = series
+        self.calls = []
+        self.in_flight = 0
+        self.max_in_flight = 0
+
+    async def get_candles(self, symbol, timeframe, limit=100, **kwargs):
+        self.calls.append(symbol)
+        self.in_flight += 1
+        self.max_in_flight = max(self.max_in_flight, self.in_flight)
+        await asyncio.sleep(0.01)
+        self.in_flight -= 1
+        return self.series.get(symbol, [])
+
+
+def _setup(monkeypatch, pairs, universe):
+    loads = []
+    monkeypatch.setattr(candle_adapter_module, '_symbol_universe', {})
+    monkeypatch.setattr('prompt_performance.core.bybit_symbols.get_bybit_symbols_cached',
+                        lambda category: loads.append(category) or list(universe))
+
+    base = 100 + np.cumsum(np.random.default_rng(99).normal(0, 1, 500))
+    series = {s: _candles(i, base=base) for i, s in enumerate(universe)}
+    series.pop('EMPTYUSDT', None)
+    adapter = FakeAdapter(series)
+    module = CointegrationAnalysisModule(config=Mock(), strategy_config={'pairs': pairs, 'adf_stride': 50})
+    module.candle_adapter = adapter
+    return module, adapter, loads
+
+
+def test_shared_legs_are_fetched_once_and_results_keep_pair_order(monkeypatch):
+    pairs = {'OP': 'ARB', 'LINK': 'ARB', 'AAVE': 'OP', 'FIL': 'NOPE', 'EMPTY': 'ARB', 'SOLO': None}
+    universe = ['OPUSDT', 'ARBUSDT', 'LINKUSDT', 'AAVEUSDT', 'FILUSDT', 'EMPTYUSDT', 'SOLOUSDT']
+    module, adapter, loads = _setup(monkeypatch, pairs, universe)
+
+    results = asyncio.run(module.run_analysis_cycle([], '1h', 'cycle-1'))
+
+    assert [r['symbol'] for r in results] == list(pairs)
+    assert sorted(adapter.calls) == sorted(['OPUSDT', 'ARBUSDT', 'LINKUSDT', 'AAVEUSDT', 'EMPTYUSDT'])
+    assert adapter.max_in_flight == 5
+    assert loads == ['linear']  # symbol universe loaded once for every existence check
+
+    by_symbol = {r['symbol']: r for r in results}
+    assert all('error' not in by_symbol[s] and not by_symbol[s].get('skipped') for s in ('OP', 'LINK', 'AAVE'))
+    assert by_symbol['OP']['analysis']['strategy'] == 'cointegration'
+    assert by_symbol['FIL']['skip_reason'] == 'Symbol not available: NOPEUSDT'
+    assert by_symbol['EMPTY']['skip_reason'] == 'Insufficient candle data'
+    assert by_symbol['SOLO']['skip_reason'] == 'No pair configured'
+
+
+def test_pool_results_match_a_single_pair_cycle(monkeypatch):
+    pairs = {'OP': 'ARB', 'LINK': 'ARB'}
+    module, _, _ = _setup(monkeypatch, pairs, ['OPUSDT', 'ARBUSDT', 'LINKUSDT'])
+    together = asyncio.run(module.run_analysis_cycle([], '1h', 'c'))
+
+    for expected in together:
+        single, _, _ = _setup(monkeypatch, {expected['symbol']: pairs[expected['symbol']]},
+                              ['OPUSDT', 'ARBUSDT', 'LINKUSDT'])
+        assert asyncio.run(single.run_analysis_cycle([], '1h', 'c')) == [expected]
+
+
+def test_symbol_universe_memo_retries_failures_quickly(monkeypatch):
+    monkeypatch.setattr(candle_adapter_module, '_symbol_universe', {})
+    now = [1000.0]
+    monkeypatch.setattr(candle_adapter_module.time, 'time', lambda: now[0])
+    answers = [RuntimeError('down'), ['BTCUSDT']]
+
+    def load(category):
+        answer = answers.pop(0)
+        if isinstance(answer, Exception):
+            raise answer
+        return answer
+
+    monkeypatch.setattr('prompt_performance.core.bybit_symbols.get_bybit_symbols_cached', load)
+    adapter = CandleAdapter()
+
+    assert not asyncio.run(adapter.symbol_exists('BTCUSDT'))
+    now[0] += candle_adapter_module.SYMBOL_UNIVERSE_RETRY + 1
+    assert asyncio.run(adapter.symbol_exists('BTCUSDT'))
+    now[0] += 3600
+    assert asyncio.run(CandleAdapter().symbol_exists('BTCUSDT')) and answers == []
@@ -0,0 +1,47 @@
+"""
+Tests for the batched execute_many helper in the DB client.
+"""
+
+import sqlite3
+
+import pytest
+
+from trading_bot.db.client import execute_many
+
+
+@pytest.fixture
+def conn():
+    conn = sqlite3.connect(":memory:")
+    conn.execute("CREATE TABLE klines_store (symbol TEXT, start_time INTEGER, close_price REAL, "
+                 "PRIMARY KEY (symbol, start_time))")
+    yield conn
+    conn.close()
+
+
+def test_inserts_all_rows_in_one_commit(conn):
+    rows = [("BTCUSDT", t, 100.0 + t) for t in range(500)]
+    affected = execute_many(conn, "INSERT OR IGNORE INTO klines_store VALUES (?, ?, ?)", rows)
+
+    assert affected == 500
+    assert conn.in_transaction is False
+    assert conn.execute("SELECT COUNT(*) FROM klines_store").fetchone()[0] == 500
+
+
+def test_duplicates_are_ignored(conn):
+    sql = "INSERT OR IGNORE INTO klines_store VALUES (?, ?, ?)"
+    execute_many(conn, sql, [("BTCUSDT", 1, 1.0), ("BTCUSDT", 2, 2.0)])
+
+    assert execute_many(conn, sql, [("BTCUSDT", 2, 9.0), ("BTCUSDT", 3, 3.0)]) == 1
+    assert conn.execute("SELECT close_price FROM klines_store WHERE start_time = 2").fetchone()[0] == 2.0
+
+
+def test_failure_rolls_back_whole_batch(conn):
+    sql = "INSERT INTO klines_store VALUES (?, ?, ?)"
+    with pytest.raises(sqlite3.IntegrityError):
+        execute_many(conn, sql, [("BTCUSDT", 1, 1.0), ("BTCUSDT", 1, 1.0)])
+
+    assert conn.execute("SELECT COUNT(*) FROM klines_store").fetchone()[0] == 0
+
+
+def test_empty_batch_is_noop(conn):
+    assert execute_many(conn, "INSERT INTO klines_store VALUES (?, ?, ?)", []) == 0
@@ -0,0 +1,48 @@
+"""
+Tests for PostgreSQL placeholder translation and its LRU cache.
+"""
+
+import pytest
+
+from trading_bot.db import client
+
+
+@pytest.fixture
+def postgres_mode(monkeypatch):
+    monkeypatch.setattr(client, 'DB_TYPE', 'postgres')
+    client.reset_placeholder_cache()
+    yield
+    client.reset_placeholder_cache()
+
+
+def test_translation(postgres_mode):
+    sql, params = client.convert_placeholders(
+        "SELECT * FROM t WHERE a = ? AND b LIKE '%x?%' AND c = ?", (1, 2)
+    )
+    assert sql == "SELECT * FROM t WHERE a = %s AND b LIKE '%%x?%%' AND c = %s"
+    assert params == (1, 2)
+
+
+def test_repeated_sql_hits_cache(postgres_mode):
+    for _ in range(3):
+        client.convert_placeholders("UPDATE t SET a = ? WHERE id = ?", (1, 2))
+
+    stats = client.get_placeholder_cache_stats()
+    assert stats['misses'] == 1
+    assert stats['hits'] == 2
+    assert stats['size'] == 1
+    assert stats['time_spent'] > 0
+
+
+def test_fast_path_skips_cache(postgres_mode):
+    sql, _ = client.convert_placeholders("SELECT 1", ())
+
+    stats = client.get_placeholder_cache_stats()
+    assert sql == "SELECT 1"
+    assert stats['fast_path'] == 1
+    assert stats['hits'] == stats['misses'] == 0
+
+
+def test_sqlite_mode_is_passthrough(monkeypatch):
+    monkeypatch.setattr(client, 'DB_TYPE', 'sqlite')
+    assert client.convert_placeholders("SELECT ?", (1,)) == ("SELECT ?", (1,))
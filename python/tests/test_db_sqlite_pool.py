@@ -0,0 +1,89 @@
+"""
+Tests for the per-thread SQLite connection pool in the DB client.
+"""
+
+import threading
+
+import pytest
+
+from trading_bot.db import client
+
+
+@pytest.fixture
+def sqlite_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(client, 'DB_TYPE', 'sqlite')
+    monkeypatch.setattr(client, 'DB_PATH', tmp_path / "trading.db")
+    yield
+    client.close_pooled_connections()
+
+
+def test_released_connection_is_reused(sqlite_db):
+    conn = client.get_connection()
+    client.release_connection(conn)
+
+    assert client.get_connection() is conn
+
+
+def test_nested_checkouts_get_distinct_connections(sqlite_db):
+    outer = client.get_connection()
+    inner = client.get_connection()
+
+    assert outer is not inner
+    client.release_connection(inner)
+    client.release_connection(outer)
+
+
+def test_pragmas_applied(sqlite_db):
+    conn = client.get_connection()
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == 'wal'
+        assert conn.execute("PRAGMA synchronous").fetchone()[0] == 1  # NORMAL
+        assert conn.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    finally:
+        client.release_connection(conn)
+
+
+def test_release_rolls_back_uncommitted_work(sqlite_db):
+    conn = client.get_connection()
+    conn.execute("CREATE TABLE t (x INTEGER)")
+    conn.commit()
+    conn.execute("INSERT INTO t VALUES (1)")
+    client.release_connection(conn)
+
+    conn = client.get_connection()
+    try:
+        assert conn.execute("SELECT COUNT(*) FROM t").fetchone()[0] == 0
+    finally:
+        client.release_connection(conn)
+
+
+def test_closed_connection_is_not_handed_out(sqlite_db):
+    conn = client.get_connection()
+    client.release_connection(conn)
+    conn.close()
+
+    fresh = client.get_connection()
+    try:
+        assert fresh is not conn
+        fresh.execute("SELECT 1")
+    finally:
+        client.release_connection(fresh)
+
+
+def test_pools_are_per_thread(sqlite_db):
+    conn = client.get_connection()
+    client.release_connection(conn)
+
+    seen = []
+
+    def worker():
+        other = client.get_connection()
+        seen.append(other)
+        client.release_connection(other)
+        client.close_pooled_connections()
+
+    thread = threading.Thread(target=worker)
+    thread.start()
+    thread.join()
+
+    assert seen and seen[0] is not conn
@@ -0,0 +1,94 @@
+"""
+Tests for the queue-backed DatabaseErrorHandler.
+"""
+
+import logging
+import threading
+
+import pytest
+
+from trading_bot.core import error_logger
+from trading_bot.core.error_logger import DatabaseErrorHandler
+from trading_bot.db import client
+
+
+@pytest.fixture
+def error_db(tmp_path, monkeypatch):
+    monkeypatch.setattr(client, 'DB_TYPE', 'sqlite')
+    monkeypatch.setattr(client, 'DB_PATH', tmp_path / "trading.db")
+    conn = client.get_connection()
+    conn.execute("""
+        CREATE TABLE error_logs (
+            id TEXT PRIMARY KEY, timestamp TEXT, level TEXT, run_id TEXT, cycle_id TEXT,
+            trade_id TEXT, symbol TEXT, component TEXT, event TEXT, message TEXT,
+            stack_trace TEXT, context TEXT
+        )
+    """)
+    conn.commit()
+    client.release_connection(conn)
+    yield
+    client.close_pooled_connections()
+
+
+def _logger(handler):
+    log = logging.getLogger(f"tests.error_logger.{id(handler)}")
+    log.propagate = False
+    log.addHandler(handler)
+    return log
+
+
+def _count_rows():
+    conn = client.get_connection()
+    try:
+        return conn.execute("SELECT COUNT(*) FROM error_logs").fetchone()[0]
+    finally:
+        client.release_connection(conn)
+
+
+def test_records_are_written_in_batches(error_db):
+    handler = DatabaseErrorHandler("unused.db", batch_size=10, flush_interval=0.05)
+    log = _logger(handler)
+    batches = []
+    write_batch = handler._write_batch
+    handler._write_batch = lambda rows: (batches.append(len(rows)), write_batch(rows))
+
+    for i in range(25):
+        log.warning("endpoint failed %d", i, extra={'symbol': 'BTCUSDT', 'context': {'i': i}})
+
+    assert handler.flush(timeout=5.0)
+    handler.close()
+
+    assert _count_rows() == 25
+    assert handler.written == 25
+    assert max(batches) <= 10
+
+
+def test_full_queue_drops_instead_of_blocking(error_db):
+    handler = DatabaseErrorHandler("unused.db", queue_size=2, batch_size=1, flush_interval=0.05)
+    log = _logger(handler)
+    release = threading.Event()
+    write_batch = handler._write_batch
+    handler._write_batch = lambda rows: (release.wait(5.0), write_batch(rows))
+
+    for i in range(10):
+        log.error("burst %d", i)
+
+    # One record held by the writer, two queued, the rest dropped
+    assert handler.dropped >= 7
+    release.set()
+    assert handler.flush(timeout=5.0)
+    handler.close()
+    assert _count_rows() == 10 - handler.dropped
+
+
+def test_flush_error_logging_drains_root_handlers(error_db):
+    handler = DatabaseErrorHandler("unused.db", flush_interval=0.05)
+    root = logging.getLogger()
+    root.addHandler(handler)
+    try:
+        logging.getLogger("tests.error_logger.root").error("shutdown pending")
+        error_logger.flush_error_logging(timeout=5.0)
+        assert _count_rows() == 1
+    finally:
+        root.removeHandler(handler)
+        handler.close()
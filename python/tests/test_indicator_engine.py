@@ -0,0 +1,141 @@
+"""Tests for the shared memoized indicator engine."""
+
+import numpy as np
+import pandas as pd
+import pandas_ta as ta
+import pytest
+
+from trading_bot.core.indicator_engine import IndicatorEngine, parse_indicator
+from trading_bot.services.alex_strategy import AlexStrategy
+from trading_bot.services.market_regime_strategy import MarketRegimeStrategy
+
+ALL = ['sma_20', 'ema_12', 'rsi_14', 'atr_14', 'volume_sma_20', 'macd_12_26_9', 'bbands_20_2']
+
+
+def _candles(n, seed=0, start=0):
+    rng = np.random.default_rng(seed)
+    close = 100 + np.cumsum(rng.normal(0, 1, n))
+    return pd.DataFrame({
+        'timestamp': (start + np.arange(n)) * 3_600_000,
+        'open': close + rng.normal(0, 0.2, n),
+        'high': close + rng.random(n) + 0.2,
+        'low': close - rng.random(n) - 0.2,
+        'close': close,
+        'volume': rng.random(n) * 1000 + 1,
+    })
+
+
+def _pandas_ta(df):
+    bb = ta.bbands(df['close'], length=20)
+    macd = ta.macd(df['close'])
+    return {
+        'sma_20': ta.sma(df['close'], length=20),
+        'ema_12': ta.ema(df['close'], length=12),
+        'rsi_14': ta.rsi(df['close'], length=14),
+        'atr_14': ta.atr(df['high'], df['low'], df['close'], length=14),
+        'volume_sma_20': ta.sma(df['volume'], length=20),
+        'macd': macd['MACD_12_26_9'], 'signal': macd['MACDs_12_26_9'], 'hist': macd['MACDh_12_26_9'],
+        'lower': bb[[c for c in bb.columns if c.startswith('BBL_')][0]],
+        'upper': bb[[c for c in bb.columns if c.startswith('BBU_')][0]],
+    }
+
+
+def _assert_matches(result, expected):
+    for name in ('sma_20', 'ema_12', 'rsi_14', 'atr_14', 'volume_sma_20'):
+        np.testing.assert_allclose(result[name].to_numpy(), expected[name].to_numpy(), rtol=1e-9, err_msg=name)
+    for column in ('macd', 'signal', 'hist'):
+        np.testing.assert_allclose(result['macd_12_26_9'][column].to_numpy(), expected[column].to_numpy(), rtol=1e-9)
+    for column in ('lower', 'upper'):
+        np.testing.assert_allclose(result['bbands_20_2'][column].to_numpy(), expected[column].to_numpy(), rtol=1e-9)
+
+
+def test_full_computation_matches_pandas_ta():
+    df = _candles(120)
+    _assert_matches(IndicatorEngine().compute(df, ALL, 'BTCUSDT', '1h'), _pandas_ta(df))
+
+
+def test_same_series_is_served_from_cache():
+    engine = IndicatorEngine()
+    df = _candles(120)
+    first = engine.compute(df, ['rsi_14'], 'BTCUSDT', '1h')
+    second = engine.compute(df.copy(), ['rsi_14', 'ema_12'], 'BTCUSDT', '1h')
+
+    assert engine.stats()['misses'] == 1 and engine.stats()['hits'] == 1
+    pd.testing.assert_series_equal(first['rsi_14'], second['rsi_14'])
+
+
+def test_appended_candle_is_an_incremental_update():
+    engine = IndicatorEngine()
+    df = _candles(121)
+    engine.compute(df.iloc[:120], ALL, 'BTCUSDT', '1h')
+    result = engine.compute(df, ALL, 'BTCUSDT', '1h')
+
+    assert engine.incremental == 1 and engine.misses == 1
+    _assert_matches(result, _pandas_ta(df))
+
+
+def test_sliding_window_recomputes_on_the_window():
+    engine = IndicatorEngine()
+    df = _candles(251)
+    engine.compute(df.iloc[:250], ALL + ['ema_200'], 'BTCUSDT', '1h')
+    window = df.iloc[1:].reset_index(drop=True)
+    result = engine.compute(window, ALL + ['ema_200'], 'BTCUSDT', '1h')
+
+    # Same values (and warm-up NaNs) as a cold cache would give
+    assert engine.incremental == 0 and engine.misses == 2
+    _assert_matches(result, _pandas_ta(window))
+    np.testing.assert_allclose(result['ema_200'].to_numpy(), ta.ema(window['close'], length=200).to_numpy(), rtol=1e-9)
+
+
+def test_revised_last_candle_and_gaps_recompute():
+    engine = IndicatorEngine()
+    df = _candles(121)
+    engine.compute(df.iloc[:120], ['rsi_14'], 'BTCUSDT', '1h')
+
+    revised = df.copy()
+    revised.loc[119, 'close'] += 5  # the previously open candle closed elsewhere
+    result = engine.compute(revised, ['rsi_14'], 'BTCUSDT', '1h')
+    engine.compute(df.iloc[:60], ['rsi_14'], 'BTCUSDT', '1h')
+
+    assert engine.incremental == 0 and engine.misses == 3
+    np.testing.assert_allclose(result['rsi_14'].to_numpy(), ta.rsi(revised['close'], length=14).to_numpy(), rtol=1e-9)
+
+
+def test_short_series_and_lru_eviction():
+    engine = IndicatorEngine(max_series=2)
+    short = engine.compute(_candles(30), ['sma_50', 'macd_12_26_9'], 'A', '1h')
+    assert short == {'sma_50': None, 'macd_12_26_9': None}
+
+    engine.compute(_candles(30), ['sma_20'], 'B', '1h')
+    engine.compute(_candles(30), ['sma_20'], 'C', '1h')
+    assert engine.stats()['series'] == 2
+    engine.compute(_candles(30), ['sma_20'], 'A', '1h')
+    assert engine.misses == 4
+
+
+def test_frames_without_timestamps_are_not_cached():
+    engine = IndicatorEngine()
+    df = _candles(60).drop(columns='timestamp')
+    engine.compute(df, ['ema_12'], 'BTCUSDT', '1h')
+    engine.compute(df, ['ema_12'], 'BTCUSDT', '1h')
+
+    assert engine.stats() == {'series': 0, 'hits': 0, 'incremental': 0, 'misses': 0}
+
+
+def test_unknown_indicator():
+    with pytest.raises(ValueError):
+        parse_indicator('vwap')
+
+
+def test_strategies_share_one_computation(monkeypatch):
+    engine = IndicatorEngine()
+    monkeypatch.setattr('trading_bot.core.indicator_engine._engine', engine)
+    df = _candles(250)
+
+    alex = AlexStrategy({}).calculate_indicators(df, 'ETHUSDT', '4h')
+    regime = MarketRegimeStrategy({})._calculate_regime_indicators(df, 'ETHUSDT', '4h')
+
+    assert engine.misses == 1 and engine.hits == 1
+    np.testing.assert_allclose(alex['rsi'].to_numpy(), regime['rsi'].to_numpy())
+    np.testing.assert_allclose(alex['sma_200'].to_numpy(), ta.sma(df['close'], length=200).to_numpy(), rtol=1e-9)
+    np.testing.assert_allclose(regime['ema_200'].to_numpy(), ta.ema(df['close'], length=200).to_numpy(), rtol=1e-9)
@@ -0,0 +1,259 @@
+"""
+Tests for the bounded-concurrency, rate-limit-aware LLM dispatcher.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import httpx
+import pytest
+
+from trading_bot.core.llm_dispatcher import LLMDispatcher, TokenBucket, parse_reset_duration
+
+
+class _Response:
+    def __init__(self, status_code=200, headers=None):
+        self.status_code = status_code
+        self.headers = headers or {}
+
+
+def test_parse_reset_duration():
+    assert parse_reset_duration("1s") == 1.0
+    assert parse_reset_duration("6m0s") == 360.0
+    assert parse_reset_duration("20ms") == pytest.approx(0.02)
+    assert parse_reset_duration("2") == 2.0
+    assert parse_reset_duration(None) is None
+
+
+def test_concurrency_cap():
+    dispatcher = LLMDispatcher(max_concurrency=2)
+    active = [0]
+    peak = [0]
+    lock = threading.Lock()
+
+    def call():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.02)
+        with lock:
+            active[0] -= 1
+        return {"ok": True}
+
+    threads = [threading.Thread(target=dispatcher.run, args=(call,)) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert peak[0] == 2
+    metrics = dispatcher.metrics()
+    assert metrics['calls'] == 8
+    assert metrics['queue_wait_max'] > 0
+    assert len(metrics['recent']) == 8
+
+
+def test_rate_limited_failure_is_requeued():
+    dispatcher = LLMDispatcher(base_backoff=0.01, max_backoff=0.02)
+    attempts = []
+
+    def call():
+        attempts.append(1)
+        if len(attempts) < 3:
+            # What the httpx hook does when OpenAI answers 429
+            dispatcher.response_hook(_Response(429, {"retry-after": "0.01"}))
+            return {"error": True, "summary": "rate limited"}
+        return {"recommendation": "buy"}
+
+    assert dispatcher.run(call) == {"recommendation": "buy"}
+    assert len(attempts) == 3
+    assert dispatcher.metrics()['retries'] == 2
+
+
+def test_failure_without_429_is_not_retried():
+    dispatcher = LLMDispatcher(base_backoff=0.01)
+    attempts = []
+
+    def call():
+        attempts.append(1)
+        return {"error": True}
+
+    assert dispatcher.run(call) == {"error": True}
+    assert len(attempts) == 1
+
+
+def test_gives_up_after_max_retries():
+    dispatcher = LLMDispatcher(max_retries=1, base_backoff=0.01, max_backoff=0.01)
+
+    class RateLimit(Exception):
+        status_code = 429
+
+    def call():
+        raise RateLimit("429")
+
+    with pytest.raises(RateLimit):
+        dispatcher.run(call)
+    assert dispatcher.metrics()['gave_up'] == 1
+
+
+def test_headers_resync_buckets():
+    dispatcher = LLMDispatcher()
+    dispatcher.response_hook(_Response(200, {
+        "x-ratelimit-limit-requests": "60",
+        "x-ratelimit-remaining-requests": "0",
+        "x-ratelimit-limit-tokens": "90000",
+    }))
+
+    assert dispatcher.request_bucket.capacity == 60
+    # Bucket is empty, so the next request waits about a second (60/min)
+    assert dispatcher.request_bucket.reserve(1) == pytest.approx(1.0, abs=0.05)
+    assert dispatcher.token_bucket.capacity == 90000
+
+
+def test_token_bucket_unlimited_by_default():
+    assert TokenBucket().reserve(10_000) == 0.0
+
+
+def test_run_async():
+    dispatcher = LLMDispatcher()
+    assert asyncio.run(dispatcher.run_async(lambda x: x * 2, 21)) == 42
+
+
+def test_run_async_uses_own_executor_at_full_concurrency():
+    """Async calls run max_concurrency wide without touching the default executor."""
+    dispatcher = LLMDispatcher(max_concurrency=6)
+    active = [0]
+    peak = [0]
+    lock = threading.Lock()
+
+    def call():
+        with lock:
+            active[0] += 1
+            peak[0] = max(peak[0], active[0])
+        time.sleep(0.3)
+        with lock:
+            active[0] -= 1
+        return threading.current_thread().name
+
+    async def main():
+        asyncio.get_running_loop().set_default_executor(ThreadPoolExecutor(max_workers=1))
+        calls = [asyncio.create_task(dispatcher.run_async(call)) for _ in range(12)]
+        await asyncio.sleep(0.02)
+        started = time.monotonic()
+        await asyncio.to_thread(lambda: None)  # not starved by queued analyses
+        waited = time.monotonic() - started
+        return await asyncio.gather(*calls), waited
+
+    names, waited = asyncio.run(main())
+    assert peak[0] == 6
+    assert waited < 0.2  # a starved default executor would wait for a 0.3s call
+    assert all(name.startswith('llm-dispatch') for name in names)
+
+
+def test_run_async_waits_for_rate_limits_without_a_thread():
+    dispatcher = LLMDispatcher(requests_per_minute=600)
+    dispatcher.request_bucket.set_remaining(0)  # each call now waits 0.1s more than the last
+
+    async def main():
+        calls = [asyncio.create_task(dispatcher.run_async(lambda: 1)) for _ in range(3)]
+        await asyncio.sleep(0.05)
+        idle_while_waiting = dispatcher._executor is None
+        return await asyncio.gather(*calls), idle_while_waiting
+
+    started = time.monotonic()
+    results, idle_while_waiting = asyncio.run(main())
+    assert results == [1, 1, 1]
+    assert idle_while_waiting
+    assert time.monotonic() - started >= 0.25
+
+
+def test_run_async_requeues_rate_limited_calls():
+    dispatcher = LLMDispatcher(base_backoff=0.01, max_backoff=0.02)
+    attempts = []
+
+    def call():
+        attempts.append(1)
+        if len(attempts) < 2:
+            dispatcher.response_hook(_Response(429, {"retry-after": "0.01"}))
+            return {"error": True}
+        return {"ok": True}
+
+    assert asyncio.run(dispatcher.run_async(call, label="BTCUSDT")) == {"ok": True}
+    assert dispatcher.metrics()['retries'] == 1
+
+
+def test_run_async_awaits_coroutines_and_hooks_async_clients():
+    """Coroutine calls run on the loop; an AsyncClient's 429 re-queues them."""
+    dispatcher = LLMDispatcher(base_backoff=0.01, max_backoff=0.02)
+    statuses = [429, 200]
+
+    class AsyncOpenAIStub:
+        _client = httpx.AsyncClient(transport=httpx.MockTransport(
+            lambda request: httpx.Response(statuses.pop(0), headers={"retry-after": "0.01"})
+        ))
+
+    client = dispatcher.attach(AsyncOpenAIStub())
+
+    async def call():
+        response = await client._client.get("http://fake/v1/threads")
+        return {"error": response.status_code != 200}
+
+    assert asyncio.run(dispatcher.run_async(call)) == {"error": False}
+    assert dispatcher.metrics()['retries'] == 1
+    assert dispatcher._executor is None  # never needed a thread
+
+
+def test_run_async_serves_queued_calls_in_fifo_order():
+    """Waiting calls get slots in arrival order, without polling in between."""
+    dispatcher = LLMDispatcher(max_concurrency=1)
+    order = []
+
+    async def call(i):
+        order.append(i)
+        await asyncio.sleep(0.01)
+        return i
+
+    async def main():
+        tasks = []
+        for i in range(6):
+            tasks.append(asyncio.create_task(dispatcher.run_async(call, i)))
+            await asyncio.sleep(0)  # queue them in a known order
+        return await asyncio.gather(*tasks)
+
+    assert asyncio.run(main()) == list(range(6))
+    assert order == list(range(6))
+
+
+def test_cancelled_waiter_does_not_leak_its_slot():
+    dispatcher = LLMDispatcher(max_concurrency=1)
+
+    async def hold():
+        await asyncio.sleep(0.05)
+        return "held"
+
+    async def main():
+        holder = asyncio.create_task(dispatcher.run_async(hold))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(dispatcher.run_async(hold))
+        await asyncio.sleep(0.01)
+        waiter.cancel()
+        await holder
+        # Slot is free again for the next call
+        return await asyncio.wait_for(dispatcher.run_async(lambda: "next"), timeout=1)
+
+    assert asyncio.run(main()) == "next"
+
+
+def test_metrics_since_reports_only_the_new_span():
+    dispatcher = LLMDispatcher()
+    dispatcher.run(lambda: 1)
+    before = dispatcher.metrics()
+    dispatcher.run(lambda: 2)
+    dispatcher.run(lambda: 3)
+
+    delta = dispatcher.metrics_since(before)
+    assert delta['calls'] == 2
+    assert delta['retries'] == 0
+    assert delta['queue_wait_avg'] >= 0
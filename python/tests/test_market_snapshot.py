@@ -0,0 +1,148 @@
+"""Tests for the coalesced market snapshot cache."""
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from trading_bot.config import settings_v2
+from trading_bot.core.market_snapshot import MarketSnapshotCache, SingleFlightCache
+
+
+def _tickers(*symbols):
+    return {"retCode": 0, "result": {"list": [
+        {"symbol": s, "lastPrice": "100", "bid1Price": "99.5", "ask1Price": "100.5"} for s in symbols
+    ]}}
+
+
+class FakeAPIManager:
+    def __init__(self, symbols=("BTCUSDT", "ETHUSDT"), delay=0.0):
+        self.symbols = symbols
+        self.delay = delay
+        self.calls = []
+        self.session = self
+
+    def get_tickers(self, **kwargs):
+        self.calls.append(("tickers", kwargs))
+        time.sleep(self.delay)
+        if "symbol" in kwargs:
+            return _tickers(kwargs["symbol"])
+        return _tickers(*self.symbols)
+
+    def get_long_short_ratio(self, **kwargs):
+        self.calls.append(("long_short_ratio", kwargs))
+        return {"retCode": 0, "result": {"list": [{"buyRatio": "0.6", "sellRatio": "0.4"}]}}
+
+    def get_kline(self, **kwargs):
+        self.calls.append(("kline", kwargs))
+        return {"retCode": 10001, "retMsg": "params error"}
+
+    def get_server_time(self):
+        self.calls.append(("server_time", {}))
+        return {"retCode": 0, "result": {"timeSecond": str(int(time.time()) + 3600)}}
+
+    def count(self, name):
+        return sum(1 for call, _ in self.calls if call == name)
+
+
+def test_one_tickers_call_serves_every_symbol():
+    api = FakeAPIManager()
+    snapshot = MarketSnapshotCache(api)
+
+    assert snapshot.ticker("BTCUSDT")["lastPrice"] == "100"
+    assert snapshot.ticker("ETHUSDT.P")["symbol"] == "ETHUSDT"
+    assert api.calls == [("tickers", {"category": "linear"})]
+
+
+def test_symbols_missing_from_snapshot_fall_back_to_single_fetch():
+    api = FakeAPIManager(symbols=("BTCUSDT",))
+    snapshot = MarketSnapshotCache(api)
+
+    assert snapshot.ticker("NEWUSDT")["symbol"] == "NEWUSDT"
+    assert api.calls[-1] == ("tickers", {"category": "linear", "symbol": "NEWUSDT"})
+
+
+def test_concurrent_misses_are_coalesced():
+    api = FakeAPIManager(delay=0.1)
+    snapshot = MarketSnapshotCache(api)
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        results = list(pool.map(lambda _: snapshot.ticker("BTCUSDT"), range(8)))
+
+    assert all(r["symbol"] == "BTCUSDT" for r in results)
+    assert api.count("tickers") == 1
+
+
+def test_ttl_expiry_and_failures_are_not_cached():
+    now = [0.0]
+    cache = SingleFlightCache(clock=lambda: now[0])
+    loads = []
+
+    def loader():
+        loads.append(1)
+        return len(loads)
+
+    assert cache.get("k", 5, loader) == 1
+    now[0] = 4.9
+    assert cache.get("k", 5, loader) == 1
+    now[0] = 5.1
+    assert cache.get("k", 5, loader) == 2
+
+    assert cache.get("bad", 5, loader, cacheable=lambda v: False) == 3
+    assert cache.get("bad", 5, loader, cacheable=lambda v: False) == 4
+
+
+def test_loader_errors_reach_every_waiter():
+    cache = SingleFlightCache()
+    started = threading.Event()
+
+    def failing():
+        started.set()
+        time.sleep(0.05)
+        raise RuntimeError("boom")
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        leader = pool.submit(cache.get, "k", 5, failing)
+        started.wait(1)
+        follower = pool.submit(cache.get, "k", 5, failing)
+        for future in (leader, follower):
+            with pytest.raises(RuntimeError):
+                future.result()
+
+
+def test_long_short_ratio_ttl_follows_timeframe():
+    api = FakeAPIManager()
+    snapshot = MarketSnapshotCache(api, ls_ratio_max_ttl=900)
+
+    snapshot.long_short_ratio("BTCUSDT", "1h")
+    snapshot.long_short_ratio("BTCUSDT", "1h")
+    snapshot.long_short_ratio("BTCUSDT", "4h")
+
+    assert api.count("long_short_ratio") == 2
+    assert snapshot._ls_ratio_ttl("1m") == 60
+    assert snapshot._ls_ratio_ttl("1d") == 900
+
+
+def test_error_responses_are_refetched_and_server_clock_is_reused():
+    api = FakeAPIManager()
+    snapshot = MarketSnapshotCache(api)
+
+    snapshot.recent_klines("BTCUSDT", "60")
+    snapshot.recent_klines("BTCUSDT", "60")
+    assert api.count("kline") == 2
+
+    first, second = snapshot.server_time_ms(), snapshot.server_time_ms()
+    assert api.count("server_time") == 1
+    assert abs(first - (time.time() + 3600) * 1000) < 5000
+    assert second >= first
+
+
+def test_from_config_uses_market_data_ttls(monkeypatch):
+    settings = settings_v2.StaticConfig(market_data=settings_v2.MarketDataConfig(ticker_ttl=0, ls_ratio_max_ttl=60))
+    monkeypatch.setattr(settings_v2, '_static_config', settings)
+
+    snapshot = MarketSnapshotCache.from_config(object())
+    assert snapshot.ticker_ttl == 0
+    assert snapshot.ls_ratio_max_ttl == 60
+    assert snapshot.server_time_ttl == 300
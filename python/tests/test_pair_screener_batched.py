@@ -0,0 +1,79 @@
+"""
+Tests for the batched (matrix-prefiltered) PairScreener path.
+"""
+
+import numpy as np
+import pandas as pd
+from statsmodels.tsa.stattools import adfuller
+
+from trading_bot.strategies.pair_screener import PairScreener, batched_adf_tstat
+
+
+def _make_universe(n_symbols=40, n_candles=300, seed=3):
+    rng = np.random.default_rng(seed)
+    factors = np.cumsum(rng.normal(0, 1, (n_candles, 4)), axis=0)
+    timestamps = np.arange(n_candles) * 3_600_000
+    symbol_candles = {}
+    for k in range(n_symbols):
+        loading = rng.uniform(0.5, 2.0) if k % 2 == 0 else 0.0
+        closes = (
+            300
+            + factors[:, k % 4] * loading
+            + rng.normal(0, rng.uniform(0.5, 4.0), n_candles)
+            + np.cumsum(rng.normal(0, 1, n_candles)) * rng.uniform(0, 1.5)
+        )
+        symbol_candles[f"SYM{k}USDT"] = [
+            {"timestamp": int(ts), "close": float(c), "volume": 1e6}
+            for ts, c in zip(timestamps, closes)
+        ]
+    return symbol_candles
+
+
+def test_batched_matches_serial():
+    """Batched mode returns exactly the serial loop's rows and order."""
+    symbol_candles = _make_universe()
+    screener = PairScreener(lookback_days=120, min_data_points=100)
+
+    serial = screener.screen_pairs(symbol_candles, batched=False)
+    batched = screener.screen_pairs(symbol_candles, batched=True)
+
+    assert not serial.empty
+    pd.testing.assert_frame_equal(serial, batched)
+
+
+def test_prefilter_drops_pairs():
+    """The matrix prefilter discards most pairs before per-pair checks."""
+    symbol_candles = _make_universe()
+    screener = PairScreener(lookback_days=120, min_data_points=100)
+    symbols, prices = screener.build_price_matrix(symbol_candles)
+
+    total = len(symbols) * (len(symbols) - 1) // 2
+    candidates = screener.prefilter_pairs(prices)
+    assert 0 < len(candidates) < total
+    assert candidates == sorted(candidates)
+
+
+def test_batched_adf_tstat_tracks_statsmodels():
+    """Closed-form DF statistics agree with adfuller's fixed-lag regressions."""
+    rng = np.random.default_rng(0)
+    series = np.column_stack([
+        np.cumsum(rng.normal(size=200)),
+        rng.normal(size=200),
+    ])
+    t_stat = batched_adf_tstat(series)
+
+    for k in range(series.shape[1]):
+        lag0 = adfuller(series[:, k], maxlag=0, autolag=None, regression='c')[0]
+        lag1 = adfuller(series[:, k], maxlag=1, autolag=None, regression='c')[0]
+        assert np.isclose(t_stat[k], min(lag0, lag1))
+
+
+def test_process_pool_matches_serial():
+    """Shared-memory process pool returns the serial rows in serial order."""
+    symbol_candles = _make_universe(n_symbols=20)
+    screener = PairScreener(lookback_days=120, min_data_points=100, parallel_min_pairs=1)
+
+    serial = screener.screen_pairs(symbol_candles)
+    parallel = screener.screen_pairs(symbol_candles, batched=True, workers=2)
+
+    pd.testing.assert_frame_equal(serial, parallel)
@@ -0,0 +1,221 @@
+"""Tests for assistant-run completion (event stream and adaptive polling)."""
+
+import asyncio
+import http.server
+import json
+import threading
+import time
+
+import httpx
+import openai
+import pytest
+
+from trading_bot.core.llm_dispatcher import LLMDispatcher
+from trading_bot.core.simple_openai_handler import SimpleOpenAIAssistantHandler
+
+
+def _run(status, run_id="run_1"):
+    return {
+        "id": run_id, "object": "thread.run", "created_at": 0, "assistant_id": "asst_1",
+        "thread_id": "thread_1", "status": status, "instructions": "", "model": "gpt-4o",
+        "tools": [], "last_error": None, "required_action": None,
+    }
+
+
+def _message(text):
+    return {
+        "id": "msg_1", "object": "thread.message", "created_at": 0, "thread_id": "thread_1",
+        "role": "assistant", "status": "completed", "attachments": [], "metadata": {},
+        "content": [{"type": "text", "text": {"value": text, "annotations": []}}],
+    }
+
+
+def _sse(events):
+    body = "".join(f"event: {name}\ndata: {json.dumps(data)}\n\n" for name, data in events)
+    return body + "event: done\ndata: [DONE]\n\n"
+
+
+class FakeAssistants:
+    """Minimal assistants endpoints served through httpx.MockTransport."""
+
+    def __init__(self, statuses=("queued", "in_progress", "completed"), stream_events=None):
+        self.statuses = list(statuses)
+        self.stream_events = stream_events
+        self.calls = []
+
+    def __call__(self, request):
+        path = request.url.path
+        self.calls.append((request.method, path))
+        if request.method == "POST" and path.endswith("/threads/thread_1/runs"):
+            body = json.loads(request.content)
+            if body.get("stream"):
+                return httpx.Response(200, text=_sse(self.stream_events),
+                                      headers={"content-type": "text/event-stream"})
+            return httpx.Response(200, json=_run("queued"))
+        if request.method == "GET" and path.endswith("/runs/run_1"):
+            status = self.statuses.pop(0) if len(self.statuses) > 1 else self.statuses[0]
+            return httpx.Response(200, json=_run(status))
+        if request.method == "GET" and path.endswith("/threads/thread_1/messages"):
+            return httpx.Response(200, json={"object": "list", "data": [_message("polled answer")],
+                                             "first_id": "msg_1", "last_id": "msg_1", "has_more": False})
+        return httpx.Response(404, json={"error": {"message": f"unexpected {path}"}})
+
+    def count(self, method, suffix):
+        return sum(1 for m, p in self.calls if m == method and p.endswith(suffix))
+
+
+def _handler(server):
+    client = openai.OpenAI(api_key="test", base_url="http://fake/v1", max_retries=0,
+                           http_client=httpx.Client(transport=httpx.MockTransport(server)))
+    return SimpleOpenAIAssistantHandler(client)
+
+
+def test_stream_returns_on_completed_event_without_polling():
+    server = FakeAssistants(stream_events=[
+        ("thread.run.created", _run("queued")),
+        ("thread.run.in_progress", _run("in_progress")),
+        ("thread.message.completed", _message("streamed answer")),
+        ("thread.run.completed", _run("completed")),
+    ])
+    result = _handler(server).run_assistant_streaming("thread_1", "asst_1")
+
+    assert result == {"status": "completed", "response": "streamed answer", "run_id": "run_1"}
+    assert server.count("GET", "/runs/run_1") == 0
+    assert server.count("GET", "/messages") == 0
+
+
+def test_stream_reports_failed_run():
+    failed = dict(_run("failed"), last_error={"code": "server_error", "message": "boom"})
+    server = FakeAssistants(stream_events=[("thread.run.created", _run("queued")),
+                                           ("thread.run.failed", failed)])
+    result = _handler(server).run_assistant_streaming("thread_1", "asst_1")
+
+    assert result["status"] == "failed"
+    assert result["error"] == "boom"
+
+
+def test_stream_without_terminal_event_falls_back_to_polling():
+    server = FakeAssistants(statuses=("completed",),
+                            stream_events=[("thread.run.created", _run("queued"))])
+    result = _handler(server).run_assistant_streaming("thread_1", "asst_1", timeout=5)
+
+    assert result["status"] == "completed"
+    assert result["response"] == "polled answer"
+    assert server.count("GET", "/runs/run_1") == 1
+
+
+def test_adaptive_polling_backs_off(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("trading_bot.core.simple_openai_handler.time.sleep", sleeps.append)
+    server = FakeAssistants(statuses=("queued", "in_progress", "in_progress", "in_progress", "completed"))
+    result = _handler(server).wait_for_run_completion("thread_1", "run_1")
+
+    assert result["response"] == "polled answer"
+    assert sleeps == sorted(sleeps)
+    assert sleeps[0] < 1.0 and sleeps[-1] > sleeps[0]
+
+
+def test_fixed_poll_interval_is_respected(monkeypatch):
+    sleeps = []
+    monkeypatch.setattr("trading_bot.core.simple_openai_handler.time.sleep", sleeps.append)
+    server = FakeAssistants(statuses=("queued", "in_progress", "completed"))
+    _handler(server).wait_for_run_completion("thread_1", "run_1", poll_interval=1.0)
+
+    assert sleeps == [1.0, 1.0]
+
+
+class _LocalAssistantsHandler(http.server.BaseHTTPRequestHandler):
+    """Assistants endpoints over a real socket; runs stream as text/event-stream."""
+
+    def log_message(self, *args):
+        pass
+
+    def _json(self, body):
+        data = json.dumps(body).encode()
+        self.send_response(200)
+        self.send_header("content-type", "application/json")
+        self.send_header("content-length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def do_GET(self):
+        self.server.calls.append(("GET", self.path))
+        self._json({"id": "asst_1", "object": "assistant", "created_at": 0, "model": "gpt-4o",
+                    "tools": [], "metadata": {}})
+
+    def do_DELETE(self):
+        self.server.calls.append(("DELETE", self.path))
+        self._json({"id": self.path.rsplit("/", 1)[-1], "object": "deleted", "deleted": True})
+
+    def do_POST(self):
+        self.server.calls.append(("POST", self.path))
+        self.rfile.read(int(self.headers.get("content-length", 0)))
+        if self.path.endswith("/threads"):
+            return self._json({"id": "thread_1", "object": "thread", "created_at": 0, "metadata": {}})
+        if self.path.endswith("/files"):
+            return self._json({"id": "file_1", "object": "file", "bytes": 3, "created_at": 0,
+                               "filename": "chart.png", "purpose": "vision", "status": "processed"})
+        if self.path.endswith("/messages"):
+            return self._json(dict(_message("chart"), role="user"))
+        # runs: one SSE event per write, as the API delivers them
+        self.send_response(200)
+        self.send_header("content-type", "text/event-stream")
+        self.end_headers()
+        for name, data in self.server.stream_events:
+            self.wfile.write(f"event: {name}\ndata: {json.dumps(data)}\n\n".encode())
+            self.wfile.flush()
+            time.sleep(0.01)
+        self.wfile.write(b"event: done\ndata: [DONE]\n\n")
+
+
+@pytest.fixture
+def sse_server():
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _LocalAssistantsHandler)
+    server.calls = []
+    server.stream_events = [
+        ("thread.run.created", _run("queued")),
+        ("thread.run.in_progress", _run("in_progress")),
+        ("thread.message.completed", _message('{"recommendation": "buy", "confidence": 0.8, '
+                                              '"entry_price": 1.0, "stop_loss": 0.9, "take_profit": 1.2}')),
+        ("thread.run.completed", _run("completed")),
+    ]
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_async_autotrader_run_streams_over_real_sse(sse_server, tmp_path):
+    base_url = f"http://127.0.0.1:{sse_server.server_address[1]}/v1"
+    chart = tmp_path / "BTCUSDT_1h.png"
+    chart.write_bytes(b"png")
+    handler = SimpleOpenAIAssistantHandler(
+        openai.OpenAI(api_key="test", base_url=base_url, max_retries=0),
+        async_client=openai.AsyncOpenAI(api_key="test", base_url=base_url, max_retries=0),
+    )
+    dispatcher = LLMDispatcher()
+
+    result = asyncio.run(dispatcher.run_async(
+        handler.analyze_chart_for_autotrader_async,
+        message="analyze", agent_id="asst_1", image_path=str(chart), symbol="BTCUSDT",
+        run_blocking=dispatcher.run_blocking,
+    ))
+
+    assert result["recommendation"] == "buy"
+    assert result["assistant_model"] == "gpt-4o"
+    # Completed from the stream: no polling, thread and upload cleaned up
+    paths = [path for _, path in sse_server.calls]
+    assert not any("/runs/" in path for path in paths)
+    assert ("DELETE", "/v1/threads/thread_1") in sse_server.calls
+    assert ("DELETE", "/v1/files/file_1") in sse_server.calls
+    assert handler._threads_by_agent == {}
+
+
+def test_sync_stream_over_real_sse(sse_server):
+    base_url = f"http://127.0.0.1:{sse_server.server_address[1]}/v1"
+    handler = SimpleOpenAIAssistantHandler(openai.OpenAI(api_key="test", base_url=base_url, max_retries=0))
+
+    result = handler.run_assistant_streaming("thread_1", "asst_1")
+
+    assert result["status"] == "completed"
+    assert '"recommendation": "buy"' in result["response"]
@@ -0,0 +1,165 @@
+"""
+Tests for sharding the watchlist capture across several pages in ChartSourcer.
+
+Pages are in-memory stand-ins for Playwright pages (no browser needed): each
+"screenshot" renders the symbol the page was last navigated to.
+"""
+
+import asyncio
+import io
+from types import SimpleNamespace
+
+import pytest
+from PIL import Image
+
+import trading_bot.core.storage as storage
+from trading_bot.core.sourcer import ChartSourcer
+
+SYMBOLS = ["BTCUSDT", "ETHUSDT", "SOLUSDT", "XRPUSDT", "ADAUSDT", "DOGEUSDT", "LINKUSDT"]
+_real_sleep = asyncio.sleep
+
+
+class FakePage:
+    url = "https://www.tradingview.com/chart/"
+
+    def __init__(self, name):
+        self.name = name
+        self.symbol = None
+        self.captured = []
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+    async def goto(self, url, timeout=None):
+        pass
+
+    async def wait_for_load_state(self, state=None):
+        pass
+
+    async def screenshot(self, path=None):
+        if path is not None:  # debug screenshot
+            return b""
+        self.captured.append(self.symbol)
+        img = Image.new("RGB", (32, 16), (sum(map(ord, self.symbol)) % 256, 40, 90))
+        buf = io.BytesIO()
+        img.save(buf, format="PNG")
+        return buf.getvalue()
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record requested sleeps, but only yield briefly."""
+    requested = []
+
+    async def fast_sleep(delay, *args, **kwargs):
+        requested.append(delay)
+        await _real_sleep(0.001)
+
+    monkeypatch.setattr(asyncio, "sleep", fast_sleep)
+    return requested
+
+
+def _sourcer(tmp_path, monkeypatch, existing=(), max_requests_per_minute=6000):
+    config = SimpleNamespace(
+        paths=SimpleNamespace(charts=str(tmp_path / "charts")),
+        tradingview=SimpleNamespace(
+            enabled=False,
+            browser=SimpleNamespace(capture_pages=1),
+            screenshot=SimpleNamespace(enable_crop=False),
+            rate_limit=SimpleNamespace(respect_rate_limits=True, delay_between_requests=0.0,
+                                       max_requests_per_minute=max_requests_per_minute),
+        ),
+    )
+    sourcer = ChartSourcer(config)
+    sourcer.browser = sourcer.context = object()
+    sourcer.page = FakePage("primary")
+    sourcer.opened_pages = []
+    saved = {}
+
+    async def new_page():
+        page = FakePage(f"extra-{len(sourcer.opened_pages)}")
+        sourcer.opened_pages.append(page)
+        return page
+
+    async def get_watchlist_symbols(already_authenticated=False):
+        return list(SYMBOLS)
+
+    async def navigate_to_chart(symbol, timeframe):
+        sourcer.page.symbol = symbol
+        await _real_sleep(0.002 * (len(symbol) % 3))  # uneven load times
+        return symbol != "XRPUSDT"
+
+    async def wait_for_chart_load(changed_from=None):
+        await _real_sleep(0.001)
+
+    def save_chart(image_data, symbol, timeframe):
+        path = f"charts/{symbol}_{timeframe}.png"
+        saved[path] = image_data
+        return path
+
+    monkeypatch.setattr(sourcer, "_new_page", new_page)
+    monkeypatch.setattr(sourcer, "get_watchlist_symbols", get_watchlist_symbols)
+    monkeypatch.setattr(sourcer, "navigate_to_chart", navigate_to_chart)
+    monkeypatch.setattr(sourcer, "wait_for_chart_load", wait_for_chart_load)
+    monkeypatch.setattr(sourcer, "save_chart", save_chart)
+    monkeypatch.setattr(sourcer, "get_charts_for_current_boundary", lambda timeframe: {})
+    monkeypatch.setattr(sourcer, "_get_expected_chart_filename", lambda symbol, tf: f"{symbol}_{tf}.png")
+    monkeypatch.setattr(storage, "file_exists", lambda path: path in {f"charts/{s}_1h.png" for s in existing})
+    return sourcer, saved
+
+
+def _capture(sourcer, pages):
+    ready = []
+
+    async def on_chart_ready(symbol, path):
+        ready.append((symbol, path))
+
+    paths = asyncio.run(sourcer.capture_all_watchlist_screenshots(
+        output_dir=str(sourcer.data_dir / f"out-{pages}"), timeframe="1h",
+        on_chart_ready=on_chart_ready, pages=pages,
+    ))
+    return paths, ready
+
+
+def test_concurrent_capture_matches_serial(tmp_path, monkeypatch, sleeps):
+    serial, serial_saved = _sourcer(tmp_path / "serial", monkeypatch, existing=["SOLUSDT"])
+    serial_paths, serial_ready = _capture(serial, pages=1)
+
+    sharded, sharded_saved = _sourcer(tmp_path / "sharded", monkeypatch, existing=["SOLUSDT"])
+    sharded_paths, sharded_ready = _capture(sharded, pages=3)
+
+    assert list(sharded_paths.items()) == list(serial_paths.items())
+    assert "XRPUSDT" not in sharded_paths and sharded_paths["SOLUSDT"] == "charts/SOLUSDT_1h.png"
+    assert sharded_saved == serial_saved
+    assert sharded.chart_hashes == serial.chart_hashes
+    assert sorted(sharded_ready) == sorted(serial_ready)
+
+    # Work was spread over every page, each page screenshotting its own symbol
+    workers = [sharded._page] + sharded.opened_pages
+    assert len(workers) == 3 and all(page.captured for page in workers)
+    assert sorted(s for page in workers for s in page.captured) == sorted(set(SYMBOLS) - {"SOLUSDT", "XRPUSDT"})
+    assert all(page.closed for page in sharded.opened_pages) and not sharded._page.closed
+    assert sharded.page is sharded._page
+
+
+def test_concurrent_capture_shares_rate_limit_bucket(tmp_path, monkeypatch, sleeps):
+    # 60/min -> one request per second after an initial burst of one per page
+    sourcer, _ = _sourcer(tmp_path, monkeypatch, max_requests_per_minute=60)
+    paths, _ = _capture(sourcer, pages=2)
+
+    assert len(paths) == len(SYMBOLS) - 1
+    bucket_waits = sorted(d for d in sleeps if 0.5 < d < 2.9)
+    # 7 navigations, 2 free -> waits of ~1..5s, the last ones above the filter window
+    assert bucket_waits[:2] == [pytest.approx(1.0, abs=0.2), pytest.approx(2.0, abs=0.2)]
+
+
+def test_pages_are_capped_by_watchlist_size(tmp_path, monkeypatch, sleeps):
+    sourcer, _ = _sourcer(tmp_path, monkeypatch)
+    paths, _ = _capture(sourcer, pages=50)
+
+    assert len(paths) == len(SYMBOLS) - 1
+    assert len(sourcer.opened_pages) == len(SYMBOLS) - 1
@@ -0,0 +1,137 @@
+"""Tests for reusing a warm browser session across trading cycles."""
+
+import asyncio
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from trading_bot.core.sourcer import ChartSourcer
+
+
+class FakePage:
+    def __init__(self):
+        self.closed = False
+
+    def is_closed(self):
+        return self.closed
+
+    async def close(self):
+        self.closed = True
+
+
+class FakeSourcer:
+    """ChartSourcer with the browser lifecycle replaced by in-memory stand-ins."""
+
+    def __init__(self, tmp_path, monkeypatch, persistent=True, max_age=240):
+        config = SimpleNamespace(
+            paths=SimpleNamespace(charts=str(tmp_path / "charts")),
+            tradingview=SimpleNamespace(
+                enabled=False,
+                browser=SimpleNamespace(persistent=persistent, max_session_age_minutes=max_age),
+                screenshot=None,
+                rate_limit=None,
+            ),
+        )
+        self.sourcer = sourcer = ChartSourcer(config)
+        self.launches = 0
+        self.healthy = True
+        self.responsive = True
+        self.resources_ok = True
+
+        async def setup_browser_session():
+            self.launches += 1
+            sourcer.browser = sourcer.context = object()
+            sourcer.page = FakePage()
+            sourcer._browser_started_at = time.monotonic()
+            return True
+
+        async def cleanup_browser_session():
+            sourcer.browser = sourcer.context = sourcer.page = None
+            sourcer._browser_started_at = None
+
+        async def new_page():
+            return FakePage()
+
+        async def healthy():
+            return self.healthy
+
+        async def responsive():
+            return self.responsive
+
+        async def resources_ok():
+            return self.resources_ok
+
+        monkeypatch.setattr(sourcer, "setup_browser_session", setup_browser_session)
+        monkeypatch.setattr(sourcer, "cleanup_browser_session", cleanup_browser_session)
+        monkeypatch.setattr(sourcer, "_new_page", new_page)
+        monkeypatch.setattr(sourcer, "_check_browser_connection_health", healthy)
+        monkeypatch.setattr(sourcer, "_check_page_responsiveness", responsive)
+        monkeypatch.setattr(sourcer, "_check_system_resources", resources_ok)
+
+    def cycle(self):
+        async def run():
+            assert await self.sourcer.acquire_browser_session()
+            await self.sourcer.release_browser_session()
+        asyncio.run(run())
+
+
+@pytest.fixture
+def fake(tmp_path, monkeypatch):
+    return FakeSourcer(tmp_path, monkeypatch)
+
+
+def test_without_persistence_every_cycle_launches(tmp_path, monkeypatch):
+    fake = FakeSourcer(tmp_path, monkeypatch, persistent=False)
+    fake.cycle()
+    fake.cycle()
+
+    assert fake.launches == 2
+    assert fake.sourcer.browser is None
+
+
+def test_healthy_browser_is_reused(fake):
+    fake.cycle()
+    page = fake.sourcer.page
+    fake.cycle()
+
+    assert fake.launches == 1
+    assert fake.sourcer.page is page
+
+
+def test_unhealthy_connection_restarts(fake):
+    fake.cycle()
+    fake.healthy = False
+    fake.cycle()
+
+    assert fake.launches == 2
+
+
+def test_closed_page_restarts(fake):
+    fake.cycle()
+    fake.sourcer.page.closed = True
+    fake.cycle()
+
+    assert fake.launches == 2
+
+
+def test_unresponsive_page_is_replaced_in_same_context(fake):
+    fake.cycle()
+    stale, context = fake.sourcer.page, fake.sourcer.context
+    fake.responsive = False
+    fake.cycle()
+
+    assert fake.launches == 1
+    assert stale.closed and fake.sourcer.page is not stale
+    assert fake.sourcer.context is context
+
+
+def test_age_and_resource_budgets_recycle(fake):
+    fake.cycle()
+    fake.sourcer._browser_started_at -= 241 * 60
+    fake.cycle()
+    assert fake.launches == 2
+
+    fake.resources_ok = False
+    fake.cycle()
+    assert fake.launches == 3
@@ -0,0 +1,80 @@
+"""
+Tests for the incremental rolling-OLS engine in CointegrationStrategy.
+"""
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from trading_bot.strategies.spread_trading_cointegrated import (
+    CointegrationStrategy,
+    RollingSpreadStats,
+)
+
+
+def _make_pair(n=300, seed=7, level=100.0):
+    rng = np.random.default_rng(seed)
+    x = level + np.cumsum(rng.normal(0, 0.5, n))
+    y = 0.8 * x + rng.normal(0, 2, n)
+    return pd.DataFrame({"close_1": x, "close_2": y})
+
+
+def _brute_force(x, y):
+    cov = np.cov(x, y, ddof=0)
+    beta = cov[0, 1] / cov[0, 0]
+    spread = y - beta * x
+    return beta, spread.mean(), spread.std(), (spread[-1] - spread.mean()) / spread.std()
+
+
+@pytest.mark.parametrize("level", [1.0, 100.0, 60000.0])
+def test_rolling_stats_match_full_window_fit(level):
+    """Running sums reproduce a fresh OLS fit for every window."""
+    df = _make_pair(level=level)
+    x, y = df["close_1"].values, df["close_2"].values
+    window = 121
+    stats = RollingSpreadStats(window)
+
+    for i in range(len(x)):
+        stats.push(x[i], y[i])
+        if i < window - 1:
+            continue
+        expected = _brute_force(x[i - window + 1:i + 1], y[i - window + 1:i + 1])
+        np.testing.assert_allclose(stats.spread_stats(), expected, rtol=1e-6, atol=1e-8)
+
+
+def test_generate_signals_matches_windowed_reference():
+    """Every-bar stride reproduces the per-window slice computation."""
+    df = _make_pair()
+    strategy = CointegrationStrategy(lookback=120, adf_stride=1)
+    signals = strategy.generate_signals(df)
+
+    reference = CointegrationStrategy(lookback=120)
+    for i in (120, 200, len(df) - 1):
+        p1 = df["close_1"].values[i - 120:i + 1]
+        p2 = df["close_2"].values[i - 120:i + 1]
+        beta = reference._compute_beta(p1, p2)
+        spread = p2 - beta * p1
+        z = (spread[-1] - spread.mean()) / spread.std()
+        assert signals["z_score"].iloc[i] == pytest.approx(z, rel=1e-6)
+        assert signals["is_mean_reverting"].iloc[i] == reference._is_mean_reverting(spread)
+
+    assert signals["z_score"].iloc[:120].isna().all()
+
+
+def test_adf_stride_always_tests_last_bar():
+    """Sparse strides still evaluate the regime on the final bar."""
+    df = _make_pair()
+    dense = CointegrationStrategy(lookback=120, adf_stride=1).generate_signals(df)
+
+    for stride in (0, 7):
+        sparse = CointegrationStrategy(lookback=120, adf_stride=stride).generate_signals(df)
+        pd.testing.assert_series_equal(sparse["z_score"], dense["z_score"])
+        assert sparse["is_mean_reverting"].iloc[-1] == dense["is_mean_reverting"].iloc[-1]
+
+
+def test_generate_signals_short_series():
+    """Series no longer than the lookback yield no z-scores."""
+    df = _make_pair(n=50)
+    signals = CointegrationStrategy(lookback=120).generate_signals(df)
+    assert signals["z_score"].isna().all()
+    assert (signals["signal"] == 0).all()
@@ -0,0 +1,94 @@
+"""
+Tests for the YAML-only StaticConfig used by process-wide components.
+"""
+
+import pytest
+
+from trading_bot.config.settings_v2 import (
+    AnalysisCacheConfig,
+    AssistantConfig,
+    ChartsConfig,
+    ConfigurationError,
+    DatabaseConfig,
+    ErrorLogConfig,
+    IndicatorsConfig,
+    LLMDispatcherConfig,
+    MarketDataConfig,
+    StaticConfig,
+    StrategiesConfig,
+)
+
+
+def _write(tmp_path, text):
+    path = tmp_path / "config.yaml"
+    path.write_text(text)
+    return str(path)
+
+
+def test_missing_file_gives_defaults(tmp_path):
+    config = StaticConfig.load(str(tmp_path / "absent.yaml"))
+    assert config.database == DatabaseConfig()
+    assert config.error_log == ErrorLogConfig()
+    assert config.llm_dispatcher == LLMDispatcherConfig()
+    assert config.assistant == AssistantConfig()
+    assert config.analysis_cache == AnalysisCacheConfig()
+    assert config.charts == ChartsConfig()
+    assert config.market_data == MarketDataConfig()
+    assert config.indicators == IndicatorsConfig()
+    assert config.strategies == StrategiesConfig()
+
+
+def test_yaml_overrides_database_section(tmp_path):
+    config = StaticConfig.load(_write(tmp_path, """
+database:
+  sqlite:
+    pool_size: 0
+  candle_cache:
+    enabled: false
+    dir: /tmp/candles
+  placeholder_cache_size: 64
+"""))
+    assert config.database.candle_cache_enabled is False
+    assert config.database.candle_cache_dir == "/tmp/candles"
+    assert config.database.placeholder_cache_size == 64
+    assert config.database.sqlite_pool_size == 0
+    assert config.database.sqlite_cached_statements == DatabaseConfig.sqlite_cached_statements
+
+
+def test_error_log_nested_under_logging(tmp_path):
+    config = StaticConfig.load(_write(tmp_path, """
+logging:
+  style: compact
+  error_log:
+    batch_size: 10
+"""))
+    assert config.error_log.batch_size == 10
+    assert config.error_log.queue_size == ErrorLogConfig.queue_size
+
+
+def test_null_rate_limits_mean_unlimited(tmp_path):
+    config = StaticConfig.load(_write(tmp_path, """
+openai:
+  dispatcher:
+    max_concurrency: 4
+    requests_per_minute: null
+    tokens_per_minute: 90000
+"""))
+    assert config.llm_dispatcher.max_concurrency == 4
+    assert config.llm_dispatcher.requests_per_minute is None
+    assert config.llm_dispatcher.tokens_per_minute == 90000
+
+
+def test_chart_llm_encoding_is_configurable(tmp_path):
+    config = StaticConfig.load(_write(tmp_path, """
+charts:
+  llm_format: WEBP
+  llm_quality: 70
+  llm_max_width: 1280
+"""))
+    assert (config.charts.llm_format, config.charts.llm_quality, config.charts.llm_max_width) == ("webp", 70, 1280)
+
+
+def test_unknown_chart_llm_format_is_rejected(tmp_path):
+    with pytest.raises(ConfigurationError, match="charts.llm_format"):
+        StaticConfig.load(_write(tmp_path, "charts:\n  llm_format: gif\n"))
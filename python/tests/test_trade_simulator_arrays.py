@@ -0,0 +1,93 @@
+"""Array-backed TradeSimulator path must reproduce the dict-walking results."""
+
+import random
+
+import pytest
+
+from prompt_performance.core.trade_simulator import TradeSimulator
+
+
+def _random_candles(n, seed, start_ms=1_700_000_000_000, step_ms=3_600_000):
+    rng = random.Random(seed)
+    price = 100.0
+    candles = []
+    for i in range(n):
+        o = price
+        c = o * (1 + rng.uniform(-0.02, 0.02))
+        h = max(o, c) * (1 + rng.uniform(0, 0.01))
+        l = min(o, c) * (1 - rng.uniform(0, 0.01))
+        candles.append({
+            'start_time': start_ms + i * step_ms,
+            'open_price': o, 'high_price': h, 'low_price': l, 'close_price': c,
+        })
+        price = c
+    return candles
+
+
+def _random_records(candles, count, seed):
+    rng = random.Random(seed)
+    records = []
+    for _ in range(count):
+        anchor = rng.choice(candles)
+        entry = anchor['close_price'] * (1 + rng.uniform(-0.01, 0.01))
+        risk = entry * rng.uniform(0.005, 0.03)
+        reward = risk * rng.uniform(0.5, 3.0)
+        side = rng.choice(['buy', 'sell'])
+        sign = 1 if side == 'buy' else -1
+        records.append({
+            'recommendation': side.upper(),
+            'entry_price': entry,
+            'stop_loss': entry - sign * risk,
+            'take_profit': entry + sign * reward,
+            # Off-grid timestamps exercise the closest-candle lookup
+            'timestamp': anchor['start_time'] + rng.randint(-2_000_000, 2_000_000),
+        })
+    return records
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_array_path_matches_dict_path(seed):
+    sim = TradeSimulator()
+    candles = _random_candles(300, seed)
+    records = _random_records(candles, 60, seed)
+    arrays = sim.candles_to_arrays(candles)
+
+    for record in records:
+        assert sim.simulate_trade_arrays(record, arrays) == sim.simulate_trade(record, candles)
+
+
+def test_timestamp_variants_and_ties():
+    sim = TradeSimulator()
+    # start_time in seconds and duplicated timestamps
+    candles = [
+        {'start_time': 1000, 'high_price': 10.0, 'low_price': 9.0, 'close_price': 9.5},
+        {'start_time': 1000, 'high_price': 11.0, 'low_price': 9.5, 'close_price': 10.5},
+        {'start_time': 1060, 'high_price': 10.8, 'low_price': 10.2, 'close_price': 10.4},
+        {'start_time': 1120, 'high_price': 12.0, 'low_price': 10.0, 'close_price': 11.0},
+    ]
+    arrays = sim.candles_to_arrays(candles)
+    base = {'recommendation': 'buy', 'entry_price': 10.0, 'stop_loss': 8.0, 'take_profit': 13.0}
+    for ts in (None, 1030, 1_030_000, 1090, '1970-01-01T00:17:10+00:00', 'not a date'):
+        record = dict(base, timestamp=ts)
+        assert sim.simulate_trade_arrays(record, arrays) == sim.simulate_trade(record, candles)
+
+
+def test_empty_and_invalid_inputs():
+    sim = TradeSimulator()
+    record = {'recommendation': 'hold', 'entry_price': 1.0, 'stop_loss': 0.5, 'take_profit': 2.0}
+    assert sim.simulate_trade_arrays(record, sim.candles_to_arrays([])) == sim.simulate_trade(record, [])
+    candles = _random_candles(5, 0)
+    assert sim.simulate_trade_arrays(record, sim.candles_to_arrays(candles)) == sim.simulate_trade(record, candles)
+
+
+def test_accepts_cached_candle_arrays():
+    from trading_bot.db.candle_cache import CandleArrays, _records_from_candles
+
+    sim = TradeSimulator()
+    candles = _random_candles(200, 7)
+    records = _random_records(candles, 20, 7)
+    cached = CandleArrays.from_records(_records_from_candles(candles))
+
+    from_cache = sim.candles_to_arrays(cached)
+    for record in records:
+        assert sim.simulate_trade_arrays(record, from_cache) == sim.simulate_trade(record, candles)
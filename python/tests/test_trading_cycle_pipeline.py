@@ -0,0 +1,165 @@
+"""
+Tests for the streaming capture -> analysis pipeline in TradingCycle.
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+from trading_bot.core.utils import get_current_cycle_boundary
+from trading_bot.db import client
+from trading_bot.engine.trading_cycle import TradingCycle
+
+
+class _FakeSourcer:
+    """Emits charts one by one, recording when each capture happened."""
+
+    def __init__(self, symbols, events):
+        self.symbols = symbols
+        self.events = events
+
+    async def capture_all_watchlist_screenshots(self, target_chart=None, timeframe=None, on_chart_ready=None):
+        paths = {}
+        for symbol in self.symbols:
+            await asyncio.sleep(0.01)
+            paths[symbol] = f"charts/{symbol}.png"
+            self.events.append(("captured", symbol))
+            if on_chart_ready:
+                await on_chart_ready(symbol, paths[symbol])
+        self.events.append(("capture_done", None))
+        return paths
+
+    def get_chart_hash(self, chart_path):
+        return f"hash-{chart_path}"
+
+
+def _cycle(symbols, existing=(), similar=()):
+    events = []
+    cycle = TradingCycle.__new__(TradingCycle)
+    cycle.timeframe = "1h"
+    cycle.sourcer = _FakeSourcer(symbols, events)
+
+    def existing_recs(syms):
+        return {s: ({"id": f"rec-{s}", "recommendation": "BUY"} if s in existing else {}) for s in syms}
+
+    def find_similar(symbol, chart_hash):
+        return {"id": f"old-{symbol}", "chart_hash_distance": 2} if symbol in similar else None
+
+    def reuse(symbol, chart_path, cycle_id, chart_hash, rec):
+        events.append(("reused", symbol))
+        return {"symbol": symbol, "chart_hash": chart_hash, "reused_from": rec["id"], "recommendation": "HOLD"}
+
+    async def analyze(symbol, chart_path, cycle_id, chart_hash=None):
+        events.append(("analysis_started", symbol))
+        await asyncio.sleep(0.001)
+        return {"symbol": symbol, "chart_path": chart_path, "recommendation": "HOLD"}
+
+    cycle._get_existing_recommendations_for_boundary = existing_recs
+    cycle._analyze_chart_async = analyze
+    cycle._find_similar_recommendation = find_similar
+    cycle._reuse_similar_recommendation = reuse
+    return cycle, events
+
+
+def test_analysis_starts_before_capture_finishes():
+    cycle, events = _cycle(["AAA", "BBB", "CCC", "DDD"])
+
+    chart_paths, existing, analyzed, _ = asyncio.run(cycle._capture_and_analyze_pipelined(None, "cyc"))
+
+    assert list(chart_paths) == ["AAA", "BBB", "CCC", "DDD"]
+    assert [a["symbol"] for a in analyzed] == ["AAA", "BBB", "CCC", "DDD"]
+    assert events.index(("analysis_started", "AAA")) < events.index(("capture_done", None))
+
+
+def test_existing_recommendations_are_not_reanalyzed():
+    cycle, events = _cycle(["AAA", "BBB"], existing={"BBB"})
+
+    _, existing, analyzed, _ = asyncio.run(cycle._capture_and_analyze_pipelined(None, "cyc"))
+
+    assert [a["symbol"] for a in analyzed] == ["AAA"]
+    assert existing["BBB"]["id"] == "rec-BBB"
+    assert existing["AAA"] == {}
+    assert ("analysis_started", "BBB") not in events
+
+
+def test_analysis_errors_become_error_results():
+    cycle, _ = _cycle(["AAA"])
+
+    async def boom(symbol, chart_path, cycle_id, chart_hash=None):
+        raise RuntimeError("llm down")
+
+    cycle._analyze_chart_async = boom
+    _, _, analyzed, _ = asyncio.run(cycle._capture_and_analyze_pipelined(None, "cyc"))
+
+    assert analyzed == [{"symbol": "AAA", "error": "llm down", "chart_path": "charts/AAA.png"}]
+
+
+def test_near_duplicate_charts_reuse_recommendation():
+    cycle, events = _cycle(["AAA", "BBB"], similar={"BBB"})
+
+    _, existing, analyzed, _ = asyncio.run(cycle._capture_and_analyze_pipelined(None, "cyc"))
+
+    assert [a["symbol"] for a in analyzed] == ["AAA", "BBB"]
+    assert analyzed[1]["reused_from"] == "old-BBB"
+    assert analyzed[1]["chart_hash"] == "hash-charts/BBB.png"
+    assert ("analysis_started", "BBB") not in events
+    assert ("reused", "BBB") in events
+
+
+@pytest.fixture
+def boundary_db(tmp_path, monkeypatch):
+    """Runs/cycles/recommendations at the current 1h boundary for two instances."""
+    monkeypatch.setattr(client, 'DB_TYPE', 'sqlite')
+    monkeypatch.setattr(client, 'DB_PATH', tmp_path / "trading.db")
+    boundary = get_current_cycle_boundary("1h").isoformat()
+    conn = client.get_connection()
+    conn.executescript("""
+        CREATE TABLE runs (id TEXT PRIMARY KEY, instance_id TEXT);
+        CREATE TABLE cycles (id TEXT PRIMARY KEY, run_id TEXT, boundary_time TEXT);
+        CREATE TABLE recommendations (
+            id TEXT PRIMARY KEY, cycle_id TEXT, symbol TEXT, timeframe TEXT,
+            recommendation TEXT, confidence REAL, chart_hash TEXT, prompt_name TEXT,
+            model_name TEXT, raw_response TEXT, cycle_boundary TEXT, created_at TEXT
+        );
+        INSERT INTO runs VALUES ('run-a', 'inst-a'), ('run-b', 'inst-b');
+        INSERT INTO cycles VALUES ('cyc-a', 'run-a', NULL), ('cyc-b', 'run-b', NULL);
+    """)
+    conn.commit()
+
+    def add(rec_id, cycle_id, chart_hash, model="gpt-4o", prompt="v1"):
+        client.execute(conn, """
+            INSERT INTO recommendations VALUES (?, ?, 'BTCUSDT', '1h', 'LONG', 0.8, ?, ?, ?, NULL, ?, ?)
+        """, (rec_id, cycle_id, chart_hash, prompt, model, boundary, rec_id))
+
+    yield add
+    client.release_connection(conn)
+    client.close_pooled_connections()
+
+
+def _instance_cycle(instance_id, model="gpt-4o"):
+    cycle = TradingCycle.__new__(TradingCycle)
+    cycle.timeframe = "1h"
+    cycle.instance_id = instance_id
+    cycle.config = SimpleNamespace(openai=SimpleNamespace(assistant_id=None, model=model))
+    cycle._prompt_version_name = "v1"
+    return cycle
+
+
+def test_similar_chart_reused_from_another_instance_with_same_prompt_and_model(boundary_db):
+    chart_hash = "00" * 32
+    boundary_db("rec-b", "cyc-b", "01" + "00" * 31)  # 1 bit away
+
+    similar = _instance_cycle("inst-a")._find_similar_recommendation("BTCUSDT", chart_hash)
+
+    assert similar["id"] == "rec-b"
+    assert similar["chart_hash_distance"] == 1
+    # Another model's analysis of the same chart is never adopted
+    assert _instance_cycle("inst-a", model="o3")._find_similar_recommendation("BTCUSDT", chart_hash) is None
+
+
+def test_similar_chart_lookup_skips_own_instance_and_distant_charts(boundary_db):
+    boundary_db("rec-a", "cyc-a", "00" * 32)
+    boundary_db("rec-b", "cyc-b", "ff" * 32)
+
+    assert _instance_cycle("inst-a")._find_similar_recommendation("BTCUSDT", "00" * 32) is None
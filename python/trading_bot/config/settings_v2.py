@@ -10,6 +10,7 @@ import os
 import json
 import yaml
 import logging
+import threading
 from pathlib import Path
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass, field
@@ -31,7 +32,7 @@ class ConfigurationError(Exception):
 
 # Path to config.yaml (relative to this file or working directory)
 # Using centralized path manager to eliminate hardcoded paths
-from trading_bot.core.path_manager import get_config_yaml_path
+from trading_bot.core.path_manager import get_config_yaml_path, get_path_manager
 CONFIG_YAML_PATH = get_config_yaml_path()
 
 
@@ -154,6 +155,10 @@ class TradingViewBrowserConfig:
     use_vnc: bool = False
     vnc_display: str = ":99"
     vnc_window_size: str = "1920,1080"
+    capture_pages: int = 1  # Pages (tabs) capturing the watchlist concurrently
+    adaptive_waits: bool = True  # Readiness signals instead of fixed sleeps (sleeps become caps)
+    persistent: bool = False  # Keep the browser warm between cycles (health-checked reuse)
+    max_session_age_minutes: int = 240  # Recycle a persistent browser after this long
     user_agent: str = "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"
 
 
@@ -164,6 +169,7 @@ class TradingViewScreenshotConfig:
     wait_for_load: int = 5000
     quality: int = 90
     hide_elements: list = None  # Elements to hide before screenshot
+    crop_via_clip: bool = True  # Crop with Playwright's clip instead of re-encoding with PIL
 
     def __post_init__(self):
         if self.hide_elements is None:
@@ -214,6 +220,86 @@ class TradingViewConfig:
             self.retry = TradingViewRetryConfig()
 
 
+@dataclass
+class DatabaseConfig:
+    """Local database and cache settings (YAML only)."""
+    candle_cache_enabled: bool = True  # Memory-mapped columnar candle cache in front of klines_store
+    candle_cache_dir: str = "data/candle_cache"  # Relative to the project root
+    sqlite_pool_size: int = 4  # Idle SQLite connections kept per thread; 0 disables pooling
+    sqlite_mmap_size: int = 256 * 1024 * 1024  # PRAGMA mmap_size (bytes)
+    sqlite_cache_size_kb: int = 64 * 1024  # PRAGMA cache_size (KiB per connection)
+    sqlite_cached_statements: int = 256  # Prepared statements sqlite3 keeps per connection
+    placeholder_cache_size: int = 1024  # Distinct SQL texts whose PostgreSQL placeholder translation is memoized
+
+
+@dataclass
+class ErrorLogConfig:
+    """Database error log writer settings (YAML only)."""
+    queue_size: int = 1000  # Records buffered for the writer thread; more are dropped
+    batch_size: int = 100  # Rows per multi-row insert
+    flush_interval: float = 1.0  # Seconds the writer waits to fill a batch
+
+
+@dataclass
+class LLMDispatcherConfig:
+    """Process-wide LLM dispatcher limits (YAML only)."""
+    max_concurrency: int = 16  # Max in-flight calls
+    requests_per_minute: Optional[float] = None  # Request bucket until headers resync it (None: unlimited)
+    tokens_per_minute: Optional[float] = None  # Token bucket until headers resync it (None: unlimited)
+    tokens_per_call: int = 3000  # Token estimate charged per call
+    max_retries: int = 5  # Re-queues after a rate-limited call
+
+
+@dataclass
+class AssistantConfig:
+    """Assistant API run handling (YAML only)."""
+    stream_runs: bool = True  # Stream run events instead of polling runs.retrieve
+
+
+@dataclass
+class AnalysisCacheConfig:
+    """Content-addressed chart analysis cache (YAML only)."""
+    enabled: bool = True  # Reuse analyses of identical image bytes / prompt / model
+    size: int = 1024  # Entries kept in the in-memory LRU
+
+
+@dataclass
+class ChartsConfig:
+    """Chart image handling shared by live cycles and backtests (YAML only)."""
+    hash_max_distance: int = 8  # dHash bits (of 256) within which a chart reuses an analysis; -1 disables
+    async_writes: bool = True  # Write captured charts to storage on a background thread
+    memory_images: int = 64  # Charts kept in memory between capture and LLM upload
+    llm_format: str = "png"  # Upload encoding: png (stored chart as-is), webp or jpeg
+    llm_quality: int = 85  # WebP/JPEG quality for the upload
+    llm_max_width: int = 0  # Downscale wider charts for the upload (0: keep size)
+
+
+@dataclass
+class MarketDataConfig:
+    """Bybit public market data client (YAML only)."""
+    ip_limit_per_5s: int = 500  # Requests per 5 s window for the whole process (Bybit allows 600 per IP)
+    max_connections: int = 50  # Pooled connections
+    timeout: float = 10.0  # Request timeout in seconds
+    ticker_ttl: float = 5.0  # Seconds a tickers snapshot is served (0: per-symbol calls)
+    kline_ttl: float = 5.0  # Seconds recent candles are served
+    ls_ratio_max_ttl: float = 900.0  # Cap on the per-timeframe long/short ratio TTL
+    server_time_ttl: float = 300.0  # Seconds between server clock resyncs
+
+
+@dataclass
+class IndicatorsConfig:
+    """Shared indicator engine (YAML only)."""
+    cache_enabled: bool = True  # Memoize indicators across strategies and advisor nodes
+    cache_size: int = 256  # (symbol, timeframe) series kept
+
+
+@dataclass
+class StrategiesConfig:
+    """Process-wide strategy execution settings (YAML only)."""
+    cointegration_pair_workers: Optional[int] = None  # Threads evaluating pairs (None: min(8, CPU count))
+    symbol_universe_ttl: int = 24 * 3600  # Seconds the Bybit symbol list is memoized
+
+
 @dataclass
 class ConfigV2:
     """Main configuration class for V2 trading bot."""
@@ -260,13 +346,8 @@ class ConfigV2:
         if not instance_id:
             raise ConfigurationError("instance_id is required. Global config table is deprecated.")
 
-        yaml_path = Path(config_yaml_path) if config_yaml_path else CONFIG_YAML_PATH
-
         # Load YAML for static settings
-        yaml_data = {}
-        if yaml_path.exists():
-            with open(yaml_path, 'r') as f:
-                yaml_data = yaml.safe_load(f) or {}
+        yaml_data = _read_yaml(config_yaml_path)
 
         # Load database config from instance settings
         db_config = cls._load_instance_config(instance_id)
@@ -518,12 +599,17 @@ class ConfigV2:
                 viewport_width=browser_data.get('viewport_width', 1600),
                 viewport_height=browser_data.get('viewport_height', 900),
                 use_vnc=browser_data.get('use_vnc', False),
+                capture_pages=browser_data.get('capture_pages', 1),
+                adaptive_waits=browser_data.get('adaptive_waits', True),
+                persistent=browser_data.get('persistent', False),
+                max_session_age_minutes=browser_data.get('max_session_age_minutes', 240),
                 user_agent=browser_data.get('user_agent', "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/131.0.0.0 Safari/537.36"),
             ) if browser_data else TradingViewBrowserConfig(),
             screenshot=TradingViewScreenshotConfig(
                 chart_selector=screenshot_data.get('chart_selector', '.chart-container'),
                 wait_for_load=screenshot_data.get('wait_for_load', 5000),
                 quality=screenshot_data.get('quality', 90),
+                crop_via_clip=screenshot_data.get('crop_via_clip', True),
             ) if screenshot_data else TradingViewScreenshotConfig(),
             rate_limit=TradingViewRateLimitConfig(
                 respect_rate_limits=rate_limit_data.get('respect_rate_limits', True),
@@ -540,6 +626,182 @@ class ConfigV2:
         )
 
 
+def _read_yaml(config_yaml_path: Optional[str] = None) -> Dict[str, Any]:
+    """Parsed config.yaml ({} when the file is missing)."""
+    yaml_path = Path(config_yaml_path) if config_yaml_path else CONFIG_YAML_PATH
+    if not yaml_path.exists():
+        return {}
+    with open(yaml_path, 'r') as f:
+        return yaml.safe_load(f) or {}
+
+
+@dataclass
+class StaticConfig:
+    """
+    YAML-only settings for process-wide components (connection pools, caches,
+    executors) that are created once per process, before or without an
+    instance's ConfigV2.
+    """
+    database: DatabaseConfig = field(default_factory=DatabaseConfig)
+    error_log: ErrorLogConfig = field(default_factory=ErrorLogConfig)
+    llm_dispatcher: LLMDispatcherConfig = field(default_factory=LLMDispatcherConfig)
+    assistant: AssistantConfig = field(default_factory=AssistantConfig)
+    analysis_cache: AnalysisCacheConfig = field(default_factory=AnalysisCacheConfig)
+    charts: ChartsConfig = field(default_factory=ChartsConfig)
+    market_data: MarketDataConfig = field(default_factory=MarketDataConfig)
+    indicators: IndicatorsConfig = field(default_factory=IndicatorsConfig)
+    strategies: StrategiesConfig = field(default_factory=StrategiesConfig)
+
+    @classmethod
+    def load(cls, config_yaml_path: Optional[str] = None) -> 'StaticConfig':
+        """Load the static sections from YAML; missing keys keep their defaults."""
+        yaml_data = _read_yaml(config_yaml_path)
+        return cls(
+            database=cls._load_database(yaml_data),
+            error_log=cls._load_error_log(yaml_data),
+            llm_dispatcher=cls._load_llm_dispatcher(yaml_data),
+            assistant=cls._load_assistant(yaml_data),
+            analysis_cache=cls._load_analysis_cache(yaml_data),
+            charts=cls._load_charts(yaml_data),
+            market_data=cls._load_market_data(yaml_data),
+            indicators=cls._load_indicators(yaml_data),
+            strategies=cls._load_strategies(yaml_data),
+        )
+
+    @staticmethod
+    def _load_database(yaml_data: dict) -> DatabaseConfig:
+        """Load database settings from YAML."""
+        db = yaml_data.get('database') or {}
+        candle_cache = db.get('candle_cache') or {}
+        sqlite = db.get('sqlite') or {}
+        return DatabaseConfig(
+            candle_cache_enabled=candle_cache.get('enabled', True),
+            candle_cache_dir=candle_cache.get('dir', 'data/candle_cache'),
+            sqlite_pool_size=sqlite.get('pool_size', 4),
+            sqlite_mmap_size=sqlite.get('mmap_size', 256 * 1024 * 1024),
+            sqlite_cache_size_kb=sqlite.get('cache_size_kb', 64 * 1024),
+            sqlite_cached_statements=sqlite.get('cached_statements', 256),
+            placeholder_cache_size=db.get('placeholder_cache_size', 1024),
+        )
+
+
+    @staticmethod
+    def _load_error_log(yaml_data: dict) -> ErrorLogConfig:
+        """Load error log writer settings from YAML (logging.error_log)."""
+        el = (yaml_data.get('logging') or {}).get('error_log') or {}
+        return ErrorLogConfig(
+            queue_size=el.get('queue_size', 1000),
+            batch_size=el.get('batch_size', 100),
+            flush_interval=el.get('flush_interval', 1.0),
+        )
+
+
+    @staticmethod
+    def _load_llm_dispatcher(yaml_data: dict) -> LLMDispatcherConfig:
+        """Load LLM dispatcher limits from YAML (openai.dispatcher)."""
+        d = (yaml_data.get('openai') or {}).get('dispatcher') or {}
+        return LLMDispatcherConfig(
+            max_concurrency=d.get('max_concurrency', 16),
+            requests_per_minute=d.get('requests_per_minute'),
+            tokens_per_minute=d.get('tokens_per_minute'),
+            tokens_per_call=d.get('tokens_per_call', 3000),
+            max_retries=d.get('max_retries', 5),
+        )
+
+
+    @staticmethod
+    def _load_assistant(yaml_data: dict) -> AssistantConfig:
+        """Load Assistant run settings from YAML (openai.assistant)."""
+        a = (yaml_data.get('openai') or {}).get('assistant') or {}
+        return AssistantConfig(
+            stream_runs=a.get('stream_runs', True),
+        )
+
+
+    @staticmethod
+    def _load_analysis_cache(yaml_data: dict) -> AnalysisCacheConfig:
+        """Load analysis cache settings from YAML (openai.analysis_cache)."""
+        ac = (yaml_data.get('openai') or {}).get('analysis_cache') or {}
+        return AnalysisCacheConfig(
+            enabled=ac.get('enabled', True),
+            size=ac.get('size', 1024),
+        )
+
+
+    @staticmethod
+    def _load_charts(yaml_data: dict) -> ChartsConfig:
+        """Load chart image settings from YAML."""
+        charts = yaml_data.get('charts') or {}
+        llm_format = str(charts.get('llm_format', 'png')).lower()
+        if llm_format not in ('png', 'webp', 'jpeg', 'jpg'):
+            raise ConfigurationError(f"Invalid charts.llm_format: {llm_format}. Use png, webp or jpeg.")
+        return ChartsConfig(
+            hash_max_distance=charts.get('hash_max_distance', 8),
+            async_writes=charts.get('async_writes', True),
+            memory_images=charts.get('memory_images', 64),
+            llm_format=llm_format,
+            llm_quality=charts.get('llm_quality', 85),
+            llm_max_width=charts.get('llm_max_width', 0),
+        )
+
+
+    @staticmethod
+    def _load_market_data(yaml_data: dict) -> MarketDataConfig:
+        """Load market data client settings from YAML (bybit.market_data)."""
+        md = (yaml_data.get('bybit') or {}).get('market_data') or {}
+        return MarketDataConfig(
+            ip_limit_per_5s=md.get('ip_limit_per_5s', 500),
+            max_connections=md.get('max_connections', 50),
+            timeout=md.get('timeout', 10.0),
+            ticker_ttl=md.get('ticker_ttl', 5.0),
+            kline_ttl=md.get('kline_ttl', 5.0),
+            ls_ratio_max_ttl=md.get('ls_ratio_max_ttl', 900.0),
+            server_time_ttl=md.get('server_time_ttl', 300.0),
+        )
+
+
+    @staticmethod
+    def _load_indicators(yaml_data: dict) -> IndicatorsConfig:
+        """Load indicator engine settings from YAML."""
+        ind = yaml_data.get('indicators') or {}
+        return IndicatorsConfig(
+            cache_enabled=ind.get('cache_enabled', True),
+            cache_size=ind.get('cache_size', 256),
+        )
+
+
+    @staticmethod
+    def _load_strategies(yaml_data: dict) -> StrategiesConfig:
+        """Load strategy execution settings from YAML."""
+        st = yaml_data.get('strategies') or {}
+        return StrategiesConfig(
+            cointegration_pair_workers=st.get('cointegration_pair_workers'),
+            symbol_universe_ttl=st.get('symbol_universe_ttl', 24 * 3600),
+        )
+
+
+_static_config: Optional[StaticConfig] = None
+_static_config_lock = threading.Lock()
+
+
+def get_static_config() -> StaticConfig:
+    """Process-wide StaticConfig, read from config.yaml on first use."""
+    global _static_config
+    if _static_config is None:
+        with _static_config_lock:
+            if _static_config is None:
+                _static_config = StaticConfig.load()
+    return _static_config
+
+
+def resolve_project_path(path: str) -> Path:
+    """A config.yaml path, resolved against the project root when relative."""
+    resolved = Path(path)
+    if not resolved.is_absolute():
+        resolved = get_path_manager().prototype_root / resolved
+    return resolved
+
+
 # Convenience function
 def load_config(config_yaml_path: Optional[str] = None, instance_id: Optional[str] = None) -> ConfigV2:
     """Load configuration from database and YAML.
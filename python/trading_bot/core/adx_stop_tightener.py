@@ -1,6 +1,7 @@
+import numpy as np
 import pandas as pd
 import logging
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple
 from trading_bot.core.common_types import PositionInfo  # Import PositionInfo for type hinting
 from trading_bot.core.utils import get_server_synchronized_timestamp  # Import directly from utils
 
@@ -22,96 +23,124 @@ def calculate_directional_movement(high, low, prev_high, prev_low):
     else:
         return 0, 0
 
-def calculate_adx_components(candles, period=14):
+# --- Vectorized ADX/ATR kernel ---
+# Wilder smoothing x[k] = a*x[k-1] + v[k]/period is evaluated in closed form
+# per block: x[k] = a**k * (x[0] + sum(a**-j * v[j]) / period). Blocks are
+# sized so a**-block stays below e**_RMA_BLOCK_GROWTH, which keeps the scaled
+# cumulative sum well inside float64 precision.
+_RMA_BLOCK_GROWTH = 9.0
+
+
+def _wilder_continue(seed: np.ndarray, values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder smoothing of `values` (last axis) continuing from `seed`."""
+    out = np.empty_like(values)
+    a = (period - 1) / period
+    if a == 0:
+        out[...] = values
+        return out
+    block = max(1, int(_RMA_BLOCK_GROWTH / -np.log(a)))
+    state = seed
+    for start in range(0, values.shape[-1], block):
+        chunk = values[..., start:start + block]
+        decay = a ** np.arange(1, chunk.shape[-1] + 1)
+        out[..., start:start + chunk.shape[-1]] = decay * (
+            state[..., None] + np.cumsum(chunk / decay, axis=-1) / period
+        )
+        state = out[..., start + chunk.shape[-1] - 1]
+    return out
+
+
+def _wilder_rma(values: np.ndarray, period: int, first: int) -> np.ndarray:
     """
-    Calculates ADX, +DI, and -DI components.
-    Assumes candles is a list of dicts or DataFrame with 'high', 'low', 'close'.
+    Wilder's moving average along the last axis, NaN during warm-up.
+
+    Seeded with the mean of values[first:first + period], placed at index
+    first + period - 1 (the classic Wilder initialisation).
+    """
+    out = np.full(values.shape, np.nan)
+    seed_at = first + period - 1
+    if values.shape[-1] <= seed_at:
+        return out
+    seed = values[..., first:seed_at + 1].mean(axis=-1)
+    out[..., seed_at] = seed
+    out[..., seed_at + 1:] = _wilder_continue(seed, values[..., seed_at + 1:], period)
+    return out
+
+
+def adx_atr_arrays(high, low, close, adx_period: int = 14,
+                   atr_period: Optional[int] = None) -> Dict[str, np.ndarray]:
+    """
+    ADX, +DI, -DI and ATR for one series (shape (n,)) or a batch of equally
+    long series (shape (m, n)), oldest bar first.
+
+    Returns a dict of arrays with the input's shape: 'adx', 'plus_di',
+    'minus_di' and 'atr'. Bars inside the warm-up window are NaN (ADX needs
+    2 * adx_period bars, ATR needs atr_period + 1).
     """
+    high = np.asarray(high, dtype=float)
+    low = np.asarray(low, dtype=float)
+    close = np.asarray(close, dtype=float)
+    atr_period = atr_period or adx_period
+
+    # True range and directional movement (bar 0 has no previous bar)
+    tr = np.zeros_like(high)
+    plus_dm = np.zeros_like(high)
+    minus_dm = np.zeros_like(high)
+    prev_close = close[..., :-1]
+    tr[..., 1:] = np.maximum(
+        high[..., 1:] - low[..., 1:],
+        np.maximum(np.abs(high[..., 1:] - prev_close), np.abs(low[..., 1:] - prev_close)),
+    )
+    up = high[..., 1:] - high[..., :-1]
+    down = low[..., :-1] - low[..., 1:]
+    plus_dm[..., 1:] = np.where((up > down) & (up > 0), up, 0.0)
+    minus_dm[..., 1:] = np.where((down > up) & (down > 0), down, 0.0)
+
+    # Smoothed TR / DM -> DI -> DX -> ADX
+    atr_adx = _wilder_rma(tr, adx_period, first=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        plus_di = np.where(atr_adx != 0, _wilder_rma(plus_dm, adx_period, first=1) / atr_adx * 100, 0.0)
+        minus_di = np.where(atr_adx != 0, _wilder_rma(minus_dm, adx_period, first=1) / atr_adx * 100, 0.0)
+        di_sum = plus_di + minus_di
+        dx = np.where(di_sum != 0, np.abs(plus_di - minus_di) / di_sum * 100, 0.0)
+    warm = np.isnan(atr_adx)
+    plus_di[warm] = np.nan
+    minus_di[warm] = np.nan
+    adx = _wilder_rma(dx, adx_period, first=adx_period)
+
+    atr = atr_adx if atr_period == adx_period else _wilder_rma(tr, atr_period, first=1)
+    return {'adx': adx, 'plus_di': plus_di, 'minus_di': minus_di, 'atr': atr}
+
+
+def _ohlc_arrays(candles):
+    """high/low/close float arrays from a list of candle dicts or a DataFrame."""
     if isinstance(candles, list):
         df = pd.DataFrame(candles)
     elif isinstance(candles, pd.DataFrame):
-        df = candles.copy()
+        df = candles.sort_index()
     else:
         raise ValueError("Candles must be a list of dicts or a pandas DataFrame")
+    if df.empty:
+        return np.empty(0), np.empty(0), np.empty(0)
+    return tuple(pd.to_numeric(df[col]).to_numpy(dtype=float) for col in ('high', 'low', 'close'))
 
-    if len(df) < period * 2: # Need enough data for initial ATR and subsequent ADX
-        logging.warning(f"Insufficient data ({len(df)}) for ADX calculation (needs at least {period * 2}).")
-        return None, None, None
 
-    df = df.sort_index()
-    
-    # Ensure numeric types
-    df['high'] = pd.to_numeric(df['high'])
-    df['low'] = pd.to_numeric(df['low'])
-    df['close'] = pd.to_numeric(df['close'])
-
-    tr_list = [0.0] * len(df)
-    plus_dm_list = [0.0] * len(df)
-    minus_dm_list = [0.0] * len(df)
-
-    for i in range(1, len(df)):
-        tr_list[i] = calculate_true_range(df['high'].iloc[i], df['low'].iloc[i], df['close'].iloc[i-1])
-        plus_dm, minus_dm = calculate_directional_movement(
-            df['high'].iloc[i], df['low'].iloc[i],
-            df['high'].iloc[i-1], df['low'].iloc[i-1]
-        )
-        plus_dm_list[i] = plus_dm
-        minus_dm_list[i] = minus_dm
-
-    # Calculate Smoothed True Range (ATR-like smoothing)
-    atr_initial = sum(tr_list[1:period+1]) / period
-    atr_values = [0.0] * len(df)
-    atr_values[period] = atr_initial
-    for i in range(period + 1, len(df)):
-        atr_values[i] = (atr_values[i-1] * (period - 1) + tr_list[i]) / period
-
-    # Calculate Smoothed +DM and -DM
-    plus_dm_initial = sum(plus_dm_list[1:period+1]) / period
-    minus_dm_initial = sum(minus_dm_list[1:period+1]) / period
-
-    plus_dm_smoothed = [0.0] * len(df)
-    minus_dm_smoothed = [0.0] * len(df)
-    plus_dm_smoothed[period] = plus_dm_initial
-    minus_dm_smoothed[period] = minus_dm_initial
-
-    for i in range(period + 1, len(df)):
-        plus_dm_smoothed[i] = (plus_dm_smoothed[i-1] * (period - 1) + plus_dm_list[i]) / period
-        minus_dm_smoothed[i] = (minus_dm_smoothed[i-1] * (period - 1) + minus_dm_list[i]) / period
-
-    # Calculate +DI and -DI
-    plus_di = [0.0] * len(df)
-    minus_di = [0.0] * len(df)
-
-    for i in range(period, len(df)):
-        if atr_values[i] != 0:
-            plus_di[i] = (plus_dm_smoothed[i] / atr_values[i]) * 100
-            minus_di[i] = (minus_dm_smoothed[i] / atr_values[i]) * 100
-        else:
-            plus_di[i] = 0
-            minus_di[i] = 0
-
-    # Calculate DX
-    dx = [0.0] * len(df)
-    for i in range(period, len(df)):
-        di_sum = plus_di[i] + minus_di[i]
-        if di_sum != 0:
-            dx[i] = (abs(plus_di[i] - minus_di[i]) / di_sum) * 100
-        else:
-            dx[i] = 0
+def _latest(values: np.ndarray) -> Optional[float]:
+    return None if values.size == 0 or np.isnan(values[-1]) else float(values[-1])
 
-    # Calculate ADX (smoothed DX)
-    adx_values = [0.0] * len(df)
-    # ADX calculation needs to start after 2*period, so ensure enough data
-    if len(dx) < period * 2:
-        return None, None, None # Not enough data for ADX
-    
-    adx_initial = sum(dx[period:period*2]) / period # Initial ADX is SMA of DX
-    adx_values[period*2 -1] = adx_initial # ADX starts after 2*period
 
-    for i in range(period*2, len(df)):
-        adx_values[i] = (adx_values[i-1] * (period - 1) + dx[i]) / period
+def calculate_adx_components(candles, period=14):
+    """
+    Calculates ADX, +DI, and -DI components.
+    Assumes candles is a list of dicts or DataFrame with 'high', 'low', 'close'.
+    """
+    high, low, close = _ohlc_arrays(candles)
+    if len(close) < period * 2: # Need enough data for initial ATR and subsequent ADX
+        logging.warning(f"Insufficient data ({len(close)}) for ADX calculation (needs at least {period * 2}).")
+        return None, None, None
 
-    return adx_values[-1], plus_di[-1], minus_di[-1] # Return latest values
+    result = adx_atr_arrays(high, low, close, adx_period=period)
+    return _latest(result['adx']), _latest(result['plus_di']), _latest(result['minus_di']) # Return latest values
 
 def determine_trend_direction_strength(adx, di_plus, di_minus, adx_threshold=25):
     """
@@ -143,38 +172,12 @@ def calculate_atr(candles, period=14):
     Returns:
         float or None: The latest ATR value, or None if insufficient data.
     """
-    if isinstance(candles, list):
-        df = pd.DataFrame(candles)
-    elif isinstance(candles, pd.DataFrame):
-        df = candles.copy()
-    else:
-        raise ValueError("Candles must be a list of dicts or a pandas DataFrame")
-
-    if len(df) < period + 1:
-        logging.warning(f"Insufficient data ({len(df)}) for ATR calculation (needs {period + 1}).")
+    high, low, close = _ohlc_arrays(candles)
+    if len(close) < period + 1:
+        logging.warning(f"Insufficient data ({len(close)}) for ATR calculation (needs {period + 1}).")
         return None
 
-    df = df.sort_index()
-    
-    # Ensure numeric types
-    df['high'] = pd.to_numeric(df['high'])
-    df['low'] = pd.to_numeric(df['low'])
-    df['close'] = pd.to_numeric(df['close'])
-
-    tr_list = [0.0] * len(df)
-
-    for i in range(1, len(df)):
-        tr_list[i] = calculate_true_range(df['high'].iloc[i], df['low'].iloc[i], df['close'].iloc[i-1])
-
-    # Simple Moving Average for initial ATR
-    atr_list = [0.0] * len(df)
-    atr_list[period] = sum(tr_list[1:period+1]) / period
-
-    # Wilder's Smoothing for subsequent ATR values
-    for i in range(period + 1, len(df)):
-        atr_list[i] = (atr_list[i-1] * (period - 1) + tr_list[i]) / period
-
-    return atr_list[-1] # Return the latest ATR
+    return _latest(adx_atr_arrays(high, low, close, adx_period=period)['atr']) # Return the latest ATR
 
 class ADXStopTightener:
     """
@@ -250,6 +253,34 @@ class ADXStopTightener:
         total_pnl = sum(pos.unrealized_pnl for pos in open_positions)
         return total_pnl
 
+    def _calculate_indicators(
+        self, candle_sets: List[List[Dict[str, Any]]]
+    ) -> List[Tuple[Optional[float], Optional[float], Optional[float], Optional[float]]]:
+        """
+        Latest (ATR, ADX, +DI, -DI) per candle set.
+
+        Sets of equal length are stacked and computed in a single kernel call.
+        """
+        results: List[Tuple[Optional[float], ...]] = [(None, None, None, None)] * len(candle_sets)
+        by_length: Dict[int, List[int]] = {}
+        for idx, candles in enumerate(candle_sets):
+            by_length.setdefault(len(candles), []).append(idx)
+
+        for indices in by_length.values():
+            ohlc = np.array(
+                [[(c['high'], c['low'], c['close']) for c in candle_sets[idx]] for idx in indices],
+                dtype=float,
+            )
+            arrays = adx_atr_arrays(ohlc[..., 0], ohlc[..., 1], ohlc[..., 2],
+                                    adx_period=self.adx_period, atr_period=self.atr_period)
+            latest = {name: values[:, -1] for name, values in arrays.items()}
+            for row, idx in enumerate(indices):
+                results[idx] = tuple(
+                    None if np.isnan(latest[name][row]) else float(latest[name][row])
+                    for name in ('atr', 'adx', 'plus_di', 'minus_di')
+                )
+        return results
+
     async def check_and_tighten_adx_stop(self, open_positions: List[PositionInfo]) -> List[Dict[str, Any]]:
         """
         Checks if total PnL has reached target_profit.
@@ -278,17 +309,15 @@ class ADXStopTightener:
         if total_pnl >= self.target_profit_usd:
             self.logger.info(f"ADX Tightener: Target profit ${self.target_profit_usd:.2f} reached (Current PnL: ${total_pnl:.2f}). Tightening stops...")
 
-            # 3. Iterate through Open Positions
+            # 3. Collect candles for every position that has a stop and a price
+            candidates = []
             for position in open_positions:
                 symbol = position.symbol
-                side = position.side.lower()
-                current_price = position.current_price
-                current_stop = position.current_stop_loss
-                
-                if current_stop is None:
+
+                if position.current_stop_loss is None:
                     self.logger.debug(f"  ADX Tightener: No stop loss set for position {symbol}. Skipping.")
                     continue
-                if current_price is None:
+                if position.current_price is None:
                     self.logger.warning(f"  ADX Tightener: Current price missing for {symbol}. Skipping.")
                     continue
 
@@ -300,16 +329,24 @@ class ADXStopTightener:
                 if not candles or len(candles) < max(self.adx_period * 2, self.atr_period) + 1:
                     self.logger.warning(f"  ADX Tightener: Insufficient candle data for {symbol}. Skipping.")
                     continue
+                candidates.append((position, candles))
+
+            # 4. ATR/ADX for all positions in one batched kernel call
+            indicators = self._calculate_indicators([candles for _, candles in candidates])
+
+            for (position, _), (atr_value, adx, di_plus, di_minus) in zip(candidates, indicators):
+                symbol = position.symbol
+                side = position.side.lower()
+                current_price = position.current_price
+                current_stop = position.current_stop_loss
 
                 # 5. Calculate Volatility (ATR)
-                atr_value = calculate_atr(candles, period=self.atr_period)
                 if atr_value is None or atr_value <= 0:
                     self.logger.warning(f"  ADX Tightener: Could not calculate ATR for {symbol}. Skipping.")
                     continue
                 self.logger.debug(f"  ADX Tightener: {symbol}: ATR = {atr_value:.2f}")
 
                 # 6. Determine Market Trend (using ADX)
-                adx, di_plus, di_minus = calculate_adx_components(candles, period=self.adx_period)
                 if adx is None or di_plus is None or di_minus is None:
                     self.logger.warning(f"  ADX Tightener: Could not calculate ADX components for {symbol}. Skipping.")
                     continue
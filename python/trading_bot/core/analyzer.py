@@ -1,10 +1,11 @@
 """Chart analysis module using OpenAI Vision API and Assistant API."""
+import asyncio
 import base64
 import io
 import json
 import logging
 import re
-from typing import Dict, Any, Optional, Callable
+from typing import Any, Awaitable, Callable, Dict, Optional, Tuple
 
 from PIL import Image
 
@@ -14,8 +15,11 @@ from .timeframe_extractor import TimeframeExtractor
 from .timestamp_extractor import TimestampExtractor
 from .timestamp_validator import TimestampValidator
 from .bybit_api_manager import BybitAPIManager
+from .chart_images import get_chart_image_pipeline
+from .market_snapshot import MarketSnapshotCache
 from .utils import smart_format_price, normalize_symbol_for_bybit
 from ..config.settings_v2 import ConfigV2
+from ..db.analysis_cache import AnalysisCacheKey, get_analysis_cache, make_analysis_key
 # Use the dynamic prompt registry for looking up prompts by name
 from .prompts.prompt_registry import get_prompt_function as get_prompt_by_name
 
@@ -24,7 +28,7 @@ from .prompts.prompt_registry import get_prompt_function as get_prompt_by_name
 class ChartAnalyzer:
     """Analyzes chart images using OpenAI's Vision API and Assistant API."""
 
-    def __init__(self, openai_client, config: ConfigV2, skip_boundary_validation: bool = False, api_manager: Optional[BybitAPIManager] = None, logger: Optional[logging.Logger] = None):
+    def __init__(self, openai_client, config: ConfigV2, skip_boundary_validation: bool = False, api_manager: Optional[BybitAPIManager] = None, logger: Optional[logging.Logger] = None, async_openai_client=None):
         self.client = openai_client
         self.config = config
         self.skip_boundary_validation = skip_boundary_validation
@@ -36,10 +40,14 @@ class ChartAnalyzer:
         # Use provided logger or fallback to module logger
         self.logger = logger or logging.getLogger(__name__)
 
+        # Content-addressed analysis cache (None when disabled) and assistant_id -> model
+        self.analysis_cache = get_analysis_cache()
+        self._assistant_models: Dict[str, Optional[str]] = {}
+
         # Initialize Assistant handler if assistant is configured
         self.assistant_handler = None
         if hasattr(config, 'openai') and getattr(config.openai, 'assistant_id', None):
-            self.assistant_handler = SimpleOpenAIAssistantHandler(openai_client, config)
+            self.assistant_handler = SimpleOpenAIAssistantHandler(openai_client, config, async_client=async_openai_client)
 
         # Use provided API manager or create new one
         if api_manager:
@@ -55,12 +63,13 @@ class ChartAnalyzer:
                 self.bybit_api_manager = None
                 self.bybit_session = None
 
+        # Tickers, long/short ratio, recent candles and server clock shared across symbols
+        self.market_snapshot = MarketSnapshotCache.from_config(self.bybit_api_manager) if self.bybit_api_manager else None
+
     def encode_image(self, image_path: str) -> str:
         """Encode image to base64."""
-        from trading_bot.core.storage import read_file
-
-        # Read file from storage (supports both local and Supabase)
-        image_data = read_file(image_path)
+        # Freshly captured charts come from memory, others from storage (local or Supabase)
+        image_data = get_chart_image_pipeline().read(image_path)
         if image_data is None:
             raise FileNotFoundError(f"Image not found: {image_path}")
 
@@ -74,24 +83,16 @@ class ChartAnalyzer:
 
     def get_bid_ask_prices(self, symbol: str, category: str = "linear") -> Dict[str, Optional[float]]:
         """Get bid and ask prices for a symbol using tickers endpoint."""
-        if not self.bybit_api_manager:
+        if not self.market_snapshot:
             return {"bid": None, "ask": None, "mid": None}
 
         try:
-            normalized_symbol = normalize_symbol_for_bybit(symbol)
-            response = self.bybit_api_manager.get_tickers(
-                category=category,
-                symbol=normalized_symbol
-            )
-
-            if response and response.get("retCode") == 0:
-                ticker_list = response.get("result", {}).get("list", [])
-                if ticker_list:
-                    ticker = ticker_list[0]
-                    bid = float(ticker.get("bid1Price", 0))
-                    ask = float(ticker.get("ask1Price", 0))
-                    mid = (bid + ask) / 2 if bid > 0 and ask > 0 else None
-                    return {"bid": bid, "ask": ask, "mid": mid}
+            ticker = self.market_snapshot.ticker(symbol, category)
+            if ticker:
+                bid = float(ticker.get("bid1Price", 0))
+                ask = float(ticker.get("ask1Price", 0))
+                mid = (bid + ask) / 2 if bid > 0 and ask > 0 else None
+                return {"bid": bid, "ask": ask, "mid": mid}
         except Exception as e:
             print(f"Failed to get bid/ask prices: {e}")
 
@@ -115,54 +116,43 @@ class ChartAnalyzer:
             'symbol': symbol
         }
 
-        if not self.bybit_api_manager:
+        if not self.market_snapshot:
             print(f"⚠️ Bybit API manager not available - using placeholder market data")
             return market_data
 
         try:
             normalized_symbol = normalize_symbol_for_bybit(symbol)
 
-            # Get ticker data (includes price, 24h stats, etc.)
-            ticker_response = self.bybit_api_manager.get_tickers(
-                category=category,
-                symbol=normalized_symbol
-            )
-
-            if ticker_response and ticker_response.get("retCode") == 0:
-                ticker_list = ticker_response.get("result", {}).get("list", [])
-                if ticker_list:
-                    ticker = ticker_list[0]
-
-                    # Extract price data
-                    last_price = ticker.get("lastPrice", "N/A")
-                    market_data['last_price'] = float(last_price) if last_price != "N/A" else "N/A"
-
-                    # Extract 24h statistics
-                    price_change_pct = ticker.get("price24hPcnt", "N/A")
-                    if price_change_pct != "N/A":
-                        # Convert to percentage format (e.g., "0.0068" -> "+0.68%")
-                        pct_value = float(price_change_pct) * 100
-                        market_data['price_change_24h_percent'] = f"{'+' if pct_value >= 0 else ''}{pct_value:.2f}%"
-
-                    high_24h = ticker.get("highPrice24h", "N/A")
-                    market_data['high_24h'] = float(high_24h) if high_24h != "N/A" else "N/A"
-
-                    low_24h = ticker.get("lowPrice24h", "N/A")
-                    market_data['low_24h'] = float(low_24h) if low_24h != "N/A" else "N/A"
-
-                    # Funding rate is already in ticker for linear/inverse
-                    funding_rate = ticker.get("fundingRate", "N/A")
-                    if funding_rate != "N/A":
-                        # Convert to percentage format (e.g., "0.0001" -> "0.01%")
-                        fr_value = float(funding_rate) * 100
-                        market_data['funding_rate'] = f"{fr_value:.4f}%"
-
-            # Get long/short ratio (separate API call)
+            # Ticker data (price, 24h stats, funding) from the shared tickers snapshot
+            ticker = self.market_snapshot.ticker(normalized_symbol, category)
+            if ticker:
+                # Extract price data
+                last_price = ticker.get("lastPrice", "N/A")
+                market_data['last_price'] = float(last_price) if last_price != "N/A" else "N/A"
+
+                # Extract 24h statistics
+                price_change_pct = ticker.get("price24hPcnt", "N/A")
+                if price_change_pct != "N/A":
+                    # Convert to percentage format (e.g., "0.0068" -> "+0.68%")
+                    pct_value = float(price_change_pct) * 100
+                    market_data['price_change_24h_percent'] = f"{'+' if pct_value >= 0 else ''}{pct_value:.2f}%"
+
+                high_24h = ticker.get("highPrice24h", "N/A")
+                market_data['high_24h'] = float(high_24h) if high_24h != "N/A" else "N/A"
+
+                low_24h = ticker.get("lowPrice24h", "N/A")
+                market_data['low_24h'] = float(low_24h) if low_24h != "N/A" else "N/A"
+
+                # Funding rate is already in ticker for linear/inverse
+                funding_rate = ticker.get("fundingRate", "N/A")
+                if funding_rate != "N/A":
+                    # Convert to percentage format (e.g., "0.0001" -> "0.01%")
+                    fr_value = float(funding_rate) * 100
+                    market_data['funding_rate'] = f"{fr_value:.4f}%"
+
+            # Long/short ratio (separate endpoint, cached per timeframe)
             try:
-                ls_ratio_response = self.bybit_api_manager.get_long_short_ratio(
-                    symbol=normalized_symbol,
-                    timeframe=timeframe
-                )
+                ls_ratio_response = self.market_snapshot.long_short_ratio(normalized_symbol, timeframe, category)
 
                 if ls_ratio_response and ls_ratio_response.get("retCode") == 0:
                     ratio_list = ls_ratio_response.get("result", {}).get("list", [])
@@ -208,7 +198,7 @@ class ChartAnalyzer:
 
     def get_last_close_price(self, symbol: str, timeframe: str) -> Optional[float]:
         """Get the last close price for a given symbol and timeframe."""
-        if not self.bybit_api_manager:
+        if not self.market_snapshot:
             return None
 
         # Normalize the symbol for Bybit API
@@ -229,12 +219,7 @@ class ChartAnalyzer:
 
         try:
             # Fetch last 2 candles to ensure we get a completed one
-            response = self.bybit_api_manager.get_kline(
-                category="linear",
-                symbol=normalized_symbol, # Use normalized symbol here
-                interval=bybit_interval,
-                limit=2  # Get the last 2 candles
-            )
+            response = self.market_snapshot.recent_klines(normalized_symbol, bybit_interval, limit=2)
 
             if response and response.get("retCode") == 0 and response.get("result") and response["result"].get("list"):
                 candles = response["result"]["list"]
@@ -243,8 +228,8 @@ class ChartAnalyzer:
                     return None # No candles returned
 
                 # Get server time for comparison
-                from .utils import get_bybit_server_time, parse_timeframe_to_minutes
-                server_time_ms = get_bybit_server_time(self.bybit_api_manager.session)
+                from .utils import parse_timeframe_to_minutes
+                server_time_ms = self.market_snapshot.server_time_ms()
 
                 # If server time is not available, or only one candle is returned,
                 # we can't reliably determine if the first candle is open.
@@ -272,6 +257,24 @@ class ChartAnalyzer:
         except Exception:
             return None
 
+    def get_assistant_model(self, assistant_id: str) -> Optional[str]:
+        """Model name of an assistant, retrieved once per assistant_id."""
+        if assistant_id not in self._assistant_models:
+            try:
+                asst_obj = self.client.beta.assistants.retrieve(assistant_id)
+                self._assistant_models[assistant_id] = getattr(asst_obj, 'model', None)
+            except Exception:
+                # Don't memoize failures; retry on the next analysis
+                return None
+        return self._assistant_models[assistant_id]
+
+    def analysis_cache_key(self, image_data: bytes, prompt_text: str,
+                           assistant_id: Optional[str] = None) -> AnalysisCacheKey:
+        """Cache key for analysing image_data with prompt_text on the given (default) assistant."""
+        assistant_id = assistant_id or self.config.openai.assistant_id
+        model = self.get_assistant_model(assistant_id) if assistant_id else None
+        return make_analysis_key(image_data, prompt_text, model or f"assistant:{assistant_id}")
+
     def analyze_chart_with_assistant(  # noqa: ARG002
         self,
         image_path: str,
@@ -282,10 +285,63 @@ class ChartAnalyzer:
         skip_market_data: bool = False
     ) -> Dict[str, Any]:
         """Analyze chart using OpenAI Assistant API when available."""
+        early_result, request = self._prepare_assistant_analysis(
+            image_path, assistant_id, target_timeframe, prompt_function, custom_prompt_data, skip_market_data
+        )
+        if request is None:
+            return early_result
 
-        # Capture the analysis prompt for storage
-        analysis_prompt = None
+        result = request['cached_result']
+        if result is None:
+            result = self.assistant_handler.analyze_chart_for_autotrader(**self._autotrader_kwargs(request))
+            self._cache_assistant_result(request, result)
+        return self._finish_assistant_analysis(request, result)
 
+    async def analyze_chart_with_assistant_async(
+        self,
+        image_path: str,
+        target_timeframe: Optional[str] = None,
+        prompt_function: Optional[Callable] = None,
+        custom_prompt_data: Optional[Dict[str, Any]] = None,
+        run_blocking: Optional[Callable[..., Awaitable[Any]]] = None,
+    ) -> Dict[str, Any]:
+        """analyze_chart_with_assistant with the assistant run awaited on the event loop.
+
+        Needs an assistant handler with an async_client. Blocking steps (image
+        reads, OCR, market data, cache) go through run_blocking (default
+        asyncio.to_thread).
+        """
+        run_blocking = run_blocking or asyncio.to_thread
+        early_result, request = await run_blocking(
+            self._prepare_assistant_analysis, image_path, None, target_timeframe, prompt_function, custom_prompt_data
+        )
+        if request is None:
+            return early_result
+
+        result = request['cached_result']
+        if result is None:
+            result = await self.assistant_handler.analyze_chart_for_autotrader_async(
+                **self._autotrader_kwargs(request),
+                assistant_model=request['assistant_model'],
+                run_blocking=run_blocking,
+            )
+            await run_blocking(self._cache_assistant_result, request, result)
+        return self._finish_assistant_analysis(request, result)
+
+    def _prepare_assistant_analysis(
+        self,
+        image_path: str,
+        assistant_id: Optional[str] = None,
+        target_timeframe: Optional[str] = None,
+        prompt_function: Optional[Callable] = None,
+        custom_prompt_data: Optional[Dict[str, Any]] = None,
+        skip_market_data: bool = False
+    ) -> Tuple[Optional[Dict[str, Any]], Optional[Dict[str, Any]]]:
+        """Everything before the assistant run (blocking).
+
+        Returns (result, None) when no run is needed (stored analysis, skip,
+        error), else (None, request) for _autotrader_kwargs/_finish_assistant_analysis.
+        """
         if not self.assistant_handler:
             print("⚠️ Assistant handler not available, falling back to Vision API")
             return {
@@ -294,7 +350,7 @@ class ChartAnalyzer:
                 "summary": "Assistant handler not available",
                 "error": True,
                 "fallback_required": True
-            }
+            }, None
 
         # Check database existence FIRST - before ANY processing
         # If already analyzed, return the stored recommendation instead of re-analyzing
@@ -322,7 +378,7 @@ class ChartAnalyzer:
                 result["risk_reward"] = stored_analysis.get("risk_reward")
                 result["cached"] = True
                 result["timestamp"] = stored_analysis.get("timestamp")
-                return result
+                return result, None
             else:
                 # Fallback if analysis_data is not a dict
                 return {
@@ -336,14 +392,11 @@ class ChartAnalyzer:
                     "risk_reward": stored_analysis.get("risk_reward"),
                     "cached": True,
                     "error": False
-                }
+                }, None
 
         try:
-            from trading_bot.core.storage import read_file
-            import io
-
-            # Read image from storage (supports both local and Supabase)
-            image_data = read_file(image_path)
+            # Read image from memory or storage (supports both local and Supabase)
+            image_data = get_chart_image_pipeline().read(image_path)
             if image_data is None:
                 raise FileNotFoundError(f"Image not found: {image_path}")
 
@@ -372,7 +425,7 @@ class ChartAnalyzer:
                 "confidence": 0.0,
                 "summary": f"Extraction failed: {e}",
                 "error": True
-            }
+            }, None
 
         # Check if timeframe extraction failed
         if timeframe is None:
@@ -386,7 +439,7 @@ class ChartAnalyzer:
                 "skipped": True,
                 "error": False,
                 "skip_reason": "missing_timeframe"
-            }
+            }, None
 
         # Validate and normalize timeframe
         try:
@@ -405,7 +458,7 @@ class ChartAnalyzer:
                     "skipped": True,
                     "error": False,
                     "skip_reason": "timeframe_mismatch"
-                }
+                }, None
         except Exception as e:
             from pathlib import Path
             symbol = Path(image_path).stem.split('_')[0].upper()
@@ -417,7 +470,7 @@ class ChartAnalyzer:
                 "skipped": True,
                 "error": False,
                 "skip_reason": "invalid_timeframe"
-            }
+            }, None
 
         # Extract symbol from filename
         from pathlib import Path
@@ -453,7 +506,7 @@ class ChartAnalyzer:
                 "summary": "No assistant ID configured",
                 "error": True,
                 "fallback_required": True,
-            }
+            }, None
 
         # Prompt selection
         # If a custom prompt was provided by caller (e.g., backtests), use it as-is
@@ -470,12 +523,7 @@ class ChartAnalyzer:
         analysis_prompt = prompt_data['prompt']
 
         # Retrieve assistant model name for logging visibility
-        assistant_model_name = None
-        try:
-            asst_obj = self.client.beta.assistants.retrieve(assistant_id)
-            assistant_model_name = getattr(asst_obj, 'model', None)
-        except Exception:
-            assistant_model_name = None
+        assistant_model_name = self.get_assistant_model(assistant_id)
 
 
         # Log prompt version and assistant model for tracking
@@ -497,28 +545,66 @@ class ChartAnalyzer:
         last_price_raw = market_data.get('last_price')
         last_price_value: Optional[float] = None if last_price_raw == 'N/A' else (float(last_price_raw) if isinstance(last_price_raw, (int, float, str)) and last_price_raw != 'N/A' else None)
 
-        result = self.assistant_handler.analyze_chart_for_autotrader(
-        message=analysis_prompt,
-        agent_id=assistant_id,
-        image_path=image_path,
-        symbol=symbol,
-        timeframe=normalized_timeframe,
-        last_close_price=last_price_value,
-        timeout=600, # Increased timeout to 10 minutes
-        prompt_data=prompt_data  # Pass full prompt data including decision matrix
+        # Same chart bytes + prompt + model analysed before (live or backtest): reuse it
+        cache_key = None
+        cached_result = None
+        if self.analysis_cache is not None:
+            cache_key = self.analysis_cache_key(image_data, analysis_prompt, assistant_id)
+            cached_result = self.analysis_cache.get(cache_key)
+            if cached_result is not None:
+                print(f"         ♻️ Using content-cached analysis for {image_path}")
+                cached_result['cached'] = True
+
+        return None, {
+            'image_path': image_path,
+            'assistant_id': assistant_id,
+            'assistant_model': assistant_model_name,
+            'symbol': symbol,
+            'timeframe': timeframe,
+            'normalized_timeframe': normalized_timeframe,
+            'extracted_timestamp': extracted_timestamp,
+            'market_data': market_data,
+            'prompt_data': prompt_data,
+            'analysis_prompt': analysis_prompt,
+            'last_price': last_price_value,
+            'cache_key': cache_key,
+            'cached_result': cached_result,
+        }
+
+    def _autotrader_kwargs(self, request: Dict[str, Any]) -> Dict[str, Any]:
+        """Arguments for the assistant handler's analyze_chart_for_autotrader(_async)."""
+        return dict(
+            message=request['analysis_prompt'],
+            agent_id=request['assistant_id'],
+            image_path=request['image_path'],
+            symbol=request['symbol'],
+            timeframe=request['normalized_timeframe'],
+            last_close_price=request['last_price'],
+            timeout=600,  # Increased timeout to 10 minutes
+            prompt_data=request['prompt_data'],  # Pass full prompt data including decision matrix
         )
 
+    def _cache_assistant_result(self, request: Dict[str, Any], result: Dict[str, Any]) -> None:
+        if request['cache_key'] is not None:
+            self.analysis_cache.put(request['cache_key'], result)
+
+    def _finish_assistant_analysis(self, request: Dict[str, Any], result: Dict[str, Any]) -> Dict[str, Any]:
+        """Attach timestamp, prompt and market-data metadata to an assistant result and log it."""
+        symbol = request['symbol']
+        analysis_prompt = request['analysis_prompt']
+        prompt_data = request['prompt_data']
+
         # Add timestamp information
-        result['timestamp'] = extracted_timestamp
-        result['original_timeframe'] = timeframe
-        result['normalized_timeframe'] = normalized_timeframe
+        result['timestamp'] = request['extracted_timestamp']
+        result['original_timeframe'] = request['timeframe']
+        result['normalized_timeframe'] = request['normalized_timeframe']
         result['analysis_method'] = 'assistant'
         result['analysis_prompt'] = analysis_prompt  # Store the prompt
-        result['passed_image'] = image_path
+        result['passed_image'] = request['image_path']
         result['trade_confidence'] = result["confidence"]
         result['prompt_version'] = prompt_data['version']['name']  # Add prompt version
         result['prompt_id'] = prompt_data['version']['name']  # Add prompt_id for database
-        result['market_data_snapshot'] = market_data  # Add market data snapshot for database
+        result['market_data_snapshot'] = request['market_data']  # Add market data snapshot for database
 
         # Log analyzer result
         self.logger.info("🤖 ASSISTANT ANALYSIS RESULT:")
@@ -546,7 +632,56 @@ class ChartAnalyzer:
 
     def analyze_chart(self, image_path: str, use_assistant: bool = False, target_timeframe: Optional[str] = None, prompt_function: Optional[Callable] = None, custom_prompt_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """Main analysis method that chooses between Vision API and Assistant API."""
+        target_timeframe, skipped = self._check_boundary(image_path, target_timeframe)
+        if skipped is not None:
+            return skipped
+
+        # Determine if we should use assistant
+        if self._should_use_assistant(use_assistant):
+            print("         🤖 Using OpenAI Assistant API for chart analysis")
+            # Try assistant first, fallback to vision API if needed
+            result = self.analyze_chart_with_assistant(image_path, target_timeframe=target_timeframe, prompt_function=prompt_function, custom_prompt_data=custom_prompt_data)
+            if result.get('fallback_required'):
+                print("         ⚠️ Assistant unavailable, falling back to Vision API")
+                return self._analyze_chart_vision_internal(image_path, target_timeframe)
+            return result
+        else:
+            print("         👁️ Using OpenAI Vision API (standard) for chart analysis")
+            # Use traditional vision API
+            return self._analyze_chart_vision_internal(image_path, target_timeframe)
+
+    async def analyze_chart_async(self, image_path: str, use_assistant: bool = False, target_timeframe: Optional[str] = None, prompt_function: Optional[Callable] = None, custom_prompt_data: Optional[Dict[str, Any]] = None, run_blocking: Optional[Callable[..., Awaitable[Any]]] = None) -> Dict[str, Any]:
+        """analyze_chart for the event loop.
 
+        With an async OpenAI client the assistant run is awaited on the loop
+        (streamed, no thread held while it is in flight); everything blocking
+        goes through run_blocking (default asyncio.to_thread). Without one, the
+        whole sync analyze_chart runs through run_blocking.
+        """
+        run_blocking = run_blocking or asyncio.to_thread
+        handler = self.assistant_handler
+        if handler is None or handler.async_client is None or not self._should_use_assistant(use_assistant):
+            return await run_blocking(self.analyze_chart, image_path, use_assistant, target_timeframe, prompt_function, custom_prompt_data)
+
+        target_timeframe, skipped = await run_blocking(self._check_boundary, image_path, target_timeframe)
+        if skipped is not None:
+            return skipped
+
+        print("         🤖 Using OpenAI Assistant API for chart analysis")
+        result = await self.analyze_chart_with_assistant_async(
+            image_path, target_timeframe=target_timeframe, prompt_function=prompt_function,
+            custom_prompt_data=custom_prompt_data, run_blocking=run_blocking,
+        )
+        if result.get('fallback_required'):
+            print("         ⚠️ Assistant unavailable, falling back to Vision API")
+            return await run_blocking(self._analyze_chart_vision_internal, image_path, target_timeframe)
+        return result
+
+    def _check_boundary(self, image_path: str, target_timeframe: Optional[str]) -> Tuple[Optional[str], Optional[Dict[str, Any]]]:
+        """Resolve target_timeframe and validate the file against the current boundary.
+
+        Returns (target_timeframe, skip result or None).
+        """
         # Skip boundary validation if configured (for backtesting)
         if not self.skip_boundary_validation:
             # Validate file timestamp against current boundary
@@ -565,7 +700,7 @@ class ChartAnalyzer:
                     print(f"⏸️ SKIPPED {symbol}: {validation_result['reason']}")
                     print(f"   File boundary: {validation_result.get('file_boundary')}")
                     print(f"   Current boundary: {validation_result.get('current_boundary')}")
-                    return {
+                    return target_timeframe, {
                         "recommendation": "hold",
                         "confidence": 0.0,
                         "summary": f"Skipped {symbol}: {validation_result['reason']}",
@@ -586,29 +721,18 @@ class ChartAnalyzer:
         else:
             print(f"🔄 BACKTEST MODE: Skipping boundary validation for {image_path}")
 
-        # Auto-detect if we should use assistant based on configuration (when use_assistant not explicitly set)
-        if not use_assistant:
-            should_use_assistant = (
-                self.assistant_handler is not None and
-                hasattr(self.config.openai, 'assistant_id') and
-                self.config.openai.assistant_id is not None and
-                self.config.openai.assistant_id.strip() != ''
-            )
-            use_assistant = should_use_assistant
+        return target_timeframe, None
 
-        # Determine if we should use assistant
+    def _should_use_assistant(self, use_assistant: bool) -> bool:
+        """Explicit use_assistant, else auto-detect from the assistant configuration."""
         if use_assistant:
-            print("         🤖 Using OpenAI Assistant API for chart analysis")
-            # Try assistant first, fallback to vision API if needed
-            result = self.analyze_chart_with_assistant(image_path, target_timeframe=target_timeframe, prompt_function=prompt_function, custom_prompt_data=custom_prompt_data)
-            if result.get('fallback_required'):
-                print("         ⚠️ Assistant unavailable, falling back to Vision API")
-                return self._analyze_chart_vision_internal(image_path, target_timeframe)
-            return result
-        else:
-            print("         👁️ Using OpenAI Vision API (standard) for chart analysis")
-            # Use traditional vision API
-            return self._analyze_chart_vision_internal(image_path, target_timeframe)
+            return True
+        return (
+            self.assistant_handler is not None and
+            hasattr(self.config.openai, 'assistant_id') and
+            self.config.openai.assistant_id is not None and
+            self.config.openai.assistant_id.strip() != ''
+        )
 
     def _analyze_chart_vision_internal(self, image_path: str, target_timeframe: Optional[str] = None) -> Dict[str, Any]:
         """Internal method for vision-based analysis (original analyze_chart)."""
@@ -656,11 +780,8 @@ class ChartAnalyzer:
                 }
 
         try:
-            from trading_bot.core.storage import read_file
-            import io
-
-            # Read image from storage (supports both local and Supabase)
-            image_data = read_file(image_path)
+            # Read image from memory or storage (supports both local and Supabase)
+            image_data = get_chart_image_pipeline().read(image_path)
             if image_data is None:
                 raise FileNotFoundError(f"Image not found: {image_path}")
 
@@ -743,7 +864,7 @@ class ChartAnalyzer:
                 )
                 if not validation_result.is_valid:
                     from pathlib import Path
-                    from trading_bot.core.storage import delete_file, get_storage_type
+                    from trading_bot.core.storage import get_storage_type
 
                     symbol = Path(image_path).stem.split('_')[0].upper()
                     print(f"🗑️  DELETING {symbol}: Timestamp validation failed - recommendation expired")
@@ -757,8 +878,8 @@ class ChartAnalyzer:
                         filename = Path(image_path).name
                         storage_type = get_storage_type()
 
-                        # Use centralized delete_file function
-                        result = delete_file(filename)
+                        # Through the chart pipeline, so a queued background write can't recreate it
+                        result = get_chart_image_pipeline().delete(image_path, storage_path=filename)
 
                         if result.get('success'):
                             print(f"✅ Deleted expired file: {filename} (storage: {storage_type})")
@@ -816,12 +937,12 @@ class ChartAnalyzer:
 
         # Get long/short ratio
         long_short_ratio = "N/A"
-        if self.bybit_api_manager:
+        if self.market_snapshot:
             try:
                 # Use a more descriptive name for the ratio variable
                 # Use normalized symbol for Bybit API
                 normalized_symbol = normalize_symbol_for_bybit(symbol)
-                ratio_data = self.bybit_api_manager.get_long_short_ratio(symbol=normalized_symbol, timeframe=normalized_timeframe)
+                ratio_data = self.market_snapshot.long_short_ratio(normalized_symbol, normalized_timeframe)
                 if ratio_data and ratio_data.get("retCode") == 0 and ratio_data.get("result", {}).get("list"):
                     # Get the latest ratio data
                     latest_ratio = ratio_data["result"]["list"][0]
@@ -7,6 +7,7 @@ from typing import Dict, Any, Optional, cast # Import cast
 
 from pybit.unified_trading import HTTP
 
+from trading_bot.core.bybit_market_client import BybitMarketClient, get_bybit_market_client
 from trading_bot.core.secrets_manager import get_bybit_credentials
 from trading_bot.config.settings_v2 import ConfigV2
 from trading_bot.core.utils import (
@@ -480,6 +481,33 @@ class BybitAPIManager:
         kwargs.pop('recv_window', None)
         return self._execute_with_circuit_breaker(lambda s, **kw: s.get_tickers(**kw), **kwargs)
 
+    # --- Public market data over the shared pooled client ---
+
+    @property
+    def market(self) -> BybitMarketClient:
+        """Process-wide pooled client for public market-data endpoints."""
+        return get_bybit_market_client(testnet=self.use_testnet)
+
+    async def get_kline_async(self, **kwargs) -> Dict[str, Any]:
+        """Get kline (candlestick) data without blocking the event loop."""
+        kwargs.setdefault("category", "linear")
+        kwargs["symbol"] = normalize_symbol_for_bybit(kwargs["symbol"])
+        return await self.market.get("kline", **kwargs)
+
+    async def get_tickers_async(self, **kwargs) -> Dict[str, Any]:
+        """Get ticker snapshot(s) without blocking the event loop."""
+        kwargs.setdefault("category", "linear")
+        if "symbol" in kwargs:
+            kwargs["symbol"] = normalize_symbol_for_bybit(kwargs["symbol"])
+        return await self.market.get("tickers", **kwargs)
+
+    async def get_instruments_info_async(self, **kwargs) -> Dict[str, Any]:
+        """Get instrument information without blocking the event loop."""
+        kwargs.setdefault("category", "linear")
+        if "symbol" in kwargs:
+            kwargs["symbol"] = normalize_symbol_for_bybit(kwargs["symbol"])
+        return await self.market.get("instruments_info", **kwargs)
+
     def get_executions(self, **kwargs) -> Dict[str, Any]:
         """Get execution/trade history from Bybit."""
         kwargs.setdefault("category", "linear")
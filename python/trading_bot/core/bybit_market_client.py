@@ -0,0 +1,273 @@
+"""
+Shared async HTTP client for Bybit public market data.
+
+One pooled httpx.AsyncClient (keep-alive, HTTP/2 when the h2 package is
+installed) serves every public market-data request in the process: candle
+fetches in strategies and the screener, ticker scans, symbol lists and the
+backtest candle fetcher. TLS handshakes happen once per connection instead of
+once per request or per throwaway pybit session.
+
+The client lives on its own event loop thread, so it can be shared by
+coroutines on any loop (`await client.get(...)`) and by plain threads
+(`client.get_sync(...)`).
+
+Rate limiting: Bybit limits public endpoints per IP (600 requests per 5 s
+window, HTTP 403 beyond it). Each endpoint has a weight charged against that
+shared budget, and can additionally be capped on its own via ENDPOINT_LIMITS.
+The per-endpoint buckets are resynced from X-Bapi-Limit-Status headers when
+Bybit sends them; a retCode 10006 ("too many visits"), 403 or 429 response
+waits for X-Bapi-Limit-Reset-Timestamp (or backs off) and retries.
+
+Usage:
+    from trading_bot.core.bybit_market_client import get_bybit_market_client
+
+    client = get_bybit_market_client()
+    data = await client.get('kline', category='linear', symbol='BTCUSDT', interval='60', limit=200)
+    data = client.get_sync('tickers', category='linear')
+
+Configuration (config.yaml, bybit.market_data):
+    ip_limit_per_5s   Requests per 5 s window for the whole process (default 500)
+    max_connections   Max pooled connections (default 50)
+    timeout           Request timeout in seconds (default 10)
+"""
+
+import asyncio
+import logging
+import random
+import threading
+import time
+from typing import Any, Dict, Optional, Tuple
+
+import httpx
+
+from trading_bot.config.settings_v2 import get_static_config
+from trading_bot.core.llm_dispatcher import TokenBucket
+
+logger = logging.getLogger(__name__)
+
+MAINNET_URL = "https://api.bybit.com"
+TESTNET_URL = "https://api-testnet.bybit.com"
+
+# name -> (path, weight against the per-IP budget)
+ENDPOINTS: Dict[str, Tuple[str, float]] = {
+    'kline': ('/v5/market/kline', 1),
+    'mark_price_kline': ('/v5/market/mark-price-kline', 1),
+    'tickers': ('/v5/market/tickers', 1),
+    'instruments_info': ('/v5/market/instruments-info', 1),
+    'orderbook': ('/v5/market/orderbook', 1),
+    'recent_trade': ('/v5/market/recent-trade', 1),
+    'funding_history': ('/v5/market/funding/history', 1),
+    'long_short_ratio': ('/v5/market/account-ratio', 1),
+    'historical_volatility': ('/v5/market/historical-volatility', 1),
+    'server_time': ('/v5/market/time', 1),
+}
+
+# Optional per-endpoint caps (requests per second) on top of the IP budget
+ENDPOINT_LIMITS: Dict[str, float] = {}
+
+RATE_LIMITED_RET_CODE = 10006
+
+
+def _http2_available() -> bool:
+    try:
+        import h2  # noqa: F401
+        return True
+    except ImportError:
+        return False
+
+
+class BybitMarketClient:
+    """Process-wide pooled client for Bybit public REST endpoints."""
+
+    def __init__(
+        self,
+        testnet: bool = False,
+        base_url: Optional[str] = None,
+        ip_limit_per_5s: int = 500,
+        endpoint_limits: Optional[Dict[str, float]] = None,
+        max_connections: int = 50,
+        timeout: float = 10.0,
+        max_retries: int = 3,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = base_url or (TESTNET_URL if testnet else MAINNET_URL)
+        self.max_connections = max_connections
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self._transport = transport
+        self._ip_bucket = TokenBucket(ip_limit_per_5s * 12, burst=ip_limit_per_5s)
+        limits = ENDPOINT_LIMITS if endpoint_limits is None else endpoint_limits
+        self._endpoint_buckets = {
+            name: TokenBucket(per_second * 60, burst=max(1.0, per_second))
+            for name, per_second in limits.items()
+        }
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.rate_limited = 0
+
+    # --- event loop owning the connection pool -----------------------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or self._loop.is_closed():
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever, name='bybit-market-client', daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def _http(self) -> httpx.AsyncClient:
+        # Only ever called on the client's own loop
+        if self._client is None:
+            http2 = self._transport is None and _http2_available()
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                timeout=self.timeout,
+                http2=http2,
+                transport=self._transport,
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=60.0,
+                ),
+                headers={'Accept': 'application/json'},
+            )
+            logger.debug(f"Bybit market client connected to {self.base_url} (http2={http2})")
+        return self._client
+
+    # --- rate limiting --------------------------------------------------
+
+    def _reserve(self, endpoint: str) -> float:
+        wait = self._ip_bucket.reserve(ENDPOINTS[endpoint][1])
+        bucket = self._endpoint_buckets.get(endpoint)
+        if bucket is not None:
+            wait = max(wait, bucket.reserve(1))
+        return wait
+
+    def _observe_headers(self, endpoint: str, headers: httpx.Headers) -> None:
+        bucket = self._endpoint_buckets.get(endpoint)
+        remaining = headers.get('X-Bapi-Limit-Status')
+        if bucket is not None and remaining is not None:
+            try:
+                bucket.set_remaining(float(remaining))
+            except ValueError:
+                pass
+
+    @staticmethod
+    def _retry_delay(headers: httpx.Headers, attempt: int) -> float:
+        reset_ms = headers.get('X-Bapi-Limit-Reset-Timestamp')
+        if reset_ms:
+            try:
+                return min(10.0, max(0.0, float(reset_ms) / 1000.0 - time.time()) + 0.05)
+            except ValueError:
+                pass
+        return min(10.0, 0.5 * (2 ** attempt)) * random.uniform(0.8, 1.2)
+
+    # --- requests ---------------------------------------------------------
+
+    async def _request(self, endpoint: str, params: Dict[str, Any]) -> Dict[str, Any]:
+        path = ENDPOINTS[endpoint][0]
+        params = {k: v for k, v in params.items() if v is not None}
+        for attempt in range(self.max_retries + 1):
+            wait = self._reserve(endpoint)
+            if wait > 0:
+                await asyncio.sleep(wait)
+            self.requests += 1
+            response = await self._http().get(path, params=params)
+            self._observe_headers(endpoint, response.headers)
+
+            limited = response.status_code in (403, 429)
+            data: Dict[str, Any] = {}
+            if not limited:
+                response.raise_for_status()
+                data = response.json()
+                limited = data.get('retCode') == RATE_LIMITED_RET_CODE
+            if not limited:
+                return data
+
+            self.rate_limited += 1
+            if attempt == self.max_retries:
+                if data:
+                    return data
+                response.raise_for_status()
+            delay = self._retry_delay(response.headers, attempt)
+            logger.warning(f"Bybit rate limit on {path} - retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+        return {}
+
+    async def get(self, endpoint: str, **params: Any) -> Dict[str, Any]:
+        """GET a public endpoint (see ENDPOINTS) and return the decoded JSON body."""
+        if endpoint not in ENDPOINTS:
+            raise ValueError(f"Unknown Bybit market endpoint: {endpoint}")
+        loop = self._ensure_loop()
+        try:
+            running = asyncio.get_running_loop()
+        except RuntimeError:
+            running = None
+        if running is loop:
+            return await self._request(endpoint, params)
+        future = asyncio.run_coroutine_threadsafe(self._request(endpoint, params), loop)
+        return await asyncio.wrap_future(future)
+
+    def get_sync(self, endpoint: str, **params: Any) -> Dict[str, Any]:
+        """Blocking get() for threads and synchronous code."""
+        if endpoint not in ENDPOINTS:
+            raise ValueError(f"Unknown Bybit market endpoint: {endpoint}")
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            raise RuntimeError("get_sync() called from the market client's own loop; use await get()")
+        future = asyncio.run_coroutine_threadsafe(self._request(endpoint, params), loop)
+        return future.result(timeout=(self.timeout + 10.0) * (self.max_retries + 1))
+
+    def close(self) -> None:
+        """Close pooled connections and stop the client's loop."""
+        with self._lock:
+            loop, thread, client = self._loop, self._thread, self._client
+            self._loop = self._thread = self._client = None
+        if loop is None:
+            return
+        if client is not None:
+            try:
+                asyncio.run_coroutine_threadsafe(client.aclose(), loop).result(timeout=5)
+            except Exception as e:
+                logger.debug(f"Error closing Bybit market client: {e}")
+        loop.call_soon_threadsafe(loop.stop)
+        if thread is not None:
+            thread.join(timeout=5)
+        loop.close()
+
+    def stats(self) -> Dict[str, Any]:
+        return {'requests': self.requests, 'rate_limited': self.rate_limited, 'base_url': self.base_url}
+
+
+_clients: Dict[bool, BybitMarketClient] = {}
+_clients_lock = threading.Lock()
+
+
+def get_bybit_market_client(testnet: bool = False) -> BybitMarketClient:
+    """Process-wide client for mainnet (default) or testnet, sized from config.yaml."""
+    client = _clients.get(testnet)
+    if client is None:
+        with _clients_lock:
+            client = _clients.get(testnet)
+            if client is None:
+                settings = get_static_config().market_data
+                client = _clients[testnet] = BybitMarketClient(
+                    testnet=testnet,
+                    ip_limit_per_5s=settings.ip_limit_per_5s,
+                    max_connections=settings.max_connections,
+                    timeout=settings.timeout,
+                )
+    return client
+
+
+__all__ = [
+    'BybitMarketClient',
+    'ENDPOINTS',
+    'ENDPOINT_LIMITS',
+    'get_bybit_market_client',
+]
@@ -0,0 +1,132 @@
+"""
+Vectorized candlestick pattern and swing-pivot detection.
+
+Each detector evaluates a whole frame at once and returns one boolean array
+per pattern (True on the bar that completes it) instead of walking bars with
+`df.iloc[i]`:
+
+    bullish_engulfing / bearish_engulfing   2-bar, volume-confirmed
+    hammer / shooting_star                  1-bar, volume-confirmed
+    inside_bar                              2-bar, on falling volume
+    swing high / swing low                  fractal pivot, `width` bars each side
+
+Many symbols can be evaluated in one pass by stacking their candles in one
+frame (contiguous per symbol, oldest first) and passing the symbol column as
+`groups`: comparisons that would reach across a symbol boundary are False.
+
+Usage:
+    from trading_bot.core.candle_patterns import detect_patterns_frame, swing_pivots
+
+    flags = detect_patterns_frame(df, volume_confirmed=df['volume_confirmed'])
+    recent_hammers = np.flatnonzero(flags['hammer'].to_numpy()[-10:])
+
+    is_high, is_low = swing_pivots(df['high'], df['low'])
+    stacked = detect_patterns_frame(watchlist_df, group_col='symbol')
+"""
+
+from typing import Dict, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+PATTERN_NAMES = ('bullish_engulfing', 'bearish_engulfing', 'hammer', 'shooting_star', 'inside_bar')
+
+
+def _shift(values: np.ndarray, k: int, fill) -> np.ndarray:
+    """values shifted by k bars (k > 0: previous bars, k < 0: following bars)."""
+    out = np.full(values.shape, fill, dtype=values.dtype)
+    if k > 0:
+        out[k:] = values[:-k]
+    elif k < 0:
+        out[:k] = values[-k:]
+    else:
+        out[:] = values
+    return out
+
+
+def _neighbour_valid(n: int, k: int, groups: Optional[np.ndarray]) -> np.ndarray:
+    """Whether bar t - k exists and belongs to the same group as bar t."""
+    valid = _shift(np.ones(n, dtype=bool), k, False)
+    if groups is not None:
+        valid &= _shift(groups, k, None) == groups
+    return valid
+
+
+def _as_array(values) -> np.ndarray:
+    return values.to_numpy(dtype=float) if isinstance(values, pd.Series) else np.asarray(values, dtype=float)
+
+
+def candlestick_patterns(open_, high, low, close, volume, volume_confirmed=None,
+                         groups=None) -> Dict[str, np.ndarray]:
+    """
+    Boolean arrays (one per PATTERN_NAMES entry) for a chronological series.
+
+    Args:
+        volume_confirmed: per-bar volume confirmation for the engulfing,
+            hammer and shooting-star patterns (None: no volume filter).
+        groups: per-bar symbol labels for stacked multi-symbol input.
+    """
+    o, h, l, c, v = (_as_array(x) for x in (open_, high, low, close, volume))
+    n = len(c)
+    groups = None if groups is None else np.asarray(groups, dtype=object)
+    confirmed = np.ones(n, dtype=bool) if volume_confirmed is None else np.asarray(volume_confirmed, dtype=bool)
+    has_prev = _neighbour_valid(n, 1, groups)
+
+    body = np.abs(c - o)
+    candle_range = h - l
+    upper_shadow = h - np.maximum(o, c)
+    lower_shadow = np.minimum(o, c) - l
+    po, ph, pl, pc, pv = (_shift(x, 1, np.nan) for x in (o, h, l, c, v))
+
+    with np.errstate(invalid='ignore'):
+        bullish_engulfing = (pc < po) & (c > o) & (o < pc) & (c > po)
+        bearish_engulfing = (pc > po) & (c < o) & (o > pc) & (c < po)
+        hammer = ((body <= 0.3 * candle_range) & (lower_shadow >= 2.0 * body)
+                  & (upper_shadow <= 0.2 * candle_range) & (c > l + 0.6 * candle_range))
+        shooting_star = ((body <= 0.3 * candle_range) & (upper_shadow >= 2.0 * body)
+                         & (lower_shadow <= 0.2 * candle_range) & (c < h - 0.6 * candle_range))
+        inside_bar = (h < ph) & (l > pl) & (v < pv)
+
+    return {
+        'bullish_engulfing': bullish_engulfing & confirmed & has_prev,
+        'bearish_engulfing': bearish_engulfing & confirmed & has_prev,
+        'hammer': hammer & confirmed,
+        'shooting_star': shooting_star & confirmed,
+        'inside_bar': inside_bar & has_prev,
+    }
+
+
+def swing_pivots(high, low, width: int = 2, groups=None) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Fractal swing highs and lows: a high strictly above (low strictly below)
+    the `width` bars on each side. Bars without a full neighbourhood are False.
+    """
+    h, l = _as_array(high), _as_array(low)
+    n = len(h)
+    groups = None if groups is None else np.asarray(groups, dtype=object)
+    is_high = np.ones(n, dtype=bool)
+    is_low = np.ones(n, dtype=bool)
+    with np.errstate(invalid='ignore'):
+        for k in range(1, width + 1):
+            for shift in (k, -k):
+                valid = _neighbour_valid(n, shift, groups)
+                is_high &= valid & (h > _shift(h, shift, np.nan))
+                is_low &= valid & (l < _shift(l, shift, np.nan))
+    return is_high, is_low
+
+
+def detect_patterns_frame(df: pd.DataFrame, group_col: Optional[str] = None,
+                          volume_confirmed=None) -> pd.DataFrame:
+    """candlestick_patterns() over an OHLCV frame, as boolean columns on df.index."""
+    groups = df[group_col].to_numpy() if group_col else None
+    flags = candlestick_patterns(df['open'], df['high'], df['low'], df['close'], df['volume'],
+                                 volume_confirmed=volume_confirmed, groups=groups)
+    return pd.DataFrame(flags, index=df.index)
+
+
+__all__ = [
+    'PATTERN_NAMES',
+    'candlestick_patterns',
+    'detect_patterns_frame',
+    'swing_pivots',
+]
@@ -0,0 +1,55 @@
+"""
+Perceptual hashing of chart screenshots.
+
+A difference hash (dHash) shrinks the image to a small grayscale grid and
+records whether each pixel is brighter than its right-hand neighbour. Charts
+that are pixel-identical or differ only slightly (illiquid pairs, a re-capture
+after a restart within the same boundary) end up a few bits apart, so the
+Hamming distance between hashes tells near-duplicates apart from real changes.
+
+Usage:
+    from trading_bot.core.chart_hash import compute_chart_hash, is_near_duplicate
+
+    h = compute_chart_hash(png_bytes)
+    if is_near_duplicate(h, previous_hash):
+        ...
+
+config.yaml charts.hash_max_distance sets the reuse threshold (bits out of
+256), -1 disables reuse.
+"""
+
+import io
+from typing import Optional, Union
+
+import numpy as np
+from PIL import Image
+
+# Grid is (DHASH_SIZE + 1) x DHASH_SIZE -> DHASH_SIZE**2 bits
+DHASH_SIZE = 16
+
+
+def compute_chart_hash(image: Union[bytes, Image.Image], hash_size: int = DHASH_SIZE) -> str:
+    """dHash of a chart image (PNG bytes or PIL image) as a hex string."""
+    if isinstance(image, (bytes, bytearray)):
+        with Image.open(io.BytesIO(image)) as img:
+            return compute_chart_hash(img, hash_size)
+
+    small = image.convert('L').resize((hash_size + 1, hash_size), Image.Resampling.LANCZOS)
+    pixels = np.asarray(small, dtype=np.int16)
+    bits = (pixels[:, 1:] > pixels[:, :-1]).flatten()
+    return np.packbits(bits).tobytes().hex()
+
+
+def hamming_distance(hash_a: str, hash_b: str) -> int:
+    """Number of differing bits between two hex hashes of the same size."""
+    if len(hash_a) != len(hash_b):
+        raise ValueError(f"Hash sizes differ: {len(hash_a)} vs {len(hash_b)} hex digits")
+    return bin(int(hash_a, 16) ^ int(hash_b, 16)).count('1')
+
+
+def is_near_duplicate(hash_a: Optional[str], hash_b: Optional[str],
+                      max_distance: int = 8) -> bool:
+    """True when both hashes exist, match in size and are within max_distance bits."""
+    if max_distance < 0 or not hash_a or not hash_b or len(hash_a) != len(hash_b):
+        return False
+    return hamming_distance(hash_a, hash_b) <= max_distance
@@ -0,0 +1,241 @@
+"""
+In-memory chart image pipeline.
+
+Captured charts stay in memory as bytes from the screenshot to the LLM upload:
+save() remembers the PNG under its storage path and hands the storage write to
+a background thread, and read() / llm_image() serve later reads from memory
+before falling back to storage.read_file. This avoids a disk or S3 round trip
+(and a second base64 pass over a freshly read file) for every chart analysed
+in the same process.
+
+Delete charts through delete() (or forget() before deleting them yourself):
+it cancels, or waits for, a queued write of the same path so a background
+write cannot recreate a chart that was just deleted.
+
+llm_image() can additionally re-encode the chart for the model as a downscaled
+WebP or JPEG, which shrinks the upload; the stored chart remains the PNG.
+
+Usage:
+    from trading_bot.core.chart_images import get_chart_image_pipeline
+
+    pipeline = get_chart_image_pipeline()
+    pipeline.save("charts/BTCUSDT_1h_20250101_000000.png", png_bytes)
+    data, filename = pipeline.llm_image("charts/BTCUSDT_1h_20250101_000000.png")
+    pipeline.flush()  # wait for pending storage writes
+    pipeline.delete("charts/BTCUSDT_1h_20250101_000000.png")
+
+Configuration (config.yaml, charts):
+    async_writes   write to storage in the background (default true)
+    memory_images  charts kept in memory (default 64)
+    llm_format     png (default, unchanged), webp or jpeg
+    llm_quality    WebP/JPEG quality (default 85)
+    llm_max_width  downscale wider charts for the LLM, 0 = keep size
+"""
+
+import io
+import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from PIL import Image
+
+from trading_bot.config.settings_v2 import get_static_config
+from trading_bot.core import storage
+
+logger = logging.getLogger(__name__)
+
+_PIL_FORMATS = {'png': 'PNG', 'webp': 'WEBP', 'jpeg': 'JPEG', 'jpg': 'JPEG'}
+
+
+def encode_for_llm(png_bytes: bytes, fmt: str = 'png', quality: int = 85,
+                   max_width: int = 0) -> Tuple[bytes, str]:
+    """
+    Re-encode a chart for the model.
+
+    Returns:
+        (image bytes, file extension). PNG at full size is returned untouched.
+    """
+    fmt = (fmt or 'png').lower()
+    if fmt not in _PIL_FORMATS:
+        raise ValueError(f"Unsupported LLM image format: {fmt}")
+    ext = 'jpg' if fmt in ('jpeg', 'jpg') else fmt
+
+    with Image.open(io.BytesIO(png_bytes)) as img:
+        if fmt == 'png' and not (max_width and img.width > max_width):
+            return png_bytes, 'png'
+        if max_width and img.width > max_width:
+            height = max(1, round(img.height * max_width / img.width))
+            img = img.resize((max_width, height), Image.Resampling.LANCZOS)
+        if ext == 'jpg':
+            img = img.convert('RGB')
+        buffer = io.BytesIO()
+        if fmt == 'png':
+            img.save(buffer, format='PNG')
+        else:
+            img.save(buffer, format=_PIL_FORMATS[fmt], quality=quality)
+    return buffer.getvalue(), ext
+
+
+class ChartImagePipeline:
+    """Bounded in-memory chart store with background storage writes."""
+
+    def __init__(
+        self,
+        max_images: int = 64,
+        async_writes: bool = True,
+        llm_format: str = 'png',
+        llm_quality: int = 85,
+        llm_max_width: int = 0,
+    ):
+        self.max_images = max_images
+        self.async_writes = async_writes
+        self.llm_format = llm_format
+        self.llm_quality = llm_quality
+        self.llm_max_width = llm_max_width
+        self._images: "OrderedDict[str, bytes]" = OrderedDict()
+        self._llm_images: Dict[str, Tuple[bytes, str]] = {}
+        self._pending: Dict[Future, str] = {}  # queued write -> path
+        self._lock = threading.Lock()
+        self._executor: Optional[ThreadPoolExecutor] = None
+
+    # --- memory --------------------------------------------------------
+
+    def remember(self, path: str, image_bytes: bytes) -> None:
+        with self._lock:
+            self._images[path] = image_bytes
+            self._images.move_to_end(path)
+            self._llm_images.pop(path, None)
+            while len(self._images) > self.max_images:
+                evicted, _ = self._images.popitem(last=False)
+                self._llm_images.pop(evicted, None)
+
+    def _recall(self, path: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._images.get(path)
+            if data is not None:
+                self._images.move_to_end(path)
+            return data
+
+    def forget(self, path: str) -> None:
+        """Drop the in-memory copy and cancel (or wait for) any queued write of path."""
+        with self._lock:
+            self._images.pop(path, None)
+            self._llm_images.pop(path, None)
+            writes = [f for f, pending_path in self._pending.items() if pending_path == path]
+        for future in writes:
+            if not future.cancel():
+                wait([future])
+
+    def _prune(self) -> None:
+        """Drop finished writes from _pending (caller holds _lock)."""
+        self._pending = {f: p for f, p in self._pending.items() if not f.done()}
+
+    # --- storage -------------------------------------------------------
+
+    def _write(self, path: str, image_bytes: bytes, content_type: str) -> dict:
+        result = storage.save_file(path, image_bytes, content_type=content_type)
+        if not result.get('success'):
+            logger.error(f"Background chart write failed for {path}: {result.get('error', 'Unknown error')}")
+        return result
+
+    def save(self, path: str, image_bytes: bytes, content_type: str = 'image/png') -> Optional[dict]:
+        """
+        Keep the chart in memory and write it to storage.
+
+        Returns the storage result for synchronous writes, None when the write
+        was queued (failures are logged; the in-memory copy stays readable).
+        """
+        self.remember(path, image_bytes)
+        if not self.async_writes:
+            return storage.save_file(path, image_bytes, content_type=content_type)
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='chart-writer')
+            self._prune()
+            self._pending[self._executor.submit(self._write, path, image_bytes, content_type)] = path
+        return None
+
+    def delete(self, path: str, storage_path: Optional[str] = None) -> dict:
+        """
+        Delete a chart from memory and storage.
+
+        Any queued write of path is cancelled or finished first, so it cannot
+        recreate the file afterwards. storage_path defaults to path.
+        """
+        self.forget(path)
+        return storage.delete_file(storage_path or path)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait for queued storage writes. True when all finished in time."""
+        with self._lock:
+            pending = list(self._pending)
+        _, not_done = wait(pending, timeout=timeout)
+        with self._lock:
+            self._prune()
+        return not not_done
+
+    def pending_writes(self) -> int:
+        with self._lock:
+            return sum(1 for f in self._pending if not f.done())
+
+    # --- reads ---------------------------------------------------------
+
+    def read(self, path: str) -> Optional[bytes]:
+        """Chart bytes from memory, else from storage."""
+        data = self._recall(path)
+        return data if data is not None else storage.read_file(path)
+
+    def llm_image(self, path: str) -> Optional[Tuple[bytes, str]]:
+        """
+        Chart as sent to the model: (bytes, filename), re-encoded per llm_format / llm_quality / llm_max_width.
+
+        The filename carries the matching extension so upload APIs detect the type.
+        """
+        with self._lock:
+            cached = self._llm_images.get(path)
+        if cached is not None:
+            return cached
+        data = self.read(path)
+        if data is None:
+            return None
+        try:
+            encoded, ext = encode_for_llm(data, self.llm_format, self.llm_quality, self.llm_max_width)
+        except Exception as e:
+            logger.warning(f"Could not re-encode {path} for the LLM, sending original: {e}")
+            encoded, ext = data, Path(path).suffix.lstrip('.') or 'png'
+        result = (encoded, f"{Path(path).stem}.{ext}")
+        with self._lock:
+            if path in self._images:
+                self._llm_images[path] = result
+        return result
+
+
+_pipeline: Optional[ChartImagePipeline] = None
+_pipeline_lock = threading.Lock()
+
+
+def get_chart_image_pipeline() -> ChartImagePipeline:
+    """Process-wide pipeline instance, configured from config.yaml (charts)."""
+    global _pipeline
+    if _pipeline is None:
+        with _pipeline_lock:
+            if _pipeline is None:
+                settings = get_static_config().charts
+                _pipeline = ChartImagePipeline(
+                    max_images=settings.memory_images,
+                    async_writes=settings.async_writes,
+                    llm_format=settings.llm_format,
+                    llm_quality=settings.llm_quality,
+                    llm_max_width=settings.llm_max_width,
+                )
+    return _pipeline
+
+
+__all__ = [
+    'ChartImagePipeline',
+    'encode_for_llm',
+    'get_chart_image_pipeline',
+]
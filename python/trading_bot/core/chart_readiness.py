@@ -0,0 +1,272 @@
+"""
+Adaptive readiness detection for TradingView chart pages.
+
+Instead of sleeping a fixed 1-3 s after every navigation, click or timeframe
+change, race three readiness signals and return as soon as one fires:
+
+- network_idle:  Playwright's 'networkidle' load state (no requests for 500 ms),
+                 only after a real navigation (pass after_navigation=True): for
+                 in-page waits the load state is already reached and would
+                 return immediately
+- canvas_stable: two identical successive hashes of the chart canvases, once
+                 they show a non-blank paint or have changed during the wait
+- dom_quiet:     no DOM mutations under the chart container for a quiet period
+
+In-page actions (a click, a timeframe change) start with the previous chart
+already painted and quiet, so take canvas_snapshot() before the action and pass
+it as changed_from: both signals then only count once the canvas differs from
+that snapshot. The previous fixed sleep becomes the cap, so the worst case is
+unchanged.
+WaitTimings records how long each step waited and which signal ended it, so
+the capture summary shows which waits dominate.
+
+Usage:
+    from trading_bot.core.chart_readiness import WaitTimings, wait_for_chart_ready
+
+    await page.goto(url, wait_until='commit')
+    signal = await wait_for_chart_ready(page, ".chart-container", cap=3.0, after_navigation=True)
+
+    before = await canvas_snapshot(page, ".chart-container")
+    await button.click()
+    signal = await wait_for_chart_ready(page, ".chart-container", cap=1.0, changed_from=before)
+"""
+
+import asyncio
+import time
+from collections import Counter, defaultdict
+from typing import Any, Dict, List, Optional
+
+NETWORK_IDLE = 'network_idle'
+CANVAS_STABLE = 'canvas_stable'
+DOM_QUIET = 'dom_quiet'
+TIMEOUT = 'timeout'
+
+# Content hash of all canvases under the selector, and whether any of them is
+# painted (differs from a blank canvas of its size); null while absent or tainted
+_CANVAS_HASH_JS = """
+(selector) => {
+    const root = (selector && document.querySelector(selector)) || document;
+    const canvases = root.querySelectorAll('canvas');
+    if (!canvases.length) return null;
+    let h = 0;
+    let painted = false;
+    const blanks = {};
+    for (const c of canvases) {
+        let data;
+        try { data = c.toDataURL(); } catch (e) { return null; }
+        const size = c.width + 'x' + c.height;
+        if (!(size in blanks)) {
+            const blank = document.createElement('canvas');
+            blank.width = c.width;
+            blank.height = c.height;
+            blanks[size] = blank.toDataURL();
+        }
+        painted = painted || (c.width > 0 && c.height > 0 && data !== blanks[size]);
+        h = (Math.imul(h, 31) + c.width * 7 + c.height) | 0;
+        for (let i = 0; i < data.length; i++) h = (Math.imul(h, 31) + data.charCodeAt(i)) | 0;
+    }
+    return {hash: canvases.length + ':' + h, painted: painted};
+}
+"""
+
+# Resolves true after quietMs without mutations, false at capMs
+_DOM_QUIET_JS = """
+([selector, quietMs, capMs]) => new Promise((resolve) => {
+    const root = (selector && document.querySelector(selector)) || document.documentElement;
+    if (!root) { resolve(false); return; }
+    let quiet = null;
+    let cap = null;
+    const observer = new MutationObserver(() => {
+        clearTimeout(quiet);
+        quiet = setTimeout(() => finish(true), quietMs);
+    });
+    const finish = (value) => {
+        observer.disconnect();
+        clearTimeout(quiet);
+        clearTimeout(cap);
+        resolve(value);
+    };
+    observer.observe(root, {childList: true, subtree: true, attributes: true, characterData: true});
+    quiet = setTimeout(() => finish(true), quietMs);
+    cap = setTimeout(() => finish(false), capMs);
+})
+"""
+
+
+class WaitTimings:
+    """Per-step wait durations and the signal that ended each wait."""
+
+    def __init__(self):
+        self._durations: Dict[str, List[float]] = defaultdict(list)
+        self._signals: Dict[str, Counter] = defaultdict(Counter)
+
+    def record(self, step: str, seconds: float, signal: str) -> None:
+        self._durations[step].append(seconds)
+        self._signals[step][signal] += 1
+
+    def reset(self) -> None:
+        self._durations.clear()
+        self._signals.clear()
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """step -> count/total/mean/max seconds and signal counts, slowest total first."""
+        rows = {}
+        for step, durations in self._durations.items():
+            rows[step] = {
+                'count': len(durations),
+                'total': sum(durations),
+                'mean': sum(durations) / len(durations),
+                'max': max(durations),
+                'signals': dict(self._signals[step]),
+            }
+        return dict(sorted(rows.items(), key=lambda item: item[1]['total'], reverse=True))
+
+    def format_summary(self) -> str:
+        lines = []
+        for step, row in self.summary().items():
+            signals = ", ".join(f"{name}={count}" for name, count in row['signals'].items())
+            lines.append(
+                f"{step}: n={row['count']} total={row['total']:.2f}s "
+                f"mean={row['mean']:.2f}s max={row['max']:.2f}s ({signals})"
+            )
+        return "\n".join(lines)
+
+
+async def _network_idle(page, cap: float) -> bool:
+    await page.wait_for_load_state('networkidle', timeout=cap * 1000)
+    return True
+
+
+async def canvas_snapshot(page, selector: Optional[str] = None) -> str:
+    """Hash of the chart canvases before an in-page action ('' when none can be read)."""
+    try:
+        current = await page.evaluate(_CANVAS_HASH_JS, selector)
+    except Exception:
+        return ''
+    return current['hash'] if current else ''
+
+
+async def _canvas_stable(page, selector: Optional[str], poll_interval: float,
+                         changed_from: Optional[str] = None,
+                         changed_event: Optional[asyncio.Event] = None) -> bool:
+    # Two equal hashes of a blank (or not yet repainted) canvas prove nothing:
+    # also require a non-blank paint or a change seen during this wait. With a
+    # pre-action snapshot the old chart is painted too, so only a change counts
+    previous = None
+    changed = False
+    while True:
+        current = await page.evaluate(_CANVAS_HASH_JS, selector)
+        if current is not None:
+            if changed_from is not None and current['hash'] != changed_from:
+                changed = True
+            if previous is not None:
+                if current['hash'] != previous['hash']:
+                    changed = True
+                elif changed or (changed_from is None and current['painted']):
+                    return True
+            if changed and changed_event is not None:
+                changed_event.set()
+        previous = current
+        await asyncio.sleep(poll_interval)
+
+
+async def _dom_quiet(page, selector: Optional[str], quiet: float, cap: float,
+                     after: Optional[asyncio.Event] = None) -> bool:
+    if after is not None:
+        # The DOM is already quiet before an in-page action takes effect
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        await after.wait()
+        cap -= loop.time() - started
+        if cap <= 0:
+            return False
+    return bool(await page.evaluate(_DOM_QUIET_JS, [selector, int(quiet * 1000), int(cap * 1000)]))
+
+
+async def wait_for_chart_ready(
+    page,
+    selector: Optional[str] = None,
+    cap: float = 3.0,
+    quiet: float = 0.5,
+    poll_interval: float = 0.25,
+    after_navigation: bool = False,
+    changed_from: Optional[str] = None,
+) -> str:
+    """
+    Wait until the chart looks ready, at most `cap` seconds.
+
+    Args:
+        page: Playwright page
+        selector: Chart container (canvases and mutations are watched under it)
+        cap: Upper bound in seconds (the fixed sleep this replaces)
+        quiet: DOM mutation quiet period in seconds
+        poll_interval: Seconds between canvas hashes
+        after_navigation: The wait follows page.goto; also race 'networkidle'
+        changed_from: canvas_snapshot() taken before an in-page action; canvas
+            and DOM signals only count once the canvas differs from it
+
+    Returns:
+        The signal that fired first (NETWORK_IDLE, CANVAS_STABLE, DOM_QUIET) or TIMEOUT
+    """
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + cap
+    # Dict order breaks ties when several detectors finish in the same iteration
+    tasks = {}
+    if after_navigation:
+        tasks[asyncio.ensure_future(_network_idle(page, cap))] = NETWORK_IDLE
+    changed = asyncio.Event() if changed_from is not None else None
+    tasks[asyncio.ensure_future(_canvas_stable(page, selector, poll_interval, changed_from, changed))] = CANVAS_STABLE
+    tasks[asyncio.ensure_future(_dom_quiet(page, selector, quiet, cap, changed))] = DOM_QUIET
+    pending = set(tasks)
+    try:
+        while pending:
+            remaining = deadline - loop.time()
+            if remaining <= 0:
+                break
+            done, pending = await asyncio.wait(pending, timeout=remaining, return_when=asyncio.FIRST_COMPLETED)
+            # A detector that errors (closed page, CSP, unsupported state) just drops out
+            fired = [t for t in tasks if t in done and not t.cancelled() and t.exception() is None and t.result()]
+            if fired:
+                return tasks[fired[0]]
+        # Every detector dropped out early: fall back to the fixed wait
+        remaining = deadline - loop.time()
+        if remaining > 0:
+            await asyncio.sleep(remaining)
+        return TIMEOUT
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+
+
+async def timed_wait(
+    timings: Optional[WaitTimings],
+    step: str,
+    page,
+    selector: Optional[str] = None,
+    cap: float = 3.0,
+    adaptive: bool = True,
+    **kwargs,
+) -> str:
+    """wait_for_chart_ready (or a fixed sleep of `cap` when not adaptive), recorded under `step`."""
+    started = time.monotonic()
+    if adaptive and page is not None:
+        signal = await wait_for_chart_ready(page, selector, cap=cap, **kwargs)
+    else:
+        await asyncio.sleep(cap)
+        signal = 'fixed'
+    if timings is not None:
+        timings.record(step, time.monotonic() - started, signal)
+    return signal
+
+
+__all__ = [
+    'CANVAS_STABLE',
+    'DOM_QUIET',
+    'NETWORK_IDLE',
+    'TIMEOUT',
+    'WaitTimings',
+    'canvas_snapshot',
+    'timed_wait',
+    'wait_for_chart_ready',
+]
@@ -4,6 +4,10 @@ Only captures failures to keep the log trail focused and queryable.
 """
 
 import logging
+import queue
+import sys
+import threading
+import time
 import traceback
 import uuid
 import json
@@ -12,8 +16,9 @@ from pathlib import Path
 from typing import Optional, Dict, Any
 from contextvars import ContextVar
 
+from trading_bot.config.settings_v2 import get_static_config
 # Import centralized database client
-from trading_bot.db.client import get_connection, release_connection, execute, DB_TYPE
+from trading_bot.db.client import get_connection, release_connection, execute_many, DB_TYPE
 
 # Context variables for correlation IDs
 _current_run_id: ContextVar[Optional[str]] = ContextVar('run_id', default=None)
@@ -35,94 +40,178 @@ def clear_cycle_id() -> None:
     _current_cycle_id.set(None)
 
 
+_INSERT_SQL = """
+    INSERT INTO error_logs (
+        id, timestamp, level, run_id, cycle_id, trade_id, symbol,
+        component, event, message, stack_trace, context
+    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+
 class DatabaseErrorHandler(logging.Handler):
     """
     Logging handler that stores ERROR, WARNING, and CRITICAL logs to database.
     Uses centralized database client (auto-detects SQLite/PostgreSQL).
     Captures stack traces and context for debugging.
+
+    emit() only builds the row and puts it on a bounded queue; a background
+    writer thread drains the queue and stores rows with batched multi-row
+    inserts. When the queue is full, records are dropped (and counted) rather
+    than blocking the logging thread. Call flush() before exit to drain it.
     """
 
-    def __init__(self, db_path: str):
+    def __init__(self, db_path: str, queue_size: int = 1000,
+                 batch_size: int = 100, flush_interval: float = 1.0):
         super().__init__(level=logging.WARNING)  # WARNING and above (ERROR, CRITICAL)
         self.db_path = Path(db_path)
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.dropped = 0
+        self.written = 0
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._writer: Optional[threading.Thread] = None
+        self._writer_lock = threading.Lock()
+        self._stop = threading.Event()
 
     def emit(self, record: logging.LogRecord) -> None:
-        """Store error log to database with defensive error handling."""
+        """Queue the log row for the background writer (never blocks)."""
+        try:
+            row = self._build_row(record)
+        except Exception as e:
+            print(f"[ErrorLogger] ❌ Failed to build log row: {e}", file=sys.stderr)
+            return
+
+        self._ensure_writer()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            self.dropped += 1
+            # Report the first drop and then every 100th, not every record
+            if self.dropped == 1 or self.dropped % 100 == 0:
+                print(f"[ErrorLogger] ⚠️  Log queue full, dropped {self.dropped} record(s) so far", file=sys.stderr)
+
+    def _build_row(self, record: logging.LogRecord) -> tuple:
+        """Extract the error_logs row in the caller's thread (context vars live there)."""
+        # Extract context if provided via extra
+        context = getattr(record, 'context', None)
+        event = getattr(record, 'event', None)
+        symbol = getattr(record, 'symbol', None)
+        trade_id = getattr(record, 'trade_id', None)
+        cycle_id_override = getattr(record, 'cycle_id', None)
+
+        # Get stack trace for errors
+        stack_trace = None
+        if record.exc_info:
+            stack_trace = ''.join(traceback.format_exception(*record.exc_info))
+
+        context_json = json.dumps(context) if context else None
+
+        return (
+            str(uuid.uuid4())[:12],
+            datetime.now(timezone.utc).isoformat(),
+            record.levelname,
+            _current_run_id.get(),
+            cycle_id_override or _current_cycle_id.get(),
+            trade_id,
+            symbol,
+            record.name.split('.')[-1],  # Last part of logger name
+            event,
+            record.getMessage(),
+            stack_trace,
+            context_json,
+        )
+
+    def _ensure_writer(self) -> None:
+        if self._writer is not None and self._writer.is_alive():
+            return
+        with self._writer_lock:
+            if self._writer is None or not self._writer.is_alive():
+                self._stop.clear()
+                self._writer = threading.Thread(
+                    target=self._writer_loop, name="error-log-writer", daemon=True
+                )
+                self._writer.start()
+
+    def _writer_loop(self) -> None:
+        while not (self._stop.is_set() and self._queue.empty()):
+            try:
+                first = self._queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                continue
+            batch = [first]
+            while len(batch) < self.batch_size:
+                try:
+                    batch.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                self._write_batch(batch)
+            finally:
+                for _ in batch:
+                    self._queue.task_done()
+
+    def _write_batch(self, rows: list) -> None:
+        """Store rows in one transaction, falling back to stderr on failure."""
         conn = None
         try:
-            # Extract context if provided via extra
-            context = getattr(record, 'context', None)
-            event = getattr(record, 'event', None)
-            symbol = getattr(record, 'symbol', None)
-            trade_id = getattr(record, 'trade_id', None)
-            cycle_id_override = getattr(record, 'cycle_id', None)
-
-            # Get stack trace for errors
-            stack_trace = None
-            if record.exc_info:
-                stack_trace = ''.join(traceback.format_exception(*record.exc_info))
-
-            # Build log entry
-            log_id = str(uuid.uuid4())[:12]
-            timestamp = datetime.now(timezone.utc).isoformat()
-            run_id = _current_run_id.get()
-            cycle_id = cycle_id_override or _current_cycle_id.get()
-            component = record.name.split('.')[-1]  # Last part of logger name
-            message = record.getMessage()
-            context_json = json.dumps(context) if context else None
-
-            # Use centralized database client (auto-handles SQLite/PostgreSQL)
             # Use shorter timeout for logging to fail fast if pool exhausted
             try:
                 conn = get_connection(timeout_seconds=5.0)
-            except TimeoutError as timeout_err:
+            except TimeoutError:
                 # Pool exhausted - log to stderr instead of database
                 # This prevents cascade failure where logging errors prevent visibility
-                import sys
-                print(f"[ErrorLogger] ⚠️  Connection pool exhausted, logging to stderr instead", file=sys.stderr)
-                print(f"[ErrorLogger] {record.levelname}: {message}", file=sys.stderr)
-                if stack_trace:
-                    print(f"[ErrorLogger] Stack trace:\n{stack_trace}", file=sys.stderr)
+                print(f"[ErrorLogger] ⚠️  Connection pool exhausted, logging {len(rows)} record(s) to stderr instead", file=sys.stderr)
+                self._print_rows(rows)
                 return
 
-            execute(conn, """
-                INSERT INTO error_logs (
-                    id, timestamp, level, run_id, cycle_id, trade_id, symbol,
-                    component, event, message, stack_trace, context
-                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                log_id,
-                timestamp,
-                record.levelname,
-                run_id,
-                cycle_id,
-                trade_id,
-                symbol,
-                component,
-                event,
-                message,
-                stack_trace,
-                context_json,
-            ))
-
-            conn.commit()
+            execute_many(conn, _INSERT_SQL, rows)
+            self.written += len(rows)
 
             # DEBUG: Log successful database write
-            import sys
-            print(f"[ErrorLogger] ✅ Stored {record.levelname} to DB: {message[:80]}", file=sys.stderr)
+            print(f"[ErrorLogger] ✅ Stored {len(rows)} log(s) to DB: {rows[-1][9][:80]}", file=sys.stderr)
 
         except Exception as e:
             # Don't let logging errors break the app
             # Print to stderr for debugging (fallback when database unavailable)
-            import sys
-            print(f"[ErrorLogger] ❌ Failed to log error: {e}", file=sys.stderr)
-            print(f"[ErrorLogger] Original message: {record.getMessage()[:100]}", file=sys.stderr)
-            if hasattr(e, '__traceback__'):
-                print(f"[ErrorLogger] Error traceback: {traceback.format_exc()}", file=sys.stderr)
+            print(f"[ErrorLogger] ❌ Failed to log {len(rows)} record(s): {e}", file=sys.stderr)
+            self._print_rows(rows)
         finally:
             if conn:
                 release_connection(conn)
 
+    @staticmethod
+    def _print_rows(rows: list) -> None:
+        for row in rows:
+            print(f"[ErrorLogger] {row[2]}: {row[9][:100]}", file=sys.stderr)
+            if row[10]:
+                print(f"[ErrorLogger] Stack trace:\n{row[10]}", file=sys.stderr)
+
+    def flush(self, timeout: float = 5.0) -> bool:
+        """
+        Wait until every queued record has been written (or timeout expires).
+
+        Returns:
+            True if the queue was drained
+        """
+        if self._writer is None or not self._writer.is_alive():
+            return self._queue.unfinished_tasks == 0
+        deadline = time.monotonic() + timeout
+        with self._queue.all_tasks_done:
+            while self._queue.unfinished_tasks:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._queue.all_tasks_done.wait(remaining)
+        return True
+
+    def close(self) -> None:
+        """Drain the queue and stop the writer thread."""
+        self.flush()
+        self._stop.set()
+        if self._writer is not None:
+            self._writer.join(timeout=self.flush_interval + 1.0)
+        super().close()
+
 
 def log_error(
     logger: logging.Logger,
@@ -162,7 +251,8 @@ def log_error(
 
 def setup_error_logging(db_path: str) -> DatabaseErrorHandler:
     """
-    Add database error handler to root logger.
+    Add database error handler to root logger, sized from config.yaml
+    (logging.error_log).
     
     Args:
         db_path: Path to the trading.db file
@@ -170,7 +260,10 @@ def setup_error_logging(db_path: str) -> DatabaseErrorHandler:
     Returns:
         The handler instance (for cleanup if needed)
     """
-    handler = DatabaseErrorHandler(db_path)
+    settings = get_static_config().error_log
+    handler = DatabaseErrorHandler(db_path, queue_size=settings.queue_size,
+                                   batch_size=settings.batch_size,
+                                   flush_interval=settings.flush_interval)
     handler.setFormatter(logging.Formatter('%(message)s'))
     
     # Add to root logger so all loggers capture errors
@@ -179,3 +272,10 @@ def setup_error_logging(db_path: str) -> DatabaseErrorHandler:
     
     return handler
 
+
+def flush_error_logging(timeout: float = 5.0) -> None:
+    """Drain every DatabaseErrorHandler on the root logger (call before exit)."""
+    for handler in logging.getLogger().handlers:
+        if isinstance(handler, DatabaseErrorHandler):
+            if not handler.flush(timeout=timeout):
+                print(f"[ErrorLogger] ⚠️  Shutdown flush timed out, {handler._queue.qsize()} record(s) unwritten", file=sys.stderr)
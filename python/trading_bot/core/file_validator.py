@@ -342,11 +342,12 @@ class FileValidator:
                 # If so, use centralized storage layer
                 file_path_obj = Path(file_path)
                 if 'charts' in file_path_obj.parts:
-                    from trading_bot.core.storage import delete_file, get_storage_type
+                    from trading_bot.core.chart_images import get_chart_image_pipeline
 
-                    # Extract filename for storage layer
+                    # Extract filename for storage layer; the pipeline drops its
+                    # copy and any queued write of the chart (saved as charts/<name>)
                     filename = file_path_obj.name
-                    storage_result = delete_file(filename)
+                    storage_result = get_chart_image_pipeline().delete(f"charts/{filename}", storage_path=filename)
 
                     if not storage_result.get('success'):
                         raise Exception(storage_result.get('error', 'Delete failed'))
@@ -0,0 +1,380 @@
+"""
+Shared, memoized technical indicator engine.
+
+Strategies and advisor nodes that look at the same market ask for overlapping
+indicator sets (SMA/EMA/RSI/MACD/ATR/Bollinger) on the same candles. The engine
+computes each requested indicator once per (symbol, timeframe, last candle)
+and keeps the results in an LRU cache.
+
+When the next request for a series carries exactly one appended candle,
+cached indicators are advanced by one bar from their saved state instead of
+being recomputed: recursive indicators (EMA, RSI, ATR, MACD) take one
+recurrence step and windowed ones (SMA, Bollinger) look only at their window.
+Anything else - a fixed-size fetch window that dropped its oldest candle, a
+revised last candle (the previously open bar closing at a different price) or
+a gap - falls back to a full recompute, since recursive indicators seeded on
+a longer history would no longer match a computation on the frame given.
+
+Full computations use pandas_ta and one-bar steps follow the same
+recurrences, so values match the direct pandas_ta calls the strategies made
+before, whatever the cache state.
+
+Indicator names:
+    sma_N, ema_N, rsi_N, atr_N, volume_sma_N   -> pd.Series
+    macd_F_S_G                                  -> DataFrame: macd, signal, hist
+    bbands_N_K                                  -> DataFrame: lower, middle, upper
+
+Usage:
+    from trading_bot.core.indicator_engine import get_indicator_engine
+
+    ind = get_indicator_engine().compute(df, ['rsi_14', 'macd_12_26_9'], symbol='BTCUSDT', timeframe='1h')
+    df['rsi'] = ind['rsi_14']          # None when there are too few candles
+
+Candles need a 'timestamp' (or 'start_time') column or a DatetimeIndex to be
+cached; without one, or without symbol/timeframe, indicators are computed
+directly.
+
+Configuration (config.yaml, indicators):
+    cache_enabled  cache indicators across calls (default true)
+    cache_size     (symbol, timeframe) series kept (default 256)
+"""
+
+import abc
+import logging
+import re
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+import pandas_ta as ta
+
+from trading_bot.config.settings_v2 import get_static_config
+
+logger = logging.getLogger(__name__)
+
+_BAR_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# Output arrays of one indicator: {'value': arr} or {'macd': arr, 'signal': arr, ...}
+Outputs = Dict[str, np.ndarray]
+Result = Union[pd.Series, pd.DataFrame, None]
+
+
+def _array(series: Optional[pd.Series]) -> Optional[np.ndarray]:
+    return None if series is None else series.to_numpy(dtype=float)
+
+
+class _Indicator(abc.ABC):
+    """One indicator: full computation plus a one-bar update from saved state."""
+
+    multi = False
+
+    @abc.abstractmethod
+    def full(self, bars: Dict[str, np.ndarray]) -> Tuple[Optional[Outputs], Any]:
+        """Outputs over all bars (None when too short) and the state step() continues from."""
+
+    @abc.abstractmethod
+    def step(self, bars: Dict[str, np.ndarray], state: Any) -> Tuple[Dict[str, float], Any]:
+        """Latest value(s) for the newest bar appended to bars, and the new state."""
+
+
+class _SMA(_Indicator):
+    def __init__(self, source: str, length: int):
+        self.source, self.length = source, length
+
+    def full(self, bars):
+        values = _array(ta.sma(pd.Series(bars[self.source]), length=self.length))
+        return (None if values is None else {'value': values}), None
+
+    def step(self, bars, state):
+        return {'value': float(np.mean(bars[self.source][-self.length:]))}, None
+
+
+class _EMA(_Indicator):
+    def __init__(self, length: int):
+        self.length = length
+        self.alpha = 2.0 / (length + 1)
+
+    def full(self, bars):
+        values = _array(ta.ema(pd.Series(bars['close']), length=self.length))
+        if values is None:
+            return None, None
+        return {'value': values}, values[-1]
+
+    def step(self, bars, last):
+        value = last + self.alpha * (bars['close'][-1] - last)
+        return {'value': value}, value
+
+
+class _RSI(_Indicator):
+    """pandas_ta's RSI: RMA of gains over RMA of gains + |losses|."""
+
+    def __init__(self, length: int):
+        self.length = length
+        self.alpha = 1.0 / length
+
+    def full(self, bars):
+        close = pd.Series(bars['close'])
+        if len(close) < self.length + 1:
+            return None, None
+        change = close.diff()
+        gain_avg = change.clip(lower=0).ewm(alpha=self.alpha, adjust=False).mean()
+        loss_avg = change.clip(upper=0).ewm(alpha=self.alpha, adjust=False).mean().abs()
+        values = (100 * gain_avg / (gain_avg + loss_avg)).to_numpy(dtype=float)
+        return {'value': values}, (gain_avg.iloc[-1], loss_avg.iloc[-1])
+
+    def step(self, bars, state):
+        gain_avg, loss_avg = state
+        change = bars['close'][-1] - bars['close'][-2]
+        gain_avg += self.alpha * (max(change, 0.0) - gain_avg)
+        loss_avg += self.alpha * (max(-change, 0.0) - loss_avg)
+        total = gain_avg + loss_avg
+        value = 100 * gain_avg / total if total else np.nan
+        return {'value': value}, (gain_avg, loss_avg)
+
+
+class _ATR(_Indicator):
+    def __init__(self, length: int):
+        self.length = length
+
+    def full(self, bars):
+        values = _array(ta.atr(pd.Series(bars['high']), pd.Series(bars['low']),
+                               pd.Series(bars['close']), length=self.length))
+        if values is None:
+            return None, None
+        return {'value': values}, values[-1]
+
+    def step(self, bars, last):
+        high, low, prev_close = bars['high'][-1], bars['low'][-1], bars['close'][-2]
+        high_low = (high - low) or np.finfo(float).eps
+        true_range = max(high_low, abs(high - prev_close), abs(prev_close - low))
+        value = last + (true_range - last) / self.length
+        return {'value': value}, value
+
+
+class _MACD(_Indicator):
+    multi = True
+
+    def __init__(self, fast: int, slow: int, signal: int):
+        self.fast, self.slow, self.signal = sorted((fast, slow)) + [signal]
+        self.alphas = tuple(2.0 / (n + 1) for n in (self.fast, self.slow, self.signal))
+
+    def full(self, bars):
+        close = pd.Series(bars['close'])
+        if len(close) < self.slow + self.signal - 1:
+            return None, None
+        # Same construction as ta.macd: EMA(fast) - EMA(slow), signal = EMA of the valid MACD values
+        fast_ma = ta.ema(close, length=self.fast)
+        slow_ma = ta.ema(close, length=self.slow)
+        macd = fast_ma - slow_ma
+        signal = ta.ema(macd.loc[macd.first_valid_index():], length=self.signal)
+        if signal is None:
+            return None, None
+        signal = signal.reindex(macd.index)
+        outputs = {
+            'macd': macd.to_numpy(dtype=float),
+            'signal': signal.to_numpy(dtype=float),
+            'hist': (macd - signal).to_numpy(dtype=float),
+        }
+        return outputs, (fast_ma.iloc[-1], slow_ma.iloc[-1], signal.iloc[-1])
+
+    def step(self, bars, state):
+        fast_ma, slow_ma, signal = state
+        close = bars['close'][-1]
+        a_fast, a_slow, a_signal = self.alphas
+        fast_ma += a_fast * (close - fast_ma)
+        slow_ma += a_slow * (close - slow_ma)
+        macd = fast_ma - slow_ma
+        signal += a_signal * (macd - signal)
+        return {'macd': macd, 'signal': signal, 'hist': macd - signal}, (fast_ma, slow_ma, signal)
+
+
+class _BBands(_Indicator):
+    multi = True
+
+    def __init__(self, length: int, std: float):
+        self.length, self.std = length, std
+
+    def _bands(self, close: np.ndarray) -> Optional[Outputs]:
+        bb = ta.bbands(pd.Series(close), length=self.length, lower_std=self.std, upper_std=self.std)
+        if bb is None:
+            return None
+        # Column names differ between pandas_ta releases (BBL_20_2.0 vs BBL_20_2.0_2.0)
+        columns = {col[:3]: col for col in bb.columns}
+        if not all(prefix in columns for prefix in ('BBL', 'BBM', 'BBU')):
+            logger.warning(f"Unexpected Bollinger Bands columns: {bb.columns.tolist()}")
+            return None
+        return {
+            'lower': bb[columns['BBL']].to_numpy(dtype=float),
+            'middle': bb[columns['BBM']].to_numpy(dtype=float),
+            'upper': bb[columns['BBU']].to_numpy(dtype=float),
+        }
+
+    def full(self, bars):
+        return self._bands(bars['close']), None
+
+    def step(self, bars, state):
+        window = self._bands(bars['close'][-self.length:])
+        return {name: values[-1] for name, values in window.items()}, None
+
+
+_INDICATOR_PATTERNS = (
+    (re.compile(r'sma_(\d+)'), lambda n: _SMA('close', int(n))),
+    (re.compile(r'volume_sma_(\d+)'), lambda n: _SMA('volume', int(n))),
+    (re.compile(r'ema_(\d+)'), lambda n: _EMA(int(n))),
+    (re.compile(r'rsi_(\d+)'), lambda n: _RSI(int(n))),
+    (re.compile(r'atr_(\d+)'), lambda n: _ATR(int(n))),
+    (re.compile(r'macd_(\d+)_(\d+)_(\d+)'), lambda f, s, g: _MACD(int(f), int(s), int(g))),
+    (re.compile(r'bbands_(\d+)_(\d+(?:\.\d+)?)'), lambda n, k: _BBands(int(n), float(k))),
+)
+
+
+def parse_indicator(name: str) -> _Indicator:
+    """Indicator for a name such as 'ema_200' or 'macd_12_26_9'."""
+    for pattern, factory in _INDICATOR_PATTERNS:
+        match = pattern.fullmatch(name)
+        if match:
+            return factory(*match.groups())
+    raise ValueError(f"Unknown indicator: {name}")
+
+
+@dataclass
+class _SeriesEntry:
+    """Cached indicators of one (symbol, timeframe) candle series."""
+    timestamps: np.ndarray
+    last_bar: Tuple[float, ...]
+    outputs: Dict[str, Optional[Outputs]] = field(default_factory=dict)
+    states: Dict[str, Any] = field(default_factory=dict)
+
+
+def _timestamps(df: pd.DataFrame) -> Optional[np.ndarray]:
+    for column in ('timestamp', 'start_time'):
+        if column in df.columns:
+            return df[column].to_numpy()
+    if isinstance(df.index, pd.DatetimeIndex):
+        return df.index.to_numpy()
+    return None
+
+
+def _bar_at(bars: Dict[str, np.ndarray], i: int) -> Tuple[float, ...]:
+    return tuple(float(values[i]) for values in bars.values())
+
+
+class IndicatorEngine:
+    """LRU cache of indicator series with one-bar incremental updates."""
+
+    def __init__(self, max_series: int = 256, enabled: bool = True):
+        self.max_series = max_series
+        self.enabled = enabled
+        self._entries: "OrderedDict[Tuple[str, str], _SeriesEntry]" = OrderedDict()
+        self._indicators: Dict[str, _Indicator] = {}
+        self._lock = threading.RLock()
+        self.hits = 0
+        self.incremental = 0
+        self.misses = 0
+
+    def _indicator(self, name: str) -> _Indicator:
+        indicator = self._indicators.get(name)
+        if indicator is None:
+            indicator = self._indicators[name] = parse_indicator(name)
+        return indicator
+
+    def _advance(self, entry: _SeriesEntry, bars: Dict[str, np.ndarray]) -> None:
+        """Move every cached indicator forward by the newest (appended) bar."""
+        for name, outputs in list(entry.outputs.items()):
+            indicator = self._indicator(name)
+            if outputs is None:
+                # Was too short before; the new bar may be enough now
+                entry.outputs[name], entry.states[name] = indicator.full(bars)
+                continue
+            latest, entry.states[name] = indicator.step(bars, entry.states[name])
+            entry.outputs[name] = {key: np.append(values, latest[key]) for key, values in outputs.items()}
+
+    def _entry_for(self, key: Tuple[str, str], timestamps: np.ndarray,
+                   bars: Dict[str, np.ndarray]) -> _SeriesEntry:
+        entry = self._entries.get(key)
+        last_bar = _bar_at(bars, -1)
+        if entry is not None:
+            cached = entry.timestamps
+            if len(cached) == len(timestamps) and np.array_equal(cached, timestamps) and entry.last_bar == last_bar:
+                self.hits += 1
+                return entry
+            appended = len(timestamps) == len(cached) + 1 and np.array_equal(cached, timestamps[:-1])
+            if appended and entry.last_bar == _bar_at(bars, -2):
+                self._advance(entry, bars)
+                entry.timestamps, entry.last_bar = timestamps, last_bar
+                self.incremental += 1
+                return entry
+        self.misses += 1
+        entry = _SeriesEntry(timestamps, last_bar)
+        self._entries[key] = entry
+        return entry
+
+    def compute(self, df: pd.DataFrame, indicators: Iterable[str],
+                symbol: Optional[str] = None, timeframe: Optional[str] = None) -> Dict[str, Result]:
+        """
+        Indicators for a chronological OHLCV frame.
+
+        Returns {name: Series/DataFrame aligned to df.index, or None when the
+        frame has too few candles for that indicator}.
+        """
+        names = list(indicators)
+        bars = {col: df[col].to_numpy(dtype=float) for col in _BAR_COLUMNS if col in df.columns}
+        timestamps = _timestamps(df) if self.enabled and symbol and timeframe and len(df) else None
+
+        with self._lock:
+            if timestamps is None:
+                entry = _SeriesEntry(np.empty(0), ())
+            else:
+                key = (symbol, timeframe)
+                entry = self._entry_for(key, timestamps, bars)
+                self._entries.move_to_end(key)
+                while len(self._entries) > self.max_series:
+                    self._entries.popitem(last=False)
+
+            for name in names:
+                if name not in entry.outputs:
+                    entry.outputs[name], entry.states[name] = self._indicator(name).full(bars)
+            outputs = {name: entry.outputs[name] for name in names}
+
+        results: Dict[str, Result] = {}
+        for name, output in outputs.items():
+            if output is None:
+                results[name] = None
+            elif self._indicator(name).multi:
+                results[name] = pd.DataFrame({k: v.copy() for k, v in output.items()}, index=df.index)
+            else:
+                results[name] = pd.Series(output['value'].copy(), index=df.index, name=name)
+        return results
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {'series': len(self._entries), 'hits': self.hits,
+                'incremental': self.incremental, 'misses': self.misses}
+
+
+_engine: Optional[IndicatorEngine] = None
+_engine_lock = threading.Lock()
+
+
+def get_indicator_engine() -> IndicatorEngine:
+    """Process-wide indicator engine, configured from config.yaml (indicators)."""
+    global _engine
+    if _engine is None:
+        with _engine_lock:
+            if _engine is None:
+                settings = get_static_config().indicators
+                _engine = IndicatorEngine(max_series=settings.cache_size, enabled=settings.cache_enabled)
+    return _engine
+
+
+__all__ = [
+    'IndicatorEngine',
+    'get_indicator_engine',
+    'parse_indicator',
+]
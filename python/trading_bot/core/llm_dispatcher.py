@@ -0,0 +1,585 @@
+"""
+LLM call dispatcher with bounded concurrency and OpenAI rate-limit awareness.
+
+Every chart analysis (live cycle, tournament, image backtest) goes through one
+process-wide dispatcher, so they share a single concurrency cap and a pair of
+token buckets (requests/min and tokens/min). The buckets are resynced from the
+x-ratelimit-* response headers via an httpx hook attached to the OpenAI client.
+A 429 seen during a call pauses new dispatches until the advertised reset and
+re-queues the call with jittered exponential backoff.
+
+From the event loop, run_async() awaits rate-limit and backoff waits with
+asyncio.sleep and runs the call on the dispatcher's own executor (sized to
+the concurrency cap), so queued analyses never hold default-executor threads.
+Coroutine functions (e.g. an AsyncOpenAI-based analysis) are awaited on the
+loop instead; their blocking steps can use run_blocking().
+
+Usage:
+    from trading_bot.core.llm_dispatcher import get_llm_dispatcher
+
+    dispatcher = get_llm_dispatcher()
+    dispatcher.attach(openai_client)
+    result = dispatcher.run(analyzer.analyze_chart, image_path=path, label="BTCUSDT")
+    result = await dispatcher.run_async(analyzer.analyze_chart, image_path=path)
+    result = await dispatcher.run_async(analyzer.analyze_chart_async, image_path=path,
+                                        run_blocking=dispatcher.run_blocking)
+
+Configuration (config.yaml, openai.dispatcher):
+    max_concurrency      Max in-flight calls (default 16)
+    requests_per_minute  Request bucket size, until headers say otherwise (default: unlimited)
+    tokens_per_minute    Token bucket size, until headers say otherwise (default: unlimited)
+    tokens_per_call      Token estimate charged per call (default 3000)
+    max_retries          Re-queues after a rate-limited call (default 5)
+"""
+
+import asyncio
+import contextvars
+import functools
+import logging
+import random
+import re
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+from trading_bot.config.settings_v2 import get_static_config
+
+logger = logging.getLogger(__name__)
+
+_DURATION_PART = re.compile(r'(\d+(?:\.\d+)?)(ms|h|m|s)')
+
+
+def parse_reset_duration(value: Optional[str]) -> Optional[float]:
+    """Parse OpenAI reset values like '1s', '6m0s', '20ms' into seconds."""
+    if not value:
+        return None
+    try:
+        return float(value)
+    except ValueError:
+        pass
+    parts = _DURATION_PART.findall(value)
+    if not parts:
+        return None
+    scale = {'h': 3600.0, 'm': 60.0, 's': 1.0, 'ms': 0.001}
+    return sum(float(amount) * scale[unit] for amount, unit in parts)
+
+
+class TokenBucket:
+    """Thread-safe token bucket; capacity None means unlimited.
+
+    burst caps how many tokens can accumulate (default: a full minute's worth).
+    """
+
+    def __init__(self, per_minute: Optional[float] = None, burst: Optional[float] = None):
+        self._lock = threading.Lock()
+        self.capacity: Optional[float] = None
+        self.burst = burst
+        self.rate = 0.0
+        self.tokens = 0.0
+        self._updated = time.monotonic()
+        self.set_limit(per_minute)
+
+    def set_limit(self, per_minute: Optional[float]) -> None:
+        with self._lock:
+            if not per_minute or per_minute <= 0:
+                self.capacity = None
+                return
+            first = self.capacity is None
+            self.capacity = float(self.burst or per_minute)
+            self.rate = float(per_minute) / 60.0
+            if first:
+                self.tokens = self.capacity
+            self.tokens = min(self.tokens, self.capacity)
+
+    def set_remaining(self, remaining: float) -> None:
+        """Trust the server's view of what is left in the current window."""
+        with self._lock:
+            if self.capacity is None:
+                return
+            self._refill()
+            self.tokens = min(float(remaining), self.capacity)
+
+    def _refill(self) -> None:
+        now = time.monotonic()
+        if self.capacity is not None:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def reserve(self, amount: float) -> float:
+        """Take amount now (possibly going negative) and return seconds to wait before using it."""
+        with self._lock:
+            if self.capacity is None or amount <= 0:
+                return 0.0
+            self._refill()
+            # A single call larger than the whole bucket waits for a full bucket
+            amount = min(amount, self.capacity)
+            self.tokens -= amount
+            return 0.0 if self.tokens >= 0 else -self.tokens / self.rate
+
+
+class _SlotWaiter:
+    """A thread (event) or task (loop future) queued for a slot."""
+
+    __slots__ = ('event', 'loop', 'future', 'granted')
+
+    def __init__(self, event: Optional[threading.Event] = None,
+                 loop: Optional[asyncio.AbstractEventLoop] = None,
+                 future: Optional[asyncio.Future] = None):
+        self.event = event
+        self.loop = loop
+        self.future = future
+        self.granted = False
+
+    def grant(self) -> bool:
+        """Hand the slot over; False if the waiter's loop is gone."""
+        if self.event is not None:
+            self.event.set()
+        else:
+            try:
+                self.loop.call_soon_threadsafe(_resolve_waiter, self.future)
+            except RuntimeError:  # loop closed
+                return False
+        self.granted = True
+        return True
+
+
+def _resolve_waiter(future: asyncio.Future) -> None:
+    if not future.done():
+        future.set_result(None)
+
+
+class _SlotPool:
+    """
+    Concurrency slots shared by threads and event-loop tasks, handed out in
+    FIFO order. release() passes a slot straight to the oldest waiter, so
+    queued tasks sleep on a future instead of polling.
+    """
+
+    def __init__(self, size: int):
+        self._free = size
+        self._waiters: deque = deque()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Block the calling thread until it holds a slot."""
+        with self._lock:
+            if self._free > 0 and not self._waiters:
+                self._free -= 1
+                return
+            waiter = _SlotWaiter(event=threading.Event())
+            self._waiters.append(waiter)
+        waiter.event.wait()
+
+    async def acquire_async(self) -> None:
+        """Await a slot without holding a thread."""
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            if self._free > 0 and not self._waiters:
+                self._free -= 1
+                return
+            waiter = _SlotWaiter(loop=loop, future=loop.create_future())
+            self._waiters.append(waiter)
+        try:
+            await waiter.future
+        except BaseException:
+            with self._lock:
+                granted = waiter.granted
+                if not granted:
+                    self._waiters.remove(waiter)
+            if granted:
+                # Cancelled after the slot was handed over: pass it on
+                self.release()
+            raise
+
+    def release(self) -> None:
+        with self._lock:
+            while self._waiters:
+                if self._waiters.popleft().grant():
+                    return
+            self._free += 1
+
+
+class LLMDispatcher:
+    """Bounded-concurrency, rate-limited executor for blocking LLM calls."""
+
+    def __init__(
+        self,
+        max_concurrency: int = 16,
+        requests_per_minute: Optional[float] = None,
+        tokens_per_minute: Optional[float] = None,
+        tokens_per_call: int = 3000,
+        max_retries: int = 5,
+        base_backoff: float = 2.0,
+        max_backoff: float = 60.0,
+    ):
+        self.max_concurrency = max_concurrency
+        self.tokens_per_call = tokens_per_call
+        self.max_retries = max_retries
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.request_bucket = TokenBucket(requests_per_minute)
+        self.token_bucket = TokenBucket(tokens_per_minute)
+        self._slots = _SlotPool(max_concurrency)
+        # Outcome of the dispatched call running in this thread / task (None outside one)
+        self._current: contextvars.ContextVar[Optional[_Outcome]] = contextvars.ContextVar('llm_dispatch_call', default=None)
+        self._lock = threading.Lock()
+        self._blocked_until = 0.0
+        self._attached: set = set()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._stats = {
+            'calls': 0,
+            'retries': 0,
+            'rate_limited_responses': 0,
+            'gave_up': 0,
+            'queue_wait_total': 0.0,
+            'queue_wait_max': 0.0,
+            'service_time_total': 0.0,
+            'service_time_max': 0.0,
+        }
+        self._recent: deque = deque(maxlen=200)
+
+    # ------------------------------------------------------------------
+    # Rate-limit feedback
+    # ------------------------------------------------------------------
+
+    def attach(self, openai_client: Any) -> Any:
+        """Hook the client's HTTP responses so headers and 429s feed the dispatcher."""
+        http_client = getattr(openai_client, '_client', None)
+        if http_client is None or not hasattr(http_client, 'event_hooks') or id(http_client) in self._attached:
+            return openai_client
+        hooks = http_client.event_hooks
+        hook = self.response_hook
+        if isinstance(http_client, httpx.AsyncClient):
+            # AsyncOpenAI: httpx awaits its hooks
+            async def hook(response: Any) -> None:
+                self.response_hook(response)
+        hooks['response'] = list(hooks.get('response', [])) + [hook]
+        http_client.event_hooks = hooks
+        self._attached.add(id(http_client))
+        return openai_client
+
+    def response_hook(self, response: Any) -> None:
+        """httpx response hook: resync buckets and record 429s."""
+        try:
+            self.update_from_headers(response.headers)
+            if response.status_code == 429:
+                retry_after = parse_reset_duration(response.headers.get('retry-after'))
+                if retry_after is None:
+                    retry_after = parse_reset_duration(response.headers.get('x-ratelimit-reset-requests'))
+                self.note_rate_limited(retry_after)
+        except Exception as e:
+            logger.debug(f"LLM dispatcher response hook failed: {e}")
+
+    def update_from_headers(self, headers: Any) -> None:
+        """Apply x-ratelimit-{limit,remaining}-{requests,tokens} headers."""
+        for kind, bucket in (('requests', self.request_bucket), ('tokens', self.token_bucket)):
+            limit = headers.get(f'x-ratelimit-limit-{kind}')
+            remaining = headers.get(f'x-ratelimit-remaining-{kind}')
+            try:
+                if limit is not None:
+                    bucket.set_limit(float(limit))
+                if remaining is not None:
+                    bucket.set_remaining(float(remaining))
+            except ValueError:
+                continue
+
+    def note_rate_limited(self, retry_after: Optional[float] = None) -> None:
+        """Record a 429: pause new dispatches and flag the call on this thread/task."""
+        pause = retry_after if retry_after is not None else self.base_backoff
+        with self._lock:
+            self._stats['rate_limited_responses'] += 1
+            self._blocked_until = max(self._blocked_until, time.monotonic() + pause)
+        current = self._current.get()
+        if current is not None:
+            current.rate_limited = True
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _default_is_failure(result: Any) -> bool:
+        return result is None or (isinstance(result, dict) and bool(result.get('error')))
+
+    def run(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        label: str = '',
+        est_tokens: Optional[int] = None,
+        is_failure: Optional[Callable[[Any], bool]] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        Call fn(*args, **kwargs) under the concurrency cap and rate limits.
+
+        If the call hit a 429 and failed (raised, or is_failure(result) is
+        true), it is re-queued with jittered exponential backoff up to
+        max_retries times; the last outcome is returned or re-raised.
+        """
+        if self._current.get() is not None:
+            # Nested dispatch from inside a dispatched call: already holds a slot
+            return fn(*args, **kwargs)
+
+        tokens = self.tokens_per_call if est_tokens is None else est_tokens
+        attempt = 0
+        while True:
+            queued_at = time.monotonic()
+            self._slots.acquire()
+            try:
+                self._wait_for_capacity(tokens)
+                outcome = self._attempt(fn, args, kwargs, queued_at)
+            finally:
+                self._slots.release()
+            delay = self._retry_delay(fn, label, outcome, attempt, is_failure)
+            if delay is None:
+                return outcome.unwrap()
+            attempt += 1
+            time.sleep(delay)
+
+    async def run_async(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        label: str = '',
+        est_tokens: Optional[int] = None,
+        is_failure: Optional[Callable[[Any], bool]] = None,
+        **kwargs: Any,
+    ) -> Any:
+        """
+        run() for use from the event loop.
+
+        Rate-limit, backoff and slot waits are awaited on the loop. A plain
+        function then runs on the dispatcher's own executor (max_concurrency
+        threads), so queued analyses hold no threads while they wait; a
+        coroutine function is awaited on the loop.
+        """
+        is_coroutine = asyncio.iscoroutinefunction(fn)
+        if self._current.get() is not None:
+            # Nested dispatch from inside a dispatched coroutine: already holds a slot
+            return await (fn(*args, **kwargs) if is_coroutine else self.run_blocking(fn, *args, **kwargs))
+
+        loop = asyncio.get_running_loop()
+        tokens = self.tokens_per_call if est_tokens is None else est_tokens
+        attempt = 0
+        while True:
+            queued_at = time.monotonic()
+            await asyncio.sleep(self._reserve_capacity(tokens))
+            # A 429 seen by another call while this one waited pauses it too
+            while (pause := self._blocked_for()) > 0:
+                await asyncio.sleep(pause)
+            # Hold the slot before taking an executor thread, so threads never block on slots
+            await self._slots.acquire_async()
+            try:
+                if is_coroutine:
+                    outcome = await self._attempt_async(fn, args, kwargs, queued_at)
+                else:
+                    outcome = await loop.run_in_executor(
+                        self._get_executor(), self._attempt, fn, args, kwargs, queued_at
+                    )
+            finally:
+                self._slots.release()
+            delay = self._retry_delay(fn, label, outcome, attempt, is_failure)
+            if delay is None:
+                return outcome.unwrap()
+            attempt += 1
+            await asyncio.sleep(delay)
+
+    async def run_blocking(self, fn: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking step of a dispatched coroutine on the dispatcher's executor."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._get_executor(), functools.partial(fn, *args, **kwargs))
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(
+                    max_workers=self.max_concurrency, thread_name_prefix='llm-dispatch'
+                )
+            return self._executor
+
+    def _attempt(
+        self,
+        fn: Callable[..., Any],
+        args: tuple,
+        kwargs: Dict[str, Any],
+        queued_at: float,
+    ) -> '_Outcome':
+        """One attempt of fn; the caller holds a concurrency slot."""
+        outcome = _Outcome()
+        started_at = time.monotonic()
+        token = self._current.set(outcome)
+        try:
+            outcome.result = fn(*args, **kwargs)
+        except Exception as e:
+            outcome.error = e
+        finally:
+            self._current.reset(token)
+        return self._finish_attempt(outcome, started_at, queued_at)
+
+    async def _attempt_async(
+        self,
+        fn: Callable[..., Any],
+        args: tuple,
+        kwargs: Dict[str, Any],
+        queued_at: float,
+    ) -> '_Outcome':
+        """_attempt for a coroutine function, awaited on the loop."""
+        outcome = _Outcome()
+        started_at = time.monotonic()
+        token = self._current.set(outcome)
+        try:
+            outcome.result = await fn(*args, **kwargs)
+        except Exception as e:
+            outcome.error = e
+        finally:
+            self._current.reset(token)
+        return self._finish_attempt(outcome, started_at, queued_at)
+
+    @staticmethod
+    def _finish_attempt(outcome: '_Outcome', started_at: float, queued_at: float) -> '_Outcome':
+        outcome.service_time = time.monotonic() - started_at
+        outcome.queue_wait = started_at - queued_at
+        outcome.rate_limited = outcome.rate_limited or _is_rate_limit_error(outcome.error)
+        return outcome
+
+    def _retry_delay(
+        self,
+        fn: Callable[..., Any],
+        label: str,
+        outcome: '_Outcome',
+        attempt: int,
+        is_failure: Optional[Callable[[Any], bool]],
+    ) -> Optional[float]:
+        """Record the attempt; return the backoff before re-queueing it, or None if it is final."""
+        self._record(label, outcome.queue_wait, outcome.service_time, attempt)
+        is_failure = is_failure or self._default_is_failure
+        failed = outcome.error is not None or is_failure(outcome.result)
+        if not (outcome.rate_limited and failed):
+            return None
+
+        if attempt >= self.max_retries:
+            with self._lock:
+                self._stats['gave_up'] += 1
+            logger.warning(f"LLM call {label or getattr(fn, '__name__', 'call')} still rate limited after {attempt} retries")
+            return None
+
+        delay = min(self.max_backoff, self.base_backoff * (2 ** attempt)) * random.uniform(0.5, 1.5)
+        with self._lock:
+            self._stats['retries'] += 1
+        logger.info(f"LLM call {label or getattr(fn, '__name__', 'call')} rate limited (429), retry {attempt + 1}/{self.max_retries} in {delay:.1f}s")
+        return delay
+
+    def _blocked_for(self) -> float:
+        with self._lock:
+            return self._blocked_until - time.monotonic()
+
+    def _reserve_capacity(self, tokens: int) -> float:
+        """Reserve one request and `tokens` tokens; return seconds to wait before calling."""
+        return max(
+            0.0,
+            self._blocked_for(),
+            self.request_bucket.reserve(1),
+            self.token_bucket.reserve(tokens),
+        )
+
+    def _wait_for_capacity(self, tokens: int) -> None:
+        wait = self._reserve_capacity(tokens)
+        if wait > 0:
+            time.sleep(wait)
+
+    def _record(self, label: str, queue_wait: float, service_time: float, attempt: int) -> None:
+        with self._lock:
+            stats = self._stats
+            stats['calls'] += 1
+            stats['queue_wait_total'] += queue_wait
+            stats['queue_wait_max'] = max(stats['queue_wait_max'], queue_wait)
+            stats['service_time_total'] += service_time
+            stats['service_time_max'] = max(stats['service_time_max'], service_time)
+            self._recent.append({
+                'label': label,
+                'queue_wait': queue_wait,
+                'service_time': service_time,
+                'attempt': attempt,
+            })
+        logger.debug(f"LLM call {label}: queue_wait={queue_wait:.2f}s service_time={service_time:.2f}s attempt={attempt}")
+
+    def metrics(self) -> Dict[str, Any]:
+        """Aggregate counters plus the most recent per-call timings."""
+        with self._lock:
+            stats = dict(self._stats)
+            recent = list(self._recent)
+        calls = stats['calls'] or 1
+        stats['queue_wait_avg'] = stats['queue_wait_total'] / calls
+        stats['service_time_avg'] = stats['service_time_total'] / calls
+        stats['max_concurrency'] = self.max_concurrency
+        stats['requests_per_minute'] = self.request_bucket.capacity
+        stats['tokens_per_minute'] = self.token_bucket.capacity
+        stats['recent'] = recent
+        return stats
+
+    def metrics_since(self, before: Dict[str, Any]) -> Dict[str, Any]:
+        """Counters added since an earlier metrics() snapshot, with averages over that span."""
+        now = self.metrics()
+        delta = {key: now[key] - before.get(key, 0) for key in _CUMULATIVE_STATS}
+        calls = delta['calls'] or 1
+        delta['queue_wait_avg'] = delta['queue_wait_total'] / calls
+        delta['service_time_avg'] = delta['service_time_total'] / calls
+        return delta
+
+
+_CUMULATIVE_STATS = (
+    'calls', 'retries', 'rate_limited_responses', 'gave_up', 'queue_wait_total', 'service_time_total',
+)
+
+
+class _Outcome:
+    """Result of one dispatched attempt."""
+
+    __slots__ = ('result', 'error', 'rate_limited', 'queue_wait', 'service_time')
+
+    def __init__(self):
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.rate_limited = False
+        self.queue_wait = 0.0
+        self.service_time = 0.0
+
+    def unwrap(self) -> Any:
+        if self.error is not None:
+            raise self.error
+        return self.result
+
+
+def _is_rate_limit_error(error: Optional[BaseException]) -> bool:
+    if error is None:
+        return False
+    if getattr(error, 'status_code', None) == 429:
+        return True
+    response = getattr(error, 'response', None)
+    return getattr(response, 'status_code', None) == 429
+
+
+_dispatcher: Optional[LLMDispatcher] = None
+_dispatcher_lock = threading.Lock()
+
+
+def get_llm_dispatcher() -> LLMDispatcher:
+    """Process-wide dispatcher shared by live analysis, tournaments and backtests."""
+    global _dispatcher
+    if _dispatcher is None:
+        with _dispatcher_lock:
+            if _dispatcher is None:
+                settings = get_static_config().llm_dispatcher
+                _dispatcher = LLMDispatcher(
+                    max_concurrency=settings.max_concurrency,
+                    requests_per_minute=settings.requests_per_minute,
+                    tokens_per_minute=settings.tokens_per_minute,
+                    tokens_per_call=settings.tokens_per_call,
+                    max_retries=settings.max_retries,
+                )
+    return _dispatcher
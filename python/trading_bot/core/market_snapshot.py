@@ -0,0 +1,206 @@
+"""
+Short-lived market snapshot cache with request coalescing.
+
+The analyzer needs ticker data (last price, 24h stats, funding, bid/ask), the
+long/short ratio and the last closed candle for every symbol in a cycle. Rather
+than one or more REST calls per symbol, the whole linear tickers list is
+fetched in a single call (no symbol filter) and every symbol is served from it
+while it is fresh. The Bybit server clock is tracked as an offset to the local
+clock instead of being requested before every candle lookup.
+
+Concurrent requests for the same key are coalesced (single-flight): one thread
+performs the fetch, the others wait for its result. Failed or non-zero retCode
+responses are never cached.
+
+Usage:
+    from trading_bot.core.market_snapshot import MarketSnapshotCache
+
+    snapshot = MarketSnapshotCache.from_config(api_manager)
+    ticker = snapshot.ticker("BTCUSDT")                  # dict or None
+    ratio = snapshot.long_short_ratio("BTCUSDT", "1h")   # raw API response
+    candles = snapshot.recent_klines("BTCUSDT", "60")    # raw API response
+    now_ms = snapshot.server_time_ms()
+
+Configuration (config.yaml, bybit.market_data; see from_config()):
+    ticker_ttl         Seconds a tickers snapshot is served (default 5, 0 = per-symbol calls)
+    kline_ttl          Seconds recent candles are served (default 5)
+    ls_ratio_max_ttl   Cap on the per-timeframe long/short ratio TTL (default 900)
+    server_time_ttl    Seconds between server clock resyncs (default 300)
+"""
+
+import logging
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from trading_bot.config.settings_v2 import get_static_config
+from trading_bot.core.utils import get_bybit_server_time, normalize_symbol_for_bybit, parse_timeframe_to_minutes
+
+logger = logging.getLogger(__name__)
+
+
+def _ok(response: Any) -> bool:
+    return isinstance(response, dict) and response.get('retCode') == 0
+
+
+class SingleFlightCache:
+    """TTL cache where concurrent misses for one key share a single load."""
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic):
+        self._clock = clock
+        self._entries: Dict[Hashable, Tuple[float, Any]] = {}
+        self._inflight: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self.loads = 0
+
+    def get(self, key: Hashable, ttl: float, loader: Callable[[], Any],
+            cacheable: Callable[[Any], bool] = lambda value: True) -> Any:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > self._clock():
+                return entry[1]
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self._inflight[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            self.loads += 1
+            value = loader()
+        except BaseException as e:
+            with self._lock:
+                self._inflight.pop(key, None)
+            future.set_exception(e)
+            raise
+        with self._lock:
+            if ttl > 0 and cacheable(value):
+                self._entries[key] = (self._clock() + ttl, value)
+            self._inflight.pop(key, None)
+        future.set_result(value)
+        return value
+
+    def invalidate(self, key: Optional[Hashable] = None) -> None:
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
+
+
+class MarketSnapshotCache:
+    """Coalesced, TTL-bounded view of public market data for one API manager."""
+
+    def __init__(
+        self,
+        api_manager,
+        ticker_ttl: float = 5.0,
+        kline_ttl: float = 5.0,
+        ls_ratio_max_ttl: float = 900.0,
+        server_time_ttl: float = 300.0,
+    ):
+        self.api_manager = api_manager
+        self.ticker_ttl = ticker_ttl
+        self.kline_ttl = kline_ttl
+        self.ls_ratio_max_ttl = ls_ratio_max_ttl
+        self.server_time_ttl = server_time_ttl
+        self._cache = SingleFlightCache()
+
+    @classmethod
+    def from_config(cls, api_manager) -> 'MarketSnapshotCache':
+        """Snapshot cache with the TTLs from config.yaml (bybit.market_data)."""
+        settings = get_static_config().market_data
+        return cls(
+            api_manager,
+            ticker_ttl=settings.ticker_ttl,
+            kline_ttl=settings.kline_ttl,
+            ls_ratio_max_ttl=settings.ls_ratio_max_ttl,
+            server_time_ttl=settings.server_time_ttl,
+        )
+
+    # --- tickers -------------------------------------------------------
+
+    def _load_tickers(self, category: str) -> Optional[Dict[str, Dict[str, Any]]]:
+        response = self.api_manager.get_tickers(category=category)
+        if not _ok(response):
+            logger.warning(f"Tickers snapshot failed for {category}: {response.get('retMsg') if isinstance(response, dict) else response}")
+            return None
+        return {t['symbol']: t for t in response.get('result', {}).get('list', []) if t.get('symbol')}
+
+    def tickers(self, category: str = 'linear') -> Optional[Dict[str, Dict[str, Any]]]:
+        """All tickers of a category by symbol, or None if the snapshot could not be fetched."""
+        return self._cache.get(('tickers', category), self.ticker_ttl,
+                               lambda: self._load_tickers(category), lambda value: value is not None)
+
+    def _load_ticker(self, symbol: str, category: str) -> Optional[Dict[str, Any]]:
+        response = self.api_manager.get_tickers(category=category, symbol=symbol)
+        if _ok(response):
+            items = response.get('result', {}).get('list', [])
+            if items:
+                return items[0]
+        return None
+
+    def ticker(self, symbol: str, category: str = 'linear') -> Optional[Dict[str, Any]]:
+        """Ticker for one symbol, served from the category snapshot while it is fresh."""
+        symbol = normalize_symbol_for_bybit(symbol)
+        if self.ticker_ttl > 0:
+            snapshot = self.tickers(category)
+            if snapshot is not None and symbol in snapshot:
+                return snapshot[symbol]
+        # Snapshot disabled/unavailable, or a symbol it does not list
+        return self._cache.get(('ticker', category, symbol), self.ticker_ttl,
+                               lambda: self._load_ticker(symbol, category), lambda value: value is not None)
+
+    # --- per-symbol endpoints ------------------------------------------
+
+    def _ls_ratio_ttl(self, timeframe: str) -> float:
+        try:
+            period_seconds = parse_timeframe_to_minutes(timeframe) * 60
+        except Exception:
+            period_seconds = 3600
+        return max(0.0, min(float(period_seconds), self.ls_ratio_max_ttl))
+
+    def long_short_ratio(self, symbol: str, timeframe: str, category: str = 'linear') -> Dict[str, Any]:
+        """Long/short ratio response, cached for the timeframe's period (capped)."""
+        symbol = normalize_symbol_for_bybit(symbol)
+        return self._cache.get(
+            ('long_short_ratio', category, symbol, timeframe), self._ls_ratio_ttl(timeframe),
+            lambda: self.api_manager.get_long_short_ratio(symbol=symbol, timeframe=timeframe, category=category),
+            _ok,
+        )
+
+    def recent_klines(self, symbol: str, interval: str, limit: int = 2, category: str = 'linear') -> Dict[str, Any]:
+        """Most recent candles response (newest first, as Bybit returns them)."""
+        symbol = normalize_symbol_for_bybit(symbol)
+        return self._cache.get(
+            ('kline', category, symbol, interval, limit), self.kline_ttl,
+            lambda: self.api_manager.get_kline(category=category, symbol=symbol, interval=interval, limit=limit),
+            _ok,
+        )
+
+    # --- server clock --------------------------------------------------
+
+    def _load_clock_offset(self) -> Optional[float]:
+        server_ms = get_bybit_server_time(self.api_manager.session)
+        if not server_ms:
+            return None
+        return server_ms - time.time() * 1000
+
+    def server_time_ms(self) -> Optional[int]:
+        """Bybit server time from a periodically resynced clock offset."""
+        offset = self._cache.get(('server_clock_offset',), self.server_time_ttl,
+                                 self._load_clock_offset, lambda value: value is not None)
+        if offset is None:
+            return None
+        return int(time.time() * 1000 + offset)
+
+    def invalidate(self) -> None:
+        self._cache.invalidate()
+
+
+__all__ = [
+    'MarketSnapshotCache',
+    'SingleFlightCache',
+]
@@ -86,6 +86,8 @@ class ShutdownHandler:
         except Exception as e:
             logger.error(f"Error during async shutdown: {e}")
         finally:
+            # Write out queued error logs before exiting
+            await asyncio.to_thread(self._flush_error_logs)
             # Force exit if needed
             sys.exit(0)
     
@@ -108,8 +110,18 @@ class ShutdownHandler:
         except Exception as e:
             logger.error(f"Error during sync shutdown: {e}")
         finally:
+            # Write out queued error logs before exiting
+            self._flush_error_logs()
             sys.exit(0)
     
+    def _flush_error_logs(self):
+        """Drain the async database error log queue (see error_logger)."""
+        try:
+            from trading_bot.core.error_logger import flush_error_logging
+            flush_error_logging(timeout=5.0)
+        except Exception as e:
+            print(f"Error flushing error logs during shutdown: {e}", file=sys.stderr)
+    
     async def _cancel_remaining_tasks(self):
         """Cancel all remaining asyncio tasks."""
         try:
@@ -1,27 +1,35 @@
 """Simple OpenAI Assistant API handler with image support."""
+import asyncio
 import base64
 import io
 import logging
 import os
 import tempfile
 import time
-from typing import Dict, Any, Optional, Set
+from typing import Any, Awaitable, Callable, Dict, Optional, Set, Tuple
 
 import openai
 from PIL import Image
 
+from trading_bot.config.settings_v2 import get_static_config
+
+_TERMINAL_RUN_STATUSES = ("completed", "failed", "cancelled", "expired", "requires_action")
+
 
 class SimpleOpenAIAssistantHandler:
     """Simple wrapper for OpenAI Assistant API with text-only messaging."""
 
-    def __init__(self, client: openai.OpenAI, config: Optional[Any] = None):
+    def __init__(self, client: openai.OpenAI, config: Optional[Any] = None,
+                 async_client: Optional[openai.AsyncOpenAI] = None):
         """Initialize the OpenAI Assistant handler.
 
         Args:
             client: OpenAI client instance
             config: Configuration object (optional)
+            async_client: AsyncOpenAI client for the *_async methods (optional)
         """
         self.client = client
+        self.async_client = async_client
         self.config = config
         self.logger = logging.getLogger(__name__)
         # Track threads created per agent to allow cleanup at end of runs
@@ -49,10 +57,10 @@ class SimpleOpenAIAssistantHandler:
         Returns:
             Base64 encoded image string
         """
-        from trading_bot.core.storage import read_file
+        from trading_bot.core.chart_images import get_chart_image_pipeline
 
-        # Read file from storage (supports both local and Supabase)
-        image_data = read_file(image_path)
+        # Read from memory for fresh captures, else storage (local or Supabase)
+        image_data = get_chart_image_pipeline().read(image_path)
         if image_data is None:
             raise FileNotFoundError(f"Image not found: {image_path}")
 
@@ -72,45 +80,59 @@ class SimpleOpenAIAssistantHandler:
             self.logger.error(f"Failed to create thread: {e}")
             raise
 
-    def upload_image_file(self, image_path: str) -> str:
-        """Upload an image file to OpenAI and return the file ID.
+    def upload_payload(self, image_path: str) -> Tuple[bytes, str]:
+        """Bytes and filename to upload for an image path (blocking storage read).
 
         Args:
             image_path: Path to image file (can be storage path or local temp file)
 
         Returns:
-            File ID string
+            (image bytes, filename) tuple
         """
-        try:
-            from trading_bot.core.storage import read_file
-            import io
-            from pathlib import Path
-
-            # Check if this is a temporary file (starts with /tmp or contains tempfile pattern)
-            is_temp_file = image_path.startswith('/tmp') or 'tmp' in image_path.lower()
+        from trading_bot.core.chart_images import get_chart_image_pipeline
+        from pathlib import Path
 
-            if is_temp_file:
-                # For temporary files, read directly from filesystem
-                with open(image_path, 'rb') as f:
-                    image_data = f.read()
-            else:
-                # For storage paths, use centralized storage layer
-                image_data = read_file(image_path)
-                if image_data is None:
-                    raise FileNotFoundError(f"Image not found in storage: {image_path}")
+        # Check if this is a temporary file (starts with /tmp or contains tempfile pattern)
+        is_temp_file = image_path.startswith('/tmp') or 'tmp' in image_path.lower()
 
+        if is_temp_file:
+            # For temporary files, read directly from filesystem
+            with open(image_path, 'rb') as f:
+                image_data = f.read()
             # Extract filename from path to preserve extension
-            filename = Path(image_path).name
+            return image_data, Path(image_path).name
+
+        # For storage paths: in-memory chart if captured in this process, else
+        # the storage layer; re-encoded per charts.llm_format (filename keeps the extension)
+        llm_image = get_chart_image_pipeline().llm_image(image_path)
+        if llm_image is None:
+            raise FileNotFoundError(f"Image not found in storage: {image_path}")
+        return llm_image
+
+    @staticmethod
+    def _file_like(image_file: Tuple[bytes, str]) -> io.BytesIO:
+        image_data, filename = image_file
+        # Create a file-like object from bytes with a name attribute
+        file_like = io.BytesIO(image_data)
+        file_like.name = filename  # OpenAI needs this to detect file type
+        return file_like
+
+    def upload_image_file(self, image_path: str) -> str:
+        """Upload an image file to OpenAI and return the file ID.
 
-            # Create a file-like object from bytes with a name attribute
-            file_like = io.BytesIO(image_data)
-            file_like.name = filename  # OpenAI needs this to detect file type
+        Args:
+            image_path: Path to image file (can be storage path or local temp file)
 
+        Returns:
+            File ID string
+        """
+        try:
+            image_file = self.upload_payload(image_path)
             file_obj = self.client.files.create(
-                file=file_like,
+                file=self._file_like(image_file),
                 purpose="vision"
             )
-            self.logger.debug(f"Uploaded file: {file_obj.id} (filename: {filename})")
+            self.logger.debug(f"Uploaded file: {file_obj.id} (filename: {image_file[1]})")
             return file_obj.id
         except Exception as e:
             self.logger.error(f"Failed to upload file {image_path}: {e}")
@@ -225,20 +247,101 @@ class SimpleOpenAIAssistantHandler:
             self.logger.error(f"Failed to run assistant on thread {thread_id}: {e}")
             raise
 
+    @staticmethod
+    def _message_text(message: Any) -> str:
+        """Extract the text of an assistant message (first content block)."""
+        # Handle different content types safely
+        content_block = message.content[0]
+        # Check if content block has text attribute safely
+        if hasattr(content_block, 'text'):
+            text_attr = getattr(content_block, 'text', None)
+            if text_attr is not None and hasattr(text_attr, 'value'):
+                return text_attr.value
+        return str(content_block)
+
+    def _latest_message_text(self, thread_id: str) -> str:
+        """Get the assistant's response (newest message on the thread)."""
+        messages = self.client.beta.threads.messages.list(
+            thread_id=thread_id,
+            order="desc",
+            limit=1
+        )
+        return self._message_text(messages.data[0]) if messages.data else ""
+
+    def _terminal_run_result(self, thread_id: str, run: Any,
+                             response_text: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """Result dict for a run in a terminal state, or None while it is still running."""
+        run_id = run.id
+        if run.status == "completed":
+            if response_text is None:
+                response_text = self._latest_message_text(thread_id)
+            return {
+                "status": "completed",
+                "response": response_text,
+                "run_id": run_id
+            }
+
+        elif run.status == "failed":
+            error_message = "Unknown error"
+            if run.last_error is not None:
+                error_message = getattr(run.last_error, 'message', 'Unknown error')
+            return {
+                "status": "failed",
+                "error": error_message,
+                "run_id": run_id
+            }
+
+        elif run.status in ("cancelled", "expired"):
+            return {
+                "status": run.status,
+                "run_id": run_id
+            }
+
+        elif run.status == "requires_action":
+            # Handle requires_action if needed (for function calls, etc.)
+            self.logger.warning(f"Run {run_id} requires action - not implemented")
+            return {
+                "status": "requires_action",
+                "run_id": run_id,
+                "required_action": run.required_action
+            }
+
+        elif run.status not in ("queued", "in_progress", "cancelling"):
+            self.logger.warning(f"Unknown run status: {run.status}")
+        return None
+
+    @staticmethod
+    def _poll_delays(initial: float, maximum: float, factor: float = 1.5):
+        """Adaptive poll schedule: start fast, back off towards maximum."""
+        delay = initial
+        while True:
+            yield delay
+            delay = min(maximum, delay * factor)
+
     def wait_for_run_completion(self, thread_id: str, run_id: str,
-                              timeout: int = 300, poll_interval: float = 1.0) -> Dict[str, Any]:
+                              timeout: int = 300, poll_interval: Optional[float] = None,
+                              max_poll_interval: float = 2.0) -> Dict[str, Any]:
         """Wait for a run to complete and return the result.
 
+        Polls with adaptive backoff: the first check comes after 0.2s and the
+        interval grows by 1.5x up to max_poll_interval, so short runs return
+        quickly and long runs don't hammer runs.retrieve.
+
         Args:
             thread_id: Thread ID
             run_id: Run ID to wait for
             timeout: Maximum time to wait in seconds
-            poll_interval: Time between status checks in seconds
+            poll_interval: Fixed time between status checks (disables backoff)
+            max_poll_interval: Upper bound for the adaptive interval
 
         Returns:
             Dictionary with run status and result
         """
         start_time = time.time()
+        if poll_interval is not None:
+            delays = self._poll_delays(poll_interval, poll_interval)
+        else:
+            delays = self._poll_delays(0.2, max_poll_interval)
 
         try:
             while time.time() - start_time < timeout:
@@ -249,79 +352,135 @@ class SimpleOpenAIAssistantHandler:
 
                 self.logger.debug(f"Run {run_id} status: {run.status}")
 
-                if run.status == "completed":
-                    # Get the assistant's response
-                    messages = self.client.beta.threads.messages.list(
-                        thread_id=thread_id,
-                        order="desc",
-                        limit=1
-                    )
-
-                    if messages.data:
-                        # Handle different content types safely
-                        content_block = messages.data[0].content[0]
-                        # Check if content block has text attribute safely
-                        if hasattr(content_block, 'text'):
-                            text_attr = getattr(content_block, 'text', None)
-                            if text_attr is not None and hasattr(text_attr, 'value'):
-                                response_content = text_attr.value
-                            else:
-                                response_content = str(content_block)
-                        else:
-                            response_content = str(content_block)
-
-                        return {
-                            "status": "completed",
-                            "response": response_content,
-                            "run_id": run_id
-                        }
-                    else:
-                        return {
-                            "status": "completed",
-                            "response": "",
-                            "run_id": run_id
-                        }
-
-                elif run.status == "failed":
-                    error_message = "Unknown error"
-                    if run.last_error is not None:
-                        error_message = getattr(run.last_error, 'message', 'Unknown error')
-                    return {
-                        "status": "failed",
-                        "error": error_message,
-                        "run_id": run_id
-                    }
+                result = self._terminal_run_result(thread_id, run)
+                if result is not None:
+                    return result
 
-                elif run.status == "cancelled":
-                    return {
-                        "status": "cancelled",
-                        "run_id": run_id
-                    }
+                remaining = timeout - (time.time() - start_time)
+                time.sleep(max(0.0, min(next(delays), remaining)))
 
-                elif run.status == "expired":
-                    return {
-                        "status": "expired",
-                        "run_id": run_id
-                    }
+            # Timeout reached
+            return {
+                "status": "timeout",
+                "run_id": run_id,
+                "error": f"Run did not complete within {timeout} seconds"
+            }
 
-                elif run.status in ["queued", "in_progress", "requires_action"]:
-                    # Handle requires_action if needed (for function calls, etc.)
-                    if run.status == "requires_action":
-                        self.logger.warning(f"Run {run_id} requires action - not implemented")
-                        return {
-                            "status": "requires_action",
-                            "run_id": run_id,
-                            "required_action": run.required_action
-                        }
-
-                    time.sleep(poll_interval)
-                    continue
+        except Exception as e:
+            self.logger.error(f"Error waiting for run completion: {e}")
+            return {
+                "status": "error",
+                "run_id": run_id,
+                "error": str(e)
+            }
 
-                else:
-                    self.logger.warning(f"Unknown run status: {run.status}")
-                    time.sleep(poll_interval)
+    @staticmethod
+    def _run_params(thread_id: str, assistant_id: str,
+                    additional_instructions: Optional[str] = None,
+                    reasoning_effort: Optional[str] = None, **extra: Any) -> Dict[str, Any]:
+        run_params: Dict[str, Any] = {
+            "thread_id": thread_id,
+            "assistant_id": assistant_id,
+            **extra,
+        }
+        if additional_instructions:
+            run_params["additional_instructions"] = additional_instructions
+        if reasoning_effort:
+            run_params["reasoning_effort"] = reasoning_effort
+        return run_params
+
+    def _fold_stream_event(self, event: Any, state: Dict[str, Any]) -> Optional[Any]:
+        """Apply one run-stream event to state; return the run once it is terminal."""
+        name = getattr(event, 'event', '')
+        data = getattr(event, 'data', None)
+        if name.startswith("thread.run.") and not name.startswith("thread.run.step"):
+            state["run_id"] = data.id
+            if data.status in _TERMINAL_RUN_STATUSES:
+                return data
+        elif name == "thread.message.completed" and data is not None and data.content:
+            state["response_text"] = self._message_text(data)
+        elif name == "error":
+            raise RuntimeError(getattr(data, 'message', None) or str(data))
+        return None
+
+    def run_assistant_streaming(self, thread_id: str, assistant_id: str,
+                                additional_instructions: Optional[str] = None,
+                                reasoning_effort: Optional[str] = None,
+                                timeout: int = 300) -> Dict[str, Any]:
+        """Start a run with stream=True and return as soon as it finishes.
+
+        Completion is driven by the server-sent run events instead of polling.
+        If the stream drops before a terminal event, falls back to
+        wait_for_run_completion for the remaining time.
+
+        Returns:
+            Same dictionary as wait_for_run_completion
+        """
+        run_params = self._run_params(thread_id, assistant_id, additional_instructions,
+                                      reasoning_effort, stream=True)
+        start_time = time.time()
+        state: Dict[str, Any] = {"run_id": None, "response_text": None}
+        try:
+            stream = self.client.beta.threads.runs.create(**run_params)
+            with stream:
+                for event in stream:
+                    run = self._fold_stream_event(event, state)
+                    if run is not None:
+                        self.logger.debug(f"Run {run.id} finished via stream: {run.status}")
+                        return self._terminal_run_result(thread_id, run, state["response_text"])
+                    if time.time() - start_time > timeout:
+                        break
+        except Exception as e:
+            if state["run_id"] is None:
+                self.logger.error(f"Failed to stream assistant run on thread {thread_id}: {e}")
+                raise
+            self.logger.warning(f"Run {state['run_id']} stream interrupted ({e}), falling back to polling")
+
+        if state["run_id"] is None:
+            raise RuntimeError(f"Run stream for thread {thread_id} ended without a run id")
+        remaining = max(1, int(timeout - (time.time() - start_time)))
+        return self.wait_for_run_completion(thread_id=thread_id, run_id=state["run_id"], timeout=remaining)
+
+    # ------------------------------------------------------------------
+    # AsyncOpenAI variants: the run is awaited on the event loop
+    # ------------------------------------------------------------------
+
+    def _require_async_client(self) -> openai.AsyncOpenAI:
+        if self.async_client is None:
+            raise RuntimeError("SimpleOpenAIAssistantHandler was created without an async_client")
+        return self.async_client
+
+    async def _terminal_run_result_async(self, thread_id: str, run: Any,
+                                         response_text: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """_terminal_run_result, fetching a missing response with the async client."""
+        if run.status == "completed" and response_text is None:
+            messages = await self._require_async_client().beta.threads.messages.list(
+                thread_id=thread_id,
+                order="desc",
+                limit=1
+            )
+            response_text = self._message_text(messages.data[0]) if messages.data else ""
+        return self._terminal_run_result(thread_id, run, response_text)
+
+    async def wait_for_run_completion_async(self, thread_id: str, run_id: str,
+                                            timeout: int = 300,
+                                            max_poll_interval: float = 2.0) -> Dict[str, Any]:
+        """wait_for_run_completion with awaited retrieves and asyncio.sleep backoff."""
+        client = self._require_async_client()
+        start_time = time.time()
+        delays = self._poll_delays(0.2, max_poll_interval)
+        try:
+            while time.time() - start_time < timeout:
+                run = await client.beta.threads.runs.retrieve(thread_id=thread_id, run_id=run_id)
+                self.logger.debug(f"Run {run_id} status: {run.status}")
+
+                result = await self._terminal_run_result_async(thread_id, run)
+                if result is not None:
+                    return result
+
+                remaining = timeout - (time.time() - start_time)
+                await asyncio.sleep(max(0.0, min(next(delays), remaining)))
 
-            # Timeout reached
             return {
                 "status": "timeout",
                 "run_id": run_id,
@@ -336,20 +495,118 @@ class SimpleOpenAIAssistantHandler:
                 "error": str(e)
             }
 
+    async def run_assistant_streaming_async(self, thread_id: str, assistant_id: str,
+                                            additional_instructions: Optional[str] = None,
+                                            reasoning_effort: Optional[str] = None,
+                                            timeout: int = 300) -> Dict[str, Any]:
+        """run_assistant_streaming on the AsyncOpenAI client (no thread held while the run is in flight)."""
+        client = self._require_async_client()
+        run_params = self._run_params(thread_id, assistant_id, additional_instructions,
+                                      reasoning_effort, stream=True)
+        start_time = time.time()
+        state: Dict[str, Any] = {"run_id": None, "response_text": None}
+        try:
+            stream = await client.beta.threads.runs.create(**run_params)
+            async with stream:
+                async for event in stream:
+                    run = self._fold_stream_event(event, state)
+                    if run is not None:
+                        self.logger.debug(f"Run {run.id} finished via stream: {run.status}")
+                        return await self._terminal_run_result_async(thread_id, run, state["response_text"])
+                    if time.time() - start_time > timeout:
+                        break
+        except Exception as e:
+            if state["run_id"] is None:
+                self.logger.error(f"Failed to stream assistant run on thread {thread_id}: {e}")
+                raise
+            self.logger.warning(f"Run {state['run_id']} stream interrupted ({e}), falling back to polling")
+
+        if state["run_id"] is None:
+            raise RuntimeError(f"Run stream for thread {thread_id} ended without a run id")
+        remaining = max(1, int(timeout - (time.time() - start_time)))
+        return await self.wait_for_run_completion_async(thread_id=thread_id, run_id=state["run_id"], timeout=remaining)
+
+    async def send_message_async(self, message: str, agent_id: str,
+                                 image_file: Optional[Tuple[bytes, str]] = None,
+                                 additional_instructions: Optional[str] = None,
+                                 reasoning_effort: Optional[str] = None,
+                                 timeout: int = 300,
+                                 stream: Optional[bool] = None) -> Dict[str, Any]:
+        """send_message on the AsyncOpenAI client.
+
+        Args:
+            image_file: (bytes, filename) to attach, e.g. from upload_payload()
+
+        Returns:
+            Same dictionary as send_message
+        """
+        if stream is None:
+            stream = get_static_config().assistant.stream_runs
+        thread_id: Optional[str] = None
+        try:
+            client = self._require_async_client()
+            thread = await client.beta.threads.create()
+            thread_id = thread.id
+            self._threads_by_agent.setdefault(agent_id, set()).add(str(thread_id))
+
+            content: list = [{"type": "text", "text": message}]
+            uploaded_file_id: Optional[str] = None
+            if image_file is not None:
+                file_obj = await client.files.create(file=self._file_like(image_file), purpose="vision")
+                uploaded_file_id = file_obj.id
+                content.append({"type": "image_file", "image_file": {"file_id": uploaded_file_id}})
+            message_obj = await client.beta.threads.messages.create(
+                thread_id=thread_id,
+                role="user",
+                content=content
+            )
+
+            if stream:
+                result = await self.run_assistant_streaming_async(
+                    thread_id=thread_id,
+                    assistant_id=agent_id,
+                    additional_instructions=additional_instructions,
+                    reasoning_effort=reasoning_effort,
+                    timeout=timeout
+                )
+            else:
+                run = await client.beta.threads.runs.create(
+                    **self._run_params(thread_id, agent_id, additional_instructions, reasoning_effort)
+                )
+                result = await self.wait_for_run_completion_async(thread_id, run.id, timeout=timeout)
+
+            result.update({
+                "thread_id": thread_id,
+                "message_id": message_obj.id,
+                "agent_id": agent_id,
+                "file_id": uploaded_file_id
+            })
+            return result
+
+        except Exception as e:
+            self.logger.error(f"Error in send_message_async: {e}")
+            return {
+                "status": "error",
+                "error": str(e),
+                "thread_id": thread_id,
+                "agent_id": agent_id
+            }
+
     def send_message(self, message: str, agent_id: str,
                     thread_id: Optional[str] = None,
                     image: Optional[Image.Image] = None,
                     image_path: Optional[str] = None,
                     additional_instructions: Optional[str] = None,
                     reasoning_effort: Optional[str] = None,
-                    timeout: int = 300) -> Dict[str, Any]:
+                    timeout: int = 300,
+                    stream: Optional[bool] = None) -> Dict[str, Any]:
         """Send a message to an assistant and get the response.
 
         This is the main method that combines all the steps:
         1. Create thread if not provided
         2. Add message to thread (with optional image)
         3. Run assistant
-        4. Wait for completion and return response
+        4. Wait for completion (run event stream, or adaptive polling) and return response
 
         Args:
             message: Text message to send
@@ -359,10 +616,13 @@ class SimpleOpenAIAssistantHandler:
             image_path: Optional path to image file
             additional_instructions: Optional additional instructions
             timeout: Maximum time to wait for response
+            stream: Stream run events instead of polling (default: openai.assistant.stream_runs)
 
         Returns:
             Dictionary with response and metadata
         """
+        if stream is None:
+            stream = get_static_config().assistant.stream_runs
         try:
             # Create thread if not provided
             if thread_id is None:
@@ -383,20 +643,30 @@ class SimpleOpenAIAssistantHandler:
             message_id = message_result["message_id"]
             uploaded_file_id = message_result["file_id"]
 
-            # Run assistant
-            run_id = self.run_assistant(
-                thread_id=thread_id,
-                assistant_id=agent_id,
-                additional_instructions=additional_instructions,
-                reasoning_effort=reasoning_effort
-            )
+            if stream:
+                # Run assistant and wait on its event stream
+                result = self.run_assistant_streaming(
+                    thread_id=thread_id,
+                    assistant_id=agent_id,
+                    additional_instructions=additional_instructions,
+                    reasoning_effort=reasoning_effort,
+                    timeout=timeout
+                )
+            else:
+                # Run assistant
+                run_id = self.run_assistant(
+                    thread_id=thread_id,
+                    assistant_id=agent_id,
+                    additional_instructions=additional_instructions,
+                    reasoning_effort=reasoning_effort
+                )
 
-            # Wait for completion
-            result = self.wait_for_run_completion(
-                thread_id=thread_id,
-                run_id=run_id,
-                timeout=timeout
-            )
+                # Wait for completion
+                result = self.wait_for_run_completion(
+                    thread_id=thread_id,
+                    run_id=run_id,
+                    timeout=timeout
+                )
 
             # Add metadata
             result.update({
@@ -478,197 +748,258 @@ class SimpleOpenAIAssistantHandler:
             # """
 
             analysis_prompt = message + "\n Make sure all numeric values are realistic based on the chart analysis."
-
-            # Get reasoning_effort from config if available
-            reasoning_effort = None
-            if self.config and hasattr(self.config, 'get_agent_config'):
-                try:
-                    analyzer_config = self.config.get_agent_config('analyzer')
-                    reasoning_effort = getattr(analyzer_config, 'reasoning_effort', None)
-                except:
-                    pass
-
-            # Discover assistant model for traceability
-            assistant_model = None
-            try:
-                assistant_obj = self.client.beta.assistants.retrieve(agent_id)
-                assistant_model = getattr(assistant_obj, 'model', None)
-            except Exception:
-                assistant_model = None
+            assistant_model = self._assistant_model(agent_id)
 
             # Send message with image
             result = self.send_message(
                 message=analysis_prompt,
                 agent_id=agent_id,
                 image_path=image_path,
-                reasoning_effort=reasoning_effort,
+                reasoning_effort=self._reasoning_effort(),
                 timeout=timeout
             )
 
-            if result.get('status') == 'completed':
-                response_text = result.get('response', '')
-
-                # Try to extract JSON from response
-                import json
-                import re
+            analysis, clean_up = self._autotrader_result(
+                result, agent_id, assistant_model, symbol, timeframe, last_close_price, prompt_data
+            )
+            if clean_up:
+                # Clean up thread and uploaded file
+                thread_id_val = result.get('thread_id')
+                if thread_id_val is not None:
+                    self.delete_thread(str(thread_id_val))
+                file_id_val = result.get('file_id')
+                if file_id_val is not None:
+                    self.delete_uploaded_file(str(file_id_val))
+            return analysis
 
-                # Look for JSON in the response
-                json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-                if json_match:
-                    try:
-                        analysis_data = json.loads(json_match.group())
-
-                        # Ensure all required fields are present
-                        required_fields = {
-                            "recommendation": "hold",
-                            "summary": response_text,
-                            "key_levels": {"support": 0.0, "resistance": 0.0},
-                            "risk_factors": ["Analysis unavailable"],
-                            "timeframe": "short_term",
-                            "extracted_timeframe": timeframe,
-                            "normalized_timeframe": timeframe,
-                            "symbol": symbol,
-                            "confidence": 0.5,
-                            "evidence": "Chart analysis",
-                            "last_close_price": last_close_price,
-                            "entry_price": None,  # Don't default to 0.0 - let downstream handle missing prices
-                            "stop_loss": None,    # Don't default to 0.0 - let downstream handle missing prices
-                            "take_profit": None,  # Don't default to 0.0 - let downstream handle missing prices
-                            "trade_confidence": 0.5,
-                            "direction": "Long"
-                        }
-
-                        # Fill in missing fields with defaults
-                        for key, default_value in required_fields.items():
-                            if key not in analysis_data:
-                                analysis_data[key] = default_value
-
-                        # Validate: if recommendation is buy/sell, price levels must be provided
-                        recommendation = str(analysis_data.get("recommendation", "hold")).lower()
-                        if recommendation in ["buy", "sell"]:
-                            entry = analysis_data.get("entry_price")
-                            sl = analysis_data.get("stop_loss")
-                            tp = analysis_data.get("take_profit")
-
-                            # Check if any price level is missing or zero
-                            if not entry or not sl or not tp:
-                                self.logger.warning(
-                                    f"⚠️ AI returned '{recommendation}' but missing price levels: "
-                                    f"entry={entry}, stop_loss={sl}, take_profit={tp}. "
-                                    f"Downgrading to 'hold' to prevent invalid trades."
-                                )
-                                analysis_data["recommendation"] = "hold"
-                                analysis_data["llm_original_recommendation"] = recommendation
-
-                        # Apply decision matrix enforcement if enabled in prompt
-                        if prompt_data and isinstance(prompt_data, dict):
-                            decision_matrix = prompt_data.get('decision_matrix')
-                            if decision_matrix and decision_matrix.get('enabled'):
-                                try:
-                                    confidence = float(analysis_data.get('confidence', 0))
-                                    direction = str(analysis_data.get('direction', 'Long'))
-                                    current_rec = str(analysis_data.get('recommendation', 'hold')).lower()
-
-                                    min_conf = float(decision_matrix.get('rules', {}).get('min_confidence_for_trade', 0.60))
-
-                                    if confidence >= min_conf:
-                                        # Should be a trade (buy or sell based on direction)
-                                        expected_rec = 'buy' if direction.lower() == 'long' else 'sell'
-                                        if current_rec != expected_rec:
-                                            analysis_data['llm_original_recommendation'] = current_rec
-                                            analysis_data['recommendation'] = expected_rec
-                                            self.logger.info(
-                                                f"✅ Decision matrix enforced: confidence={confidence:.2f} >= {min_conf}, "
-                                                f"direction={direction}, changed '{current_rec}' → '{expected_rec}'"
-                                            )
-                                    else:
-                                        # Should be hold
-                                        if current_rec != 'hold':
-                                            analysis_data['llm_original_recommendation'] = current_rec
-                                            analysis_data['recommendation'] = 'hold'
-                                            self.logger.info(
-                                                f"✅ Decision matrix enforced: confidence={confidence:.2f} < {min_conf}, "
-                                                f"changed '{current_rec}' → 'hold'"
-                                            )
-                                except Exception as e:
-                                    self.logger.warning(f"⚠️ Failed to apply decision matrix: {e}")
-
-                        # Inject assistant metadata and raw response
-                        analysis_data["assistant_id"] = agent_id
-                        analysis_data["assistant_model"] = assistant_model
-                        analysis_data["raw_response"] = response_text  # Store raw response for debugging/analysis
-
-                        # Clean up thread and uploaded file
-                        thread_id_val = result.get('thread_id')
-                        if thread_id_val is not None:
-                            self.delete_thread(str(thread_id_val))
-
-                        # Clean up uploaded file
-                        file_id_val = result.get('file_id')
-                        if file_id_val is not None:
-                            self.delete_uploaded_file(str(file_id_val))
-
-                        return analysis_data
-
-                    except json.JSONDecodeError:
-                        self.logger.warning("Failed to parse JSON from assistant response")
-
-                # Fallback: create structured response from text
-                return {
-                    "recommendation": "hold",
-                    "summary": response_text,
-                    "key_levels": {"support": 0.0, "resistance": 0.0},
-                    "risk_factors": ["Manual analysis required"],
-                    "timeframe": "short_term",
-                    "extracted_timeframe": timeframe,
-                    "normalized_timeframe": timeframe,
-                    "symbol": symbol,
-                    "confidence": 0.5,
-                    "evidence": "Assistant analysis",
-                    "last_close_price": last_close_price,
-                    "entry_price": 0.0,
-                    "stop_loss": 0.0,
-                    "take_profit": 0.0,
-                    "trade_confidence": 0.5,
-                    "direction": "Long",
-                    "assistant_id": agent_id,
-                    "assistant_model": assistant_model,
-                    "raw_response": response_text  # Store raw response for debugging/analysis
-                }
-            else:
-                # Error case - try to clean up thread/file if present
+        except Exception as e:
+            self.logger.error(f"Error in analyze_chart_for_autotrader: {e}")
+            return self._autotrader_error(e, agent_id, symbol, timeframe)
+
+    async def analyze_chart_for_autotrader_async(self, message: str, agent_id: str,
+                                                 image_path: str, symbol: str,
+                                                 timeframe: str = "1h",
+                                                 last_close_price: Optional[float] = None,
+                                                 timeout: int = 300,
+                                                 prompt_data: Optional[Dict[str, Any]] = None,
+                                                 assistant_model: Optional[str] = None,
+                                                 run_blocking: Optional[Callable[..., Awaitable[Any]]] = None) -> Dict[str, Any]:
+        """analyze_chart_for_autotrader on the AsyncOpenAI client.
+
+        The image read goes through run_blocking (default asyncio.to_thread);
+        every API call, including the streamed run, is awaited on the loop.
+        """
+        try:
+            client = self._require_async_client()
+            image_file = await (run_blocking or asyncio.to_thread)(self.upload_payload, image_path)
+            analysis_prompt = message + "\n Make sure all numeric values are realistic based on the chart analysis."
+            if assistant_model is None:
                 try:
-                    thread_id_val = result.get('thread_id')
-                    if thread_id_val is not None:
-                        self.delete_thread(str(thread_id_val))
-                    file_id_val = result.get('file_id')
-                    if file_id_val is not None:
-                        self.delete_uploaded_file(str(file_id_val))
+                    assistant_model = getattr(await client.beta.assistants.retrieve(agent_id), 'model', None)
                 except Exception:
-                    pass
-                return {
-                    "error": result.get('error', 'Analysis failed'),
-                    "recommendation": "hold",
-                    "summary": f"Analysis failed: {result.get('error', 'Unknown error')}",
-                    "symbol": symbol,
-                    "extracted_timeframe": timeframe,
-                    "confidence": 0.0,
-                    "assistant_id": agent_id,
-                    "assistant_model": assistant_model
-                }
+                    assistant_model = None
+
+            result = await self.send_message_async(
+                message=analysis_prompt,
+                agent_id=agent_id,
+                image_file=image_file,
+                reasoning_effort=self._reasoning_effort(),
+                timeout=timeout
+            )
+
+            analysis, clean_up = self._autotrader_result(
+                result, agent_id, assistant_model, symbol, timeframe, last_close_price, prompt_data
+            )
+            if clean_up:
+                thread_id_val = result.get('thread_id')
+                if thread_id_val is not None:
+                    try:
+                        await client.beta.threads.delete(str(thread_id_val))
+                        self.logger.info(f"Deleted thread: {thread_id_val}")
+                        self._untrack_thread(str(thread_id_val))
+                    except Exception as e:
+                        self.logger.error(f"Failed to delete thread {thread_id_val}: {e}")
+                file_id_val = result.get('file_id')
+                if file_id_val is not None:
+                    try:
+                        await client.files.delete(str(file_id_val))
+                        self.logger.debug(f"Deleted file: {file_id_val}")
+                    except Exception as e:
+                        self.logger.error(f"Failed to delete file {file_id_val}: {e}")
+            return analysis
 
         except Exception as e:
-            self.logger.error(f"Error in analyze_chart_for_autotrader: {e}")
+            self.logger.error(f"Error in analyze_chart_for_autotrader_async: {e}")
+            return self._autotrader_error(e, agent_id, symbol, timeframe)
+
+    def _reasoning_effort(self) -> Optional[str]:
+        """Analyzer reasoning_effort from config, if set."""
+        if self.config and hasattr(self.config, 'get_agent_config'):
+            try:
+                analyzer_config = self.config.get_agent_config('analyzer')
+                return getattr(analyzer_config, 'reasoning_effort', None)
+            except:
+                pass
+        return None
+
+    def _assistant_model(self, agent_id: str) -> Optional[str]:
+        """Discover assistant model for traceability."""
+        try:
+            assistant_obj = self.client.beta.assistants.retrieve(agent_id)
+            return getattr(assistant_obj, 'model', None)
+        except Exception:
+            return None
+
+    def _autotrader_result(self, result: Dict[str, Any], agent_id: str,
+                           assistant_model: Optional[str], symbol: str, timeframe: str,
+                           last_close_price: Optional[float],
+                           prompt_data: Optional[Dict[str, Any]]) -> Tuple[Dict[str, Any], bool]:
+        """Autotrader dict for a send_message result, and whether to clean up its thread and file."""
+        if result.get('status') == 'completed':
+            response_text = result.get('response', '')
+
+            # Try to extract JSON from response
+            import json
+            import re
+
+            # Look for JSON in the response
+            json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
+            if json_match:
+                try:
+                    analysis_data = json.loads(json_match.group())
+
+                    # Ensure all required fields are present
+                    required_fields = {
+                        "recommendation": "hold",
+                        "summary": response_text,
+                        "key_levels": {"support": 0.0, "resistance": 0.0},
+                        "risk_factors": ["Analysis unavailable"],
+                        "timeframe": "short_term",
+                        "extracted_timeframe": timeframe,
+                        "normalized_timeframe": timeframe,
+                        "symbol": symbol,
+                        "confidence": 0.5,
+                        "evidence": "Chart analysis",
+                        "last_close_price": last_close_price,
+                        "entry_price": None,  # Don't default to 0.0 - let downstream handle missing prices
+                        "stop_loss": None,    # Don't default to 0.0 - let downstream handle missing prices
+                        "take_profit": None,  # Don't default to 0.0 - let downstream handle missing prices
+                        "trade_confidence": 0.5,
+                        "direction": "Long"
+                    }
+
+                    # Fill in missing fields with defaults
+                    for key, default_value in required_fields.items():
+                        if key not in analysis_data:
+                            analysis_data[key] = default_value
+
+                    # Validate: if recommendation is buy/sell, price levels must be provided
+                    recommendation = str(analysis_data.get("recommendation", "hold")).lower()
+                    if recommendation in ["buy", "sell"]:
+                        entry = analysis_data.get("entry_price")
+                        sl = analysis_data.get("stop_loss")
+                        tp = analysis_data.get("take_profit")
+
+                        # Check if any price level is missing or zero
+                        if not entry or not sl or not tp:
+                            self.logger.warning(
+                                f"⚠️ AI returned '{recommendation}' but missing price levels: "
+                                f"entry={entry}, stop_loss={sl}, take_profit={tp}. "
+                                f"Downgrading to 'hold' to prevent invalid trades."
+                            )
+                            analysis_data["recommendation"] = "hold"
+                            analysis_data["llm_original_recommendation"] = recommendation
+
+                    # Apply decision matrix enforcement if enabled in prompt
+                    if prompt_data and isinstance(prompt_data, dict):
+                        decision_matrix = prompt_data.get('decision_matrix')
+                        if decision_matrix and decision_matrix.get('enabled'):
+                            try:
+                                confidence = float(analysis_data.get('confidence', 0))
+                                direction = str(analysis_data.get('direction', 'Long'))
+                                current_rec = str(analysis_data.get('recommendation', 'hold')).lower()
+
+                                min_conf = float(decision_matrix.get('rules', {}).get('min_confidence_for_trade', 0.60))
+
+                                if confidence >= min_conf:
+                                    # Should be a trade (buy or sell based on direction)
+                                    expected_rec = 'buy' if direction.lower() == 'long' else 'sell'
+                                    if current_rec != expected_rec:
+                                        analysis_data['llm_original_recommendation'] = current_rec
+                                        analysis_data['recommendation'] = expected_rec
+                                        self.logger.info(
+                                            f"✅ Decision matrix enforced: confidence={confidence:.2f} >= {min_conf}, "
+                                            f"direction={direction}, changed '{current_rec}' → '{expected_rec}'"
+                                        )
+                                else:
+                                    # Should be hold
+                                    if current_rec != 'hold':
+                                        analysis_data['llm_original_recommendation'] = current_rec
+                                        analysis_data['recommendation'] = 'hold'
+                                        self.logger.info(
+                                            f"✅ Decision matrix enforced: confidence={confidence:.2f} < {min_conf}, "
+                                            f"changed '{current_rec}' → 'hold'"
+                                        )
+                            except Exception as e:
+                                self.logger.warning(f"⚠️ Failed to apply decision matrix: {e}")
+
+                    # Inject assistant metadata and raw response
+                    analysis_data["assistant_id"] = agent_id
+                    analysis_data["assistant_model"] = assistant_model
+                    analysis_data["raw_response"] = response_text  # Store raw response for debugging/analysis
+
+                    return analysis_data, True
+
+                except json.JSONDecodeError:
+                    self.logger.warning("Failed to parse JSON from assistant response")
+
+            # Fallback: create structured response from text
             return {
-                "error": str(e),
                 "recommendation": "hold",
-                "summary": f"Analysis error: {str(e)}",
+                "summary": response_text,
+                "key_levels": {"support": 0.0, "resistance": 0.0},
+                "risk_factors": ["Manual analysis required"],
+                "timeframe": "short_term",
+                "extracted_timeframe": timeframe,
+                "normalized_timeframe": timeframe,
+                "symbol": symbol,
+                "confidence": 0.5,
+                "evidence": "Assistant analysis",
+                "last_close_price": last_close_price,
+                "entry_price": 0.0,
+                "stop_loss": 0.0,
+                "take_profit": 0.0,
+                "trade_confidence": 0.5,
+                "direction": "Long",
+                "assistant_id": agent_id,
+                "assistant_model": assistant_model,
+                "raw_response": response_text  # Store raw response for debugging/analysis
+            }, False
+        else:
+            # Error case - clean up thread/file if present
+            return {
+                "error": result.get('error', 'Analysis failed'),
+                "recommendation": "hold",
+                "summary": f"Analysis failed: {result.get('error', 'Unknown error')}",
                 "symbol": symbol,
                 "extracted_timeframe": timeframe,
                 "confidence": 0.0,
                 "assistant_id": agent_id,
-                "assistant_model": None
-            }
+                "assistant_model": assistant_model
+            }, True
+
+    @staticmethod
+    def _autotrader_error(e: Exception, agent_id: str, symbol: str, timeframe: str) -> Dict[str, Any]:
+        return {
+            "error": str(e),
+            "recommendation": "hold",
+            "summary": f"Analysis error: {str(e)}",
+            "symbol": symbol,
+            "extracted_timeframe": timeframe,
+            "confidence": 0.0,
+            "assistant_id": agent_id,
+            "assistant_model": None
+        }
 
     def delete_thread(self, thread_id: str) -> bool:
         """Delete a thread.
@@ -1,5 +1,6 @@
 """Chart image sourcing module."""
 import asyncio
+import contextvars
 import json
 import logging
 import os
@@ -8,7 +9,7 @@ import random
 import time
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Callable, Awaitable
 
 import requests
 from trading_bot.core.secrets_manager import get_tradingview_email
@@ -34,6 +35,11 @@ def get_random_user_agent() -> str:
     """Get a random realistic user agent string."""
     return random.choice(USER_AGENTS)
 
+
+# (sourcer, page) driven by the current capture worker task. ChartSourcer.page
+# resolves to it so navigation/screenshot helpers work unchanged on any tab.
+_worker_page: contextvars.ContextVar = contextvars.ContextVar('chart_sourcer_worker_page', default=None)
+
 # Image processing imports
 try:
     from PIL import Image
@@ -65,6 +71,10 @@ except ImportError:
 
 from trading_bot.config.settings_v2 import Config, TradingViewConfig
 from trading_bot.core.utils import check_system_resources, normalize_symbol_for_bybit # Import normalize_symbol_for_bybit
+from trading_bot.core.chart_hash import compute_chart_hash
+from trading_bot.core.chart_readiness import WaitTimings, canvas_snapshot, timed_wait
+from trading_bot.core.chart_images import get_chart_image_pipeline
+from trading_bot.core.llm_dispatcher import TokenBucket
 
 
 def is_railway_environment() -> bool:
@@ -96,7 +106,12 @@ class ChartSourcer:
         self.context = None
         self.page = None
         self.session_data = None
+        self._playwright = None
+        self._browser_started_at: Optional[float] = None  # time.monotonic() of the launch
         self.last_request_time = 0.0
+        self._last_request_by_page: Dict[int, float] = {}
+        rate_limit = self.tv_config.rate_limit if self.tv_config else None
+        self._request_bucket = TokenBucket(rate_limit.max_requests_per_minute if rate_limit else None, burst=1)
 
         # Setup logging
         self.logger = logging.getLogger(__name__)
@@ -105,6 +120,12 @@ class ChartSourcer:
         self.analysis_queue = queue.Queue()
         self.analysis_results = {}
 
+        # Perceptual hash (dHash) per chart path, computed on capture
+        self.chart_hashes: Dict[str, str] = {}
+
+        # How long each readiness wait took and which signal ended it
+        self.wait_timings = WaitTimings()
+
         # Check TradingView availability
         self.tradingview_enabled = (
             TRADINGVIEW_AVAILABLE and
@@ -118,6 +139,18 @@ class ChartSourcer:
                 "TradingView automation disabled: missing dependencies or credentials"
             )
     
+    @property
+    def page(self):
+        """Page of the current capture worker, else the primary page."""
+        worker = _worker_page.get()
+        if worker is not None and worker[0] is self:
+            return worker[1]
+        return self._page
+
+    @page.setter
+    def page(self, value) -> None:
+        self._page = value
+
     def _check_credentials(self) -> bool:
         """
         Check if TradingView session is available.
@@ -296,13 +329,29 @@ class ChartSourcer:
             return sorted(matches)[-1]
         return None
     
+    def get_chart_hash(self, chart_path: str) -> Optional[str]:
+        """Perceptual hash of a saved chart (computed from storage if not captured this run)."""
+        chart_hash = self.chart_hashes.get(chart_path)
+        if chart_hash is None:
+            from trading_bot.core.storage import read_file
+            try:
+                image_data = read_file(chart_path)
+                if image_data is None:
+                    return None
+                chart_hash = compute_chart_hash(image_data)
+            except Exception as e:
+                self.logger.debug(f"Could not hash chart {chart_path}: {e}")
+                return None
+            self.chart_hashes[chart_path] = chart_hash
+        return chart_hash
+
     def save_chart(self, image_data: bytes, symbol: str, timeframe: str) -> str:
         """Save chart image to storage (local or cloud based on STORAGE_TYPE)."""
         # Import here to avoid circular imports
         from trading_bot.core.file_validator import FileValidator
         from trading_bot.core.timestamp_validator import TimestampValidator
         from trading_bot.core.utils import align_timestamp_to_boundary
-        from trading_bot.core.storage import save_file, get_storage_type
+        from trading_bot.core.storage import get_storage_type
 
         validator = FileValidator()
         timestamp_validator = TimestampValidator()
@@ -339,15 +388,18 @@ class ChartSourcer:
         storage_type = get_storage_type()
         self.logger.info(f"💾 Saving chart to {storage_type} storage: {filename}")
 
-        # Save using storage module with charts/ prefix for consistency
+        # Save using storage module with charts/ prefix for consistency. The bytes
+        # stay in memory for analysis; the storage write may finish in the background
         file_path = f"charts/{filename}"
-        result = save_file(file_path, image_data, content_type='image/png')
+        result = get_chart_image_pipeline().save(file_path, image_data, content_type='image/png')
 
-        if not result.get('success'):
+        if result is None:
+            self.logger.info(f"✅ Chart queued for {storage_type} storage: {file_path}")
+        elif not result.get('success'):
             raise ValueError(f"Failed to save chart: {result.get('error', 'Unknown error')}")
-
-        saved_path = result.get('path', file_path)
-        self.logger.info(f"✅ Successfully saved chart: {saved_path} (storage: {storage_type})")
+        else:
+            saved_path = result.get('path', file_path)
+            self.logger.info(f"✅ Successfully saved chart: {saved_path} (storage: {storage_type})")
 
         # Return the file_path (charts/filename) for consistency with storage layer
         # This allows callers to use it directly with read_file(), move_file(), etc.
@@ -451,11 +503,12 @@ class ChartSourcer:
                 raise Exception("Failed to authenticate with TradingView after retries")
             
             # Navigate to chart using normalized symbol
+            before = await self._canvas_snapshot()
             if not await self.navigate_to_chart(normalized_symbol, timeframe):
                 raise Exception(f"Failed to navigate to chart for {normalized_symbol}")
             
             # Wait for chart to load
-            if not await self.wait_for_chart_load():
+            if not await self.wait_for_chart_load(changed_from=before):
                 raise Exception("Chart failed to load properly")
             
             # Capture screenshot using normalized symbol
@@ -490,6 +543,7 @@ class ChartSourcer:
             if self.browser is None:
                 try:
                     playwright = await async_playwright().start()
+                    self._playwright = playwright
                 except Exception as e:
                     self.logger.error(f"Failed to start Playwright: {str(e)}")
                     return False
@@ -642,6 +696,7 @@ class ChartSourcer:
                         await playwright.stop()
                     except Exception:
                         pass
+                    self._playwright = None
                     return False
                 
                 try:
@@ -700,182 +755,13 @@ class ChartSourcer:
                 try:
 
                     # Create new page
-                    self.page = await self.context.new_page()
-
-                    # Apply playwright-stealth if available (comprehensive anti-detection)
-                    if STEALTH_AVAILABLE and stealth_async:
-                        try:
-                            await stealth_async(self.page)
-                            self.logger.info("🥷 Stealth mode applied successfully")
-                        except Exception as e:
-                            self.logger.warning(f"Stealth plugin failed (using fallback): {str(e)}")
-
-                    # Add console error logging for debugging (with error handling)
-                    try:
-                        self.page.on("console", lambda msg: self.logger.debug(f"Browser console: {msg.type}: {msg.text}"))
-                        self.page.on("pageerror", lambda err: self.logger.error(f"Page error: {err}"))
-                    except Exception as e:
-                        self.logger.warning(f"Failed to set up page event handlers: {str(e)}")
-
-                    # Add request/response monitoring for debugging stuck loads (optional)
-                    try:
-                        self.page.on("request", lambda req: self.logger.debug(f"Request: {req.method} {req.url}"))
-                        self.page.on("response", lambda res: self.logger.debug(f"Response: {res.status} {res.url}"))
-                    except Exception as e:
-                        self.logger.debug(f"Failed to set up request monitoring: {str(e)}")
-
-                    # Add comprehensive anti-detection scripts and viewport fixes
-                    try:
-                        await self.page.add_init_script("""
-                            // Comprehensive anti-detection measures
-                            (() => {
-                                // 1. Hide webdriver property
-                                try {
-                                    Object.defineProperty(navigator, 'webdriver', {
-                                        get: () => undefined,
-                                    });
-                                    // Also delete it if possible
-                                    delete navigator.__proto__.webdriver;
-                                } catch (e) {}
-
-                                // 2. Fake plugins array (Chrome typically has 3-5 plugins)
-                                try {
-                                    const fakePlugins = {
-                                        length: 5,
-                                        0: { name: 'Chrome PDF Plugin', description: 'Portable Document Format', filename: 'internal-pdf-viewer' },
-                                        1: { name: 'Chrome PDF Viewer', description: '', filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai' },
-                                        2: { name: 'Native Client', description: '', filename: 'internal-nacl-plugin' },
-                                        3: { name: 'Chromium PDF Plugin', description: 'Portable Document Format', filename: 'internal-pdf-viewer' },
-                                        4: { name: 'Chromium PDF Viewer', description: '', filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai' },
-                                        item: function(i) { return this[i]; },
-                                        namedItem: function(name) { return null; },
-                                        refresh: function() {}
-                                    };
-                                    Object.defineProperty(navigator, 'plugins', {
-                                        get: () => fakePlugins,
-                                    });
-                                } catch (e) {}
-
-                                // 3. Fake languages
-                                try {
-                                    Object.defineProperty(navigator, 'languages', {
-                                        get: () => ['en-US', 'en'],
-                                    });
-                                } catch (e) {}
-
-                                // 4. Hide automation flags
-                                try {
-                                    Object.defineProperty(navigator, 'maxTouchPoints', {
-                                        get: () => 0,
-                                    });
-                                } catch (e) {}
-
-                                // 5. Override permissions query
-                                try {
-                                    const originalQuery = window.navigator.permissions.query;
-                                    window.navigator.permissions.query = (parameters) => (
-                                        parameters.name === 'notifications' ?
-                                            Promise.resolve({ state: Notification.permission }) :
-                                            originalQuery(parameters)
-                                    );
-                                } catch (e) {}
-
-                                // 6. Fix chrome object
-                                try {
-                                    if (!window.chrome) {
-                                        window.chrome = {
-                                            runtime: {},
-                                            loadTimes: function() {},
-                                            csi: function() {},
-                                            app: {}
-                                        };
-                                    }
-                                } catch (e) {}
-
-                                // 7. Fake hardware concurrency (realistic core count)
-                                try {
-                                    Object.defineProperty(navigator, 'hardwareConcurrency', {
-                                        get: () => 8,
-                                    });
-                                } catch (e) {}
-
-                                // 8. Fake device memory
-                                try {
-                                    Object.defineProperty(navigator, 'deviceMemory', {
-                                        get: () => 8,
-                                    });
-                                } catch (e) {}
-
-                                // 9. Override toString to hide modifications
-                                try {
-                                    const nativeToString = Function.prototype.toString;
-                                    const toStringProxy = new Proxy(nativeToString, {
-                                        apply: function(target, thisArg, args) {
-                                            if (thisArg === navigator.permissions.query) {
-                                                return 'function query() { [native code] }';
-                                            }
-                                            return Reflect.apply(target, thisArg, args);
-                                        }
-                                    });
-                                    Function.prototype.toString = toStringProxy;
-                                } catch (e) {}
-                            })();
-
-                            // Safe viewport fixing function
-                            function fixViewport() {
-                                try {
-                                    const viewport = document.querySelector('meta[name="viewport"]');
-                                    if (viewport) {
-                                        viewport.setAttribute('content', 'width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no');
-                                    }
-
-                                    const docElement = document.documentElement;
-                                    const body = document.body;
-
-                                    if (docElement && docElement.style) {
-                                        docElement.style.width = '100%';
-                                        docElement.style.height = '100%';
-                                        docElement.style.margin = '0';
-                                        docElement.style.padding = '0';
-                                        docElement.style.overflow = 'hidden';
-                                    }
-
-                                    if (body && body.style) {
-                                        body.style.width = '100%';
-                                        body.style.height = '100%';
-                                        body.style.margin = '0';
-                                        body.style.padding = '0';
-                                        body.style.overflow = 'hidden';
-                                    }
-
-                                    const containers = document.querySelectorAll('.container, .main, #main, .content, .app');
-                                    containers.forEach(container => {
-                                        if (container && container.style) {
-                                            container.style.width = '100%';
-                                            container.style.height = '100%';
-                                            container.style.maxWidth = 'none';
-                                            container.style.maxHeight = 'none';
-                                        }
-                                    });
-                                } catch (error) {}
-                            }
-
-                            // Run viewport fix with error handling
-                            try {
-                                fixViewport();
-                                window.addEventListener('load', fixViewport);
-                                window.addEventListener('resize', fixViewport);
-                                window.addEventListener('DOMContentLoaded', fixViewport);
-                                setInterval(fixViewport, 1000);
-                            } catch (error) {}
-                        """)
-                    except Exception as e:
-                        self.logger.warning(f"Failed to add init script: {str(e)}")
+                    self.page = await self._new_page()
                 except Exception as e:
                     self.logger.error(f"Failed to create page or add scripts: {str(e)}")
                     await self.cleanup_browser_session()
                     return False
                 
+                self._browser_started_at = time.monotonic()
                 self.logger.info("Browser session initialized successfully")
                 return True
 
@@ -886,6 +772,182 @@ class ChartSourcer:
 
         return True
 
+    async def _new_page(self):
+        """Open a page in the current context with stealth, logging and anti-detection scripts."""
+        page = await self.context.new_page()
+
+        # Apply playwright-stealth if available (comprehensive anti-detection)
+        if STEALTH_AVAILABLE and stealth_async:
+            try:
+                await stealth_async(page)
+                self.logger.info("🥷 Stealth mode applied successfully")
+            except Exception as e:
+                self.logger.warning(f"Stealth plugin failed (using fallback): {str(e)}")
+
+        # Add console error logging for debugging (with error handling)
+        try:
+            page.on("console", lambda msg: self.logger.debug(f"Browser console: {msg.type}: {msg.text}"))
+            page.on("pageerror", lambda err: self.logger.error(f"Page error: {err}"))
+        except Exception as e:
+            self.logger.warning(f"Failed to set up page event handlers: {str(e)}")
+
+        # Add request/response monitoring for debugging stuck loads (optional)
+        try:
+            page.on("request", lambda req: self.logger.debug(f"Request: {req.method} {req.url}"))
+            page.on("response", lambda res: self.logger.debug(f"Response: {res.status} {res.url}"))
+        except Exception as e:
+            self.logger.debug(f"Failed to set up request monitoring: {str(e)}")
+
+        # Add comprehensive anti-detection scripts and viewport fixes
+        try:
+            await page.add_init_script("""
+                // Comprehensive anti-detection measures
+                (() => {
+                    // 1. Hide webdriver property
+                    try {
+                        Object.defineProperty(navigator, 'webdriver', {
+                            get: () => undefined,
+                        });
+                        // Also delete it if possible
+                        delete navigator.__proto__.webdriver;
+                    } catch (e) {}
+
+                    // 2. Fake plugins array (Chrome typically has 3-5 plugins)
+                    try {
+                        const fakePlugins = {
+                            length: 5,
+                            0: { name: 'Chrome PDF Plugin', description: 'Portable Document Format', filename: 'internal-pdf-viewer' },
+                            1: { name: 'Chrome PDF Viewer', description: '', filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai' },
+                            2: { name: 'Native Client', description: '', filename: 'internal-nacl-plugin' },
+                            3: { name: 'Chromium PDF Plugin', description: 'Portable Document Format', filename: 'internal-pdf-viewer' },
+                            4: { name: 'Chromium PDF Viewer', description: '', filename: 'mhjfbmdgcfjbbpaeojofohoefgiehjai' },
+                            item: function(i) { return this[i]; },
+                            namedItem: function(name) { return null; },
+                            refresh: function() {}
+                        };
+                        Object.defineProperty(navigator, 'plugins', {
+                            get: () => fakePlugins,
+                        });
+                    } catch (e) {}
+
+                    // 3. Fake languages
+                    try {
+                        Object.defineProperty(navigator, 'languages', {
+                            get: () => ['en-US', 'en'],
+                        });
+                    } catch (e) {}
+
+                    // 4. Hide automation flags
+                    try {
+                        Object.defineProperty(navigator, 'maxTouchPoints', {
+                            get: () => 0,
+                        });
+                    } catch (e) {}
+
+                    // 5. Override permissions query
+                    try {
+                        const originalQuery = window.navigator.permissions.query;
+                        window.navigator.permissions.query = (parameters) => (
+                            parameters.name === 'notifications' ?
+                                Promise.resolve({ state: Notification.permission }) :
+                                originalQuery(parameters)
+                        );
+                    } catch (e) {}
+
+                    // 6. Fix chrome object
+                    try {
+                        if (!window.chrome) {
+                            window.chrome = {
+                                runtime: {},
+                                loadTimes: function() {},
+                                csi: function() {},
+                                app: {}
+                            };
+                        }
+                    } catch (e) {}
+
+                    // 7. Fake hardware concurrency (realistic core count)
+                    try {
+                        Object.defineProperty(navigator, 'hardwareConcurrency', {
+                            get: () => 8,
+                        });
+                    } catch (e) {}
+
+                    // 8. Fake device memory
+                    try {
+                        Object.defineProperty(navigator, 'deviceMemory', {
+                            get: () => 8,
+                        });
+                    } catch (e) {}
+
+                    // 9. Override toString to hide modifications
+                    try {
+                        const nativeToString = Function.prototype.toString;
+                        const toStringProxy = new Proxy(nativeToString, {
+                            apply: function(target, thisArg, args) {
+                                if (thisArg === navigator.permissions.query) {
+                                    return 'function query() { [native code] }';
+                                }
+                                return Reflect.apply(target, thisArg, args);
+                            }
+                        });
+                        Function.prototype.toString = toStringProxy;
+                    } catch (e) {}
+                })();
+
+                // Safe viewport fixing function
+                function fixViewport() {
+                    try {
+                        const viewport = document.querySelector('meta[name="viewport"]');
+                        if (viewport) {
+                            viewport.setAttribute('content', 'width=device-width, initial-scale=1.0, maximum-scale=1.0, user-scalable=no');
+                        }
+
+                        const docElement = document.documentElement;
+                        const body = document.body;
+
+                        if (docElement && docElement.style) {
+                            docElement.style.width = '100%';
+                            docElement.style.height = '100%';
+                            docElement.style.margin = '0';
+                            docElement.style.padding = '0';
+                            docElement.style.overflow = 'hidden';
+                        }
+
+                        if (body && body.style) {
+                            body.style.width = '100%';
+                            body.style.height = '100%';
+                            body.style.margin = '0';
+                            body.style.padding = '0';
+                            body.style.overflow = 'hidden';
+                        }
+
+                        const containers = document.querySelectorAll('.container, .main, #main, .content, .app');
+                        containers.forEach(container => {
+                            if (container && container.style) {
+                                container.style.width = '100%';
+                                container.style.height = '100%';
+                                container.style.maxWidth = 'none';
+                                container.style.maxHeight = 'none';
+                            }
+                        });
+                    } catch (error) {}
+                }
+
+                // Run viewport fix with error handling
+                try {
+                    fixViewport();
+                    window.addEventListener('load', fixViewport);
+                    window.addEventListener('resize', fixViewport);
+                    window.addEventListener('DOMContentLoaded', fixViewport);
+                    setInterval(fixViewport, 1000);
+                } catch (error) {}
+            """)
+        except Exception as e:
+            self.logger.warning(f"Failed to add init script: {str(e)}")
+
+        return page
+
     def _is_browser_alive(self) -> bool:
         """Check if browser, context and page are still alive and usable."""
         try:
@@ -974,17 +1036,17 @@ class ChartSourcer:
                 await self.page.goto(chart_url, wait_until='commit', timeout=10000)
                 self.logger.info("Chart page navigation initiated")
 
-                # Optimized wait time: 3 seconds for page to load
-                # This is more reliable than waiting for networkidle/domcontentloaded
-                # which can timeout on TradingView due to continuous network activity
-                await asyncio.sleep(3)
-                self.logger.info("Chart page assumed loaded after 3 second wait")
+                # Wait for the first readiness signal, at most 3 seconds. networkidle
+                # alone can time out on TradingView due to continuous network activity,
+                # so a stable canvas or a quiet DOM also counts
+                signal = await self._wait_until_ready('navigation', 3.0, after_navigation=True)
+                self.logger.info(f"Chart page ready ({signal})")
 
             except Exception as nav_error:
                 self.logger.warning(f"Navigation error (continuing anyway): {str(nav_error)}")
                 # Even if navigation fails, wait and try to continue
-                # The page might still be usable
-                await asyncio.sleep(3)
+                # The page might still be usable (no navigation committed, so no networkidle)
+                await self._wait_until_ready('navigation', 3.0)
 
             # Check if we hit the "can't open chart layout" error page
             if await self._detect_login_required_page():
@@ -993,7 +1055,7 @@ class ChartSourcer:
                     # Re-navigate after successful login
                     self.logger.info("🔄 Retrying navigation after successful login...")
                     await self.page.goto(chart_url, wait_until='commit', timeout=10000)
-                    await asyncio.sleep(3)
+                    await self._wait_until_ready('navigation', 3.0, after_navigation=True)
                 else:
                     self.logger.error("❌ Login failed - cannot access chart")
                     return False
@@ -1136,9 +1198,11 @@ class ChartSourcer:
                     if self.page:
                         element = await self.page.query_selector(selector)
                         if element:
+                            before = await self._canvas_snapshot()
                             await element.click()
                             self.logger.info(f"Set timeframe to {timeframe}")
-                            await asyncio.sleep(1)  # Wait for chart to update
+                            # Wait for chart to update
+                            await self._wait_until_ready('timeframe', 1.0, changed_from=before)
                             return True
                 except Exception:
                     continue
@@ -1150,14 +1214,55 @@ class ChartSourcer:
             self.logger.error(f"Failed to set timeframe: {str(e)}")
             return False
     
-    async def wait_for_chart_load(self) -> bool:
-        """Wait for chart data to fully load."""
+    def _adaptive_waits(self) -> bool:
+        browser = self.tv_config.browser if self.tv_config else None
+        return getattr(browser, 'adaptive_waits', True)
+
+    def _chart_selector(self) -> Optional[str]:
+        screenshot = self.tv_config.screenshot if self.tv_config else None
+        return getattr(screenshot, 'chart_selector', None)
+
+    async def _canvas_snapshot(self) -> Optional[str]:
+        """Chart canvas hash to pass as changed_from, taken before an in-page action."""
+        if not self.page or not self._adaptive_waits():
+            return None
+        return await canvas_snapshot(self.page, self._chart_selector())
+
+    async def _wait_until_ready(self, step: str, cap: float, after_navigation: bool = False,
+                                changed_from: Optional[str] = None) -> str:
+        """
+        Wait for the chart to become ready, at most `cap` seconds (the old fixed sleep).
+
+        Returns the readiness signal that fired; the wait is recorded in
+        self.wait_timings under `step`. With tradingview.browser.adaptive_waits
+        off this sleeps the full cap as before. Pass after_navigation=True
+        right after page.goto so network idle counts as a signal too, and
+        changed_from=self._canvas_snapshot() (taken before a click) for in-page
+        waits so the old, already painted chart doesn't count as ready.
+        """
+        return await timed_wait(
+            self.wait_timings, step, self.page,
+            selector=self._chart_selector(),
+            cap=cap,
+            adaptive=self._adaptive_waits(),
+            after_navigation=after_navigation,
+            changed_from=changed_from,
+        )
+
+    async def wait_for_chart_load(self, changed_from: Optional[str] = None) -> bool:
+        """
+        Wait for chart data to fully load.
+
+        Args:
+            changed_from: self._canvas_snapshot() taken before navigating, so the
+                previous symbol's chart doesn't count as loaded
+        """
         if not self.page:
             return False
 
         try:
-            # Reduced wait time for faster chart capture (3s instead of 5s)
-            await asyncio.sleep(3)
+            # Readiness signals instead of a fixed 3s (previously 5s) sleep
+            await self._wait_until_ready('chart_load', 3.0, changed_from=changed_from)
 
             # Use a simpler approach that doesn't violate CSP
             # Wait for chart container to be visible and stable
@@ -1172,7 +1277,7 @@ class ChartSourcer:
                 self.logger.warning(f"Chart container not found: {str(e)}")
 
             # Try to wait for loading indicators to disappear using selector-based approach
-            # Reduced timeout from 5s to 2s per selector
+            # Selectors are awaited together, so the total is at most 2s rather than 2s each
             loading_selectors = [
                 '[class*="loading"]',
                 '[class*="spinner"]',
@@ -1181,7 +1286,7 @@ class ChartSourcer:
                 '.spinner'
             ]
 
-            for selector in loading_selectors:
+            async def wait_hidden(selector: str) -> None:
                 try:
                     # Wait for loading elements to be hidden (if they exist)
                     await self.page.wait_for_selector(selector, state='hidden', timeout=2000)
@@ -1190,6 +1295,10 @@ class ChartSourcer:
                     # Loading indicator might not exist, which is fine
                     pass
 
+            started = time.monotonic()
+            await asyncio.gather(*(wait_hidden(selector) for selector in loading_selectors))
+            self.wait_timings.record('loading_indicators', time.monotonic() - started, 'selectors')
+
             self.logger.info("Chart loaded successfully")
             return True
 
@@ -1251,10 +1360,11 @@ class ChartSourcer:
                 )
             else:
                 # Hide unwanted elements safely
+                before = await self._canvas_snapshot()
                 await self._hide_unwanted_elements_safely()
 
                 # Wait a moment for UI changes
-                await asyncio.sleep(1)
+                await self._wait_until_ready('hide_elements', 1.0, changed_from=before)
 
                 # Take screenshot of chart area
                 try:
@@ -1444,6 +1554,72 @@ class ChartSourcer:
                 # Log but don't fail - element hiding is not critical
                 self.logger.debug(f"Failed to hide element {selector}: {str(e)}")
     
+    def _persistent_browser(self) -> bool:
+        browser = self.tv_config.browser if self.tv_config else None
+        return bool(getattr(browser, 'persistent', False))
+
+    async def acquire_browser_session(self) -> bool:
+        """
+        Browser session for one trading cycle.
+
+        With tradingview.browser.persistent the browser from the previous cycle
+        is reused while it passes the health checks and is within its age and
+        system resource budget; otherwise it is restarted. Without it this is
+        setup_browser_session().
+        """
+        if not self._persistent_browser() or self.browser is None:
+            return await self.setup_browser_session()
+
+        reason = await self._warm_browser_recycle_reason()
+        if reason is None:
+            age_minutes = (time.monotonic() - (self._browser_started_at or time.monotonic())) / 60
+            self.logger.info(f"♻️ Reusing warm browser session (up {age_minutes:.0f} min)")
+            return True
+
+        self.logger.info(f"🔄 Restarting warm browser session: {reason}")
+        await self.cleanup_browser_session()
+        return await self.setup_browser_session()
+
+    def flush_chart_writes(self, timeout: Optional[float] = None) -> bool:
+        """Wait for charts still being written to storage in the background."""
+        return get_chart_image_pipeline().flush(timeout)
+
+    async def release_browser_session(self) -> None:
+        """End of a trading cycle: keep a healthy persistent browser warm, else clean up."""
+        if self._persistent_browser() and self._is_browser_alive():
+            self.logger.info("Keeping browser session warm for the next cycle")
+            return
+        await self.cleanup_browser_session()
+
+    async def _warm_browser_recycle_reason(self) -> Optional[str]:
+        """Why the warm browser can't be reused, or None when it can."""
+        if not self._is_browser_alive():
+            return "browser, context or page closed"
+        if not await self._check_browser_connection_health():
+            return "browser connection unhealthy"
+
+        if not await self._check_page_responsiveness():
+            # The context (and its cookies) is fine - a fresh page is enough
+            self.logger.info("Warm page unresponsive - opening a fresh page in the same context")
+            try:
+                stale = self._page
+                self.page = await self._new_page()
+                await stale.close()
+            except Exception as e:
+                return f"could not replace unresponsive page: {e}"
+            if not await self._check_browser_connection_health():
+                return "browser connection unhealthy after page replacement"
+
+        max_age = getattr(self.tv_config.browser, 'max_session_age_minutes', 0)
+        if max_age and self._browser_started_at is not None:
+            age_minutes = (time.monotonic() - self._browser_started_at) / 60
+            if age_minutes >= max_age:
+                return f"session age {age_minutes:.0f} min exceeds {max_age} min budget"
+
+        if not await self._check_system_resources():
+            return "system resources over budget"
+        return None
+
     async def cleanup_browser_session(self) -> None:
         """Proper browser resource cleanup."""
         try:
@@ -1467,6 +1643,14 @@ class ChartSourcer:
                 except Exception:
                     pass  # Browser might already be closed
                 self.browser = None
+
+            if self._playwright:
+                try:
+                    await self._playwright.stop()
+                except Exception:
+                    pass  # Driver might already be gone
+                self._playwright = None
+            self._browser_started_at = None
             
             self.logger.info("Browser session cleaned up")
             
@@ -1564,23 +1748,32 @@ class ChartSourcer:
             self.logger.warning(f"Error during force cleanup: {str(e)}")
     
     async def _respect_rate_limits(self) -> None:
-        """Implement rate limiting to respect TradingView terms."""
+        """Implement rate limiting to respect TradingView terms.
+
+        delay_between_requests spaces requests made from the same page;
+        max_requests_per_minute is a token bucket shared by all capture pages.
+        """
         # Handle case where rate_limit config is None
         if not self.tv_config or not self.tv_config.rate_limit:
             return
         if not self.tv_config.rate_limit.respect_rate_limits:
             return
 
-        current_time = time.time()
-        time_since_last = current_time - self.last_request_time
+        page_key = id(self.page)
+        time_since_last = time.time() - self._last_request_by_page.get(page_key, 0.0)
         min_delay = self.tv_config.rate_limit.delay_between_requests
 
-        if time_since_last < min_delay:
-            sleep_time = min_delay - time_since_last
-            self.logger.info(f"Rate limiting: sleeping for {sleep_time:.2f} seconds")
+        sleep_time = max(0.0, min_delay - time_since_last)
+        if sleep_time > 0:
             await asyncio.sleep(sleep_time)
+        bucket_wait = self._request_bucket.reserve(1)
+        if bucket_wait > 0:
+            await asyncio.sleep(bucket_wait)
+        if sleep_time + bucket_wait > 0:
+            self.logger.info(f"Rate limiting: slept {sleep_time + bucket_wait:.2f} seconds")
 
         self.last_request_time = time.time()
+        self._last_request_by_page[page_key] = self.last_request_time
 
     async def _load_session_from_db(self) -> dict | None:
         """Load encrypted session from database (supports both SQLite and PostgreSQL).
@@ -2452,6 +2645,48 @@ class ChartSourcer:
 
         return timeframe_map.get(timeframe.lower(), timeframe)
 
+    def _crop_margins(self) -> Dict[str, int]:
+        """Crop margins from config, defaulting to the browser UI around the chart."""
+        # Use default crop configuration from config
+        crop_config = getattr(self.tv_config.screenshot, 'crop', None)
+        if not crop_config:
+            # Default crop: remove browser UI elements
+            crop_config = {
+                'left': 50,
+                'top': 40,
+                'right': 320,
+                'bottom': 40
+            }
+        return crop_config
+
+    def _screenshot_clip(self) -> Optional[Dict[str, float]]:
+        """
+        Crop margins as a Playwright screenshot clip of the current viewport.
+
+        Clipping in the browser yields the cropped PNG directly, skipping the
+        PIL decode/crop/re-encode of _crop_screenshot. None if unavailable.
+        """
+        if not getattr(self.tv_config.screenshot, 'crop_via_clip', True):
+            return None
+        viewport = None
+        try:
+            viewport = self.page.viewport_size
+        except Exception:
+            pass
+        if not viewport and self.tv_config.browser:
+            viewport = {'width': self.tv_config.browser.viewport_width,
+                        'height': self.tv_config.browser.viewport_height}
+        if not viewport:
+            return None
+
+        margins = self._crop_margins()
+        left, top = margins.get('left', 0), margins.get('top', 0)
+        width = viewport['width'] - left - margins.get('right', 0)
+        height = viewport['height'] - top - margins.get('bottom', 0)
+        if width <= 0 or height <= 0:
+            return None
+        return {'x': left, 'y': top, 'width': width, 'height': height}
+
     def _crop_screenshot(self, image_data: bytes, crop_config: Optional[Dict[str, int]] = None) -> bytes:
         """
         Crop screenshot image based on configuration.
@@ -2473,16 +2708,7 @@ class ChartSourcer:
             return image_data
 
         if not crop_config:
-            # Use default crop configuration from config
-            crop_config = getattr(self.tv_config.screenshot, 'crop', None)
-            if not crop_config:
-                # Default crop: remove browser UI elements
-                crop_config = {
-                    'left': 50,
-                    'top': 40,
-                    'right': 320,
-                    'bottom': 40
-                }
+            crop_config = self._crop_margins()
 
         try:
             # Load image from bytes
@@ -2866,7 +3092,7 @@ class ChartSourcer:
                 self.logger.info("Navigating to TradingView chart page for symbol navigation")
                 await self.page.goto("https://www.tradingview.com/chart/", timeout=30000)
                 await self.page.wait_for_load_state('domcontentloaded')
-                await asyncio.sleep(3)
+                await self._wait_until_ready('navigation', 3.0, after_navigation=True)
 
             # Detect and close any popups that might interfere with clicking
             await self._detect_and_close_popups()
@@ -2893,6 +3119,7 @@ class ChartSourcer:
             self.logger.info(f"Navigating to symbol {symbol_index}: {symbol_text}")
 
             # Try multiple click strategies to handle overlays
+            before = await self._canvas_snapshot()
             click_success = False
 
             # Strategy 1: Direct click with force
@@ -2935,7 +3162,7 @@ class ChartSourcer:
                 return False
 
             # Wait for chart to load after successful click
-            await asyncio.sleep(3)
+            await self._wait_until_ready('watchlist_click', 3.0, changed_from=before)
 
             # Verify that we've navigated to the correct symbol by checking the chart
             try:
@@ -3087,7 +3314,168 @@ class ChartSourcer:
 
         return filename
 
-    async def capture_all_watchlist_screenshots(self, output_dir: Optional[str] = None, target_chart: Optional[str] = None, timeframe: Optional[str] = None) -> Dict[str, str]:
+    async def _capture_watchlist_symbol(
+        self,
+        symbol: str,
+        timeframe: Optional[str],
+        chart_ready: Callable[[str, str], Awaitable[None]],
+        rate_limited: bool = False,
+    ) -> tuple:
+        """
+        Capture (or reuse) one watchlist symbol's chart on the current page.
+
+        rate_limited applies _respect_rate_limits before navigating (used when
+        several pages capture at once).
+
+        Returns:
+            (status, path): status is 'new', 'dedup', 'failed' or 'stop'
+            (browser gone - no further captures possible)
+        """
+        # Check if browser is still alive before each capture
+        if not self._is_browser_alive():
+            self.logger.warning("Browser session closed, stopping screenshot capture")
+            return 'stop', None
+
+        try:
+            # Normalize symbol name for Bybit format (removes .P suffix etc.)
+            symbol_clean = symbol.replace('/', '_').replace(':', '_').replace(' ', '_')
+            symbol_clean = normalize_symbol_for_bybit(symbol_clean)
+
+            # OPTIMIZATION: Check if screenshot already exists for this symbol+timeframe+boundary
+            # This prevents duplicate screenshots when multiple instances run simultaneously
+            from trading_bot.core.storage import file_exists
+
+            expected_filename = self._get_expected_chart_filename(symbol_clean, timeframe or "1d")
+            expected_path = f"charts/{expected_filename}"
+
+            if file_exists(expected_path):
+                self.logger.info(f"📦 [DEDUP] Reusing existing chart for {symbol_clean}")
+                self.logger.info(f"   ├─ Filename: {expected_filename}")
+                self.logger.info(f"   ├─ Storage path: {expected_path}")
+                self.logger.info(f"   └─ Reason: Same symbol+timeframe+boundary already captured")
+                await chart_ready(symbol, expected_path)
+                return 'dedup', expected_path  # No need to navigate or screenshot
+
+            if rate_limited:
+                await self._respect_rate_limits()
+
+            # Navigate to symbol using URL-based navigation (more reliable than watchlist clicks)
+            before = await self._canvas_snapshot()
+            if not await self.navigate_to_chart(symbol_clean, timeframe or "1d"):
+                self.logger.error(f"Failed to navigate to symbol: {symbol}")
+                return 'failed', None
+
+            # Wait for chart to load after navigation
+            await self.wait_for_chart_load(changed_from=before)
+
+            # Take screenshot with timestamp and timeframe (check browser alive again)
+            if not self._is_browser_alive():
+                self.logger.warning("Browser closed during chart load, stopping")
+                return 'stop', None
+
+            # Crop screenshot before saving (if enabled) - in the browser via clip when possible
+            clip = None
+            if getattr(self.tv_config.screenshot, 'enable_crop', True):
+                clip = self._screenshot_clip()
+            if clip:
+                screenshot_bytes = await self.page.screenshot(clip=clip)
+            else:
+                screenshot_bytes = await self.page.screenshot()
+                if getattr(self.tv_config.screenshot, 'enable_crop', True):
+                    screenshot_bytes = self._crop_screenshot(screenshot_bytes)
+
+            # Save using existing method
+            screenshot_path = str(self.save_chart(screenshot_bytes, symbol_clean, timeframe or "1d"))
+            try:
+                self.chart_hashes[screenshot_path] = compute_chart_hash(screenshot_bytes)
+            except Exception as e:
+                self.logger.debug(f"Could not hash chart for {symbol_clean}: {e}")
+
+            self.logger.info(f"📸 [NEW] Screenshot captured and saved: {Path(screenshot_path).name}")
+            await chart_ready(symbol, screenshot_path)
+            return 'new', screenshot_path
+
+        except Exception as e:
+            # Check if it's a browser closed error
+            if "Target page, context or browser has been closed" in str(e):
+                self.logger.warning("Browser was closed externally, stopping capture")
+                return 'stop', None
+            self.logger.error(f"Error capturing screenshot for {symbol}: {str(e)}")
+            return 'failed', None
+
+    async def _capture_symbols_concurrently(
+        self,
+        symbols: List[str],
+        timeframe: Optional[str],
+        pages: int,
+        chart_ready: Callable[[str, str], Awaitable[None]],
+    ) -> Dict[str, tuple]:
+        """
+        Shard the watchlist across `pages` tabs of the current (authenticated) context.
+
+        Workers pull symbols from a shared queue, so a slow chart doesn't hold
+        up a fixed shard. The primary page is one of the workers; extra pages
+        are closed afterwards. Requests stay under the shared rate limit bucket.
+
+        Returns:
+            symbol -> (status, path), as _capture_watchlist_symbol
+        """
+        worker_pages = [self._page]
+        try:
+            for _ in range(pages - 1):
+                worker_pages.append(await self._new_page())
+        except Exception as e:
+            self.logger.warning(f"Could only open {len(worker_pages)} capture pages: {e}")
+        self.logger.info(f"🗂️ Capturing {len(symbols)} symbols on {len(worker_pages)} pages")
+
+        work: asyncio.Queue = asyncio.Queue()
+        for symbol in symbols:
+            work.put_nowait(symbol)
+        outcomes: Dict[str, tuple] = {}
+        stop = asyncio.Event()
+
+        async def worker(page) -> None:
+            _worker_page.set((self, page))
+            while not stop.is_set():
+                try:
+                    symbol = work.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                status, path = await self._capture_watchlist_symbol(
+                    symbol, timeframe, chart_ready, rate_limited=True
+                )
+                if status == 'stop':
+                    stop.set()
+                    return
+                outcomes[symbol] = (status, path)
+
+        previous_bucket = self._request_bucket
+        rate_limit = self.tv_config.rate_limit
+        # Let every page start at once, then refill at max_requests_per_minute
+        self._request_bucket = TokenBucket(
+            rate_limit.max_requests_per_minute if rate_limit else None, burst=len(worker_pages)
+        )
+        try:
+            # Each task runs in a copy of this context, so the worker page stays task-local
+            await asyncio.gather(*(worker(page) for page in worker_pages))
+        finally:
+            self._request_bucket = previous_bucket
+            for page in worker_pages[1:]:
+                self._last_request_by_page.pop(id(page), None)
+                try:
+                    await page.close()
+                except Exception:
+                    pass
+        return outcomes
+
+    async def capture_all_watchlist_screenshots(
+        self,
+        output_dir: Optional[str] = None,
+        target_chart: Optional[str] = None,
+        timeframe: Optional[str] = None,
+        on_chart_ready: Optional[Callable[[str, str], Awaitable[None]]] = None,
+        pages: Optional[int] = None,
+    ) -> Dict[str, str]:
         """
         Capture screenshots for all symbols in the watchlist or a specific target chart.
         Skips capturing if charts already exist for the current boundary.
@@ -3096,6 +3484,11 @@ class ChartSourcer:
             output_dir: Directory to save screenshots (default: data/charts/watchlist_TIMESTAMP)
             target_chart: Optional specific chart URL to capture instead of watchlist
             timeframe: Timeframe for the charts (e.g., '1h', '4h', '1d')
+            on_chart_ready: Optional coroutine called as on_chart_ready(symbol, path)
+                as soon as each chart is saved (or reused), so callers can start
+                analysis while the remaining symbols are still being captured
+            pages: Number of tabs capturing concurrently in the same authenticated
+                context (default: tradingview.browser.capture_pages, 1 = serial)
 
         Returns:
             Dict mapping symbol names to screenshot file paths
@@ -3104,12 +3497,26 @@ class ChartSourcer:
             self.logger.error("No page available for screenshot capture")
             return {}
 
+        async def chart_ready(symbol: str, path: str) -> None:
+            if on_chart_ready is None:
+                return
+            try:
+                await on_chart_ready(symbol, path)
+            except Exception as e:
+                self.logger.warning(f"Chart-ready callback failed for {symbol}: {e}")
+
+        # Hashes and wait timings are only needed for the charts of this capture
+        self.chart_hashes.clear()
+        self.wait_timings.reset()
+
         try:
             # Check if charts already exist for current boundary
             if timeframe:
                 existing_charts = self.get_charts_for_current_boundary(timeframe)
                 if existing_charts:
                     self.logger.info(f"🎯 Reusing {len(existing_charts)} existing charts for current boundary")
+                    for symbol, path in existing_charts.items():
+                        await chart_ready(symbol, path)
                     return existing_charts
 
             # Setup output directory - save directly to data/charts
@@ -3193,76 +3600,28 @@ class ChartSourcer:
                 await asyncio.sleep(5)
 
             # Capture screenshots for each symbol in the watchlist
-            screenshot_paths = {}
-            successful_captures = 0
-            deduped_count = 0  # Track reused screenshots
-            new_captures = 0   # Track newly captured screenshots
-
-            for i, symbol in enumerate(symbols):
-                # Check if browser is still alive before each capture
-                if not self._is_browser_alive():
-                    self.logger.warning("Browser session closed, stopping screenshot capture")
-                    break
-
-                try:
-                    self.logger.info(f"\n##############\nProcessing symbol {i+1}/{len(symbols)}: {symbol}")
-
-                    # Normalize symbol name for Bybit format (removes .P suffix etc.)
-                    symbol_clean = symbol.replace('/', '_').replace(':', '_').replace(' ', '_')
-                    symbol_clean = normalize_symbol_for_bybit(symbol_clean)
-
-                    # OPTIMIZATION: Check if screenshot already exists for this symbol+timeframe+boundary
-                    # This prevents duplicate screenshots when multiple instances run simultaneously
-                    from trading_bot.core.storage import file_exists
-
-                    expected_filename = self._get_expected_chart_filename(symbol_clean, timeframe or "1d")
-                    expected_path = f"charts/{expected_filename}"
-
-                    if file_exists(expected_path):
-                        self.logger.info(f"📦 [DEDUP] Reusing existing chart for {symbol_clean}")
-                        self.logger.info(f"   ├─ Filename: {expected_filename}")
-                        self.logger.info(f"   ├─ Storage path: {expected_path}")
-                        self.logger.info(f"   └─ Reason: Same symbol+timeframe+boundary already captured")
-                        screenshot_paths[symbol] = expected_path
-                        successful_captures += 1
-                        deduped_count += 1
-                        continue  # Skip to next symbol - no need to navigate or screenshot
-
-                    # Navigate to symbol using URL-based navigation (more reliable than watchlist clicks)
-                    if await self.navigate_to_chart(symbol_clean, timeframe or "1d"):
-
-                        # Wait for chart to load after navigation
-                        await self.wait_for_chart_load()
-
-                        # Take screenshot with timestamp and timeframe (check browser alive again)
-                        if not self._is_browser_alive():
-                            self.logger.warning("Browser closed during chart load, stopping")
-                            break
-
-                        screenshot_bytes = await self.page.screenshot()
-
-                        # Crop screenshot before saving (if enabled)
-                        if getattr(self.tv_config.screenshot, 'enable_crop', True):
-                            screenshot_bytes = self._crop_screenshot(screenshot_bytes)
-
-                        # Save using existing method
-                        screenshot_path = self.save_chart(screenshot_bytes, symbol_clean, timeframe or "1d")
+            if pages is None:
+                pages = getattr(self.tv_config.browser, 'capture_pages', 1) if self.tv_config.browser else 1
+            pages = max(1, min(int(pages), len(symbols)))
+            if pages > 1:
+                outcomes = await self._capture_symbols_concurrently(symbols, timeframe, pages, chart_ready)
+            else:
+                outcomes = {}
+                for symbol in symbols:
+                    status, path = await self._capture_watchlist_symbol(symbol, timeframe, chart_ready)
+                    if status == 'stop':
+                        break
+                    outcomes[symbol] = (status, path)
 
-                        screenshot_paths[symbol] = str(screenshot_path)
-                        successful_captures += 1
-                        new_captures += 1
-                        self.logger.info(f"📸 [NEW] Screenshot captured and saved: {Path(screenshot_path).name}")
-                    else:
-                        self.logger.error(f"Failed to navigate to symbol: {symbol}")
+            # Same shape and order as a serial capture, whichever mode ran
+            screenshot_paths = {
+                symbol: outcomes[symbol][1] for symbol in symbols
+                if symbol in outcomes and outcomes[symbol][0] in ('new', 'dedup')
+            }
+            new_captures = sum(1 for status, _ in outcomes.values() if status == 'new')
+            deduped_count = sum(1 for status, _ in outcomes.values() if status == 'dedup')  # Track reused screenshots
+            successful_captures = new_captures + deduped_count
 
-                except Exception as e:
-                    # Check if it's a browser closed error
-                    if "Target page, context or browser has been closed" in str(e):
-                        self.logger.warning("Browser was closed externally, stopping capture")
-                        break
-                    self.logger.error(f"Error capturing screenshot for {symbol}: {str(e)}")
-                    continue
-            
             # Create summary
             summary_file = output_path / "capture_summary.txt"
             with open(summary_file, 'w') as f:
@@ -3305,6 +3664,10 @@ class ChartSourcer:
                 self.logger.info(f"   ├─ Skipped: {deduped_count} browser navigations")
                 self.logger.info(f"   └─ Benefit: Faster cycle execution & reduced resource usage")
 
+            wait_summary = self.wait_timings.format_summary()
+            if wait_summary:
+                self.logger.info(f"\n⏱️ Wait timings (slowest first):\n{wait_summary}")
+
             if target_chart:
                 self.logger.info(f"\nWatchlist capture with target chart auth complete: {successful_captures}/{len(symbols)} successful")
             else:
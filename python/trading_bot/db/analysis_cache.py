@@ -0,0 +1,287 @@
+"""
+Content-addressed cache for chart analyses.
+
+An analysis is keyed by what actually determines it: the SHA-256 of the chart
+image bytes, the SHA-256 of the prompt with its dynamic market-data lines
+removed (`normalize_prompt_for_hashing`) and the model id. The short
+`generate_prompt_hash` is stored alongside for display only: at 20 bits it
+collides too easily across the many prompt variants optimizer and tournament
+runs render. Renamed or re-captured files with identical
+bytes, and tournaments / A/B tests / the optimizer re-running overlapping image
+sets, therefore reuse earlier results instead of calling the API again.
+
+A process-local LRU sits in front of the `analysis_cache` table in the backtest
+database (shared by live trading and all backtest tooling). Lookups can use any
+leading part of the key: image only, image + prompt, or the full key.
+
+Usage:
+    from trading_bot.db.analysis_cache import get_analysis_cache, make_analysis_key
+
+    cache = get_analysis_cache()
+    key = make_analysis_key(image_bytes, prompt_text, "gpt-4o")
+    result = cache.get(key)
+    if result is None:
+        result = analyze(...)
+        cache.put(key, result)
+
+config.yaml: openai.analysis_cache.enabled: false bypasses the cache,
+openai.analysis_cache.size sizes the in-memory LRU.
+"""
+
+import hashlib
+import json
+import logging
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Optional
+
+from trading_bot.config.settings_v2 import get_static_config
+from trading_bot.db.client import (
+    DB_TYPE,
+    get_backtest_connection,
+    get_table_name,
+    execute as db_execute,
+    query_one as db_query_one,
+    release_connection,
+)
+
+logger = logging.getLogger(__name__)
+
+_KEY_SEPARATOR = ":"
+
+
+@dataclass(frozen=True)
+class AnalysisCacheKey:
+    """(image hash, prompt hash, model) - most to least specific."""
+    image_hash: str
+    prompt_hash: str
+    model: str
+    prompt_short_hash: str = field(default="", compare=False)  # display only, not part of the key
+
+    def __str__(self) -> str:
+        return _KEY_SEPARATOR.join((self.image_hash, self.prompt_hash, self.model))
+
+
+def hash_image_bytes(image_bytes: bytes) -> str:
+    """SHA-256 hex digest of the raw image bytes."""
+    return hashlib.sha256(image_bytes).hexdigest()
+
+
+def hash_prompt(prompt_text: str) -> str:
+    """SHA-256 hex digest of the prompt with market data lines removed."""
+    from prompt_performance.core.utils import normalize_prompt_for_hashing
+    return hashlib.sha256(normalize_prompt_for_hashing(prompt_text or "").encode()).hexdigest()
+
+
+def make_analysis_key(image_bytes: bytes, prompt_text: str, model: str) -> AnalysisCacheKey:
+    """Build the cache key for an image/prompt/model combination."""
+    from prompt_performance.core.utils import generate_prompt_hash
+    return AnalysisCacheKey(
+        hash_image_bytes(image_bytes),
+        hash_prompt(prompt_text),
+        model or "unknown",
+        prompt_short_hash=generate_prompt_hash(prompt_text),
+    )
+
+
+def _key_prefix(image_hash: str, prompt_hash: Optional[str] = None, model: Optional[str] = None) -> str:
+    if model is not None and prompt_hash is None:
+        raise ValueError("model lookups also need prompt_hash (keys are matched by prefix)")
+    parts = [image_hash] + [p for p in (prompt_hash, model) if p is not None]
+    prefix = _KEY_SEPARATOR.join(parts)
+    # Full keys match exactly; partial keys must stop at a separator boundary
+    return prefix if model is not None else prefix + _KEY_SEPARATOR
+
+
+def is_cacheable(result: Optional[Dict[str, Any]]) -> bool:
+    """Only successful, non-skipped analyses are worth reusing."""
+    return bool(result) and not result.get('error') and not result.get('skipped')
+
+
+class AnalysisCache:
+    """In-memory LRU over the persistent analysis_cache table."""
+
+    def __init__(self, max_entries: int = 1024, persist: bool = True):
+        self.max_entries = max_entries
+        self.persist = persist
+        self._entries: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._table_ready = False
+        self.hits = 0
+        self.db_hits = 0
+        self.misses = 0
+
+    # --- in-memory LRU -------------------------------------------------
+
+    def _remember(self, key: str, result: Dict[str, Any]) -> None:
+        with self._lock:
+            self._entries[key] = result
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _recall(self, prefix: str, exact: bool) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            if exact:
+                key = prefix if prefix in self._entries else None
+            else:
+                # Newest first, matching the DB ordering
+                key = next((k for k in reversed(self._entries) if k.startswith(prefix)), None)
+            if key is None:
+                return None
+            self._entries.move_to_end(key)
+            return self._entries[key]
+
+    # --- persistent table ---------------------------------------------
+
+    def _connect(self):
+        conn = get_backtest_connection()
+        if not self._table_ready:
+            # PostgreSQL schema is managed by migrations (013_analysis_cache.sql)
+            if DB_TYPE != 'postgres':
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS analysis_cache (
+                        cache_key TEXT PRIMARY KEY,
+                        image_hash TEXT NOT NULL,
+                        prompt_hash TEXT NOT NULL,
+                        prompt_short_hash TEXT,
+                        model TEXT NOT NULL,
+                        result_json TEXT NOT NULL,
+                        created_at TEXT NOT NULL
+                    )
+                """)
+                conn.commit()
+            self._table_ready = True
+        return conn
+
+    def _load(self, prefix: str, exact: bool) -> Optional[Dict[str, Any]]:
+        table = get_table_name('analysis_cache')
+        if exact:
+            sql = f"SELECT cache_key, result_json FROM {table} WHERE cache_key = ?"
+            params = (prefix,)
+        else:
+            # LIKE wildcards can't occur in hex digests / model ids used here
+            sql = (f"SELECT cache_key, result_json FROM {table} WHERE cache_key LIKE ? "
+                   "ORDER BY created_at DESC LIMIT 1")
+            params = (prefix + "%",)
+        conn = None
+        try:
+            conn = self._connect()
+            row = db_query_one(conn, sql, params)
+        except Exception as e:
+            logger.debug(f"Analysis cache lookup failed: {e}")
+            return None
+        finally:
+            release_connection(conn)
+        if row is None:
+            return None
+        result = row['result_json']
+        if isinstance(result, str):
+            result = json.loads(result)
+        self._remember(row['cache_key'], result)
+        return result
+
+    def _store(self, key: AnalysisCacheKey, result: Dict[str, Any]) -> None:
+        table = get_table_name('analysis_cache')
+        conn = None
+        try:
+            conn = self._connect()
+            db_execute(conn, f"""
+                INSERT INTO {table} (cache_key, image_hash, prompt_hash, prompt_short_hash, model,
+                                     result_json, created_at)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (cache_key) DO UPDATE SET
+                    result_json = excluded.result_json,
+                    created_at = excluded.created_at
+            """, (
+                str(key), key.image_hash, key.prompt_hash, key.prompt_short_hash or None, key.model,
+                json.dumps(result, default=str),
+                datetime.now(timezone.utc).isoformat(),
+            ))
+        except Exception as e:
+            logger.debug(f"Analysis cache write failed: {e}")
+        finally:
+            release_connection(conn)
+
+    # --- public API ----------------------------------------------------
+
+    def get(self, key: AnalysisCacheKey) -> Optional[Dict[str, Any]]:
+        """Exact lookup. Returns a copy of the cached result, or None."""
+        return self._find(str(key), exact=True)
+
+    def lookup(self, image_hash: str, prompt_hash: Optional[str] = None,
+               model: Optional[str] = None) -> Optional[Dict[str, Any]]:
+        """
+        Lookup by key prefix: image only, image + prompt, or the full key.
+
+        With a partial key the most recently stored match is returned.
+        """
+        return self._find(_key_prefix(image_hash, prompt_hash, model), exact=model is not None)
+
+    def _find(self, prefix: str, exact: bool) -> Optional[Dict[str, Any]]:
+        result = self._recall(prefix, exact)
+        if result is not None:
+            self.hits += 1
+            return dict(result)
+        if self.persist:
+            result = self._load(prefix, exact)
+            if result is not None:
+                self.db_hits += 1
+                return dict(result)
+        self.misses += 1
+        return None
+
+    def put(self, key: AnalysisCacheKey, result: Optional[Dict[str, Any]]) -> bool:
+        """Cache a successful analysis. Errors and skips are ignored (returns False)."""
+        if not is_cacheable(result):
+            return False
+        result = dict(result)
+        result.pop('cached', None)
+        self._remember(str(key), result)
+        if self.persist:
+            self._store(key, result)
+        return True
+
+    def clear_memory(self) -> None:
+        """Drop the in-memory LRU (the table is append-only and kept)."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            'hits': self.hits,
+            'db_hits': self.db_hits,
+            'misses': self.misses,
+            'size': len(self._entries),
+            'max_entries': self.max_entries,
+        }
+
+
+_cache: Optional[AnalysisCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_analysis_cache() -> Optional[AnalysisCache]:
+    """Process-wide cache instance, or None when openai.analysis_cache.enabled is off."""
+    global _cache
+    settings = get_static_config().analysis_cache
+    if not settings.enabled:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = AnalysisCache(max_entries=settings.size)
+    return _cache
+
+
+__all__ = [
+    'AnalysisCache',
+    'AnalysisCacheKey',
+    'get_analysis_cache',
+    'hash_image_bytes',
+    'hash_prompt',
+    'is_cacheable',
+    'make_analysis_key',
+]
@@ -0,0 +1,384 @@
+"""
+Columnar candle cache backed by memory-mapped files.
+
+One append-only binary file per (symbol, timeframe) holds fixed-size records
+(start_time, open, high, low, close, volume, turnover). Reads memory-map the
+file and return NumPy column views, so no per-candle Python objects are
+created. `klines_store` stays the durable source: the cache is filled from it
+(`sync_from_store`) and written through by the code paths that insert candles.
+
+Several processes share the files (the bot and the scripts started by the
+Node routes), so writers hold an flock on a per-file `.lock` file around
+read-merge-write. Readers need no lock: appends only add whole records and
+rewrites are atomic replaces. Each sync also compares the cached range with
+klines_store and rebuilds it when rows were written into it behind the
+cache's back (e.g. by the Node simulator).
+
+Usage:
+    from trading_bot.db.candle_cache import get_candle_cache
+
+    cache = get_candle_cache()
+    cache.sync_from_store(conn, "BTCUSDT", "1h")
+    arrays = cache.read("BTCUSDT", "1h", limit=500)
+    closes = arrays.close
+
+config.yaml: database.candle_cache.enabled: false bypasses the cache,
+database.candle_cache.dir moves it.
+"""
+
+import logging
+import os
+import re
+import threading
+from collections.abc import Mapping
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional
+
+import numpy as np
+
+try:
+    import fcntl
+except ImportError:  # Windows: writers are only serialized within the process
+    fcntl = None
+
+from trading_bot.config.settings_v2 import get_static_config, resolve_project_path
+from trading_bot.db.client import DB_DIR, DB_TYPE, convert_placeholders, get_table_name
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CANDLE_CACHE_DIR = DB_DIR / "candle_cache"
+
+# On-disk record layout (little-endian, fixed size)
+CANDLE_RECORD_DTYPE = np.dtype([
+    ('start_time', '<i8'),
+    ('open', '<f8'),
+    ('high', '<f8'),
+    ('low', '<f8'),
+    ('close', '<f8'),
+    ('volume', '<f8'),
+    ('turnover', '<f8'),
+])
+
+_STORE_COLUMNS = "start_time, open_price, high_price, low_price, close_price, volume, turnover"
+
+# Field aliases accepted when appending candle dicts (API or DB naming)
+_FIELD_ALIASES = {
+    'start_time': ('start_time', 'timestamp'),
+    'open': ('open', 'open_price'),
+    'high': ('high', 'high_price'),
+    'low': ('low', 'low_price'),
+    'close': ('close', 'close_price'),
+    'volume': ('volume',),
+    'turnover': ('turnover',),
+}
+
+
+@dataclass
+class CandleArrays:
+    """Column views over cached candles (oldest first)."""
+    timestamp: np.ndarray
+    open: np.ndarray
+    high: np.ndarray
+    low: np.ndarray
+    close: np.ndarray
+    volume: np.ndarray
+    turnover: np.ndarray
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    @classmethod
+    def from_records(cls, records: np.ndarray) -> 'CandleArrays':
+        return cls(
+            timestamp=records['start_time'],
+            open=records['open'],
+            high=records['high'],
+            low=records['low'],
+            close=records['close'],
+            volume=records['volume'],
+            turnover=records['turnover'],
+        )
+
+    def to_dicts(self, store_format: bool = False, **extra) -> List[Dict[str, Any]]:
+        """
+        Materialise candle dicts for callers that still need the list API.
+
+        Args:
+            store_format: Use klines_store column names (start_time, open_price, ...)
+                instead of the normalized ones (timestamp, open, ...)
+            **extra: Constant fields added to every dict (e.g. symbol, timeframe)
+        """
+        if store_format:
+            names = ('start_time', 'open_price', 'high_price', 'low_price', 'close_price', 'volume', 'turnover')
+        else:
+            names = ('timestamp', 'open', 'high', 'low', 'close', 'volume', 'turnover')
+        columns = (
+            self.timestamp.tolist(), self.open.tolist(), self.high.tolist(), self.low.tolist(),
+            self.close.tolist(), self.volume.tolist(), self.turnover.tolist(),
+        )
+        return [{**extra, **dict(zip(names, values))} for values in zip(*columns)]
+
+
+def _empty_records() -> np.ndarray:
+    return np.empty(0, dtype=CANDLE_RECORD_DTYPE)
+
+
+def _records_from_candles(candles: Iterable[Mapping]) -> np.ndarray:
+    """Build a record array from candle dicts in API or klines_store naming."""
+    rows = []
+    for candle in candles:
+        row = []
+        for field, aliases in _FIELD_ALIASES.items():
+            value = next((candle[a] for a in aliases if a in candle and candle[a] is not None), 0)
+            row.append(int(value) if field == 'start_time' else float(value))
+        rows.append(tuple(row))
+    return np.array(rows, dtype=CANDLE_RECORD_DTYPE) if rows else _empty_records()
+
+
+def _tuple_cursor(conn):
+    """Cursor returning plain tuples (skips sqlite3.Row / RealDictRow wrapping)."""
+    if DB_TYPE == 'postgres':
+        import psycopg2.extensions
+        return conn.cursor(cursor_factory=psycopg2.extensions.cursor)
+    cursor = conn.cursor()
+    cursor.row_factory = None
+    return cursor
+
+
+class ColumnarCandleCache:
+    """Append-only, memory-mapped candle files keyed by (symbol, timeframe)."""
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root) if root is not None else DEFAULT_CANDLE_CACHE_DIR
+        self._locks: Dict[tuple, threading.Lock] = {}
+        self._locks_guard = threading.Lock()
+
+    def _lock(self, symbol: str, timeframe: str) -> threading.Lock:
+        key = (symbol, timeframe)
+        with self._locks_guard:
+            if key not in self._locks:
+                self._locks[key] = threading.Lock()
+            return self._locks[key]
+
+    def path_for(self, symbol: str, timeframe: str) -> Path:
+        """File holding the records for symbol/timeframe."""
+        safe = re.sub(r'[^A-Za-z0-9_.-]', '_', f"{symbol}__{timeframe}")
+        return self.root / f"{safe}.candles"
+
+    def _records(self, symbol: str, timeframe: str) -> np.ndarray:
+        """Memory-map the whole file (read-only). Empty array if missing."""
+        path = self.path_for(symbol, timeframe)
+        try:
+            count = path.stat().st_size // CANDLE_RECORD_DTYPE.itemsize
+        except FileNotFoundError:
+            return _empty_records()
+        if count == 0:
+            return _empty_records()
+        # Shape is floored to whole records so a concurrent append can't tear a read
+        return np.memmap(path, dtype=CANDLE_RECORD_DTYPE, mode='r', shape=(count,))
+
+    def time_range(self, symbol: str, timeframe: str) -> Optional[tuple]:
+        """(first, last) cached start_time, or None if nothing is cached."""
+        records = self._records(symbol, timeframe)
+        if len(records) == 0:
+            return None
+        return int(records['start_time'][0]), int(records['start_time'][-1])
+
+    def covers(self, symbol: str, timeframe: str, start: int, end: int, interval_ms: int) -> bool:
+        """
+        Whether the cached range spans [start, end]: it begins at or before
+        start and its last candle is less than one interval short of end.
+        A False answer means the caller should sync_from_store first.
+        """
+        cached = self.time_range(symbol, timeframe)
+        return cached is not None and cached[0] <= start and cached[1] > end - interval_ms
+
+    def read(
+        self,
+        symbol: str,
+        timeframe: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        limit: Optional[int] = None,
+        latest: bool = False,
+    ) -> CandleArrays:
+        """
+        Read cached candles as column arrays.
+
+        Args:
+            start/end: Inclusive start_time bounds in ms (binary-searched)
+            limit: Max candles to return
+            latest: With limit, take the newest candles instead of the oldest
+        """
+        records = self._records(symbol, timeframe)
+        if len(records):
+            ts = records['start_time']
+            lo = int(np.searchsorted(ts, start, side='left')) if start is not None else 0
+            hi = int(np.searchsorted(ts, end, side='right')) if end is not None else len(records)
+            if limit is not None and hi - lo > limit:
+                if latest:
+                    lo = hi - limit
+                else:
+                    hi = lo + limit
+            records = records[lo:hi]
+        return CandleArrays.from_records(records)
+
+    def append(self, symbol: str, timeframe: str, candles: Iterable[Mapping]) -> int:
+        """
+        Add candles (dicts in API or klines_store naming) to the cache.
+
+        Existing timestamps are never overwritten. Candles newer than the last
+        cached one are appended in place; anything older triggers a merged
+        rewrite of the file (atomic replace). Returns the number of new candles.
+        """
+        return self._merge(symbol, timeframe, _records_from_candles(candles))
+
+    @contextmanager
+    def _write_lock(self, symbol: str, timeframe: str):
+        """Serialize writers of one cache file across threads and processes."""
+        path = self.path_for(symbol, timeframe)
+        with self._lock(symbol, timeframe):
+            if fcntl is None:
+                yield
+            else:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                # Separate lock file: os.replace swaps the data file's inode
+                with open(path.with_suffix('.lock'), 'a') as lock_file:
+                    fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+                    try:
+                        yield
+                    finally:
+                        fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+
+    def _rewrite(self, path: Path, records: np.ndarray) -> None:
+        """Atomically replace the file with records (caller holds the write lock)."""
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".tmp{os.getpid()}")
+        records.tofile(tmp_path)
+        os.replace(tmp_path, path)
+
+    def _merge(self, symbol: str, timeframe: str, new: np.ndarray) -> int:
+        if len(new) == 0:
+            return 0
+        new = np.sort(new, order='start_time', kind='stable')
+        _, first_idx = np.unique(new['start_time'], return_index=True)
+        new = new[first_idx]
+
+        path = self.path_for(symbol, timeframe)
+        with self._write_lock(symbol, timeframe):
+            existing = self._records(symbol, timeframe)
+            if len(existing) == 0 or new['start_time'][0] > existing['start_time'][-1]:
+                path.parent.mkdir(parents=True, exist_ok=True)
+                with open(path, 'ab') as f:
+                    f.write(new.tobytes())
+                return len(new)
+
+            known = np.isin(new['start_time'], existing['start_time'])
+            new = new[~known]
+            if len(new) == 0:
+                return 0
+            if new['start_time'][0] > existing['start_time'][-1]:
+                with open(path, 'ab') as f:
+                    f.write(new.tobytes())
+                return len(new)
+
+            merged = np.concatenate([np.asarray(existing), new])
+            merged = merged[np.argsort(merged['start_time'], kind='stable')]
+            del existing
+            self._rewrite(path, merged)
+            return len(new)
+
+    def _replace_range(self, symbol: str, timeframe: str, first: int, last: int, records: np.ndarray) -> int:
+        """Make [first, last] mirror records, keeping cached rows outside it. Returns the net change."""
+        path = self.path_for(symbol, timeframe)
+        with self._write_lock(symbol, timeframe):
+            existing = self._records(symbol, timeframe)
+            ts = existing['start_time']
+            lo = int(np.searchsorted(ts, first, side='left'))
+            hi = int(np.searchsorted(ts, last, side='right'))
+            merged = np.concatenate([np.asarray(existing[:lo]), records, np.asarray(existing[hi:])])
+            change = len(records) - (hi - lo)
+            del existing, ts
+            self._rewrite(path, merged)
+            return change
+
+    def _store_rows(self, conn, symbol: str, timeframe: str, condition: str, bounds: tuple) -> np.ndarray:
+        table_name = get_table_name('klines_store')
+        sql, params = convert_placeholders(f"""
+            SELECT {_STORE_COLUMNS} FROM {table_name}
+            WHERE symbol = ? AND timeframe = ? {condition}
+            ORDER BY start_time ASC
+        """, (symbol, timeframe) + bounds)
+        cursor = _tuple_cursor(conn)
+        cursor.execute(sql, params)
+        rows = cursor.fetchall()
+        return np.array([tuple(r) for r in rows], dtype=CANDLE_RECORD_DTYPE) if rows else _empty_records()
+
+    def _store_count(self, conn, symbol: str, timeframe: str, first: int, last: int) -> int:
+        table_name = get_table_name('klines_store')
+        sql, params = convert_placeholders(f"""
+            SELECT COUNT(*) FROM {table_name}
+            WHERE symbol = ? AND timeframe = ? AND start_time >= ? AND start_time <= ?
+        """, (symbol, timeframe, first, last))
+        cursor = _tuple_cursor(conn)
+        cursor.execute(sql, params)
+        return int(cursor.fetchone()[0])
+
+    def sync_from_store(self, conn, symbol: str, timeframe: str, since: Optional[int] = None) -> int:
+        """
+        Pull candles missing from the cache out of klines_store.
+
+        Reconciles the cached range first: if klines_store holds a different
+        number of rows inside it, the range is rebuilt from the store. Then
+        fetches rows newer than the last cached candle and, when `since` is
+        given and precedes the cached range, backfills [since, first).
+        Returns the net number of candles added.
+        """
+        cached = self.time_range(symbol, timeframe)
+        added = 0
+        if cached is None:
+            added += self._merge(symbol, timeframe, self._store_rows(conn, symbol, timeframe, "", ()))
+        else:
+            first_ts, last_ts = cached
+            cached_count = len(self.read(symbol, timeframe, start=first_ts, end=last_ts))
+            if self._store_count(conn, symbol, timeframe, first_ts, last_ts) != cached_count:
+                rows = self._store_rows(conn, symbol, timeframe, "AND start_time >= ? AND start_time <= ?",
+                                        (first_ts, last_ts))
+                added += self._replace_range(symbol, timeframe, first_ts, last_ts, rows)
+                logger.info(f"Reconciled columnar cache range for {symbol} {timeframe} with klines_store")
+
+            added += self._merge(symbol, timeframe, self._store_rows(
+                conn, symbol, timeframe, "AND start_time > ?", (last_ts,)))
+            if since is not None and since < first_ts:
+                added += self._merge(symbol, timeframe, self._store_rows(
+                    conn, symbol, timeframe, "AND start_time >= ? AND start_time < ?", (since, first_ts)))
+        if added:
+            logger.debug(f"Synced {added} candles into columnar cache for {symbol} {timeframe}")
+        return added
+
+
+_cache: Optional[ColumnarCandleCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_candle_cache() -> Optional[ColumnarCandleCache]:
+    """Process-wide cache instance, or None when database.candle_cache.enabled is off."""
+    global _cache
+    settings = get_static_config().database
+    if not settings.candle_cache_enabled:
+        return None
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                _cache = ColumnarCandleCache(resolve_project_path(settings.candle_cache_dir))
+    return _cache
+
+
+__all__ = [
+    'CandleArrays',
+    'ColumnarCandleCache',
+    'CANDLE_RECORD_DTYPE',
+    'get_candle_cache',
+]
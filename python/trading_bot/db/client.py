@@ -12,18 +12,25 @@ Usage:
     
     # Execute a query (handles parameter placeholders automatically)
     execute(conn, "INSERT INTO trades (id, symbol) VALUES (?, ?)", ("123", "BTCUSDT"))
+
+    # Bulk insert in one transaction
+    execute_many(conn, "INSERT INTO trades (id, symbol) VALUES (?, ?)", [("1", "BTCUSDT"), ("2", "ETHUSDT")])
     
     # Query data
     rows = query(conn, "SELECT * FROM trades WHERE symbol = ?", ("BTCUSDT",))
 """
 
 import os
+import re
 import sqlite3
 import time
 from pathlib import Path
-from typing import Any, List, Tuple, Optional, Union
+from typing import Any, List, Sequence, Tuple, Optional, Union
 from collections.abc import Mapping
 import threading
+from functools import lru_cache
+
+from trading_bot.config.settings_v2 import get_static_config
 
 # Database configuration
 DB_TYPE = os.getenv('DB_TYPE', 'sqlite')
@@ -239,13 +246,77 @@ def _get_pg_connection_with_timeout(timeout_seconds: float = 10.0):
             time.sleep(0.1)
 
 
+# SQLite connection pool (per thread; sqlite3 connections are thread-bound).
+# Released connections are kept open for reuse instead of being closed, so the
+# connect + PRAGMA setup cost is paid once per thread rather than per call.
+# Sizes come from config.yaml (database.sqlite).
+_sqlite_settings = get_static_config().database
+SQLITE_POOL_SIZE = _sqlite_settings.sqlite_pool_size  # idle connections kept per thread; 0 disables pooling
+SQLITE_MMAP_SIZE = _sqlite_settings.sqlite_mmap_size
+SQLITE_CACHE_SIZE_KB = _sqlite_settings.sqlite_cache_size_kb
+SQLITE_CACHED_STATEMENTS = _sqlite_settings.sqlite_cached_statements
+_sqlite_local = threading.local()
+
+
+class _PooledSQLiteConnection(sqlite3.Connection):
+    """sqlite3.Connection that remembers which pool it belongs to."""
+    _pool_path: Optional[str] = None
+
+
+def _open_sqlite_connection(db_path: str) -> sqlite3.Connection:
+    """Open a SQLite connection with WAL and the tuned PRAGMAs applied."""
+    # cached_statements: sqlite3 reuses prepared statements for repeated SQL text
+    conn = sqlite3.connect(db_path, timeout=30, cached_statements=SQLITE_CACHED_STATEMENTS,
+                           factory=_PooledSQLiteConnection)
+    conn._pool_path = db_path
+    conn.row_factory = sqlite3.Row
+    conn.execute("PRAGMA foreign_keys = ON")
+    try:
+        conn.execute("PRAGMA journal_mode=WAL;")
+        conn.execute("PRAGMA synchronous=NORMAL;")
+        conn.execute("PRAGMA busy_timeout=5000;")
+        conn.execute(f"PRAGMA mmap_size={SQLITE_MMAP_SIZE};")
+        conn.execute(f"PRAGMA cache_size=-{SQLITE_CACHE_SIZE_KB};")
+    except Exception:
+        pass
+    return conn
+
+
+def _sqlite_idle_pool(db_path: str) -> list:
+    """Idle connections for db_path owned by the current thread."""
+    pools = getattr(_sqlite_local, 'pools', None)
+    if pools is None:
+        pools = _sqlite_local.pools = {}
+    return pools.setdefault(db_path, [])
+
+
+def _get_sqlite_connection() -> sqlite3.Connection:
+    """Reuse an idle connection from this thread's pool, or open a new one."""
+    db_path = str(get_db_path())
+    idle = _sqlite_idle_pool(db_path)
+    if idle and not os.path.exists(db_path):
+        # Database file was removed underneath us; pooled handles are stale
+        for conn in idle:
+            conn.close()
+        idle.clear()
+    while idle:
+        conn = idle.pop()
+        try:
+            conn.total_changes  # raises if a caller closed it after releasing
+        except sqlite3.ProgrammingError:
+            continue
+        return conn
+    return _open_sqlite_connection(db_path)
+
+
 def get_connection(timeout_seconds: float = 10.0):
     """
     Get a database connection.
     Auto-detects SQLite or PostgreSQL based on DB_TYPE env var.
 
     For PostgreSQL: Returns a connection from the connection pool with timeout
-    For SQLite: Returns a new connection (SQLite handles concurrency internally)
+    For SQLite: Returns a connection from the calling thread's pool (WAL mode,
+    synchronous=NORMAL), opening a new one if none is idle
 
     Args:
         timeout_seconds: For PostgreSQL, max seconds to wait for a connection (default: 10)
@@ -256,23 +327,23 @@ def get_connection(timeout_seconds: float = 10.0):
     Raises:
         TimeoutError: For PostgreSQL if no connection available within timeout
 
-    IMPORTANT: For PostgreSQL, you MUST call release_connection() when done to return
-    the connection to the pool. Use the context manager pattern or try/finally.
+    IMPORTANT: You MUST call release_connection() when done to return the
+    connection to the pool. Use the context manager pattern or try/finally.
     """
     if DB_TYPE == 'postgres':
         # Use timeout wrapper to prevent indefinite blocking
         return _get_pg_connection_with_timeout(timeout_seconds)
     else:
-        conn = sqlite3.connect(str(get_db_path()))
-        conn.row_factory = sqlite3.Row
-        conn.execute("PRAGMA foreign_keys = ON")
-        return conn
+        return _get_sqlite_connection()
 
 
 def release_connection(conn):
     """
-    Release a database connection back to the pool (PostgreSQL only).
-    For SQLite, this closes the connection.
+    Release a database connection back to the pool.
+
+    For SQLite, uncommitted work is rolled back (same as closing) and the
+    connection is kept for reuse by the same thread; connections beyond
+    SQLITE_POOL_SIZE idle ones are closed.
 
     Args:
         conn: Database connection to release
@@ -284,7 +355,43 @@ def release_connection(conn):
         pool = _get_pg_pool()
         pool.putconn(conn)
     else:
+        _release_sqlite_connection(conn)
+
+
+def _release_sqlite_connection(conn) -> None:
+    db_path = getattr(conn, '_pool_path', None)
+    if db_path is None or SQLITE_POOL_SIZE <= 0:
+        _close_quietly(conn)
+        return
+    try:
+        if conn.in_transaction:
+            conn.rollback()
+        conn.row_factory = sqlite3.Row
+    except sqlite3.ProgrammingError:
+        # Already closed, or released from a thread that doesn't own it
+        _close_quietly(conn)
+        return
+    idle = _sqlite_idle_pool(db_path)
+    if len(idle) < SQLITE_POOL_SIZE and conn not in idle:
+        idle.append(conn)
+    else:
+        _close_quietly(conn)
+
+
+def _close_quietly(conn) -> None:
+    try:
         conn.close()
+    except sqlite3.ProgrammingError:
+        pass
+
+
+def close_pooled_connections() -> None:
+    """Close the calling thread's idle SQLite connections."""
+    pools = getattr(_sqlite_local, 'pools', None) or {}
+    for idle in pools.values():
+        for conn in idle:
+            _close_quietly(conn)
+        idle.clear()
 
 
 def get_backtest_connection():
@@ -313,6 +420,44 @@ def get_backtest_connection():
         return conn
 
 
+# Placeholder translation cache (PostgreSQL mode). The same statements repeat
+# for the life of the process, so each distinct SQL text is translated once.
+PLACEHOLDER_CACHE_SIZE = get_static_config().database.placeholder_cache_size
+_placeholder_stats = {'fast_path': 0, 'time_spent': 0.0}
+_placeholder_stats_lock = threading.Lock()
+
+
+@lru_cache(maxsize=PLACEHOLDER_CACHE_SIZE)
+def _translate_placeholders(sql: str) -> str:
+    """Rewrite ? as %s and escape % inside string literals (memoized per SQL text)."""
+    parts = []
+    in_string = False
+    string_char = None
+    prev = ''
+
+    for char in sql:
+        # Track if we're inside a string literal
+        if char in ("'", '"') and prev != '\\':
+            if not in_string:
+                in_string = True
+                string_char = char
+            elif char == string_char:
+                in_string = False
+                string_char = None
+
+        # Replace ? with %s only if we're not in a string literal
+        if char == '?' and not in_string:
+            parts.append('%s')
+        # Escape % as %% only if we're inside a string literal (for LIKE clauses)
+        elif char == '%' and in_string:
+            parts.append('%%')
+        else:
+            parts.append(char)
+        prev = char
+
+    return ''.join(parts)
+
+
 def convert_placeholders(sql: str, params: Tuple) -> Tuple[str, Tuple]:
     """
     Convert SQLite placeholders (?) to PostgreSQL placeholders (%s).
@@ -322,6 +467,8 @@ def convert_placeholders(sql: str, params: Tuple) -> Tuple[str, Tuple]:
     2. Escapes % characters in LIKE clauses as %% for PostgreSQL (psycopg2 requirement).
 
     Parameter placeholders are ? characters that appear outside of string literals.
+    Translations are memoized per SQL text (bounded LRU, see
+    get_placeholder_cache_stats); SQL with neither ? nor % is returned as-is.
 
     Args:
         sql: SQL query with ? placeholders
@@ -337,42 +484,51 @@ def convert_placeholders(sql: str, params: Tuple) -> Tuple[str, Tuple]:
         raise TypeError(f"params must be a tuple or list, got {type(params).__name__}: {params}")
 
     if DB_TYPE == 'postgres':
-        # Replace ? with %s for PostgreSQL, but only for parameter placeholders
-        # Parameter placeholders are ? outside of string literals
-        # Also escape % in string literals as %% for psycopg2
-        converted_sql = ""
-        in_string = False
-        string_char = None
-        i = 0
-
-        while i < len(sql):
-            char = sql[i]
-
-            # Track if we're inside a string literal
-            if char in ("'", '"') and (i == 0 or sql[i-1] != '\\'):
-                if not in_string:
-                    in_string = True
-                    string_char = char
-                elif char == string_char:
-                    in_string = False
-                    string_char = None
-
-            # Replace ? with %s only if we're not in a string literal
-            if char == '?' and not in_string:
-                converted_sql += '%s'
-            # Escape % as %% only if we're inside a string literal (for LIKE clauses)
-            elif char == '%' and in_string:
-                converted_sql += '%%'
-            else:
-                converted_sql += char
-
-            i += 1
-
+        started = time.perf_counter()
+        if '?' not in sql and '%' not in sql:
+            # Nothing to translate
+            converted_sql = sql
+            fast_path = 1
+        else:
+            converted_sql = _translate_placeholders(sql)
+            fast_path = 0
+        elapsed = time.perf_counter() - started
+        with _placeholder_stats_lock:
+            _placeholder_stats['fast_path'] += fast_path
+            _placeholder_stats['time_spent'] += elapsed
         return (converted_sql, params)
     else:
         return (sql, params)
 
 
+def get_placeholder_cache_stats() -> dict:
+    """
+    Counters for the placeholder translation cache.
+
+    Returns:
+        Dict with hits, misses, fast_path (no translation needed), size,
+        maxsize and time_spent (seconds inside convert_placeholders)
+    """
+    info = _translate_placeholders.cache_info()
+    with _placeholder_stats_lock:
+        return {
+            'hits': info.hits,
+            'misses': info.misses,
+            'fast_path': _placeholder_stats['fast_path'],
+            'size': info.currsize,
+            'maxsize': info.maxsize,
+            'time_spent': _placeholder_stats['time_spent'],
+        }
+
+
+def reset_placeholder_cache() -> None:
+    """Clear the placeholder translation cache and its counters."""
+    _translate_placeholders.cache_clear()
+    with _placeholder_stats_lock:
+        _placeholder_stats['fast_path'] = 0
+        _placeholder_stats['time_spent'] = 0.0
+
+
 def execute(conn, sql: str, params: Tuple = (), auto_commit: bool = True) -> int:
     """
     Execute an INSERT/UPDATE/DELETE query.
@@ -411,6 +567,69 @@ def execute(conn, sql: str, params: Tuple = (), auto_commit: bool = True) -> int
         raise  # Re-raise the exception after rollback
 
 
+_VALUES_GROUP = re.compile(r'\bVALUES\s*(\([^()]*\))', re.IGNORECASE)
+
+
+def execute_many(conn, sql: str, params_seq: Sequence[Tuple], auto_commit: bool = True,
+                 page_size: int = 1000) -> int:
+    """
+    Execute one INSERT/UPDATE/DELETE statement for many parameter tuples.
+
+    SQLite uses cursor.executemany. PostgreSQL uses psycopg2's execute_values
+    (multi-row VALUES, page_size rows per round trip) when the statement has a
+    single VALUES (...) group, otherwise cursor.executemany. All rows are
+    written in one transaction: committed once on success, rolled back on error.
+
+    Args:
+        conn: Database connection
+        sql: SQL statement with ? placeholders
+        params_seq: Sequence of parameter tuples
+        auto_commit: If True, commit on success and rollback on error
+        page_size: Rows per statement for PostgreSQL execute_values
+
+    Returns:
+        Number of affected rows
+    """
+    params_seq = list(params_seq)
+    if not params_seq:
+        return 0
+
+    converted_sql, _ = convert_placeholders(sql, params_seq[0])
+    cursor = conn.cursor()
+
+    try:
+        if DB_TYPE == 'postgres':
+            match = _VALUES_GROUP.search(converted_sql)
+            if match:
+                from psycopg2.extras import execute_values
+
+                template = match.group(1)
+                values_sql = converted_sql[:match.start(1)] + '%s' + converted_sql[match.end(1):]
+                affected = 0
+                for start in range(0, len(params_seq), page_size):
+                    page = params_seq[start:start + page_size]
+                    execute_values(cursor, values_sql, page, template=template, page_size=len(page))
+                    affected += max(cursor.rowcount, 0)
+            else:
+                cursor.executemany(converted_sql, params_seq)
+                affected = cursor.rowcount
+        else:
+            cursor.executemany(converted_sql, params_seq)
+            affected = cursor.rowcount
+
+        if auto_commit:
+            conn.commit()
+        return affected
+    except Exception:
+        if auto_commit:
+            try:
+                conn.rollback()
+            except Exception as rollback_error:
+                import logging
+                logging.getLogger(__name__).error(f"Rollback failed: {rollback_error}")
+        raise
+
+
 def query(conn, sql: str, params: Tuple = ()) -> List[UnifiedRow]:
     """
     Execute a SELECT query and return all rows.
@@ -516,6 +735,7 @@ def get_table_name(logical_name: str) -> str:
         'analyses': 'bt_analyses',
         'trades': 'bt_trades',
         'summaries': 'bt_summaries',
+        'analysis_cache': 'bt_analysis_cache',
     }
 
     if DB_TYPE == 'postgres' and logical_name in table_mappings:
@@ -661,12 +881,16 @@ def add_column_if_missing(conn, table_name: str, column_name: str, column_type:
 __all__ = [
     'get_connection',
     'release_connection',
+    'close_pooled_connections',
     'get_backtest_connection',
     'get_db_path',
     'execute',
+    'execute_many',
     'query',
     'query_one',
     'convert_placeholders',
+    'get_placeholder_cache_stats',
+    'reset_placeholder_cache',
     'get_table_columns',
     'add_column_if_missing',
     'get_timestamp_type',
@@ -96,6 +96,7 @@ CREATE TABLE IF NOT EXISTS recommendations (
 
     -- Audit fields
     chart_path TEXT,
+    chart_hash TEXT,  -- Perceptual hash (dHash) of the chart, for near-duplicate reuse
     prompt_name TEXT NOT NULL,
     prompt_version TEXT,
     model_name TEXT DEFAULT 'gpt-4-vision-preview',
@@ -339,6 +340,15 @@ def run_migrations(conn) -> None:
             conn.commit()
             print("✅ Migration complete: cycle_id added to recommendations")
 
+        # Migration 5: Add chart_hash to recommendations if missing
+        try:
+            cursor.execute("SELECT chart_hash FROM recommendations LIMIT 1")
+        except sqlite3.OperationalError:
+            print("🔄 Migration: Adding chart_hash column to recommendations...")
+            cursor.execute("ALTER TABLE recommendations ADD COLUMN chart_hash TEXT")
+            conn.commit()
+            print("✅ Migration complete: chart_hash added to recommendations")
+
     # Check if runs table exists
     cursor.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='runs'")
     if cursor.fetchone():
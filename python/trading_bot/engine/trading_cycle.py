@@ -4,7 +4,8 @@ This is the core production cycle that runs at timeframe boundaries.
 
 MULTISTEP PROCESS:
 1. Capture all charts from watchlist
-2. Analyze ALL charts in PARALLEL using asyncio.gather()
+2. Analyze ALL charts in PARALLEL, each handed to analysis (bounded asyncio.Queue)
+   as soon as its screenshot is saved
 3. Collect all recommendations (wait for all to complete)
 4. Rank signals by quality (confidence, risk-reward, setup quality)
 5. Check available slots and allocate to best signals
@@ -18,12 +19,14 @@ import uuid
 from datetime import datetime, timezone, timedelta
 from typing import Dict, Any, Optional, Callable, List, Tuple
 
-from trading_bot.config.settings_v2 import Config
+from trading_bot.config.settings_v2 import Config, get_static_config
 from trading_bot.core.analyzer import ChartAnalyzer
 from trading_bot.core.sourcer import ChartSourcer
 from trading_bot.core.bybit_api_manager import BybitAPIManager
+from trading_bot.core.chart_hash import hamming_distance, is_near_duplicate
 from trading_bot.core.cleaner import ChartCleaner
 from trading_bot.core.error_logger import set_cycle_id, clear_cycle_id
+from trading_bot.core.llm_dispatcher import get_llm_dispatcher
 from trading_bot.core.utils import (  # type: ignore
     get_current_cycle_boundary,  # type: ignore
     seconds_until_next_boundary,  # type: ignore
@@ -32,7 +35,7 @@ from trading_bot.core.utils import (  # type: ignore
 from trading_bot.core.prompts.prompt_registry import get_prompt_function
 from trading_bot.db.client import get_connection, release_connection, execute, query
 from trading_bot.services.sl_adjuster import StopLossAdjuster
-from openai import OpenAI
+from openai import AsyncOpenAI, OpenAI
 
 logger = logging.getLogger(__name__)
 
@@ -43,7 +46,8 @@ class TradingCycle:
 
     1. Wait for cycle boundary
     2. Capture charts for all configured symbols
-    3. Analyze ALL charts in PARALLEL (asyncio.gather)
+    3. Analyze ALL charts in PARALLEL, each one as soon as its capture lands
+       (bounded asyncio.Queue between capture and analysis)
     4. Collect ALL recommendations (wait for completion)
     5. Rank signals by quality (confidence, RR, setup)
     6. Check available slots
@@ -61,6 +65,9 @@ class TradingCycle:
         "market_environment": 0.1,
     }
 
+    # Captured charts waiting to be handed to analysis (capture blocks when full)
+    ANALYSIS_QUEUE_SIZE = 8
+
     def __init__(
         self,
         config: Optional[Config] = None,
@@ -97,8 +104,13 @@ class TradingCycle:
         # API manager for market data
         self.api_manager = BybitAPIManager(self.config, use_testnet=testnet)  # type: ignore[arg-type]
 
-        # Initialize OpenAI client
+        # Initialize OpenAI client (responses feed the shared LLM dispatcher's rate limits)
         self.openai_client = OpenAI(api_key=self.config.openai.api_key)
+        # Assistant runs in the async cycle stream on the event loop through this client
+        self.async_openai_client = AsyncOpenAI(api_key=self.config.openai.api_key)
+        self.llm_dispatcher = get_llm_dispatcher()
+        self.llm_dispatcher.attach(self.openai_client)
+        self.llm_dispatcher.attach(self.async_openai_client)
 
         # Core components
         self.sourcer = ChartSourcer(config=self.config)  # type: ignore[arg-type]
@@ -106,6 +118,7 @@ class TradingCycle:
             openai_client=self.openai_client,
             config=self.config,
             api_manager=self.api_manager,
+            async_openai_client=self.async_openai_client,
         )
         self.cleaner = ChartCleaner(
             enable_backup=True,
@@ -126,6 +139,7 @@ class TradingCycle:
         if not self.prompt_name:
             raise ValueError("prompt_name is required. Configure prompt in instance settings before starting bot.")
         self._prompt_function = get_prompt_function(self.prompt_name)
+        self._prompt_version_name: Optional[str] = None
         logger.info(f"📝 Using prompt: {self.prompt_name}")
 
         # Symbols come from TradingView watchlist (captured at runtime)
@@ -151,6 +165,10 @@ class TradingCycle:
         self._running = False
         logger.info("Trading cycle stopped")
 
+    async def close_browser(self) -> None:
+        """Close the browser kept warm between cycles (tradingview.browser.persistent)."""
+        await self.sourcer.cleanup_browser_session()
+
     def _get_existing_recommendations_for_boundary(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
         """
         Get existing recommendations for symbols in the current cycle boundary.
@@ -457,7 +475,7 @@ class TradingCycle:
 
         STEPS:
         1. Capture all charts from watchlist
-        2. Analyze ALL charts in PARALLEL
+        2. Analyze ALL charts in PARALLEL (each starts as soon as its chart is captured)
         3. Collect ALL recommendations
         4. Rank signals by quality
         5. Check available slots
@@ -524,7 +542,7 @@ class TradingCycle:
 
             step_1_start = datetime.now(timezone.utc)
 
-            if not await self.sourcer.setup_browser_session():
+            if not await self.sourcer.acquire_browser_session():
                 logger.error("Failed to setup browser session", extra={
                     'event': 'browser_setup_failed',
                     'cycle_id': cycle_id,
@@ -533,9 +551,13 @@ class TradingCycle:
                 return results
 
             try:
-                chart_paths = await self.sourcer.capture_all_watchlist_screenshots(
-                    target_chart=target_chart,
-                    timeframe=self.timeframe,
+                # STEP 1 + 2 run as a pipeline: every saved chart is queued for
+                # analysis immediately instead of waiting for the whole watchlist
+                logger.info(f"\n🤖 STEP 2: Analyzing charts in PARALLEL as they are captured...")
+                analysis_start = datetime.now(timezone.utc)
+
+                chart_paths, existing_recs_map, newly_analyzed, step_1_end = await self._capture_and_analyze_pipelined(
+                    target_chart, cycle_id
                 )
 
                 if not chart_paths:
@@ -543,37 +565,21 @@ class TradingCycle:
                     results["errors"].append({"error": "No charts captured"})
                     return results
 
-                step_1_duration = (datetime.now(timezone.utc) - step_1_start).total_seconds()
+                step_1_duration = (step_1_end - step_1_start).total_seconds()
                 self._print_step_1_summary(len(chart_paths), chart_paths, step_1_duration)
                 if self.heartbeat_callback:
                     self.heartbeat_callback()
 
-                # STEP 1.5: Check for existing recommendations for current boundary (instance-aware)
-                logger.info(f"\n🔍 STEP 1.5: Checking for existing recommendations for current boundary...")
+                # STEP 1.5: Existing recommendations for current boundary (checked per chart in the pipeline)
                 instance_label = f" (instance: {self.instance_id})" if self.instance_id else ""
-                logger.info(f"   Instance{instance_label}")
+                logger.info(f"\n🔍 STEP 1.5: Checked existing recommendations for current boundary{instance_label}")
 
                 symbols_to_analyze = list(chart_paths.keys())
-                existing_recs_map = self._get_existing_recommendations_for_boundary(symbols_to_analyze)
-
-                # Filter out symbols that already have recommendations
                 symbols_needing_analysis = [s for s in symbols_to_analyze if not existing_recs_map.get(s)]
                 symbols_with_existing_recs = [s for s in symbols_to_analyze if existing_recs_map.get(s)]
 
                 self._print_step_1_5_summary(len(symbols_to_analyze), symbols_needing_analysis, symbols_with_existing_recs)
 
-                # STEP 2: Analyze only symbols needing new recommendations
-                logger.info(f"\n🤖 STEP 2: Analyzing {len(symbols_needing_analysis)} charts in PARALLEL...")
-                analysis_start = datetime.now(timezone.utc)
-
-                # Filter chart_paths to only include symbols needing analysis
-                filtered_chart_paths = {s: chart_paths[s] for s in symbols_needing_analysis}
-
-                if filtered_chart_paths:
-                    newly_analyzed = await self._analyze_all_charts_parallel(filtered_chart_paths, cycle_id)
-                else:
-                    newly_analyzed = []
-
                 analysis_duration = (datetime.now(timezone.utc) - analysis_start).total_seconds()
 
                 # Count successful and failed analyses
@@ -708,7 +714,9 @@ class TradingCycle:
                     self.heartbeat_callback()
 
             finally:
-                await self.sourcer.cleanup_browser_session()
+                await self.sourcer.release_browser_session()
+                # Charts were analysed from memory; make sure they reached storage
+                await asyncio.to_thread(self.sourcer.flush_chart_writes)
 
         except Exception as e:
             logger.error(f"Cycle error: {e}", extra={
@@ -729,14 +737,231 @@ class TradingCycle:
 
         return results
 
+    async def _capture_and_analyze_pipelined(
+        self, target_chart: Optional[str], cycle_id: str
+    ) -> Tuple[Dict[str, str], Dict[str, Dict[str, Any]], List[Dict[str, Any]], datetime]:
+        """
+        Capture the watchlist and analyze each chart as soon as it is saved.
+
+        The sourcer pushes (symbol, chart_path) onto a bounded asyncio.Queue;
+        a consumer drains it and starts one analysis task per chart (after
+        checking for an existing recommendation at this boundary, then for a
+        near-identical chart another instance already analyzed with the same
+        prompt and model). Capture only waits when ANALYSIS_QUEUE_SIZE charts
+        are pending hand-off.
+
+        Args:
+            target_chart: Optional chart URL for watchlist authentication
+            cycle_id: Current cycle ID
+
+        Returns:
+            (chart_paths, existing_recs_map, newly_analyzed, capture_finished_at).
+            newly_analyzed follows chart_paths order.
+        """
+        chart_queue: asyncio.Queue = asyncio.Queue(maxsize=self.ANALYSIS_QUEUE_SIZE)
+        existing_recs_map: Dict[str, Dict[str, Any]] = {}
+        analysis_tasks: Dict[str, asyncio.Task] = {}
+
+        async def on_chart_ready(symbol: str, chart_path: str) -> None:
+            await chart_queue.put((symbol, chart_path))
+
+        async def analyze_unless_existing(symbol: str, chart_path: str) -> Optional[Dict[str, Any]]:
+            existing = await asyncio.to_thread(self._get_existing_recommendations_for_boundary, [symbol])
+            existing_recs_map[symbol] = existing.get(symbol) or {}
+            if existing_recs_map[symbol]:
+                return None
+            chart_hash = await asyncio.to_thread(self.sourcer.get_chart_hash, chart_path)
+            similar = await asyncio.to_thread(self._find_similar_recommendation, symbol, chart_hash)
+            if similar is not None:
+                return await asyncio.to_thread(
+                    self._reuse_similar_recommendation, symbol, chart_path, cycle_id, chart_hash, similar
+                )
+            return await self._analyze_chart_safe(symbol, chart_path, cycle_id, chart_hash)
+
+        async def consume() -> None:
+            while True:
+                item = await chart_queue.get()
+                if item is None:  # Capture finished
+                    return
+                symbol, chart_path = item
+                if symbol not in analysis_tasks:
+                    analysis_tasks[symbol] = asyncio.create_task(analyze_unless_existing(symbol, chart_path))
+
+        consumer = asyncio.create_task(consume())
+        try:
+            chart_paths = await self.sourcer.capture_all_watchlist_screenshots(
+                target_chart=target_chart,
+                timeframe=self.timeframe,
+                on_chart_ready=on_chart_ready,
+            )
+            capture_finished_at = datetime.now(timezone.utc)
+            await chart_queue.put(None)
+            await consumer
+            outcomes = dict(zip(analysis_tasks.keys(), await asyncio.gather(*analysis_tasks.values())))
+        except BaseException:
+            consumer.cancel()
+            for task in analysis_tasks.values():
+                task.cancel()
+            raise
+
+        # Charts the sourcer returned without announcing (shouldn't happen) are analyzed now
+        missed = {s: p for s, p in chart_paths.items() if s not in outcomes}
+        for symbol, outcome in zip(missed, await asyncio.gather(
+            *(analyze_unless_existing(s, p) for s, p in missed.items())
+        )):
+            outcomes[symbol] = outcome
+
+        ordered = list(chart_paths) + [s for s in outcomes if s not in chart_paths]
+        newly_analyzed = [outcomes[s] for s in ordered if outcomes.get(s) is not None]
+        return chart_paths, existing_recs_map, newly_analyzed, capture_finished_at
+
+    def _get_prompt_version_name(self) -> str:
+        """Prompt name as recorded on recommendations (the prompt's version name)."""
+        if self._prompt_version_name is None:
+            try:
+                # Version metadata doesn't depend on market data; render with placeholders
+                prompt_data = self._prompt_function({
+                    'symbol': 'N/A',
+                    'timeframe': self.timeframe,
+                    'last_price': 'N/A',
+                    'price_change_24h_percent': 'N/A',
+                    'high_24h': 'N/A',
+                    'low_24h': 'N/A',
+                    'funding_rate': 'N/A',
+                    'long_short_ratio': 'N/A',
+                })
+                self._prompt_version_name = prompt_data['version']['name']
+            except Exception as e:
+                logger.debug(f"Could not resolve prompt version name: {e}")
+                self._prompt_version_name = self.prompt_name
+        return self._prompt_version_name
+
+    def _get_model_name(self) -> str:
+        """Model name as recorded on this instance's recommendations."""
+        model = None
+        if self.config.openai.assistant_id:
+            model = self.analyzer.get_assistant_model(self.config.openai.assistant_id)
+        return model or self.config.openai.model
+
+    def _find_similar_recommendation(self, symbol: str, chart_hash: Optional[str]) -> Optional[Dict[str, Any]]:
+        """
+        Find another instance's recommendation at the current boundary whose chart is a near-duplicate.
+
+        Instances watching the same symbol with the same prompt and model capture
+        the same chart, so only the first one needs the LLM call. Candidates
+        share symbol, timeframe, prompt and model, come from another instance's
+        cycle and have a stored chart_hash within charts.hash_max_distance
+        (config.yaml) bits of chart_hash. This instance's own recommendations
+        are already picked up by _get_existing_recommendations_for_boundary; without an
+        instance_id that check covers every instance, so there is nothing to look up.
+
+        Returns the closest candidate (with a 'chart_hash_distance' key), or None.
+        """
+        max_distance = get_static_config().charts.hash_max_distance
+        if not chart_hash or max_distance < 0 or not self.instance_id:
+            return None
+        conn = None
+        try:
+            conn = get_connection()
+            candidates = query(conn, """
+                SELECT r.* FROM recommendations r
+                JOIN cycles c ON c.id = r.cycle_id
+                JOIN runs ru ON ru.id = c.run_id
+                WHERE r.symbol = ? AND r.timeframe = ? AND r.cycle_boundary = ?
+                  AND r.prompt_name = ? AND r.model_name = ?
+                  AND r.chart_hash IS NOT NULL
+                  AND COALESCE(ru.instance_id, '') != ?
+                ORDER BY r.created_at DESC
+            """, (
+                normalize_symbol_for_bybit(symbol),
+                self.timeframe,
+                get_current_cycle_boundary(self.timeframe).isoformat(),
+                self._get_prompt_version_name(),
+                self._get_model_name(),
+                self.instance_id,
+            ))
+        except Exception as e:
+            logger.warning(f"Failed to look up similar charts for {symbol}: {e}")
+            return None
+        finally:
+            if conn:
+                release_connection(conn)
+
+        best = None
+        for rec in candidates:
+            if not is_near_duplicate(chart_hash, rec['chart_hash'], max_distance):
+                continue
+            distance = hamming_distance(chart_hash, rec['chart_hash'])
+            if best is None or distance < best['chart_hash_distance']:
+                best = dict(rec)
+                best['chart_hash_distance'] = distance
+        return best
+
+    def _reuse_similar_recommendation(
+        self, symbol: str, chart_path: str, cycle_id: str, chart_hash: str, similar: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Build this cycle's result from a near-duplicate chart's recommendation (no LLM call)."""
+        analysis: Dict[str, Any] = {}
+        raw_response = similar.get("raw_response")
+        if raw_response:
+            try:
+                parsed = json.loads(raw_response) if isinstance(raw_response, str) else raw_response
+                analysis = dict(parsed.get("analysis_result") or {})
+            except (json.JSONDecodeError, TypeError, AttributeError):
+                analysis = {}
+        if not analysis.get("recommendation"):
+            rec_value = (similar.get("recommendation") or "HOLD").upper()
+            analysis.update({
+                "recommendation": {"LONG": "BUY", "SHORT": "SELL"}.get(rec_value, rec_value),
+                "confidence": similar.get("confidence", 0),
+                "entry_price": similar.get("entry_price"),
+                "stop_loss": similar.get("stop_loss"),
+                "take_profit": similar.get("take_profit"),
+                "risk_reward": similar.get("risk_reward"),
+                "summary": similar.get("reasoning", ""),
+                "prompt_id": similar.get("prompt_name"),
+                "prompt_version": similar.get("prompt_version"),
+                "assistant_model": similar.get("model_name"),
+            })
+        analysis["reused_from_recommendation"] = similar.get("id")
+        analysis["chart_hash_distance"] = similar.get("chart_hash_distance")
+
+        logger.info(
+            f"   ♻️  {normalize_symbol_for_bybit(symbol)}: near-identical chart already analyzed "
+            f"(recommendation {similar.get('id')}, {similar.get('chart_hash_distance')} bits apart) - reusing"
+        )
+        result: Dict[str, Any] = {
+            "symbol": normalize_symbol_for_bybit(symbol),
+            "timeframe": self.timeframe,
+            "cycle_id": cycle_id,
+            "chart_path": chart_path,
+            "chart_hash": chart_hash,
+            "reused_analysis": True,
+        }
+        return self._apply_analysis(result, analysis)
+
+    async def _analyze_chart_safe(
+        self, symbol: str, chart_path: str, cycle_id: str, chart_hash: Optional[str] = None
+    ) -> Dict[str, Any]:
+        """Analyze a single chart, turning exceptions into an error result."""
+        try:
+            return await self._analyze_chart_async(symbol, chart_path, cycle_id, chart_hash)
+        except Exception as e:
+            logger.error(f"Error analyzing {symbol}: {e}", exc_info=True)
+            return {
+                "symbol": symbol,
+                "error": str(e),
+                "chart_path": chart_path,
+            }
+
     async def _analyze_all_charts_parallel(
         self, chart_paths: Dict[str, str], cycle_id: str
     ) -> List[Dict[str, Any]]:
         """
         Analyze ALL charts in PARALLEL using asyncio.gather().
 
-        This is the key optimization - instead of sequential processing,
-        we launch all AI analyses concurrently and wait for all to complete.
+        Used when all chart paths are already known; the cycle itself streams
+        captures into analysis via _capture_and_analyze_pipelined.
 
         Args:
             chart_paths: Dict of {symbol: chart_path}
@@ -745,21 +970,9 @@ class TradingCycle:
         Returns:
             List of analysis results (one per symbol)
         """
-        async def analyze_single(symbol: str, chart_path: str) -> Dict[str, Any]:
-            """Wrapper to analyze a single chart with error handling."""
-            try:
-                return await self._analyze_chart_async(symbol, chart_path, cycle_id)
-            except Exception as e:
-                logger.error(f"Error analyzing {symbol}: {e}", exc_info=True)
-                return {
-                    "symbol": symbol,
-                    "error": str(e),
-                    "chart_path": chart_path,
-                }
-
         # Create tasks for all charts
         tasks = [
-            analyze_single(symbol, chart_path)
+            self._analyze_chart_safe(symbol, chart_path, cycle_id)
             for symbol, chart_path in chart_paths.items()
         ]
 
@@ -768,12 +981,15 @@ class TradingCycle:
         return list(results)
 
     async def _analyze_chart_async(
-        self, symbol: str, chart_path: str, cycle_id: str
+        self, symbol: str, chart_path: str, cycle_id: str, chart_hash: Optional[str] = None
     ) -> Dict[str, Any]:
         """
         Async wrapper for chart analysis.
 
-        Runs the synchronous analyzer in executor to not block the event loop.
+        Runs through the shared LLM dispatcher (concurrency cap, rate limits,
+        429 re-queue): the assistant run is awaited on the event loop and only
+        the blocking preparation (OCR, market data, image reads) takes one of
+        the dispatcher's threads.
         """
         normalized_symbol = normalize_symbol_for_bybit(symbol)
 
@@ -782,18 +998,18 @@ class TradingCycle:
             "timeframe": self.timeframe,
             "cycle_id": cycle_id,
             "chart_path": chart_path,
+            "chart_hash": chart_hash,
         }
 
-        # Run sync analyzer in thread pool to not block
-        loop = asyncio.get_event_loop()
-        analysis = await loop.run_in_executor(
-            None,
-            lambda: self.analyzer.analyze_chart(
-                image_path=chart_path,
-                use_assistant=True,
-                target_timeframe=self.timeframe,
-                prompt_function=self._prompt_function,
-            )
+        # Bounded by the dispatcher; blocking steps run on its executor
+        analysis = await self.llm_dispatcher.run_async(
+            self.analyzer.analyze_chart_async,
+            image_path=chart_path,
+            use_assistant=True,
+            target_timeframe=self.timeframe,
+            prompt_function=self._prompt_function,
+            run_blocking=self.llm_dispatcher.run_blocking,
+            label=normalized_symbol,
         )
 
         if not analysis or analysis.get("error") or analysis.get("skipped"):
@@ -802,6 +1018,12 @@ class TradingCycle:
             result["skip_reason"] = skip_reason
             return result
 
+        return self._apply_analysis(result, analysis)
+
+    def _apply_analysis(self, result: Dict[str, Any], analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Copy the analyzer output's key fields onto result and record the recommendation."""
+        normalized_symbol = result["symbol"]
+
         # Extract key fields
         recommendation = analysis.get("recommendation", "hold").upper()
         confidence = float(analysis.get("confidence", 0))
@@ -1222,7 +1444,7 @@ class TradingCycle:
             # Get prompt info from analysis (set by analyzer)
             prompt_name = analysis.get("prompt_id", analysis.get("prompt_version", "trading_cycle"))
             prompt_version = analysis.get("prompt_version", "1.0")
-            model_name = analysis.get("assistant_model", self.config.openai.model)
+            model_name = analysis.get("assistant_model") or self._get_model_name()
 
             # Use consistent ISO timestamp format across all tables
             now_iso = datetime.now(timezone.utc).isoformat()
@@ -1234,9 +1456,9 @@ class TradingCycle:
                     INSERT INTO recommendations
                     (id, cycle_id, symbol, timeframe, recommendation, confidence,
                      entry_price, stop_loss, take_profit, risk_reward,
-                     reasoning, chart_path, prompt_name, prompt_version, model_name,
+                     reasoning, chart_path, chart_hash, prompt_name, prompt_version, model_name,
                      raw_response, analyzed_at, cycle_boundary, created_at)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
                 """, (
                     rec_id,
                     result.get("cycle_id"),  # Link to parent cycle
@@ -1250,6 +1472,7 @@ class TradingCycle:
                     analysis.get("risk_reward_ratio", analysis.get("risk_reward")),
                     analysis.get("summary", ""),
                     result.get("chart_path"),
+                    result.get("chart_hash"),
                     prompt_name,
                     prompt_version,
                     model_name,
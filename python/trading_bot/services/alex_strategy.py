@@ -82,7 +82,7 @@ class AlexStrategy(BaseStrategy):
             }
 
         # Calculate indicators
-        df = self.calculate_indicators(df)
+        df = self.calculate_indicators(df, symbol, timeframe)
 
         # Perform top-down analysis
         analysis_result = self._perform_top_down_analysis(df, symbol, timeframe)
@@ -4,7 +4,15 @@ Base strategy interface for TA-based advisory system.
 from abc import ABC, abstractmethod
 from typing import Dict, Any, Optional, List
 import pandas as pd
-import pandas_ta as ta
+
+from trading_bot.core.candle_patterns import swing_pivots
+from trading_bot.core.indicator_engine import get_indicator_engine
+
+# Indicators behind calculate_indicators(), computed once per candle series
+COMMON_INDICATORS = (
+    'rsi_14', 'macd_12_26_9', 'bbands_20_2', 'atr_14', 'volume_sma_20',
+    'sma_20', 'sma_50', 'sma_200', 'ema_12', 'ema_26',
+)
 
 
 class BaseStrategy(ABC):
@@ -59,80 +67,52 @@ class BaseStrategy(ABC):
         required_params = self.get_parameters().keys()
         return all(param in config for param in required_params)
     
-    def calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    def calculate_indicators(self, df: pd.DataFrame, symbol: Optional[str] = None,
+                             timeframe: Optional[str] = None) -> pd.DataFrame:
         """
         Calculate common technical indicators.
         
         Args:
             df: DataFrame with OHLCV data
+            symbol: Trading symbol (with timeframe, enables the shared indicator cache)
+            timeframe: Timeframe of the data
             
         Returns:
             DataFrame with added indicator columns
         """
         # Make a copy to avoid modifying original
         result_df = df.copy()
+        ind = get_indicator_engine().compute(df, COMMON_INDICATORS, symbol=symbol, timeframe=timeframe)
         
         # Calculate common indicators
         # RSI
-        result_df['rsi'] = ta.rsi(result_df['close'], length=14)
+        result_df['rsi'] = ind['rsi_14']
         
         # MACD
-        macd = ta.macd(result_df['close'])
+        macd = ind['macd_12_26_9']
         if macd is not None:
-            result_df['macd'] = macd['MACD_12_26_9']
-            result_df['macd_signal'] = macd['MACDs_12_26_9']
-            result_df['macd_hist'] = macd['MACDh_12_26_9']
+            result_df['macd'] = macd['macd']
+            result_df['macd_signal'] = macd['signal']
+            result_df['macd_hist'] = macd['hist']
         
         # Bollinger Bands
-        bb = ta.bbands(result_df['close'], length=20)
+        bb = ind['bbands_20_2']
         if bb is not None:
-            # Handle different column naming conventions in pandas_ta
-            # New format: BBL_20_2.0_2.0, BBM_20_2.0_2.0, BBU_20_2.0_2.0
-            # Old format: BBL_20_2.0, BBM_20_2.0, BBU_20_2.0
-            # Try new format first, then old format
-            bb_upper_col = None
-            bb_middle_col = None
-            bb_lower_col = None
-
-            for col in bb.columns:
-                if col.startswith('BBU_'):
-                    bb_upper_col = col
-                elif col.startswith('BBM_'):
-                    bb_middle_col = col
-                elif col.startswith('BBL_'):
-                    bb_lower_col = col
-
-            if bb_upper_col and bb_middle_col and bb_lower_col:
-                result_df['bb_upper'] = bb[bb_upper_col]
-                result_df['bb_middle'] = bb[bb_middle_col]
-                result_df['bb_lower'] = bb[bb_lower_col]
-            else:
-                print(f"Warning: Could not find expected Bollinger Bands columns in: {bb.columns.tolist()}")
+            result_df['bb_upper'] = bb['upper']
+            result_df['bb_middle'] = bb['middle']
+            result_df['bb_lower'] = bb['lower']
         
         # ATR for volatility
-        result_df['atr'] = ta.atr(result_df['high'], result_df['low'], result_df['close'], length=14)
+        result_df['atr'] = ind['atr_14']
         
         # Volume indicators
-        result_df['volume_sma'] = ta.sma(result_df['volume'], length=20)
+        result_df['volume_sma'] = ind['volume_sma_20']
         result_df['volume_ratio'] = result_df['volume'] / result_df['volume_sma']
         
         # Moving averages
-        sma_20 = ta.sma(result_df['close'], length=20)
-        sma_50 = ta.sma(result_df['close'], length=50)
-        sma_200 = ta.sma(result_df['close'], length=200)
-        ema_12 = ta.ema(result_df['close'], length=12)
-        ema_26 = ta.ema(result_df['close'], length=26)
-
-        if sma_20 is not None:
-            result_df['sma_20'] = sma_20
-        if sma_50 is not None:
-            result_df['sma_50'] = sma_50
-        if sma_200 is not None:
-            result_df['sma_200'] = sma_200
-        if ema_12 is not None:
-            result_df['ema_12'] = ema_12
-        if ema_26 is not None:
-            result_df['ema_26'] = ema_26
+        for name in ('sma_20', 'sma_50', 'sma_200', 'ema_12', 'ema_26'):
+            if ind[name] is not None:
+                result_df[name] = ind[name]
         
         return result_df
     
@@ -222,19 +202,10 @@ class BaseStrategy(ABC):
         highs = recent_data['high']
         lows = recent_data['low']
         
-        # Simple pivot point detection
-        resistance_levels = []
-        support_levels = []
-        
-        # Look for local maxima and minima
-        for i in range(2, len(recent_data) - 2):
-            if highs.iloc[i] > highs.iloc[i-1] and highs.iloc[i] > highs.iloc[i-2] and \
-               highs.iloc[i] > highs.iloc[i+1] and highs.iloc[i] > highs.iloc[i+2]:
-                resistance_levels.append(highs.iloc[i])
-            
-            if lows.iloc[i] < lows.iloc[i-1] and lows.iloc[i] < lows.iloc[i-2] and \
-               lows.iloc[i] < lows.iloc[i+1] and lows.iloc[i] < lows.iloc[i+2]:
-                support_levels.append(lows.iloc[i])
+        # Simple pivot point detection: local maxima and minima
+        is_swing_high, is_swing_low = swing_pivots(highs, lows)
+        resistance_levels = list(highs.to_numpy()[is_swing_high])
+        support_levels = list(lows.to_numpy()[is_swing_low])
         
         # Get current price
         current_price = df['close'].iloc[-1]
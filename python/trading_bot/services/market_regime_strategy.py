@@ -8,11 +8,15 @@ Features:
 - Market structure shift confirmation
 - Liquidity zone analysis
 """
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional
+import numpy as np
 import pandas as pd
-import pandas_ta as ta
+from trading_bot.core.candle_patterns import PATTERN_NAMES, candlestick_patterns, swing_pivots
+from trading_bot.core.indicator_engine import get_indicator_engine
 from trading_bot.services.base_strategy import BaseStrategy
 
+REGIME_INDICATORS = ('volume_sma_20', 'ema_200', 'rsi_14', 'atr_14')
+
 class MarketRegimeStrategy(BaseStrategy):
     """Market Regime Detection Strategy"""
 
@@ -82,15 +86,17 @@ class MarketRegimeStrategy(BaseStrategy):
             }
 
         # Calculate indicators
-        df = self._calculate_regime_indicators(df)
+        df = self._calculate_regime_indicators(df, symbol, timeframe)
 
         # Perform regime analysis
         analysis_result = self._perform_regime_analysis(df, symbol, timeframe)
 
         return analysis_result
 
-    def _calculate_regime_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _calculate_regime_indicators(self, df: pd.DataFrame, symbol: Optional[str] = None,
+                                     timeframe: Optional[str] = None) -> pd.DataFrame:
         """Calculate indicators specific to market regime detection."""
+        ind = get_indicator_engine().compute(df, REGIME_INDICATORS, symbol=symbol, timeframe=timeframe)
         df = df.copy()
 
         # Basic derived series
@@ -100,11 +106,11 @@ class MarketRegimeStrategy(BaseStrategy):
         df['lower_shadow'] = df[['open', 'close']].min(axis=1) - df['low']
 
         # Volume indicators
-        df['volume_avg_20'] = df['volume'].rolling(20).mean()
+        df['volume_avg_20'] = ind['volume_sma_20'] if ind['volume_sma_20'] is not None else df['volume'].rolling(20).mean()
         df['volume_confirmed'] = df['volume'] > (self.config['volume_threshold'] * df['volume_avg_20'])
 
         # Trend indicators
-        ema_200 = ta.ema(df['close'], length=200)
+        ema_200 = ind['ema_200']
         if ema_200 is not None:
             df['ema_200'] = ema_200
             df['ht_trend_up'] = df['close'] > df['ema_200']
@@ -120,10 +126,10 @@ class MarketRegimeStrategy(BaseStrategy):
             df['price_above_vwap'] = df['close'] > df['vwap']
 
         # RSI for divergence detection
-        df['rsi'] = ta.rsi(df['close'], length=14)
+        df['rsi'] = ind['rsi_14']
 
         # ATR for volatility
-        df['atr'] = ta.atr(df['high'], df['low'], df['close'], length=14)
+        df['atr'] = ind['atr_14']
 
         return df
 
@@ -199,58 +205,49 @@ class MarketRegimeStrategy(BaseStrategy):
 
     def _detect_candlestick_patterns(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Detect volume-validated candlestick patterns."""
-        patterns = {
-            "bullish_engulfing": [],
-            "bearish_engulfing": [],
-            "hammer": [],
-            "shooting_star": [],
-            "inside_bar": []
-        }
+        flags = candlestick_patterns(df['open'], df['high'], df['low'], df['close'], df['volume'],
+                                     volume_confirmed=df['volume_confirmed'])
+        return self._recent_pattern_indices(flags, len(df))
 
-        for i in range(1, min(len(df), self.config['pattern_lookback'] + 1)):
-            idx = -i
-            current = df.iloc[idx]
-            prev = df.iloc[idx - 1]
-
-            # Bullish Engulfing
-            if (prev['close'] < prev['open'] and  # Previous bearish
-                current['close'] > current['open'] and  # Current bullish
-                current['open'] < prev['close'] and  # Opens below previous close
-                current['close'] > prev['open'] and  # Closes above previous open
-                current['volume_confirmed']):  # Volume confirmation
-                patterns["bullish_engulfing"].append(idx)
-
-            # Bearish Engulfing
-            if (prev['close'] > prev['open'] and  # Previous bullish
-                current['close'] < current['open'] and  # Current bearish
-                current['open'] > prev['close'] and  # Opens above previous close
-                current['close'] < prev['open'] and  # Closes below previous open
-                current['volume_confirmed']):  # Volume confirmation
-                patterns["bearish_engulfing"].append(idx)
-
-            # Hammer
-            if (current['body'] <= 0.3 * current['range'] and
-                current['lower_shadow'] >= 2.0 * current['body'] and
-                current['upper_shadow'] <= 0.2 * current['range'] and
-                current['close'] > (current['low'] + 0.6 * current['range']) and
-                current['volume_confirmed']):
-                patterns["hammer"].append(idx)
-
-            # Shooting Star
-            if (current['body'] <= 0.3 * current['range'] and
-                current['upper_shadow'] >= 2.0 * current['body'] and
-                current['lower_shadow'] <= 0.2 * current['range'] and
-                current['close'] < (current['high'] - 0.6 * current['range']) and
-                current['volume_confirmed']):
-                patterns["shooting_star"].append(idx)
-
-            # Inside Bar
-            if (current['high'] < prev['high'] and
-                current['low'] > prev['low'] and
-                current['volume'] < prev['volume']):
-                patterns["inside_bar"].append(idx)
-
-        return patterns
+    def detect_candlestick_patterns_batch(self, frames: Dict[str, pd.DataFrame]) -> Dict[str, Dict[str, Any]]:
+        """
+        Detect candlestick patterns for many symbols in one vectorized pass.
+
+        Args:
+            frames: symbol -> OHLCV DataFrame (oldest candle first)
+
+        Returns:
+            symbol -> pattern dict, as _detect_candlestick_patterns() returns it
+        """
+        frames = {symbol: df for symbol, df in frames.items() if len(df)}
+        if not frames:
+            return {}
+
+        stacked = pd.concat(frames.values(), ignore_index=True)
+        symbols = np.repeat(list(frames), [len(df) for df in frames.values()])
+        position = stacked.groupby(symbols, sort=False).cumcount().to_numpy()
+        volume_avg_20 = stacked['volume'].rolling(window=20).mean().where(position >= 19)
+        volume_confirmed = stacked['volume'] > (self.config['volume_threshold'] * volume_avg_20)
+
+        flags = candlestick_patterns(stacked['open'], stacked['high'], stacked['low'], stacked['close'],
+                                     stacked['volume'], volume_confirmed=volume_confirmed, groups=symbols)
+
+        results = {}
+        offset = 0
+        for symbol, df in frames.items():
+            end = offset + len(df)
+            results[symbol] = self._recent_pattern_indices(
+                {name: mask[offset:end] for name, mask in flags.items()}, len(df))
+            offset = end
+        return results
+
+    def _recent_pattern_indices(self, flags: Dict[str, np.ndarray], length: int) -> Dict[str, List[int]]:
+        """Negative bar indices (most recent first) of patterns within pattern_lookback."""
+        start = length - min(max(length - 1, 0), self.config['pattern_lookback'])
+        return {
+            name: (np.flatnonzero(flags[name][start:])[::-1] + start - length).tolist()
+            for name in PATTERN_NAMES
+        }
 
     def _analyze_liquidity_zones(self, df: pd.DataFrame) -> Dict[str, Any]:
         """Analyze liquidity zones (swing highs/lows)."""
@@ -258,29 +255,18 @@ class MarketRegimeStrategy(BaseStrategy):
             return {"zones": [], "current_zone": None}
 
         # Find swing highs and lows
-        swing_highs = []
-        swing_lows = []
-
-        for i in range(2, len(df) - 2):
-            if (df['high'].iloc[i] > df['high'].iloc[i-1] and
-                df['high'].iloc[i] > df['high'].iloc[i-2] and
-                df['high'].iloc[i] > df['high'].iloc[i+1] and
-                df['high'].iloc[i] > df['high'].iloc[i+2]):
-                swing_highs.append({
-                    "index": i,
-                    "price": df['high'].iloc[i],
-                    "type": "resistance"
-                })
-
-            if (df['low'].iloc[i] < df['low'].iloc[i-1] and
-                df['low'].iloc[i] < df['low'].iloc[i-2] and
-                df['low'].iloc[i] < df['low'].iloc[i+1] and
-                df['low'].iloc[i] < df['low'].iloc[i+2]):
-                swing_lows.append({
-                    "index": i,
-                    "price": df['low'].iloc[i],
-                    "type": "support"
-                })
+        highs = df['high'].to_numpy()
+        lows = df['low'].to_numpy()
+        is_swing_high, is_swing_low = swing_pivots(highs, lows)
+
+        swing_highs = [
+            {"index": int(i), "price": highs[i], "type": "resistance"}
+            for i in np.flatnonzero(is_swing_high)
+        ]
+        swing_lows = [
+            {"index": int(i), "price": lows[i], "type": "support"}
+            for i in np.flatnonzero(is_swing_low)
+        ]
 
         current_price = df['close'].iloc[-1]
 
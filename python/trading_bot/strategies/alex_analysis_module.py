@@ -10,13 +10,22 @@ Features:
 - Market structure analysis
 """
 
-from typing import Dict, Any, List, Optional
+import asyncio
+from typing import Awaitable, Callable, Dict, Any, List, Optional
 import pandas as pd
-import pandas_ta as ta
+from trading_bot.core.indicator_engine import get_indicator_engine
 from trading_bot.strategies.base import BaseAnalysisModule
 
 logger = None  # Set in __init__
 
+ALEX_INDICATORS = ('sma_20', 'sma_50', 'sma_200', 'rsi_14', 'macd_12_26_9')
+
+# Candles analyzed per timeframe, and the minimum needed for the SMAs
+CANDLE_LIMIT = 200
+MIN_CANDLES = 50
+# Lowest-timeframe candles fetched when higher timeframes are resampled locally (Bybit kline max)
+RESAMPLE_SOURCE_LIMIT = 1000
+
 
 class AlexAnalysisModule(BaseAnalysisModule):
     """Alex's Top-Down Analysis Strategy"""
@@ -28,6 +37,8 @@ class AlexAnalysisModule(BaseAnalysisModule):
         "indicators": ["RSI", "MACD", "EMA"],
         "min_confidence": 0.7,
         "use_volume": True,
+        "max_concurrent_fetches": 50,
+        "resample_higher_timeframes": False,
     }
     
     def __init__(
@@ -54,122 +65,180 @@ class AlexAnalysisModule(BaseAnalysisModule):
 
         Performs TOP-DOWN analysis across multiple timeframes:
         1. Get configured timeframes from strategy config (default: 1h, 4h, 1d)
-        2. Fetch candles for each timeframe
-        3. Analyze each timeframe
+        2. Fetch candles for every symbol and timeframe concurrently
+        3. Analyze each timeframe (per symbol, as soon as its candles arrive)
         4. Combine analysis for final recommendation
 
-        Returns list of analysis results matching output format.
+        Returns list of analysis results matching output format (in symbol order).
         """
-        results = []
-
         # Get configured timeframes for top-down analysis
         configured_timeframes = self.get_config_value('timeframes', ['1h', '4h', '1d'])
 
-        for symbol in symbols:
-            try:
-                # Send heartbeat: starting analysis for symbol
-                self._heartbeat(f"Analyzing {symbol}...", symbol=symbol)
-
-                # Get candles from adapter for ALL configured timeframes
-                if not self.candle_adapter:
-                    results.append({
-                        "symbol": symbol,
-                        "error": "Candle adapter not initialized",
-                        "timeframe": timeframe,
-                        "cycle_id": cycle_id,
-                    })
-                    continue
+        # Bounds in-flight fetches for the cycle; the pooled Bybit market client
+        # additionally enforces the process-wide request-rate budget
+        fetch_slots = asyncio.Semaphore(max(1, int(self.get_config_value('max_concurrent_fetches', 50))))
+
+        async def fetch(symbol: str, tf: str, limit: int = CANDLE_LIMIT) -> List[Dict[str, Any]]:
+            async with fetch_slots:
+                return await self.candle_adapter.get_candles(
+                    symbol=symbol,
+                    timeframe=tf,
+                    limit=limit,  # Need enough for all indicators
+                    use_cache=True,
+                    min_candles=MIN_CANDLES,  # Need at least 50 for SMA calculations
+                    prefer_source="api"  # Prefer API for real-time data
+                )
 
-                # Fetch candles for each timeframe
-                # Use API directly for real-time analysis (prefer_source="api")
-                timeframe_candles = {}
-                for tf in configured_timeframes:
-                    candles = await self.candle_adapter.get_candles(
-                        symbol=symbol,
-                        timeframe=tf,
-                        limit=200,  # Need enough for all indicators
-                        use_cache=True,
-                        min_candles=50,  # Need at least 50 for SMA calculations
-                        prefer_source="api"  # Prefer API for real-time data
-                    )
-                    if candles:
-                        timeframe_candles[tf] = candles
-
-                # Send heartbeat: candles fetched
-                self._heartbeat(f"Fetched candles for {symbol}", symbol=symbol, timeframes=list(timeframe_candles.keys()))
-
-                if not timeframe_candles:
-                    results.append({
-                        "symbol": symbol,
-                        "recommendation": "HOLD",
-                        "confidence": 0.0,
-                        "entry_price": None,
-                        "stop_loss": None,
-                        "take_profit": None,
-                        "risk_reward": 0,
-                        "setup_quality": 0.5,
-                        "market_environment": 0.5,
-                        "analysis": {"error": "Insufficient candle data for all timeframes"},
-                        "chart_path": "",
-                        "timeframe": timeframe,
-                        "cycle_id": cycle_id,
-                        "skipped": True,
-                        "skip_reason": "Insufficient candle data",
-                    })
-                    continue
+        return list(await asyncio.gather(*(
+            self._analyze_symbol(symbol, configured_timeframes, timeframe, cycle_id, fetch)
+            for symbol in symbols
+        )))
 
-                # Analyze each timeframe (top-down: 1d -> 4h -> 1h)
-                timeframe_analyses = {}
-                for tf in sorted(configured_timeframes, key=lambda x: self._timeframe_order(x), reverse=True):
-                    if tf not in timeframe_candles:
-                        continue
-
-                    candles = timeframe_candles[tf]
-                    df = self._candles_to_dataframe(candles)
-
-                    # Calculate indicators
-                    df = self._calculate_indicators(df)
-
-                    # Perform analysis
-                    trend = self._detect_trend(df)
-                    sr = self._identify_support_resistance(df)
-                    structure = self._analyze_market_structure(df)
-                    signals = self._detect_entry_signals(df, trend, sr)
-
-                    timeframe_analyses[tf] = {
-                        "trend": trend,
-                        "support_resistance": sr,
-                        "structure": structure,
-                        "signals": signals,
-                    }
-
-                # Combine analysis from all timeframes
-                result = self._combine_timeframe_analysis(
-                    symbol, timeframe_analyses, configured_timeframes, cycle_id
-                )
+    async def _analyze_symbol(
+        self,
+        symbol: str,
+        configured_timeframes: List[str],
+        timeframe: str,
+        cycle_id: str,
+        fetch: Callable[..., Awaitable[List[Dict[str, Any]]]],
+    ) -> Dict[str, Any]:
+        """Fetch candles for one symbol's timeframes and run the top-down analysis."""
+        try:
+            # Send heartbeat: starting analysis for symbol
+            self._heartbeat(f"Analyzing {symbol}...", symbol=symbol)
+
+            # Get candles from adapter for ALL configured timeframes
+            if not self.candle_adapter:
+                return {
+                    "symbol": symbol,
+                    "error": "Candle adapter not initialized",
+                    "timeframe": timeframe,
+                    "cycle_id": cycle_id,
+                }
 
-                # Validate output
-                self._validate_output(result)
+            timeframe_candles = await self._fetch_timeframe_candles(symbol, configured_timeframes, fetch)
 
-                results.append(result)
+            # Send heartbeat: candles fetched
+            self._heartbeat(f"Fetched candles for {symbol}", symbol=symbol, timeframes=list(timeframe_candles.keys()))
 
-                # Send heartbeat: analysis complete
-                self._heartbeat(f"Completed analysis for {symbol}", symbol=symbol, recommendation=result.get("recommendation"))
-                
-            except Exception as e:
-                self.logger.error(
-                    f"Analysis failed for {symbol}: {e}",
-                    extra={"symbol": symbol, "instance_id": self.instance_id}
-                )
-                results.append({
+            if not timeframe_candles:
+                return {
                     "symbol": symbol,
-                    "error": str(e),
+                    "recommendation": "HOLD",
+                    "confidence": 0.0,
+                    "entry_price": None,
+                    "stop_loss": None,
+                    "take_profit": None,
+                    "risk_reward": 0,
+                    "setup_quality": 0.5,
+                    "market_environment": 0.5,
+                    "analysis": {"error": "Insufficient candle data for all timeframes"},
+                    "chart_path": "",
                     "timeframe": timeframe,
                     "cycle_id": cycle_id,
-                })
-        
-        return results
-    
+                    "skipped": True,
+                    "skip_reason": "Insufficient candle data",
+                }
+
+            # Analyze each timeframe (top-down: 1d -> 4h -> 1h)
+            timeframe_analyses = {}
+            for tf in sorted(configured_timeframes, key=lambda x: self._timeframe_order(x), reverse=True):
+                if tf not in timeframe_candles:
+                    continue
+
+                candles = timeframe_candles[tf]
+                df = self._candles_to_dataframe(candles)
+
+                # Calculate indicators
+                df = self._calculate_indicators(df, symbol, tf)
+
+                # Perform analysis
+                trend = self._detect_trend(df)
+                sr = self._identify_support_resistance(df)
+                structure = self._analyze_market_structure(df)
+                signals = self._detect_entry_signals(df, trend, sr)
+
+                timeframe_analyses[tf] = {
+                    "trend": trend,
+                    "support_resistance": sr,
+                    "structure": structure,
+                    "signals": signals,
+                }
+
+            # Combine analysis from all timeframes
+            result = self._combine_timeframe_analysis(
+                symbol, timeframe_analyses, configured_timeframes, cycle_id
+            )
+
+            # Validate output
+            self._validate_output(result)
+
+            # Send heartbeat: analysis complete
+            self._heartbeat(f"Completed analysis for {symbol}", symbol=symbol, recommendation=result.get("recommendation"))
+            return result
+
+        except Exception as e:
+            self.logger.error(
+                f"Analysis failed for {symbol}: {e}",
+                extra={"symbol": symbol, "instance_id": self.instance_id}
+            )
+            return {
+                "symbol": symbol,
+                "error": str(e),
+                "timeframe": timeframe,
+                "cycle_id": cycle_id,
+            }
+
+    async def _fetch_timeframe_candles(
+        self,
+        symbol: str,
+        configured_timeframes: List[str],
+        fetch: Callable[..., Awaitable[List[Dict[str, Any]]]],
+    ) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        Fetch candles for all timeframes of a symbol concurrently.
+
+        With resample_higher_timeframes enabled, higher timeframes whose
+        CANDLE_LIMIT candles fit in one RESAMPLE_SOURCE_LIMIT fetch of the
+        lowest timeframe are built locally from it; the rest (and any whose
+        resampled history comes up short of CANDLE_LIMIT) are fetched from
+        the API.
+        """
+        derived: List[str] = []
+        base_tf = min(configured_timeframes, key=self._timeframe_order, default=None)
+        if base_tf and self.get_config_value('resample_higher_timeframes', False):
+            base_ms = self.candle_adapter._timeframe_to_ms(base_tf)
+            derived = [
+                tf for tf in configured_timeframes
+                if self.candle_adapter.can_resample(base_tf, tf)
+                and RESAMPLE_SOURCE_LIMIT * base_ms // self.candle_adapter._timeframe_to_ms(tf) >= CANDLE_LIMIT
+            ]
+
+        direct = [tf for tf in configured_timeframes if tf not in derived]
+        limits = {tf: (RESAMPLE_SOURCE_LIMIT if derived and tf == base_tf else CANDLE_LIMIT) for tf in direct}
+        fetched = await asyncio.gather(*(fetch(symbol, tf, limits[tf]) for tf in direct))
+        timeframe_candles = {tf: candles for tf, candles in zip(direct, fetched) if candles}
+
+        if derived:
+            base_candles = timeframe_candles.get(base_tf, [])
+            missing = []
+            for tf in derived:
+                candles = self.candle_adapter.resample_candles(base_candles, base_tf, tf, limit=CANDLE_LIMIT)
+                # A short resampled series would shrink the analysis window: fetch instead
+                if len(candles) >= CANDLE_LIMIT:
+                    timeframe_candles[tf] = candles
+                else:
+                    missing.append(tf)
+            fetched = await asyncio.gather(*(fetch(symbol, tf) for tf in missing))
+            timeframe_candles.update({tf: candles for tf, candles in zip(missing, fetched) if candles})
+            if base_tf in timeframe_candles:
+                # The base series was fetched long for resampling; analyze the usual window
+                base = timeframe_candles[base_tf]
+                newest_first = len(base) > 1 and base[0]['timestamp'] > base[-1]['timestamp']
+                timeframe_candles[base_tf] = base[:CANDLE_LIMIT] if newest_first else base[-CANDLE_LIMIT:]
+
+        return timeframe_candles
+
     def _timeframe_order(self, timeframe: str) -> int:
         """Get order value for timeframe (for sorting)."""
         order_map = {
@@ -274,23 +343,25 @@ class AlexAnalysisModule(BaseAnalysisModule):
                 raise ValueError(f"Missing required column: {col}")
         return df
     
-    def _calculate_indicators(self, df: pd.DataFrame) -> pd.DataFrame:
+    def _calculate_indicators(self, df: pd.DataFrame, symbol: Optional[str] = None,
+                              timeframe: Optional[str] = None) -> pd.DataFrame:
         """Calculate technical indicators."""
         result_df = df.copy()
+        ind = get_indicator_engine().compute(df, ALEX_INDICATORS, symbol=symbol, timeframe=timeframe)
         
         # Moving averages
-        result_df['sma_20'] = ta.sma(result_df['close'], length=20)
-        result_df['sma_50'] = ta.sma(result_df['close'], length=50)
-        result_df['sma_200'] = ta.sma(result_df['close'], length=200)
+        result_df['sma_20'] = ind['sma_20']
+        result_df['sma_50'] = ind['sma_50']
+        result_df['sma_200'] = ind['sma_200']
         
         # RSI
-        result_df['rsi'] = ta.rsi(result_df['close'], length=14)
+        result_df['rsi'] = ind['rsi_14']
         
         # MACD
-        macd = ta.macd(result_df['close'])
+        macd = ind['macd_12_26_9']
         if macd is not None:
-            result_df['macd'] = macd['MACD_12_26_9']
-            result_df['macd_signal'] = macd['MACDs_12_26_9']
+            result_df['macd'] = macd['macd']
+            result_df['macd_signal'] = macd['signal']
         
         return result_df
     
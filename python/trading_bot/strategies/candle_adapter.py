@@ -6,14 +6,20 @@ Handles caching and fallback to real API if needed.
 Uses centralized database layer for both SQLite and PostgreSQL.
 """
 
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, FrozenSet, Optional, Tuple, TYPE_CHECKING
 import logging
 import os
 import asyncio
+import threading
 import time
 from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
 
+from trading_bot.config.settings_v2 import get_static_config
+
+if TYPE_CHECKING:
+    from trading_bot.db.candle_cache import CandleArrays
+
 logger = logging.getLogger(__name__)
 
 # Load environment variables from env.local
@@ -22,6 +28,33 @@ load_dotenv('.env.local')
 # Thread pool for blocking API calls
 _executor = ThreadPoolExecutor(max_workers=5)
 
+# Seconds the Bybit symbol universe is memoized for (process-wide, config.yaml
+# strategies.symbol_universe_ttl); a failed load is retried after
+# SYMBOL_UNIVERSE_RETRY seconds
+SYMBOL_UNIVERSE_TTL = get_static_config().strategies.symbol_universe_ttl
+SYMBOL_UNIVERSE_RETRY = 60
+
+_symbol_universe: Dict[str, Tuple[float, FrozenSet[str]]] = {}
+_symbol_universe_lock = threading.Lock()
+
+
+def _load_symbol_universe(category: str) -> FrozenSet[str]:
+    """Available symbols for a category, loaded at most once per TTL."""
+    with _symbol_universe_lock:
+        cached = _symbol_universe.get(category)
+        if cached is not None and time.time() < cached[0]:
+            return cached[1]
+        try:
+            from prompt_performance.core.bybit_symbols import get_bybit_symbols_cached
+            symbols = frozenset(get_bybit_symbols_cached(category=category))
+            logger.debug(f"Fetched {len(symbols)} available symbols from Bybit")
+        except Exception as e:
+            logger.warning(f"Failed to fetch available symbols: {e}")
+            symbols = frozenset()
+        ttl = SYMBOL_UNIVERSE_TTL if symbols else SYMBOL_UNIVERSE_RETRY
+        _symbol_universe[category] = (time.time() + ttl, symbols)
+        return symbols
+
 
 class CandleAdapter:
     """
@@ -44,26 +77,15 @@ class CandleAdapter:
         """
         self.instance_id = instance_id
         self.logger = logging.getLogger(__name__)
-        self._available_symbols = None
-        self._symbols_fetched_at = 0
 
-    async def _get_available_symbols(self) -> List[str]:
+    async def _get_available_symbols(self) -> FrozenSet[str]:
         """
-        Get list of available symbols from Bybit.
-        Caches the result for 24 hours.
+        Get the set of available symbols from Bybit.
+
+        Served from a process-wide memo (see SYMBOL_UNIVERSE_TTL) shared by
+        every adapter; the blocking load runs off the event loop.
         """
-        current_time = time.time()
-        # Refresh if not cached or cache is older than 24 hours
-        if self._available_symbols is None or (current_time - self._symbols_fetched_at) > 24 * 3600:
-            try:
-                from prompt_performance.core.bybit_symbols import get_bybit_symbols_cached
-                self._available_symbols = get_bybit_symbols_cached(category="linear")
-                self._symbols_fetched_at = current_time
-                self.logger.debug(f"Fetched {len(self._available_symbols)} available symbols from Bybit")
-            except Exception as e:
-                self.logger.warning(f"Failed to fetch available symbols: {e}")
-                self._available_symbols = []
-        return self._available_symbols or []
+        return await asyncio.to_thread(_load_symbol_universe, "linear")
 
     async def symbol_exists(self, symbol: str) -> bool:
         """
@@ -123,7 +145,81 @@ class CandleAdapter:
                     break
 
         return normalized
-    
+
+    def can_resample(self, source_timeframe: str, target_timeframe: str) -> bool:
+        """
+        Whether target candles can be built from source candles.
+
+        The target must be a whole multiple of the source and divide a day, so
+        buckets align with Bybit's UTC candle boundaries (weekly candles start
+        on Monday and are never derived).
+        """
+        source_ms = self._timeframe_to_ms(source_timeframe)
+        target_ms = self._timeframe_to_ms(target_timeframe)
+        day_ms = self._timeframe_to_ms("1d")
+        return target_ms > source_ms and target_ms % source_ms == 0 and day_ms % target_ms == 0
+
+    def resample_candles(
+        self,
+        candles: List[Dict[str, Any]],
+        source_timeframe: str,
+        target_timeframe: str,
+        limit: Optional[int] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Aggregate normalized candles into a higher timeframe.
+
+        The oldest bucket is dropped when the source history starts partway
+        through it; the newest bucket is kept even if still forming, like the
+        open candle the API returns. Output keeps the input's ordering
+        (newest-first API lists stay newest-first).
+
+        Args:
+            candles: Normalized candles of source_timeframe
+            source_timeframe: Timeframe of the input (e.g., "1h")
+            target_timeframe: Timeframe to build (e.g., "4h")
+            limit: Keep only the newest N resampled candles
+
+        Returns:
+            List of normalized candles of target_timeframe
+        """
+        if not self.can_resample(source_timeframe, target_timeframe):
+            raise ValueError(f"Cannot resample {source_timeframe} candles into {target_timeframe}")
+
+        target_ms = self._timeframe_to_ms(target_timeframe)
+        per_bucket = target_ms // self._timeframe_to_ms(source_timeframe)
+        newest_first = len(candles) > 1 and candles[0]['timestamp'] > candles[-1]['timestamp']
+
+        buckets = []
+        counts = []
+        for candle in sorted(candles, key=lambda c: c['timestamp']):
+            bucket_start = int(candle['timestamp']) // target_ms * target_ms
+            if buckets and buckets[-1]['timestamp'] == bucket_start:
+                bucket = buckets[-1]
+                bucket['high'] = max(bucket['high'], candle['high'])
+                bucket['low'] = min(bucket['low'], candle['low'])
+                bucket['close'] = candle['close']
+                bucket['volume'] += candle['volume']
+                bucket['turnover'] += candle.get('turnover') or 0
+                counts[-1] += 1
+            else:
+                buckets.append({
+                    'timestamp': bucket_start,
+                    'open': candle['open'],
+                    'high': candle['high'],
+                    'low': candle['low'],
+                    'close': candle['close'],
+                    'volume': candle['volume'],
+                    'turnover': candle.get('turnover') or 0,
+                })
+                counts.append(1)
+
+        if buckets and counts[0] < per_bucket:
+            buckets = buckets[1:]
+        if limit is not None:
+            buckets = buckets[-limit:] if limit > 0 else []
+        return buckets[::-1] if newest_first else buckets
+
     async def get_candles(
         self,
         symbol: str,
@@ -164,29 +260,39 @@ class CandleAdapter:
                 try:
                     # Try to get from database using centralized layer
                     from trading_bot.db.client import get_connection, release_connection, query, get_table_name
+                    from trading_bot.db.candle_cache import get_candle_cache
 
                     conn = get_connection()
                     try:
-                        # Get the latest candles for this symbol/timeframe
-                        table_name = get_table_name('klines_store')
-                        sql = f"""
-                            SELECT * FROM {table_name}
-                            WHERE symbol = ? AND timeframe = ?
-                            ORDER BY start_time DESC
-                            LIMIT ?
-                        """
-                        cached = query(conn, sql, (symbol, timeframe, limit))
+                        candle_cache = get_candle_cache()
+                        if candle_cache is not None:
+                            # Columnar cache: sync new rows from klines_store, then
+                            # slice the newest `limit` candles out of the mmap
+                            candle_cache.sync_from_store(conn, symbol, timeframe)
+                            cached = candle_cache.read(symbol, timeframe, limit=limit, latest=True)
+                        else:
+                            # Get the latest candles for this symbol/timeframe
+                            table_name = get_table_name('klines_store')
+                            sql = f"""
+                                SELECT * FROM {table_name}
+                                WHERE symbol = ? AND timeframe = ?
+                                ORDER BY start_time DESC
+                                LIMIT ?
+                            """
+                            cached = query(conn, sql, (symbol, timeframe, limit))
 
                         if cached and len(cached) >= min_candles:
                             # Check if we got close to the requested limit
                             # If we got significantly fewer than requested, try API for more
                             if len(cached) >= limit * 0.8:  # Got at least 80% of requested
-                                # Reverse to get chronological order
-                                cached = list(reversed(cached))
                                 self.logger.debug(
                                     f"Got {len(cached)} candles from cache for {symbol} {timeframe}",
                                     extra={"symbol": symbol, "instance_id": self.instance_id}
                                 )
+                                if candle_cache is not None:
+                                    return cached.to_dicts()
+                                # Reverse to get chronological order
+                                cached = list(reversed(cached))
                                 # Normalize candle field names
                                 return [self._normalize_candle(c) for c in cached]
                             # If we got fewer than 80% of requested, try API for more
@@ -202,18 +308,9 @@ class CandleAdapter:
                 try:
                     print(f"[CandleAdapter] Fetching from API...", flush=True)
 
-                    # Try to use pybit directly (simpler than BybitAPIManager which needs full config)
-                    from pybit.unified_trading import HTTP
-
-                    # Get API credentials from environment
-                    api_key = os.getenv('BYBIT_API_KEY')
-                    api_secret = os.getenv('BYBIT_API_SECRET')
-
-                    if api_key and api_secret:
-                        session = HTTP(api_key=api_key, api_secret=api_secret, testnet=False)
-                    else:
-                        # Fallback to public session (limited rate limit)
-                        session = HTTP(testnet=False)
+                    # Kline is a public endpoint: use the shared pooled client
+                    # (one keep-alive connection pool and rate budget per process)
+                    from trading_bot.core.bybit_market_client import get_bybit_market_client
 
                     # Normalize symbol for Bybit
                     api_symbol = symbol if not symbol.endswith('.P') else symbol[:-2]
@@ -231,16 +328,13 @@ class CandleAdapter:
                     }
                     interval = interval_map.get(timeframe, "60")
 
-                    # Run blocking API call in thread pool
                     print(f"[CandleAdapter] Calling get_kline({api_symbol}, {interval})...", flush=True)
-                    response = await asyncio.get_event_loop().run_in_executor(
-                        _executor,
-                        lambda: session.get_kline(
-                            category="linear",
-                            symbol=api_symbol,
-                            interval=interval,
-                            limit=limit
-                        )
+                    response = await get_bybit_market_client().get(
+                        'kline',
+                        category="linear",
+                        symbol=api_symbol,
+                        interval=interval,
+                        limit=limit
                     )
                     print(f"[CandleAdapter] Got response: retCode={response.get('retCode')}", flush=True)
 
@@ -290,6 +384,39 @@ class CandleAdapter:
         # No candles found from any source
         return []
     
+    def get_candle_arrays(
+        self,
+        symbol: str,
+        timeframe: str,
+        limit: Optional[int] = None,
+        since_timestamp: Optional[int] = None,
+    ) -> Optional['CandleArrays']:
+        """
+        Get cached candles as NumPy column arrays (no per-candle dicts).
+
+        Syncs the columnar cache from klines_store first. Returns None when the
+        columnar cache is disabled.
+
+        Args:
+            symbol: Trading symbol
+            timeframe: Timeframe
+            limit: Newest N candles (all if None)
+            since_timestamp: Only candles at/after this time (ms)
+        """
+        from trading_bot.db.client import get_connection, release_connection
+        from trading_bot.db.candle_cache import get_candle_cache
+
+        candle_cache = get_candle_cache()
+        if candle_cache is None:
+            return None
+
+        conn = get_connection()
+        try:
+            candle_cache.sync_from_store(conn, symbol, timeframe, since=since_timestamp)
+        finally:
+            release_connection(conn)
+        return candle_cache.read(symbol, timeframe, start=since_timestamp, limit=limit, latest=True)
+
     def get_candles_since(
         self,
         symbol: str,
@@ -344,7 +471,7 @@ class CandleAdapter:
             True if successful
         """
         try:
-            from trading_bot.db.client import get_connection, release_connection, execute, get_table_name
+            from trading_bot.db.client import get_connection, release_connection, execute_many, get_table_name
 
             # Convert to database format for caching
             db_candles = [
@@ -368,23 +495,24 @@ class CandleAdapter:
             conn = get_connection()
             try:
                 table_name = get_table_name('klines_store')
-                for candle in db_candles:
-                    # Use different syntax for SQLite vs PostgreSQL
-                    if DB_TYPE == 'postgres':
-                        sql = f"""
-                            INSERT INTO {table_name}
-                            (symbol, timeframe, category, start_time, open_price, high_price, low_price, close_price, volume, turnover)
-                            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
-                            ON CONFLICT DO NOTHING
-                        """
-                    else:
-                        sql = f"""
-                            INSERT OR IGNORE INTO {table_name}
-                            (symbol, timeframe, category, start_time, open_price, high_price, low_price, close_price, volume, turnover)
-                            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                        """
-
-                    execute(conn, sql, (
+                # Use different syntax for SQLite vs PostgreSQL
+                if DB_TYPE == 'postgres':
+                    sql = f"""
+                        INSERT INTO {table_name}
+                        (symbol, timeframe, category, start_time, open_price, high_price, low_price, close_price, volume, turnover)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                        ON CONFLICT DO NOTHING
+                    """
+                else:
+                    sql = f"""
+                        INSERT OR IGNORE INTO {table_name}
+                        (symbol, timeframe, category, start_time, open_price, high_price, low_price, close_price, volume, turnover)
+                        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                    """
+
+                # Single batched statement, committed once
+                execute_many(conn, sql, [
+                    (
                         candle['symbol'],
                         candle['timeframe'],
                         candle['category'],
@@ -395,10 +523,21 @@ class CandleAdapter:
                         candle['close_price'],
                         candle['volume'],
                         candle['turnover'],
-                    ))
-                return True
+                    )
+                    for candle in db_candles
+                ])
             finally:
                 release_connection(conn)
+
+            # Write through to the columnar cache once klines_store has the rows
+            from trading_bot.db.candle_cache import get_candle_cache
+            candle_cache = get_candle_cache()
+            if candle_cache is not None:
+                try:
+                    candle_cache.append(symbol, timeframe, candles)
+                except Exception as e:
+                    self.logger.warning(f"Failed to update columnar candle cache: {e}")
+            return True
         except Exception as e:
             self.logger.error(
                 f"Failed to cache candles: {e}",
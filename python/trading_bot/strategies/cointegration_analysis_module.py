@@ -11,13 +11,23 @@ Features:
 - Mean reversion trading
 """
 
-from typing import Dict, Any, List, Optional, Callable
+import asyncio
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional, Callable, Tuple
 import numpy as np
 import pandas as pd
+from trading_bot.config.settings_v2 import get_static_config
 from trading_bot.strategies.base import BaseAnalysisModule
 from trading_bot.strategies.spread_trading_cointegrated import CointegrationStrategy
 from trading_bot.core.utils import normalize_symbol_for_bybit
 
+# Worker threads evaluating pairs (spread regression, ADF) concurrently
+# (config.yaml strategies.cointegration_pair_workers; default min(8, CPU count))
+COINTEGRATION_PAIR_WORKERS = (get_static_config().strategies.cointegration_pair_workers
+                              or min(8, os.cpu_count() or 1))
+_pair_executor = ThreadPoolExecutor(max_workers=COINTEGRATION_PAIR_WORKERS, thread_name_prefix='cointegration-pair')
+
 
 class CointegrationAnalysisModule(BaseAnalysisModule):
     """Cointegration-based spread trading strategy."""
@@ -42,6 +52,10 @@ class CointegrationAnalysisModule(BaseAnalysisModule):
         "z_entry": 2.0,            # Z-score entry threshold for cointegration
         "z_exit": 0.5,             # Z-score exit threshold for cointegration
         "use_soft_vol": False,      # Use soft volatility adjustment for cointegration
+        "adf_stride": 10,           # Re-run ADF every N bars (last bar always tested, 1 = every bar)
+
+        # Candle series fetched concurrently per cycle (each unique symbol once)
+        "max_concurrent_fetches": 20,
     }
 
     DEFAULT_CONFIG = STRATEGY_CONFIG  # Use STRATEGY_CONFIG as default
@@ -73,15 +87,13 @@ class CointegrationAnalysisModule(BaseAnalysisModule):
         Each strategy is COMPLETELY INDEPENDENT:
         - Gets symbols from config (NOT from caller/watchlist)
         - For each symbol, gets its pair from config
-        - Fetches candles (NOT chart images)
-        - Runs cointegration analysis
-        - Returns same output format
+        - Fetches candles (NOT chart images) - each unique symbol once, concurrently
+        - Runs cointegration analysis for all pairs in a thread pool
+        - Returns same output format (in configured pair order)
 
         Note: symbols and timeframe parameters are IGNORED
         Note: Uses analysis_timeframe and pairs from config only
         """
-        results = []
-
         # Get configuration (will be read from instance settings later)
         pairs = self.get_config_value('pairs', {})
         analysis_timeframe = self.get_config_value('analysis_timeframe', '1h')
@@ -92,15 +104,16 @@ class CointegrationAnalysisModule(BaseAnalysisModule):
 
         self._heartbeat(f"Starting cointegration analysis for {len(symbols_to_analyze)} symbols (timeframe: {analysis_timeframe})")
 
+        results: Dict[str, Dict[str, Any]] = {}
+        legs: Dict[str, Tuple[str, str, str]] = {}  # symbol -> (pair_symbol, normalized_symbol, normalized_pair)
+
         for symbol in symbols_to_analyze:
             try:
-                self._heartbeat(f"Analyzing {symbol}")
-
                 # Get pair symbol from config
                 pair_symbol = pairs.get(symbol)
                 if not pair_symbol:
                     self._heartbeat(f"No pair configured for {symbol}")
-                    results.append({
+                    results[symbol] = {
                         "symbol": symbol,
                         "recommendation": "HOLD",
                         "confidence": 0.0,
@@ -116,25 +129,19 @@ class CointegrationAnalysisModule(BaseAnalysisModule):
                         "cycle_id": cycle_id,
                         "skipped": True,
                         "skip_reason": "No pair configured",
-                    })
+                    }
                     continue
 
                 # Normalize symbols for Bybit API
                 normalized_symbol = normalize_symbol_for_bybit(symbol)
                 normalized_pair = normalize_symbol_for_bybit(pair_symbol)
 
-                # Check if symbols exist on Bybit before fetching
-                symbol_exists = await self.candle_adapter.symbol_exists(normalized_symbol)
-                pair_exists = await self.candle_adapter.symbol_exists(normalized_pair)
-
-                if not symbol_exists or not pair_exists:
-                    missing = []
-                    if not symbol_exists:
-                        missing.append(normalized_symbol)
-                    if not pair_exists:
-                        missing.append(normalized_pair)
+                # Check if symbols exist on Bybit before fetching (memoized symbol universe)
+                missing = [s for s in (normalized_symbol, normalized_pair)
+                           if not await self.candle_adapter.symbol_exists(s)]
+                if missing:
                     self._heartbeat(f"Symbol(s) not available on Bybit: {', '.join(missing)}")
-                    results.append({
+                    results[symbol] = {
                         "symbol": symbol,
                         "recommendation": "HOLD",
                         "confidence": 0.0,
@@ -150,159 +157,213 @@ class CointegrationAnalysisModule(BaseAnalysisModule):
                         "cycle_id": cycle_id,
                         "skipped": True,
                         "skip_reason": f"Symbol not available: {', '.join(missing)}",
-                    })
-                    continue
-
-                # Fetch candles for both symbols using analysis_timeframe from config
-                # Use higher limit to ensure we get enough candles even if some are missing
-                lookback = self.get_config_value('lookback', 120)
-                min_candles_needed = max(lookback + 10, 50)  # Need at least lookback + buffer
-                self._heartbeat(f"Fetching candles for {symbol} and {pair_symbol}")
-                candles1 = await self.candle_adapter.get_candles(
-                    normalized_symbol,
-                    analysis_timeframe,
-                    limit=500,  # Request more candles to ensure we have enough
-                    min_candles=min_candles_needed,
-                    cache_to_db=False  # Skip caching for faster test execution
-                )
-                candles2 = await self.candle_adapter.get_candles(
-                    normalized_pair,
-                    analysis_timeframe,
-                    limit=500,  # Request more candles to ensure we have enough
-                    min_candles=min_candles_needed,
-                    cache_to_db=False  # Skip caching for faster test execution
-                )
-
-                if not candles1 or not candles2:
-                    self._heartbeat(f"Failed to fetch candles for {symbol}/{pair_symbol} (got {len(candles1) if candles1 else 0} and {len(candles2) if candles2 else 0})")
-                    results.append({
-                        "symbol": symbol,
-                        "recommendation": "HOLD",
-                        "confidence": 0.0,
-                        "entry_price": None,
-                        "stop_loss": None,
-                        "take_profit": None,
-                        "risk_reward": 0,
-                        "setup_quality": 0.0,
-                        "market_environment": 0.5,
-                        "analysis": {"error": "Failed to fetch candles"},
-                        "chart_path": "",
-                        "timeframe": timeframe,
-                        "cycle_id": cycle_id,
-                        "skipped": True,
-                        "skip_reason": "Insufficient candle data",
-                    })
-                    continue
-
-                # Merge candles into DataFrame
-                # candles1 and candles2 are List[Dict[str, Any]] from CandleAdapter
-                # Align by timestamp to handle different lengths
-                df1 = pd.DataFrame({
-                    'timestamp': [c['timestamp'] for c in candles1],
-                    'close_1': [c['close'] for c in candles1]
-                })
-                df2 = pd.DataFrame({
-                    'timestamp': [c['timestamp'] for c in candles2],
-                    'close_2': [c['close'] for c in candles2]
-                })
-
-                # Merge on timestamp to align candles
-                df = pd.merge(df1, df2, on='timestamp', how='inner')
-                self._heartbeat(f"Aligned {len(df)} candles for {symbol}/{pair_symbol} (from {len(df1)} and {len(df2)})")
-
-                # Check if we have enough aligned candles
-                if len(df) < 10:
-                    self._heartbeat(f"Insufficient aligned candles for {symbol}/{pair_symbol} (got {len(df)})")
-                    results.append({
-                        "symbol": symbol,
-                        "recommendation": "HOLD",
-                        "confidence": 0.0,
-                        "entry_price": None,
-                        "stop_loss": None,
-                        "take_profit": None,
-                        "risk_reward": 0,
-                        "setup_quality": 0.0,
-                        "market_environment": 0.5,
-                        "analysis": {"error": f"Insufficient aligned candles ({len(df)})"},
-                        "chart_path": "",
-                        "timeframe": analysis_timeframe,
-                        "cycle_id": cycle_id,
-                        "skipped": True,
-                        "skip_reason": "Insufficient aligned candles",
-                    })
-                    continue
-
-                # Run cointegration strategy with config values
-                self._heartbeat(f"Running cointegration analysis for {symbol}")
-                strategy = CointegrationStrategy(
-                    lookback=self.get_config_value('lookback', 120),
-                    z_entry=self.get_config_value('z_entry', 2.0),
-                    z_exit=self.get_config_value('z_exit', 0.5),
-                    use_soft_vol=self.get_config_value('use_soft_vol', False)
-                )
-
-                signals = strategy.generate_signals(df)
-
-                # Get the last valid signal (skip NaN z_scores)
-                valid_signals = signals[signals['z_score'].notna()]
-                if valid_signals.empty:
-                    self._heartbeat(f"No valid signals for {symbol}/{pair_symbol}")
-                    results.append({
-                        "symbol": symbol,
-                        "recommendation": "HOLD",
-                        "confidence": 0.0,
-                        "entry_price": None,
-                        "stop_loss": None,
-                        "take_profit": None,
-                        "risk_reward": 0,
-                        "setup_quality": 0.0,
-                        "market_environment": 0.5,
-                        "analysis": {"error": "No valid signals generated"},
-                        "chart_path": "",
-                        "timeframe": analysis_timeframe,
-                        "cycle_id": cycle_id,
-                        "skipped": True,
-                        "skip_reason": "No valid signals",
-                    })
+                    }
                     continue
 
-                latest_signal = valid_signals.iloc[-1]
-
-                # Compute confidence using the strategy's method
-                # Use aligned data from df, not original candles which may have different lengths
-                close_1 = np.array(df['close_1'].values, dtype=float)
-                close_2 = np.array(df['close_2'].values, dtype=float)
-                beta = strategy._compute_beta(close_1, close_2)
-                spread = close_2 - beta * close_1
-                z_score = latest_signal['z_score']
-                confidence = strategy.compute_confidence(spread, z_score)
-
-                # Convert to analyzer format with config values
-                recommendation = self._convert_signal_to_recommendation(
-                    symbol=symbol,
-                    signal=latest_signal,
-                    candles=candles1,
-                    cycle_id=cycle_id,
-                    analysis_timeframe=analysis_timeframe,
-                    confidence=confidence
-                )
-
-                self._validate_output(recommendation)
-                results.append(recommendation)
-                self._heartbeat(f"Completed {symbol}: {recommendation['recommendation']}")
+                legs[symbol] = (pair_symbol, normalized_symbol, normalized_pair)
 
             except Exception as e:
-                self.logger.error(f"Error analyzing {symbol}: {e}")
+                results[symbol] = self._error_result(symbol, e, timeframe, cycle_id)
                 self._heartbeat(f"Error analyzing {symbol}: {e}")
-                results.append({
+
+        # Fetch candles for every unique leg once, concurrently, using analysis_timeframe from config
+        unique_symbols = list(dict.fromkeys(s for _, sym, pair in legs.values() for s in (sym, pair)))
+        if unique_symbols:
+            self._heartbeat(f"Fetching candles for {len(unique_symbols)} symbols")
+        candles_by_symbol = await self._fetch_candles(unique_symbols, analysis_timeframe)
+
+        # Evaluate all pairs in the thread pool (numpy/statsmodels release the GIL)
+        loop = asyncio.get_running_loop()
+        evaluations = {
+            symbol: loop.run_in_executor(
+                _pair_executor,
+                self._evaluate_pair,
+                symbol,
+                pair_symbol,
+                candles_by_symbol.get(normalized_symbol),
+                candles_by_symbol.get(normalized_pair),
+                timeframe,
+                analysis_timeframe,
+                cycle_id,
+            )
+            for symbol, (pair_symbol, normalized_symbol, normalized_pair) in legs.items()
+        }
+        for symbol, evaluation in evaluations.items():
+            try:
+                result = await evaluation
+            except Exception as e:
+                result = self._error_result(symbol, e, timeframe, cycle_id)
+            results[symbol] = result
+            if result.get("skipped"):
+                self._heartbeat(f"Skipped {symbol}/{legs[symbol][0]}: {result['skip_reason']}")
+            elif "error" in result:
+                self._heartbeat(f"Error analyzing {symbol}: {result['error']}")
+            else:
+                self._heartbeat(f"Completed {symbol}: {result['recommendation']}")
+
+        self._heartbeat("Cointegration analysis cycle complete")
+        return [results[symbol] for symbol in symbols_to_analyze if symbol in results]
+
+    async def _fetch_candles(self, symbols: List[str], analysis_timeframe: str) -> Dict[str, List[Dict[str, Any]]]:
+        """Fetch candles for each symbol concurrently (bounded by max_concurrent_fetches)."""
+        # Use higher limit to ensure we get enough candles even if some are missing
+        lookback = self.get_config_value('lookback', 120)
+        min_candles_needed = max(lookback + 10, 50)  # Need at least lookback + buffer
+        fetch_slots = asyncio.Semaphore(max(1, int(self.get_config_value('max_concurrent_fetches', 20))))
+
+        async def fetch(symbol: str) -> List[Dict[str, Any]]:
+            async with fetch_slots:
+                try:
+                    return await self.candle_adapter.get_candles(
+                        symbol,
+                        analysis_timeframe,
+                        limit=500,  # Request more candles to ensure we have enough
+                        min_candles=min_candles_needed,
+                        cache_to_db=False  # Skip caching for faster test execution
+                    )
+                except Exception as e:
+                    self.logger.warning(f"Failed to fetch candles for {symbol}: {e}")
+                    return []
+
+        fetched = await asyncio.gather(*(fetch(symbol) for symbol in symbols))
+        return dict(zip(symbols, fetched))
+
+    def _evaluate_pair(
+        self,
+        symbol: str,
+        pair_symbol: str,
+        candles1: Optional[List[Dict[str, Any]]],
+        candles2: Optional[List[Dict[str, Any]]],
+        timeframe: str,
+        analysis_timeframe: str,
+        cycle_id: str,
+    ) -> Dict[str, Any]:
+        """Run the cointegration analysis for one pair (called from the pair thread pool)."""
+        try:
+            if not candles1 or not candles2:
+                self.logger.info(f"Failed to fetch candles for {symbol}/{pair_symbol} (got {len(candles1) if candles1 else 0} and {len(candles2) if candles2 else 0})")
+                return {
                     "symbol": symbol,
-                    "error": str(e),
+                    "recommendation": "HOLD",
+                    "confidence": 0.0,
+                    "entry_price": None,
+                    "stop_loss": None,
+                    "take_profit": None,
+                    "risk_reward": 0,
+                    "setup_quality": 0.0,
+                    "market_environment": 0.5,
+                    "analysis": {"error": "Failed to fetch candles"},
+                    "chart_path": "",
                     "timeframe": timeframe,
                     "cycle_id": cycle_id,
-                })
-
-        self._heartbeat("Cointegration analysis cycle complete")
-        return results
+                    "skipped": True,
+                    "skip_reason": "Insufficient candle data",
+                }
+
+            # Merge candles into DataFrame
+            # candles1 and candles2 are List[Dict[str, Any]] from CandleAdapter
+            # Align by timestamp to handle different lengths
+            df1 = pd.DataFrame({
+                'timestamp': [c['timestamp'] for c in candles1],
+                'close_1': [c['close'] for c in candles1]
+            })
+            df2 = pd.DataFrame({
+                'timestamp': [c['timestamp'] for c in candles2],
+                'close_2': [c['close'] for c in candles2]
+            })
+
+            # Merge on timestamp to align candles
+            df = pd.merge(df1, df2, on='timestamp', how='inner')
+
+            # Check if we have enough aligned candles
+            if len(df) < 10:
+                return {
+                    "symbol": symbol,
+                    "recommendation": "HOLD",
+                    "confidence": 0.0,
+                    "entry_price": None,
+                    "stop_loss": None,
+                    "take_profit": None,
+                    "risk_reward": 0,
+                    "setup_quality": 0.0,
+                    "market_environment": 0.5,
+                    "analysis": {"error": f"Insufficient aligned candles ({len(df)})"},
+                    "chart_path": "",
+                    "timeframe": analysis_timeframe,
+                    "cycle_id": cycle_id,
+                    "skipped": True,
+                    "skip_reason": "Insufficient aligned candles",
+                }
+
+            # Run cointegration strategy with config values
+            # (a fresh instance per pair: position state carries across generate_signals calls)
+            strategy = CointegrationStrategy(
+                lookback=self.get_config_value('lookback', 120),
+                z_entry=self.get_config_value('z_entry', 2.0),
+                z_exit=self.get_config_value('z_exit', 0.5),
+                use_soft_vol=self.get_config_value('use_soft_vol', False),
+                adf_stride=self.get_config_value('adf_stride', 10)
+            )
+
+            signals = strategy.generate_signals(df)
+
+            # Get the last valid signal (skip NaN z_scores)
+            valid_signals = signals[signals['z_score'].notna()]
+            if valid_signals.empty:
+                return {
+                    "symbol": symbol,
+                    "recommendation": "HOLD",
+                    "confidence": 0.0,
+                    "entry_price": None,
+                    "stop_loss": None,
+                    "take_profit": None,
+                    "risk_reward": 0,
+                    "setup_quality": 0.0,
+                    "market_environment": 0.5,
+                    "analysis": {"error": "No valid signals generated"},
+                    "chart_path": "",
+                    "timeframe": analysis_timeframe,
+                    "cycle_id": cycle_id,
+                    "skipped": True,
+                    "skip_reason": "No valid signals",
+                }
+
+            latest_signal = valid_signals.iloc[-1]
+
+            # Compute confidence using the strategy's method
+            # Use aligned data from df, not original candles which may have different lengths
+            close_1 = np.array(df['close_1'].values, dtype=float)
+            close_2 = np.array(df['close_2'].values, dtype=float)
+            beta = strategy._compute_beta(close_1, close_2)
+            spread = close_2 - beta * close_1
+            z_score = latest_signal['z_score']
+            confidence = strategy.compute_confidence(spread, z_score)
+
+            # Convert to analyzer format with config values
+            recommendation = self._convert_signal_to_recommendation(
+                symbol=symbol,
+                signal=latest_signal,
+                candles=candles1,
+                cycle_id=cycle_id,
+                analysis_timeframe=analysis_timeframe,
+                confidence=confidence
+            )
+
+            self._validate_output(recommendation)
+            return recommendation
+
+        except Exception as e:
+            return self._error_result(symbol, e, timeframe, cycle_id)
+
+    def _error_result(self, symbol: str, error: Exception, timeframe: str, cycle_id: str) -> Dict[str, Any]:
+        """Log a failed symbol and build its error result."""
+        self.logger.error(f"Error analyzing {symbol}: {error}")
+        return {
+            "symbol": symbol,
+            "error": str(error),
+            "timeframe": timeframe,
+            "cycle_id": cycle_id,
+        }
 
     def _convert_signal_to_recommendation(
         self,
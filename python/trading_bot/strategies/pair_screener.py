@@ -7,13 +7,22 @@ Screens for cointegrated pairs using:
 3. Hurst exponent (< 0.5 = mean-reverting)
 4. Economic filters (half-life < 15, CV < 0.8)
 5. Confidence scoring
+
+`screen_pairs(..., batched=True)` builds the aligned price matrix once,
+computes correlation/beta matrices and a closed-form lag-1 ADF statistic for
+every surviving spread in a few array ops, and only runs the full statsmodels
+checks on pairs that pass those prefilters. With `workers > 1` those checks
+are spread over a process pool that reads the price matrix from shared memory.
 """
 
 import numpy as np
 import pandas as pd
 import logging
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
 from typing import List, Dict, Any, Optional
 from statsmodels.tsa.stattools import adfuller
+from statsmodels.tsa.adfvalues import mackinnonp
 from statsmodels.regression.linear_model import OLS
 import statsmodels.api as sm
 import warnings
@@ -21,6 +30,18 @@ warnings.filterwarnings('ignore')
 
 logger = logging.getLogger(__name__)
 
+# Screening thresholds (shared by the serial and batched paths)
+MIN_CORRELATION = 0.3
+MAX_CORRELATION = 0.9
+MAX_ADF_P = 0.05
+MAX_HURST = 0.5
+MAX_HALF_LIFE = 15
+MAX_CV = 0.8
+
+# Slack on vectorized prefilters so float differences vs the per-pair
+# computation never drop a pair the serial path would keep
+_PREFILTER_EPS = 1e-9
+
 
 def candles_to_series(candles: list) -> pd.Series:
     """Convert Bybit candle list to close price series."""
@@ -81,25 +102,177 @@ def compute_beta(x: np.ndarray, y: np.ndarray) -> float:
         return np.cov(x, y)[0, 1] / (np.var(x) + 1e-10)
 
 
+def batched_adf_tstat(spreads: np.ndarray) -> np.ndarray:
+    """
+    Closed-form Dickey-Fuller t-statistics for many series at once.
+
+    Fits Δs_t = α + γ·s_{t-1} (lag 0) and Δs_t = α + γ·s_{t-1} + δ·Δs_{t-1}
+    (lag 1) for every column of `spreads` (shape T x K) and returns the more
+    negative t-statistic of γ per column, i.e. the lag choice most favourable
+    to stationarity. Intended as a prefilter ahead of `adfuller(maxlag=1)`.
+    """
+    s = np.asarray(spreads, dtype=float)
+    if s.ndim == 1:
+        s = s[:, None]
+    ds = np.diff(s, axis=0)
+
+    def _center(a):
+        return a - a.mean(axis=0)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        # Lag 0: Δs_t on [1, s_{t-1}]
+        lvl = _center(s[:-1])
+        dep = _center(ds)
+        sxx = (lvl * lvl).sum(axis=0)
+        gamma = (lvl * dep).sum(axis=0) / sxx
+        rss = (dep * dep).sum(axis=0) - gamma * (lvl * dep).sum(axis=0)
+        n0 = dep.shape[0]
+        t_lag0 = gamma / np.sqrt(np.maximum(rss, 0.0) / (n0 - 2) / sxx)
+
+        # Lag 1: Δs_t on [1, s_{t-1}, Δs_{t-1}]
+        lvl = _center(s[1:-1])
+        lag_d = _center(ds[:-1])
+        dep = _center(ds[1:])
+        a = (lvl * lvl).sum(axis=0)
+        b = (lvl * lag_d).sum(axis=0)
+        c = (lag_d * lag_d).sum(axis=0)
+        r1 = (lvl * dep).sum(axis=0)
+        r2 = (lag_d * dep).sum(axis=0)
+        det = a * c - b * b
+        gamma = (c * r1 - b * r2) / det
+        delta = (a * r2 - b * r1) / det
+        rss = (dep * dep).sum(axis=0) - gamma * r1 - delta * r2
+        n1 = dep.shape[0]
+        t_lag1 = gamma / np.sqrt(np.maximum(rss, 0.0) / (n1 - 3) * c / det)
+
+    t_stat = np.fmin(t_lag0, t_lag1)
+    return np.where(np.isfinite(t_stat), t_stat, np.inf)
+
+
+def evaluate_pair(sym1: str, sym2: str, x: np.ndarray, y: np.ndarray) -> Optional[Dict[str, Any]]:
+    """
+    Run the full cointegration checks on one aligned pair.
+
+    Returns the result row if the pair passes every filter, else None.
+    """
+    if len(x) < 50 or len(y) < 50:
+        return None
+
+    try:
+        # Correlation filter
+        corr = np.corrcoef(x, y)[0, 1]
+        if not (MIN_CORRELATION < corr < MAX_CORRELATION):
+            return None
+
+        # Compute hedge ratio & spread
+        beta = compute_beta(x, y)
+        spread = y - beta * x
+
+        # ADF test
+        try:
+            adf_p = adfuller(spread, maxlag=1, regression='c')[1]
+        except:
+            adf_p = 1.0
+
+        # Hurst exponent
+        hurst = compute_hurst(spread)
+
+        # Half-life
+        half_life = estimate_half_life(spread)
+
+        # Coefficient of variation
+        spread_mean = np.mean(spread)
+        spread_std = np.std(spread)
+        cv = spread_std / (abs(spread_mean) + 1e-10)
+
+        # Economic filters
+        if not (adf_p < MAX_ADF_P and hurst < MAX_HURST and half_life <= MAX_HALF_LIFE and cv < MAX_CV):
+            return None
+
+        # Confidence score (0-1)
+        # Each component is clamped to [0, 1] before weighting
+        c1 = np.clip(1.0 - adf_p, 0.0, 1.0)  # stationarity
+        c2 = np.clip(1.0 - hurst, 0.0, 1.0)  # mean-reversion strength
+        c3 = np.clip(1.0 - cv, 0.0, 1.0)     # spread stability
+        confidence = np.clip(0.4 * c1 + 0.3 * c2 + 0.3 * c3, 0.0, 1.0)
+
+        return {
+            'pair': f"{sym2}/{sym1}",
+            'symbol1': sym1,
+            'symbol2': sym2,
+            'adf_p': adf_p,
+            'hurst': hurst,
+            'half_life': half_life,
+            'cv': cv,
+            'beta': beta,
+            'correlation': corr,
+            'confidence_score': confidence
+        }
+
+    except Exception as e:
+        logger.debug(f"Error screening {sym1}/{sym2}: {e}")
+        return None
+
+
+# Per-process state for pool workers (set once by _init_pair_worker)
+_worker_shm: Optional[shared_memory.SharedMemory] = None
+_worker_prices: Optional[np.ndarray] = None
+_worker_symbols: List[str] = []
+
+
+def _init_pair_worker(shm_name: str, shape: tuple, dtype: str, symbols: List[str]):
+    """Attach a pool worker to the shared price matrix (no per-pair pickling)."""
+    global _worker_shm, _worker_prices, _worker_symbols
+    _worker_shm = shared_memory.SharedMemory(name=shm_name)
+    _worker_prices = np.ndarray(shape, dtype=np.dtype(dtype), buffer=_worker_shm.buf)
+    _worker_symbols = symbols
+
+
+def _evaluate_pair_chunk(pairs: List[tuple]) -> List[Optional[Dict[str, Any]]]:
+    """Evaluate a chunk of (i, j) column pairs against the shared price matrix."""
+    return [
+        evaluate_pair(_worker_symbols[i], _worker_symbols[j], _worker_prices[:, i], _worker_prices[:, j])
+        for i, j in pairs
+    ]
+
+
 class PairScreener:
     """Screen for cointegrated pairs from candle data."""
 
-    def __init__(self, lookback_days: int = 120, min_data_points: int = 100):
+    def __init__(
+        self,
+        lookback_days: int = 120,
+        min_data_points: int = 100,
+        adf_prefilter_p: float = 0.10,
+        batch_chunk_size: int = 20_000,
+        parallel_min_pairs: int = 200,
+    ):
         """
         Initialize screener.
 
         Args:
             lookback_days: Rolling window for stats (trading days)
             min_data_points: Min candles required per asset
+            adf_prefilter_p: Batched-mode ADF p-value cutoff for the prefilter
+                (looser than the final 0.05 so borderline pairs still get the
+                exact statsmodels test)
+            batch_chunk_size: Max spreads materialised at once in batched mode
+            parallel_min_pairs: Below this many candidate pairs the full checks
+                run in-process even when workers > 1 (pool startup isn't worth it)
         """
         self.lookback_days = lookback_days
         self.min_data_points = min_data_points
+        self.adf_prefilter_p = adf_prefilter_p
+        self.batch_chunk_size = batch_chunk_size
+        self.parallel_min_pairs = parallel_min_pairs
 
     def screen_pairs(
         self,
         symbol_candles: Dict[str, list],
         min_volume_usd: float = 1_000_000,
-        max_pairs: Optional[int] = None
+        max_pairs: Optional[int] = None,
+        batched: bool = False,
+        workers: Optional[int] = None,
     ) -> pd.DataFrame:
         """
         Screen for cointegrated pairs from Bybit candle data.
@@ -108,10 +281,90 @@ class PairScreener:
             symbol_candles: {symbol: list_of_candles}
             min_volume_usd: Min avg daily volume (filters illiquid assets)
             max_pairs: Max pairs to return
+            batched: Prefilter all pairs with matrix ops (correlation, beta,
+                CV, closed-form ADF) before the per-pair statsmodels checks.
+                Returns the same rows as the serial loop.
+            workers: Run the per-pair checks in a process pool of this size.
+                Results are identical to (and ordered like) the serial path.
 
         Returns:
             DataFrame with cointegrated pairs sorted by confidence_score
         """
+        symbols, prices = self.build_price_matrix(symbol_candles, min_volume_usd)
+        if len(symbols) < 2:
+            logger.warning(f"Not enough assets: {len(symbols)}")
+            return pd.DataFrame()
+
+        total_pairs = len(symbols) * (len(symbols) - 1) // 2
+        logger.info(f"Screening {total_pairs} pairs")
+
+        if batched:
+            candidates = self.prefilter_pairs(prices)
+            logger.info(f"Batched prefilter kept {len(candidates)}/{total_pairs} pairs")
+        else:
+            candidates = list(zip(*np.triu_indices(len(symbols), k=1)))
+
+        if workers and workers > 1 and len(candidates) >= self.parallel_min_pairs:
+            rows = self._evaluate_pairs_parallel(symbols, prices, candidates, workers)
+        else:
+            rows = [
+                evaluate_pair(symbols[i], symbols[j], prices[:, i], prices[:, j])
+                for i, j in candidates
+            ]
+
+        results = [row for row in rows if row is not None]
+        return self._finalize_results(results, max_pairs)
+
+    def _evaluate_pairs_parallel(
+        self,
+        symbols: List[str],
+        prices: np.ndarray,
+        candidates: List[tuple],
+        workers: int,
+    ) -> List[Optional[Dict[str, Any]]]:
+        """
+        Run evaluate_pair over candidates in a ProcessPoolExecutor.
+
+        The price matrix is copied once into shared memory; workers attach to
+        it by name and only (i, j) index chunks cross the process boundary.
+        Output order matches `candidates`.
+        """
+        prices = np.ascontiguousarray(prices, dtype=float)
+        shm = shared_memory.SharedMemory(create=True, size=max(prices.nbytes, 1))
+        try:
+            shared = np.ndarray(prices.shape, dtype=prices.dtype, buffer=shm.buf)
+            shared[:] = prices
+
+            # ~4 chunks per worker keeps the pool balanced without many round-trips
+            chunk_size = max(1, -(-len(candidates) // (workers * 4)))
+            chunks = [candidates[k:k + chunk_size] for k in range(0, len(candidates), chunk_size)]
+            logger.info(f"Evaluating {len(candidates)} pairs on {workers} processes ({len(chunks)} chunks)")
+
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_pair_worker,
+                initargs=(shm.name, prices.shape, prices.dtype.str, symbols),
+            ) as executor:
+                rows = []
+                for chunk_rows in executor.map(_evaluate_pair_chunk, chunks):
+                    rows.extend(chunk_rows)
+            return rows
+        finally:
+            shm.close()
+            shm.unlink()
+
+    def build_price_matrix(
+        self,
+        symbol_candles: Dict[str, list],
+        min_volume_usd: float = 1_000_000,
+    ):
+        """
+        Filter assets and align their closes on a common time index.
+
+        Returns:
+            (symbols, prices) where prices is a (lookback x n_symbols) float
+            matrix whose column k holds the aligned closes of symbols[k]
+        """
         # ── 1. Preprocess & filter assets ──
         assets = {}
         for symbol, candles in symbol_candles.items():
@@ -138,8 +391,7 @@ class PairScreener:
             assets[symbol] = series
 
         if len(assets) < 2:
-            logger.warning(f"Not enough assets: {len(assets)}")
-            return pd.DataFrame()
+            return list(assets.keys()), np.empty((0, len(assets)))
 
         logger.info(f"Screening {len(assets)} assets")
 
@@ -154,76 +406,74 @@ class PairScreener:
         for symbol in aligned:
             aligned[symbol] = aligned[symbol].loc[recent_dates]
 
-        # ── 3. Screen pairs ──
-        results = []
         symbols = list(aligned.keys())
-        total_pairs = len(symbols) * (len(symbols) - 1) // 2
-        logger.info(f"Screening {total_pairs} pairs")
-
-        for i in range(len(symbols)):
-            for j in range(i + 1, len(symbols)):
-                sym1, sym2 = symbols[i], symbols[j]
-                x = aligned[sym1].values
-                y = aligned[sym2].values
-
-                if len(x) < 50 or len(y) < 50:
-                    continue
+        prices = np.column_stack([aligned[symbol].to_numpy(dtype=float) for symbol in symbols])
+        return symbols, prices
 
-                try:
-                    # Correlation filter
-                    corr = np.corrcoef(x, y)[0, 1]
-                    if not (0.3 < corr < 0.9):
-                        continue
-
-                    # Compute hedge ratio & spread
-                    beta = compute_beta(x, y)
-                    spread = y - beta * x
-
-                    # ADF test
-                    try:
-                        adf_p = adfuller(spread, maxlag=1, regression='c')[1]
-                    except:
-                        adf_p = 1.0
-
-                    # Hurst exponent
-                    hurst = compute_hurst(spread)
-
-                    # Half-life
-                    half_life = estimate_half_life(spread)
-
-                    # Coefficient of variation
-                    spread_mean = np.mean(spread)
-                    spread_std = np.std(spread)
-                    cv = spread_std / (abs(spread_mean) + 1e-10)
-
-                    # Economic filters
-                    if not (adf_p < 0.05 and hurst < 0.5 and half_life <= 15 and cv < 0.8):
-                        continue
-
-                    # Confidence score (0-1)
-                    # Each component is clamped to [0, 1] before weighting
-                    c1 = np.clip(1.0 - adf_p, 0.0, 1.0)  # stationarity
-                    c2 = np.clip(1.0 - hurst, 0.0, 1.0)  # mean-reversion strength
-                    c3 = np.clip(1.0 - cv, 0.0, 1.0)     # spread stability
-                    confidence = np.clip(0.4 * c1 + 0.3 * c2 + 0.3 * c3, 0.0, 1.0)
-
-                    results.append({
-                        'pair': f"{sym2}/{sym1}",
-                        'symbol1': sym1,
-                        'symbol2': sym2,
-                        'adf_p': adf_p,
-                        'hurst': hurst,
-                        'half_life': half_life,
-                        'cv': cv,
-                        'beta': beta,
-                        'correlation': corr,
-                        'confidence_score': confidence
-                    })
-
-                except Exception as e:
-                    logger.debug(f"Error screening {sym1}/{sym2}: {e}")
-                    continue
+    def prefilter_pairs(self, prices: np.ndarray) -> List[tuple]:
+        """
+        Vectorized prefilter over every column pair of the price matrix.
 
+        Applies the correlation and CV filters exactly (with a tiny slack) and
+        a closed-form ADF prefilter at `adf_prefilter_p`. Surviving (i, j)
+        index pairs are returned in the serial loop's order (i < j, row-major).
+        """
+        n_obs, n_symbols = prices.shape
+        if n_obs < 50 or n_symbols < 2:
+            return []
+
+        # ── Correlation & beta matrices ──
+        with np.errstate(divide='ignore', invalid='ignore'):
+            corr = np.corrcoef(prices, rowvar=False)
+        cov = np.cov(prices, rowvar=False, ddof=0)
+        var = np.diag(cov)
+
+        rows, cols = np.triu_indices(n_symbols, k=1)
+        pair_corr = corr[rows, cols]
+        keep = (pair_corr > MIN_CORRELATION - _PREFILTER_EPS) & (pair_corr < MAX_CORRELATION + _PREFILTER_EPS)
+        rows, cols = rows[keep], cols[keep]
+        if len(rows) == 0:
+            return []
+
+        with np.errstate(divide='ignore', invalid='ignore'):
+            beta = np.where(var[rows] < 1e-10, 1.0, cov[rows, cols] / var[rows])
+
+        # Lowest t-stat that still clears the prefilter p-value
+        t_cutoff = self._adf_tstat_cutoff(self.adf_prefilter_p)
+
+        survivors = np.zeros(len(rows), dtype=bool)
+        for start in range(0, len(rows), self.batch_chunk_size):
+            sl = slice(start, start + self.batch_chunk_size)
+            spreads = prices[:, cols[sl]] - beta[sl] * prices[:, rows[sl]]
+
+            # ── Spread stability (CV) ──
+            spread_mean = spreads.mean(axis=0)
+            spread_std = spreads.std(axis=0)
+            cv = spread_std / (np.abs(spread_mean) + 1e-10)
+            ok = cv < MAX_CV * (1 + 1e-6) + _PREFILTER_EPS
+
+            # ── Batched ADF (lag 0/1 closed form) ──
+            if ok.any():
+                t_stat = batched_adf_tstat(spreads[:, ok])
+                ok[ok] = t_stat <= t_cutoff
+            survivors[sl] = ok
+
+        return list(zip(rows[survivors].tolist(), cols[survivors].tolist()))
+
+    @staticmethod
+    def _adf_tstat_cutoff(p_value: float) -> float:
+        """Invert MacKinnon's p-value (regression='c') by bisection."""
+        lo, hi = -20.0, 5.0
+        for _ in range(60):
+            mid = (lo + hi) / 2
+            if mackinnonp(mid, regression='c', N=1) < p_value:
+                lo = mid
+            else:
+                hi = mid
+        return hi
+
+    def _finalize_results(self, results: List[Dict[str, Any]], max_pairs: Optional[int]) -> pd.DataFrame:
+        """Sort result rows by confidence and apply max_pairs."""
         if not results:
             logger.warning("No cointegrated pairs found")
             return pd.DataFrame()
@@ -235,4 +485,3 @@ class PairScreener:
 
         logger.info(f"Found {len(df)} cointegrated pairs")
         return df
-
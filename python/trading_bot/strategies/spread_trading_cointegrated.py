@@ -1,10 +1,107 @@
+from collections import deque
+from typing import Optional
+
 import numpy as np
 import pandas as pd
+import statsmodels.api as sm
 from statsmodels.tsa.stattools import adfuller
 from statsmodels.regression.linear_model import OLS
 import warnings
 warnings.filterwarnings('ignore')
 
+
+class RollingSpreadStats:
+    """
+    O(1) rolling OLS hedge ratio and spread moments over a fixed window.
+
+    Keeps running sums (Σx, Σy, Σxy, Σx², Σy²) of the last `window` price
+    pairs so each new bar updates beta, spread mean/std and z-score without
+    re-slicing the series. Sums are taken relative to the first observed
+    prices to limit cancellation on high-priced symbols, and are rebuilt
+    from the buffer every `window` updates to stop float drift accumulating.
+    """
+
+    def __init__(self, window: int):
+        self.window = window
+        self._buf = deque()
+        self._x0: Optional[float] = None
+        self._y0 = 0.0
+        self._updates = 0
+        self._reset_sums()
+
+    def _reset_sums(self):
+        self.sx = self.sy = self.sxy = self.sxx = self.syy = 0.0
+
+    def _resync(self):
+        self._reset_sums()
+        for dx, dy in self._buf:
+            self.sx += dx
+            self.sy += dy
+            self.sxy += dx * dy
+            self.sxx += dx * dx
+            self.syy += dy * dy
+
+    def push(self, x: float, y: float):
+        """Add the newest (x, y) pair, evicting the oldest once the window is full."""
+        if self._x0 is None:
+            self._x0, self._y0 = float(x), float(y)
+        dx = float(x) - self._x0
+        dy = float(y) - self._y0
+        self._buf.append((dx, dy))
+        self.sx += dx
+        self.sy += dy
+        self.sxy += dx * dy
+        self.sxx += dx * dx
+        self.syy += dy * dy
+        if len(self._buf) > self.window:
+            ox, oy = self._buf.popleft()
+            self.sx -= ox
+            self.sy -= oy
+            self.sxy -= ox * oy
+            self.sxx -= ox * ox
+            self.syy -= oy * oy
+        self._updates += 1
+        if self._updates % self.window == 0:
+            self._resync()
+
+    @property
+    def n(self) -> int:
+        return len(self._buf)
+
+    @property
+    def beta(self) -> float:
+        """OLS hedge ratio of y on x (same guards as `_compute_beta`)."""
+        n = self.n
+        if n < 10:
+            return 1.0
+        cxx = self.sxx - self.sx * self.sx / n
+        if cxx / n <= 1e-8:
+            return 1.0
+        return (self.sxy - self.sx * self.sy / n) / cxx
+
+    def spread_stats(self):
+        """
+        Return (beta, spread_mean, spread_std, z_score) for the current window.
+
+        spread = y - beta * x; std uses ddof=0 like np.std.
+        """
+        n = self.n
+        beta = self.beta
+        cxx = self.sxx - self.sx * self.sx / n
+        cyy = self.syy - self.sy * self.sy / n
+        cxy = self.sxy - self.sx * self.sy / n
+        var = max((cyy - 2.0 * beta * cxy + beta * beta * cxx) / n, 0.0)
+        std = np.sqrt(var)
+
+        mean_rel = (self.sy - beta * self.sx) / n
+        last_dx, last_dy = self._buf[-1]
+        last_rel = last_dy - beta * last_dx
+        z_score = (last_rel - mean_rel) / std if std >= 1e-8 else np.nan
+
+        spread_mean = mean_rel + self._y0 - beta * self._x0
+        return beta, spread_mean, std, z_score
+
+
 class CointegrationStrategy:
     """
     Cointegration-based mean-reversion strategy with dynamic sizing.
@@ -21,7 +118,8 @@ class CointegrationStrategy:
                  z_exit: float = 0.5,
                  base_multiplier: float = 1.0,
                  use_soft_vol: bool = False,
-                 use_adf: bool = True):
+                 use_adf: bool = True,
+                 adf_stride: int = 1):
         """
         Parameters:
         -----------
@@ -37,6 +135,10 @@ class CointegrationStrategy:
             Softer volatility scaling (0.5x–2.5x)
         use_adf : bool
             Use ADF test (True) or Hurst (False) for stationarity
+        adf_stride : int
+            Re-run the stationarity test every N bars (1 = every bar,
+            0 = last bar only). The last bar is always tested; bars in
+            between reuse the most recent result.
         """
         self.lookback = lookback
         self.z_entry = z_entry
@@ -44,6 +146,7 @@ class CointegrationStrategy:
         self.base_multiplier = base_multiplier
         self.use_soft_vol = use_soft_vol
         self.use_adf = use_adf
+        self.adf_stride = adf_stride
         
         # State
         self.in_long = False
@@ -62,14 +165,22 @@ class CointegrationStrategy:
             poly = np.polyfit(np.log(lags), np.log(tau), 1)
         return poly[0] * 2.0 if not np.isnan(poly[0]) else 0.5
     
-    def _is_mean_reverting(self, spread: np.ndarray) -> bool:
+    def _adf_pvalue(self, spread: np.ndarray) -> Optional[float]:
+        """ADF p-value of the spread, or None if too short / the fit fails"""
+        if len(spread) < 20:
+            return None
+        try:
+            return adfuller(spread, maxlag=1, regression='c')[1]
+        except:
+            return None
+
+    def _is_mean_reverting(self, spread: np.ndarray, p_adf: Optional[float] = None) -> bool:
         """Check stationarity: ADF (preferred) or Hurst"""
         if self.use_adf and len(spread) >= 20:
-            try:
-                p_val = adfuller(spread, maxlag=1, regression='c')[1]
-                return p_val < 0.05
-            except:
-                pass
+            if p_adf is None:
+                p_adf = self._adf_pvalue(spread)
+            if p_adf is not None:
+                return p_adf < 0.05
         # Fallback to Hurst
         hurst = self._compute_hurst(spread)
         return hurst < 0.5
@@ -89,12 +200,20 @@ class CointegrationStrategy:
         """Compute mathematically sound confidence score [0, 1]"""
         if len(spread) < 20:
             return 0.5  # Not enough data
-        
+        return self._confidence_from_stats(
+            self._adf_pvalue(spread), z_score, np.mean(spread), np.std(spread)
+        )
+
+    def _confidence_from_stats(self,
+                               p_adf: Optional[float],
+                               z_score: float,
+                               mu: float,
+                               sigma: float) -> float:
+        """Confidence score from precomputed ADF p-value and spread moments"""
         # Tier 1: Stationarity (ADF p-value)
-        try:
-            p_adf = adfuller(spread, maxlag=1, regression='c')[1]
+        if p_adf is not None:
             C1 = max(0.0, 1.0 - p_adf)  # Clip to [0,1]
-        except:
+        else:
             C1 = 0.5  # Fallback
         
         # Tier 2: Edge strength (normalized z-score)
@@ -104,8 +223,6 @@ class CointegrationStrategy:
         C2 = min(1.0, abs(z_score) / max(z_max, z_min))
         
         # Tier 3: Spread stability (1 / CV)
-        mu = np.mean(spread)
-        sigma = np.std(spread)
         cv = sigma / (abs(mu) + 1e-8)
         C3 = min(1.0, 1.0 / (cv + 1e-8))
         
@@ -141,30 +258,45 @@ class CointegrationStrategy:
         signals['signal'] = 0
         signals['exit_signal'] = False
         
-        # Rolling computation
+        if len(df) <= self.lookback:
+            return signals
+
+        x = df['close_1'].to_numpy(dtype=float)
+        y = df['close_2'].to_numpy(dtype=float)
+        window_len = self.lookback + 1
+        last_i = len(df) - 1
+
+        # Incremental rolling OLS: O(1) per bar for beta / spread moments / z
+        stats = RollingSpreadStats(window_len)
+        for j in range(self.lookback):
+            stats.push(x[j], y[j])
+
+        is_mr = False
+        z_col = signals.columns.get_loc('z_score')
+        mr_col = signals.columns.get_loc('is_mean_reverting')
+        size_col = signals.columns.get_loc('size_multiplier')
+        signal_col = signals.columns.get_loc('signal')
+        exit_col = signals.columns.get_loc('exit_signal')
+        stride = self.adf_stride
+
         for i in range(self.lookback, len(df)):
-            window = df.iloc[i-self.lookback:i+1]
-            p1 = window['close_1'].values
-            p2 = window['close_2'].values
-            
-            # Compute beta & spread
-            beta = self._compute_beta(p1, p2)
-            spread = p2 - beta * p1
-            
-            # Stats
-            spread_mean = np.mean(spread)
-            spread_std = np.std(spread)
+            stats.push(x[i], y[i])
+            beta, spread_mean, spread_std, z_score = stats.spread_stats()
             if spread_std < 1e-8:
                 continue
-                
-            z_score = (spread[-1] - spread_mean) / spread_std
-            confidence = self.compute_confidence(spread, z_score)
 
-            signals.at[df.index[i], 'z_score'] = z_score
-            
-            # Regime filter
-            is_mr = self._is_mean_reverting(spread)
-            signals.at[df.index[i], 'is_mean_reverting'] = is_mr
+            signals.iat[i, z_col] = z_score
+            self.beta = beta
+            self.spread_mean = spread_mean
+            self.spread_std = spread_std
+
+            # Regime filter (stationarity test only on stride bars and the last bar)
+            step = i - self.lookback
+            if i == last_i or (stride > 0 and step % stride == 0):
+                spread = y[i - self.lookback:i + 1] - beta * x[i - self.lookback:i + 1]
+                p_adf = self._adf_pvalue(spread) if self.use_adf else None
+                is_mr = self._is_mean_reverting(spread, p_adf)
+            signals.iat[i, mr_col] = is_mr
             
             if not is_mr:
                 continue
@@ -182,7 +314,7 @@ class CointegrationStrategy:
                 np.clip(size_mult, 0.5, 2.5) if self.use_soft_vol 
                 else np.clip(size_mult, 0.3, 3.0)
             )
-            signals.at[df.index[i], 'size_multiplier'] = size_mult
+            signals.iat[i, size_col] = size_mult
             
             # State-based signals
             long_cond = (z_score <= -self.z_entry) and is_mr
@@ -191,14 +323,14 @@ class CointegrationStrategy:
             
             # Record signals
             if exit_cond:
-                signals.at[df.index[i], 'exit_signal'] = True
+                signals.iat[i, exit_col] = True
                 self.in_long = False
                 self.in_short = False
             elif long_cond and not self.in_long and not self.in_short:
-                signals.at[df.index[i], 'signal'] = 1
+                signals.iat[i, signal_col] = 1
                 self.in_long = True
             elif short_cond and not self.in_short and not self.in_long:
-                signals.at[df.index[i], 'signal'] = -1
+                signals.iat[i, signal_col] = -1
                 self.in_short = True
         
         return signals
@@ -23,11 +23,12 @@ from trading_bot.db.client import (
     get_connection,
     release_connection,
     query,
-    execute,
+    execute_many,
     get_table_name,
     DB_TYPE,
     get_backtest_connection
 )
+from trading_bot.db.candle_cache import get_candle_cache
 
 
 def _convert_timeframe_to_bybit(timeframe: str) -> str:
@@ -135,13 +136,29 @@ def _get_candle_connection():
             return conn
 
 
-def _get_candles_from_db(symbol: str, timeframe: str, start_ts: int, end_ts: int) -> List[Dict[str, Any]]:
+def _get_candles_from_db(symbol: str, timeframe: str, start_ts: int, end_ts: int,
+                         timeframe_ms: int) -> List[Dict[str, Any]]:
     """Get candles from database using centralized client for PostgreSQL."""
+    # Normalize symbol (remove .P suffix if present)
+    norm_symbol = symbol[:-2] if symbol.endswith('.P') else symbol
+
+    # Columnar cache: slice the range out of the mmap, syncing from klines_store
+    # only when the cached range doesn't reach the request (miss or stale)
+    candle_cache = get_candle_cache()
+    if candle_cache is not None:
+        now_ms = int(datetime.now(timezone.utc).timestamp() * 1000)
+        if not candle_cache.covers(norm_symbol, timeframe, start_ts, min(end_ts, now_ms), timeframe_ms):
+            conn = _get_candle_connection()
+            try:
+                candle_cache.sync_from_store(conn, norm_symbol, timeframe, since=start_ts)
+            finally:
+                release_connection(conn)
+        arrays = candle_cache.read(norm_symbol, timeframe, start=start_ts, end=end_ts, limit=5000)
+        # Same shape as the SQL path; candles stored here are all linear perpetuals
+        return arrays.to_dicts(store_format=True, symbol=norm_symbol, timeframe=timeframe, category='linear')
+
     conn = _get_candle_connection()
     try:
-        # Normalize symbol (remove .P suffix if present)
-        norm_symbol = symbol[:-2] if symbol.endswith('.P') else symbol
-
         # Table name differs: 'klines' for PostgreSQL, 'klines_store' for SQLite
         table_name = get_table_name('klines_store')
 
@@ -183,24 +200,34 @@ def _insert_candles_to_db(candles: List[Dict[str, Any]], symbol: str, timeframe:
         # Table name differs: 'klines' for PostgreSQL, 'klines_store' for SQLite
         table_name = get_table_name('klines_store')
 
-        for c in candles:
-            try:
-                execute(conn, f"""
-                    INSERT INTO {table_name} (symbol, timeframe, category, start_time, open_price,
-                                       high_price, low_price, close_price, volume, turnover)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-                    ON CONFLICT (symbol, timeframe, start_time) DO NOTHING
-                """, (
+        try:
+            execute_many(conn, f"""
+                INSERT INTO {table_name} (symbol, timeframe, category, start_time, open_price,
+                                   high_price, low_price, close_price, volume, turnover)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT (symbol, timeframe, start_time) DO NOTHING
+            """, [
+                (
                     norm_symbol, timeframe, category, c['start_time'],
                     c['open_price'], c['high_price'], c['low_price'], c['close_price'],
                     c.get('volume', 0), c.get('turnover', 0)
-                ))
-            except Exception:
-                pass  # Ignore duplicates
-        conn.commit()
+                )
+                for c in candles
+            ])
+        except Exception as e:
+            sys.stderr.write(f"Candle insert failed for {norm_symbol} {timeframe}: {e}\n")
+            return
     finally:
         release_connection(conn)
 
+    # Write through to the columnar cache (klines_store stays the durable copy)
+    candle_cache = get_candle_cache()
+    if candle_cache is not None:
+        try:
+            candle_cache.append(norm_symbol, timeframe, candles)
+        except Exception as e:
+            sys.stderr.write(f"Columnar cache update failed (non-fatal): {e}\n")
+
 
 def get_candles_for_trade(symbol: str, timeframe: str, timestamp_ms: int,
                           candles_before: int = 50, candles_after: int = 150) -> dict:
@@ -239,7 +266,7 @@ def get_candles_for_trade(symbol: str, timeframe: str, timestamp_ms: int,
     end_ts = timestamp_ms + (candles_after * timeframe_ms)
 
     # Get candles from database using centralized client
-    candles = _get_candles_from_db(symbol, timeframe, start_ts, end_ts)
+    candles = _get_candles_from_db(symbol, timeframe, start_ts, end_ts, timeframe_ms)
 
     # Check if we have enough candles before the signal
     expected_candles_before = candles_before